@@ -5,25 +5,51 @@ Advanced orbital mechanics service using Skyfield, SGP4, and modern astronomical
 
 import os
 import asyncio
+import hashlib
 import json
-import logging
+import time
+import tempfile
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Any
+from concurrent.futures import Future
+import threading
 import traceback
+import uuid
+from collections import Counter
 
-import redis
 import numpy as np
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-from skyfield.api import load, Topos
-from skyfield.sgp4lib import EarthSatellite
-from sgp4.api import Satrec, WGS84
-from sgp4.io import twoline2rv
+from sgp4.api import Satrec
 import requests
-from pydantic import BaseModel, Field
+from pydantic import BaseModel
 import structlog
 
+from propagation import PropagatorCache, propagate_catalog
+from screening import closest_approaches, screen_catalog
+from passes import can_rise, find_passes
+from pass_cache import PassPredictionCache
+from response_cache import ResponseCache
+from representations import Representation, RepresentationCache, make_etag
+from position_frames import FRAME_LAYOUTS, FRAME_MIMETYPE, encode_frame
+from catalog import CATEGORY_NAMES, SatelliteCatalog, SatelliteRecord
+from catalog_index import PROJECTION_FIELDS, CatalogIndex, project
+from compute_pool import ComputePool, ComputePoolBusy, parse_limits
+from ephemeris import ChebyshevEphemeris
+from ground_tracks import compact_track, pixel_tolerance_deg
+from position_snapshot import PositionSnapshot, PositionSnapshotStore
+from metrics import (
+    COMPUTE_SECONDS, HTTP_REQUEST_SECONDS, PROPAGATED_STATES, TLE_DOWNLOAD_SECONDS, TLE_FETCH_SECONDS,
+    TLE_FETCHES, TLE_PARSE_SECONDS, render_metrics
+)
+from redis_store import COMMAND_STATS, InstrumentedRedis, connect
+from tle_parser import parse_tle_text
+from visibility import ILLUMINATION_STATES, observer_view
+
+if TYPE_CHECKING:
+    from skyfield.sgp4lib import EarthSatellite
+    from skyfield.timelib import Timescale
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -57,21 +83,155 @@ class OrbitServiceConfig:
     UPDATE_INTERVAL = int(os.getenv('UPDATE_INTERVAL_MS', '30000')) // 1000
     THREAT_THRESHOLD_KM = float(os.getenv('CONJUNCTION_THRESHOLD_KM', '10.0'))
     AUTONOMOUS_MODE = os.getenv('AUTO_TOKEN_ROTATION', 'true').lower() == 'true'
+    MAX_POSITION_TIMESTAMPS = int(os.getenv('MAX_POSITION_TIMESTAMPS', '120'))
+    PROPAGATOR_CACHE_SIZE = int(os.getenv('PROPAGATOR_CACHE_SIZE', '25000'))
+    CONJUNCTION_COARSE_STEP_SECONDS = float(os.getenv('CONJUNCTION_COARSE_STEP_SECONDS', '120'))
+    PASS_GRID_STEP_SECONDS = float(os.getenv('PASS_GRID_STEP_SECONDS', '60'))
+    MAX_PASS_WINDOW_HOURS = int(os.getenv('MAX_PASS_WINDOW_HOURS', '72'))
+    PASS_CACHE_SIZE = int(os.getenv('PASS_CACHE_SIZE', '10000'))
+    PASS_CACHE_GRID_DEG = float(os.getenv('PASS_CACHE_GRID_DEG', '0.1'))
+    CONJUNCTION_SYNC_LIMIT = int(os.getenv('CONJUNCTION_SYNC_LIMIT', '2000'))  # objects, without mode=full
+    SCREENING_STEP_SECONDS = float(os.getenv('SCREENING_STEP_SECONDS', '30'))
+    SCREENING_JOB_TTL = int(os.getenv('SCREENING_JOB_TTL', '3600'))
+    TLE_REFRESH_LOCK_SECONDS = int(os.getenv('TLE_REFRESH_LOCK_SECONDS', '45'))
+    TLE_REFRESH_POLL_SECONDS = float(os.getenv('TLE_REFRESH_POLL_SECONDS', '0.2'))
+    BACKGROUND_REFRESH = os.getenv('CATALOG_BACKGROUND_REFRESH', 'true').lower() == 'true'
+    CATALOG_REFRESH_MARGIN = int(os.getenv('CATALOG_REFRESH_MARGIN', '300'))  # refresh this long before expiry
+    MAX_GROUNDTRACK_POINTS = int(os.getenv('MAX_GROUNDTRACK_POINTS', '1441'))
+    MAX_GROUNDTRACK_SATELLITES = int(os.getenv('MAX_GROUNDTRACK_SATELLITES', '100'))
+    EPHEMERIS_ENABLED = os.getenv('EPHEMERIS_ENABLED', 'true').lower() == 'true'
+    EPHEMERIS_WINDOW_HOURS = float(os.getenv('EPHEMERIS_WINDOW_HOURS', '6'))
+    EPHEMERIS_SEGMENT_MINUTES = float(os.getenv('EPHEMERIS_SEGMENT_MINUTES', '10'))
+    EPHEMERIS_DEGREE = int(os.getenv('EPHEMERIS_DEGREE', '7'))
+    EPHEMERIS_TOLERANCE_KM = float(os.getenv('EPHEMERIS_TOLERANCE_KM', '0.1'))
+    POSITION_SNAPSHOT_ENABLED = os.getenv('POSITION_SNAPSHOT_ENABLED', 'true').lower() == 'true'
+    # tmpfs keeps the shared snapshot in memory; any directory shared by the workers works
+    POSITION_SNAPSHOT_DIR = os.getenv('POSITION_SNAPSHOT_DIR', os.path.join(
+        '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(), 'orbit-service'
+    ))
+    # Directory holding a downloaded finals2000A.all; without one the tables bundled with Skyfield are used
+    TIMESCALE_DATA_DIR = os.getenv('TIMESCALE_DATA_DIR', '')
+    # Heavy endpoint bodies are reused for this long per catalog version and parameters
+    RESPONSE_CACHE_BUCKET_SECONDS = int(os.getenv('RESPONSE_CACHE_BUCKET_SECONDS', '300'))
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '256'))
+    RESPONSE_CACHE_LOCK_SECONDS = float(os.getenv('RESPONSE_CACHE_LOCK_SECONDS', '60'))
+    # Serialized /satellites bodies kept per catalog version, each with gzip and deflate variants
+    REPRESENTATION_CACHE_SIZE = int(os.getenv('REPRESENTATION_CACHE_SIZE', '8'))
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6'))
+    # Catalogs warm_start() loads before serving, comma separated
+    PRELOAD_SOURCES = [source for source in os.getenv('PRELOAD_SOURCES', 'active').split(',') if source]
+    # CPU-bound handlers run in this many processes per server worker (0 runs them in the request thread);
+    # beyond the running tasks at most COMPUTE_QUEUE_SIZE wait, and further requests get 429
+    COMPUTE_POOL_WORKERS = int(os.getenv('COMPUTE_POOL_WORKERS', '2'))
+    COMPUTE_QUEUE_SIZE = int(os.getenv('COMPUTE_QUEUE_SIZE', '8'))
+    COMPUTE_START_METHOD = os.getenv('COMPUTE_START_METHOD', 'spawn')
+    # Pool slots each endpoint may hold at once
+    COMPUTE_LIMITS = parse_limits(os.getenv(
+        'COMPUTE_LIMITS', 'conjunctions=1,screening=1,passes=2,satellite_passes=4,positions=4,groundtrack=4,visible=4'
+    ))
 
 config = OrbitServiceConfig()
 
-# Initialize Redis
-try:
-    redis_client = redis.from_url(config.REDIS_URL, decode_responses=True)
-    redis_client.ping()
-    logger.info("Redis connection established")
-except Exception as e:
-    logger.error(f"Redis connection failed: {e}")
-    redis_client = None
+# Initialize Redis. Creating the client opens no connection; each process
+# checks the server once, on its first request or in warm_start()
+redis_client = connect(config.REDIS_URL)
+_configured_redis = redis_client
+_redis_available: Optional[bool] = None
+_redis_check_lock = threading.Lock()
+
+def ensure_redis() -> Optional[InstrumentedRedis]:
+    """Ping the configured Redis once per process, falling back to running without it if unreachable"""
+    global redis_client, _redis_available
+    if redis_client is None or redis_client is not _configured_redis:
+        return redis_client
+    if _redis_available is None:
+        with _redis_check_lock:
+            if _redis_available is None:
+                try:
+                    _redis_available = bool(redis_client.ping())
+                    logger.info("Redis connection established")
+                except Exception as e:
+                    logger.error(f"Redis connection failed: {e}")
+                    _redis_available = False
+    if not _redis_available:
+        redis_client = None
+        pass_cache.redis_client = None
+        response_cache.redis_client = None
+    return redis_client
+
+# Skyfield is imported and its timescale built on first use, not at import. NumPy,
+# SGP4 and pydantic stay eager: the catalog and the models below need them at import
+_timescale: Optional['Timescale'] = None
+_timescale_lock = threading.Lock()
 
-# Initialize Skyfield
-ts = load.timescale()
-executor = ThreadPoolExecutor(max_workers=8)
+def get_timescale() -> 'Timescale':
+    """The shared Skyfield timescale, from TIMESCALE_DATA_DIR if it holds IERS data, else Skyfield's bundled tables"""
+    global _timescale
+    if _timescale is None:
+        with _timescale_lock:
+            if _timescale is None:
+                from skyfield.api import Loader, load
+                directory = config.TIMESCALE_DATA_DIR
+                if directory and os.path.exists(os.path.join(directory, 'finals2000A.all')):
+                    _timescale = Loader(directory, verbose=False).timescale(builtin=False)
+                else:
+                    _timescale = load.timescale(builtin=True)
+    return _timescale
+
+def _satrec(name: str, line1: str, line2: str) -> Satrec:
+    return Satrec.twoline2rv(line1, line2)
+
+def _init_compute_worker() -> None:
+    """Compute pool processes check Redis once up front, as serving processes do on their first request"""
+    ensure_redis()
+
+def _report_compute_worker() -> Dict[str, Any]:
+    """Cache stats of a compute pool process, sent back with each task it completes"""
+    return {'propagator_cache': propagator_cache.stats(), 'pass_cache': pass_cache.stats()}
+
+compute_pool = ComputePool(
+    config.COMPUTE_POOL_WORKERS, config.COMPUTE_QUEUE_SIZE, config.COMPUTE_LIMITS,
+    config.COMPUTE_START_METHOD, _init_compute_worker, _report_compute_worker
+)
+
+# Initialized SGP4 records shared by every tracker method; Skyfield wraps them only where it is needed
+propagator_cache = PropagatorCache(
+    config.PROPAGATOR_CACHE_SIZE, _satrec
+)
+
+# Pass events per satellite, TLE epoch and observer grid cell
+pass_cache = PassPredictionCache(
+    redis_client, config.PASS_CACHE_SIZE, config.PASS_CACHE_GRID_DEG, config.CACHE_TTL
+)
+
+# Rendered bodies of heavy endpoints per catalog version, parameters and time bucket
+response_cache = ResponseCache(
+    redis_client, config.RESPONSE_CACHE_SIZE, config.RESPONSE_CACHE_LOCK_SECONDS, config.TLE_REFRESH_POLL_SECONDS
+)
+representations = RepresentationCache(config.REPRESENTATION_CACHE_SIZE, config.COMPRESSION_LEVEL)
+PASS_MIN_ELEVATION_DEG = 10.0
+PASS_EVENT_NAMES = {0: 'rise', 1: 'culmination', 2: 'set'}
+# Catalogs a request may name: source -> CelesTrak GP group. Catalogs, snapshots, ephemerides
+# and metric labels are keyed on these names only
+CATALOG_SOURCES = {
+    'active': 'active',
+    'starlink': 'starlink',
+    'gps': 'gps-ops',
+    'weather': 'weather',
+    'science': 'science',
+}
+
+# Streaming catalog format for /satellites?format=ndjson
+NDJSON_MIMETYPE = 'application/x-ndjson'
+NDJSON_BATCH_RECORDS = 256
+# /satellites range filters: query parameter prefix (with _min/_max) -> indexed field
+LISTING_RANGE_FILTERS = {
+    'inclination': 'inclination',
+    'mean_motion': 'mean_motion',
+    'eccentricity': 'eccentricity',
+    'perigee': 'perigee_km',
+    'apogee': 'apogee_km',
+}
 
 class SatelliteData(BaseModel):
     """Satellite data model with validation"""
@@ -105,101 +265,445 @@ class ThreatAssessment(BaseModel):
     minimum_distance_km: float
     risk_level: str  # LOW, MEDIUM, HIGH, CRITICAL
     probability: float
+    relative_velocity_kms: Optional[float] = None
+
+def classify_conjunction_risk(min_distance: float) -> Tuple[str, float]:
+    """Map a miss distance to a risk level and rough collision probability"""
+    if min_distance < 1.0:
+        return "CRITICAL", 0.9
+    elif min_distance < 5.0:
+        return "HIGH", 0.7
+    elif min_distance < config.THREAT_THRESHOLD_KM:
+        return "MEDIUM", 0.4
+    return "LOW", 0.1
 
 class AutonomousSatelliteTracker:
     """Autonomous satellite tracking with advanced orbital mechanics"""
     
     def __init__(self):
-        self.satellites_cache = {}
-        self.tle_data = {}
+        # Per-worker parsed catalogs: source -> array-backed catalog keyed by NORAD ID
+        self.tle_data: Dict[str, SatelliteCatalog] = {}
+        # Lazily validated models: source -> {norad_id: SatelliteData}
+        self.satellites_cache: Dict[str, Dict[int, SatelliteData]] = {}
+        self.catalog_versions: Dict[str, Optional[str]] = {}
+        self.catalog_loaded_at: Dict[str, float] = {}
         self.threat_assessments = []
+        self.catalog_updated_at: Dict[str, datetime] = {}
+        # Sorted filter indexes of the served catalogs, built on their first filtered listing
+        self.catalog_indexes: Dict[str, CatalogIndex] = {}
+        self._index_lock = threading.Lock()
+        # Precomputed position tables: source -> Chebyshev fits over the current window
+        self.ephemerides: Dict[str, ChebyshevEphemeris] = {}
+        self._refresh_locks: Dict[str, threading.Lock] = {}
+        self._refresh_sources = {'active'}
+        self._refresh_wakeup = threading.Event()
+        self._refresh_stop = threading.Event()
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_lock = threading.Lock()
         self.last_update = None
         
-    async def fetch_tle_data(self, source: str = 'active') -> Dict[int, SatelliteData]:
+    def _install_catalog(self, source: str, satellites: Any, version: Optional[str],
+                         updated_at: Optional[datetime] = None) -> SatelliteCatalog:
+        """Swap in a freshly decoded catalog, building it from JSON records if needed
+        
+        Readers keep whatever catalog they already hold; the new one replaces
+        it with a single assignment, so nobody sees a half-built catalog.
+        """
+        if isinstance(satellites, SatelliteCatalog):
+            catalog = satellites
+        else:
+            catalog = self._categorize(source, SatelliteCatalog.from_records(satellites.values(), category=source),
+                                       version)
+        previous_version = self.catalog_versions.get(source)
+        self.tle_data[source] = catalog
+        self.satellites_cache[source] = {}
+        self.catalog_indexes.pop(source, None)
+        self.catalog_versions[source] = version
+        if previous_version != version:
+            response_cache.invalidate(source, version)
+            representations.invalidate(source, version)
+        self.catalog_loaded_at[source] = time.monotonic()
+        self.catalog_updated_at[source] = updated_at or datetime.now(timezone.utc)
+        # Freshness of the oldest catalog this worker serves
+        self.last_update = min(self.catalog_updated_at.values())
+        return catalog
+    
+    @staticmethod
+    def _mixed_catalog(source: str) -> bool:
+        """Whether a catalog spans several category groups (such as ``active``) rather than being one of them"""
+        return source not in CATEGORY_NAMES or source == 'active'
+    
+    def _categorize(self, source: str, catalog: SatelliteCatalog,
+                    version: Optional[str] = None) -> SatelliteCatalog:
+        """Give the rows of a mixed catalog the category groups the sync job
+        filed them under; rows it has not filed, and every row of a single-group catalog, keep ``source``
+        
+        The sync job's sets are read in one pipelined round trip by the worker
+        that downloads a catalog, and the groups are published with it; a
+        worker installing that ``version`` from Redis reuses them.
+        """
+        if redis_client is None or not self._mixed_catalog(source):
+            return catalog
+        try:
+            published = redis_client.get(f"tle_data:{source}:categories") if version is not None else None
+            members = json.loads(published) if published else None
+            if members is None or members.get('version') != version:
+                groups = [category for category in CATEGORY_NAMES if category not in ('unknown', 'active')]
+                pipe = redis_client.pipeline(transaction=False)
+                for group in groups:
+                    pipe.smembers(f"satellites:category:{group}")
+                members = {'members': dict(zip(groups, pipe.execute()))}
+            catalog.assign_categories(members['members'])
+        except Exception as e:
+            logger.warning(f"Could not load satellite categories for {source}: {e}")
+        return catalog
+    
+    def catalog_version(self, source: str, catalog: SatelliteCatalog) -> Optional[str]:
+        """Version of ``catalog`` if it is the one this worker currently serves for ``source``"""
+        if self.tle_data.get(source) is not catalog:
+            return None
+        return self.catalog_versions.get(source)
+    
+    def catalog_index(self, source: str, catalog: SatelliteCatalog) -> CatalogIndex:
+        """Filter indexes of ``catalog``, built once and kept while it is the catalog served for ``source``"""
+        index = self.catalog_indexes.get(source)
+        if index is None or index.catalog is not catalog:
+            with self._index_lock:
+                index = self.catalog_indexes.get(source)
+                if index is None or index.catalog is not catalog:
+                    index = CatalogIndex(catalog)
+                    if self.tle_data.get(source) is catalog:
+                        self.catalog_indexes[source] = index
+        return index
+    
+    def _published_at(self, source: str) -> Optional[datetime]:
+        """When the catalog currently in Redis was downloaded from upstream"""
+        updated = redis_client.get(f"tle_data:{source}:updated") if redis_client else None
+        return datetime.fromisoformat(updated) if updated else None
+        
+    def _cached_catalog(self, source: str, version: Optional[str]) -> Optional[SatelliteCatalog]:
+        """Return the in-memory catalog if it is still current"""
+        if source not in self.tle_data:
+            return None
+        if redis_client:
+            if version is not None and self.catalog_versions.get(source) == version:
+                return self.tle_data[source]
+            return None
+        # Without Redis there is no shared version, so fall back to local expiry
+        if time.monotonic() - self.catalog_loaded_at[source] < config.CACHE_TTL:
+            return self.tle_data[source]
+        return None
+        
+    def get_satellite(self, norad_id: int, source: str = 'active') -> Optional[SatelliteData]:
+        """Look up a validated satellite model from the in-memory catalog"""
+        models = self.satellites_cache.setdefault(source, {})
+        satellite = models.get(norad_id)
+        if satellite is None:
+            record = self.tle_data.get(source, SatelliteCatalog.empty()).get(norad_id)
+            if record is None:
+                return None
+            satellite = models[norad_id] = SatelliteData(**record)
+        return satellite
+        
+    @staticmethod
+    def _source_url(source: str) -> str:
+        """CelesTrak URL of a catalog group"""
+        if source not in CATALOG_SOURCES:
+            raise ValueError(f"Unknown catalog source: {source}")
+        return f'{config.CELESTRAK_BASE}/NORAD/elements/gp.php?GROUP={CATALOG_SOURCES[source]}&FORMAT=tle'
+        
+    async def fetch_tle_data(self, source: str = 'active') -> SatelliteCatalog:
         """Fetch TLE data from CELESTRAK with autonomous error handling"""
+        if source not in CATALOG_SOURCES:
+            raise ValueError(f"Unknown catalog source: {source}")
+        with TLE_FETCH_SECONDS.labels(source).time():
+            return await self._fetch_tle_data(source)
+    
+    async def _fetch_tle_data(self, source: str) -> SatelliteCatalog:
         try:
-            sources = {
-                'active': f'{config.CELESTRAK_BASE}/NORAD/elements/gp.php?GROUP=active&FORMAT=tle',
-                'starlink': f'{config.CELESTRAK_BASE}/NORAD/elements/gp.php?GROUP=starlink&FORMAT=tle',
-                'gps': f'{config.CELESTRAK_BASE}/NORAD/elements/gp.php?GROUP=gps-ops&FORMAT=tle',
-                'weather': f'{config.CELESTRAK_BASE}/NORAD/elements/gp.php?GROUP=weather&FORMAT=tle',
-                'science': f'{config.CELESTRAK_BASE}/NORAD/elements/gp.php?GROUP=science&FORMAT=tle',
-            }
+            # Check the in-process catalog first; only the version key crosses the wire
+            cache_key = f"tle_data:{source}"
+            version_key = f"{cache_key}:version"
+            version = redis_client.get(version_key) if redis_client else None
             
-            url = sources.get(source, sources['active'])
+            catalog = self._cached_catalog(source, version)
+            if catalog is not None:
+                TLE_FETCHES.labels(source, 'memory').inc()
+                return catalog
             
-            # Check cache first
-            cache_key = f"tle_data:{source}"
             cached_data = redis_client.get(cache_key) if redis_client else None
             
             if cached_data:
-                logger.info(f"Using cached TLE data for {source}")
-                return json.loads(cached_data)
-            
-            # Fetch fresh data
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
+                TLE_FETCHES.labels(source, 'redis').inc()
+                logger.info(f"Loading cached TLE data for {source}")
+                if version is None:
+                    # Blob written without a version key; publish one so we decode it only once
+                    version = hashlib.sha1(cached_data.encode()).hexdigest()
+                    # Expire with the blob; one without an expiry (-1) or gone since the GET (-2) gets CACHE_TTL
+                    ttl = redis_client.ttl(cache_key)
+                    redis_client.setex(version_key, ttl if ttl > 0 else config.CACHE_TTL, version)
+                return self._install_catalog(source, json.loads(cached_data), version,
+                                             self._published_at(source))
             
-            tle_lines = response.text.strip().split('\n')
-            satellites = {}
+            stale = self.tle_data.get(source)
+            if stale is not None and self.refresh_running():
+                # Keep serving the old copy; the refresher swaps in the new one
+                self.request_refresh(source)
+                TLE_FETCHES.labels(source, 'stale').inc()
+                return stale
             
-            for i in range(0, len(tle_lines), 3):
-                if i + 2 < len(tle_lines):
-                    name = tle_lines[i].strip()
-                    line1 = tle_lines[i + 1].strip()
-                    line2 = tle_lines[i + 2].strip()
-                    
-                    try:
-                        # Parse NORAD ID
-                        norad_id = int(line1[2:7])
-                        
-                        # Parse orbital elements
-                        epoch_year = int(line1[18:20])
-                        epoch_day = float(line1[20:32])
-                        
-                        # Convert epoch to datetime
-                        year = 2000 + epoch_year if epoch_year < 57 else 1900 + epoch_year
-                        epoch = datetime(year, 1, 1) + timedelta(days=epoch_day - 1)
-                        
-                        # Extract orbital elements
-                        inclination = float(line2[8:16])
-                        raan = float(line2[17:25])
-                        eccentricity = float('0.' + line2[26:33])
-                        arg_perigee = float(line2[34:42])
-                        mean_anomaly = float(line2[43:51])
-                        mean_motion = float(line2[52:63])
-                        
-                        satellite_data = SatelliteData(
-                            norad_id=norad_id,
-                            name=name,
-                            line1=line1,
-                            line2=line2,
-                            epoch=epoch,
-                            mean_motion=mean_motion,
-                            eccentricity=eccentricity,
-                            inclination=inclination,
-                            arg_perigee=arg_perigee,
-                            raan=raan,
-                            mean_anomaly=mean_anomaly
-                        )
-                        
-                        satellites[norad_id] = satellite_data.dict()
-                        
-                    except (ValueError, IndexError) as e:
-                        logger.warning(f"Failed to parse TLE for {name}: {e}")
-                        continue
-            
-            # Cache the results
-            if redis_client:
-                redis_client.setex(cache_key, config.CACHE_TTL, json.dumps(satellites))
-            
-            logger.info(f"Fetched {len(satellites)} satellites from {source}")
-            return satellites
+            TLE_FETCHES.labels(source, 'miss').inc()
+            return await self._refresh_catalog(source, self._source_url(source))
             
         except Exception as e:
+            TLE_FETCHES.labels(source, 'error').inc()
             logger.error(f"Failed to fetch TLE data from {source}: {e}")
-            return {}
+            return self.tle_data.get(source, SatelliteCatalog.empty())
+    
+    async def _refresh_catalog(self, source: str, url: str) -> SatelliteCatalog:
+        """Download a missing catalog once per source across threads and workers
+        
+        Requests that lose the race serve the catalog this worker already holds,
+        even if it is stale, or wait for the winner to publish a fresh one.
+        """
+        local_lock = self._refresh_locks.setdefault(source, threading.Lock())
+        if not local_lock.acquire(blocking=False):
+            stale = self.tle_data.get(source)
+            if stale is not None:
+                return stale
+            if local_lock.acquire(timeout=config.TLE_REFRESH_LOCK_SECONDS):
+                local_lock.release()
+            return self.tle_data.get(source, SatelliteCatalog.empty())
+        
+        try:
+            lock_key = f"tle_data:{source}:lock"
+            token = uuid.uuid4().hex
+            if redis_client and not redis_client.set(lock_key, token, nx=True,
+                                                     ex=config.TLE_REFRESH_LOCK_SECONDS):
+                stale = self.tle_data.get(source)
+                if stale is not None:
+                    return stale
+                catalog = await self._wait_for_catalog(source, lock_key)
+                if catalog is not None:
+                    return catalog
+                # The holder gave up or its lease ran out; refresh here instead
+                if not redis_client.set(lock_key, token, nx=True, ex=config.TLE_REFRESH_LOCK_SECONDS):
+                    return SatelliteCatalog.empty()
+            
+            try:
+                satellites = self._download_catalog(source, url)
+                updated_at = datetime.now(timezone.utc)
+                version = self._publish_catalog(source, satellites, updated_at)
+                previous_version = self.catalog_versions.get(source)
+                if previous_version is not None and previous_version != version:
+                    response_cache.purge_shared(source, previous_version)
+                return self._install_catalog(source, satellites, version, updated_at)
+            finally:
+                # Only release our own lease; an expired one may already belong to another worker
+                if redis_client and redis_client.get(lock_key) == token:
+                    redis_client.delete(lock_key)
+        finally:
+            local_lock.release()
+    
+    async def _wait_for_catalog(self, source: str, lock_key: str) -> Optional[SatelliteCatalog]:
+        """Poll for the catalog another worker is publishing, until its lease ends"""
+        cache_key = f"tle_data:{source}"
+        deadline = time.monotonic() + config.TLE_REFRESH_LOCK_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(config.TLE_REFRESH_POLL_SECONDS)
+            cached_data = redis_client.get(cache_key)
+            if cached_data:
+                version = redis_client.get(f"{cache_key}:version")
+                return self._install_catalog(source, json.loads(cached_data), version,
+                                             self._published_at(source))
+            if redis_client.get(lock_key) is None:
+                return None
+        return None
+    
+    def _download_catalog(self, source: str, url: str) -> SatelliteCatalog:
+        """Fetch and parse a catalog from CelesTrak (validated as SatelliteData only when served)"""
+        with TLE_DOWNLOAD_SECONDS.labels(source).time():
+            response = requests.get(url, timeout=30)
+            response.raise_for_status()
+        
+        with TLE_PARSE_SECONDS.labels(source).time():
+            columns, errors = parse_tle_text(response.text)
+        if errors:
+            reasons = Counter(error['reason'] for error in errors)
+            logger.warning(f"Skipped {len(errors)} malformed TLE records from {source}: {dict(reasons)}")
+        satellites = self._categorize(source, SatelliteCatalog.from_columns(columns, categories=source))
+        
+        logger.info(f"Fetched {len(satellites)} satellites from {source}")
+        return satellites
+    
+    def _publish_catalog(self, source: str, satellites: SatelliteCatalog,
+                         updated_at: datetime) -> str:
+        """Write a catalog to Redis together with its version, returning the version"""
+        cache_key = f"tle_data:{source}"
+        payload = json.dumps(satellites.to_records())
+        version = hashlib.sha1(payload.encode()).hexdigest()
+        if redis_client:
+            pipe = redis_client.pipeline()
+            pipe.setex(cache_key, config.CACHE_TTL, payload)
+            pipe.setex(f"{cache_key}:version", config.CACHE_TTL, version)
+            pipe.setex(f"{cache_key}:updated", config.CACHE_TTL, updated_at.isoformat())
+            if self._mixed_catalog(source):
+                pipe.setex(f"{cache_key}:categories", config.CACHE_TTL, json.dumps({
+                    'version': version, 'members': satellites.category_members(exclude=('unknown', 'active'))
+                }))
+            pipe.execute()
+        return version
+    
+    def _catalog_needs_refresh(self, source: str) -> bool:
+        """Whether a catalog is missing or close enough to expiry to download again"""
+        if redis_client:
+            ttl = redis_client.ttl(f"tle_data:{source}")
+            return ttl == -2 or 0 <= ttl < config.CATALOG_REFRESH_MARGIN
+        loaded_at = self.catalog_loaded_at.get(source)
+        return loaded_at is None or time.monotonic() - loaded_at >= config.CACHE_TTL - config.CATALOG_REFRESH_MARGIN
+    
+    def refresh_catalog(self, source: str) -> None:
+        """Bring one catalog up to date outside the request path"""
+        try:
+            if self._catalog_needs_refresh(source):
+                asyncio.run(self._refresh_catalog(source, self._source_url(source)))
+            else:
+                # Pick up a catalog another worker has published
+                asyncio.run(self.fetch_tle_data(source))
+            if config.EPHEMERIS_ENABLED:
+                self.update_ephemeris(source)
+            if config.POSITION_SNAPSHOT_ENABLED:
+                self.publish_snapshot(source)
+        except Exception as e:
+            logger.error(f"Background refresh of {source} failed: {e}")
+    
+    def update_ephemeris(self, source: str) -> Optional[ChebyshevEphemeris]:
+        """Roll a catalog's ephemeris window forward, refitting only new segments and changed TLEs"""
+        catalog = self.tle_data.get(source)
+        if catalog is None:
+            return None
+        norad_ids, satrecs = self._cached_satrecs(catalog.records())
+        previous = self.ephemerides.get(source)
+        started = time.monotonic()
+        # Start a segment back so requests stamped just before now still hit the table
+        ephemeris = ChebyshevEphemeris.build(
+            norad_ids, satrecs,
+            datetime.now(timezone.utc) - timedelta(minutes=config.EPHEMERIS_SEGMENT_MINUTES),
+            config.EPHEMERIS_WINDOW_HOURS, config.EPHEMERIS_SEGMENT_MINUTES,
+            config.EPHEMERIS_DEGREE, config.EPHEMERIS_TOLERANCE_KM, previous
+        )
+        if ephemeris is not previous:
+            self.ephemerides[source] = ephemeris
+            logger.info(f"Fitted {source} ephemeris for {len(norad_ids)} satellites "
+                        f"in {time.monotonic() - started:.2f}s")
+        return ephemeris
+    
+    def publish_snapshot(self, source: str) -> Optional[PositionSnapshot]:
+        """Propagate a catalog to the current tick once for all workers, unless another worker has"""
+        catalog = self.tle_data.get(source)
+        version = self.catalog_versions.get(source)
+        # Readers match snapshots to their catalog by version, so unversioned catalogs are not published
+        if catalog is None or version is None:
+            return None
+        interval = max(config.UPDATE_INTERVAL, 1)
+        tick = datetime.fromtimestamp(time.time() // interval * interval, timezone.utc)
+        
+        def produce() -> Tuple[List[int], Dict[str, np.ndarray]]:
+            records = catalog.records(range(min(config.MAX_SATELLITES, len(catalog))))
+            norad_ids, satrecs = self._cached_satrecs(records)
+            return norad_ids, self._propagate(norad_ids, satrecs, [tick], source)
+        
+        return snapshot_store.publish(source, tick, version, produce)
+    
+    def current_snapshot(self, source: str) -> Optional[PositionSnapshot]:
+        """The shared snapshot of a source if it was taken from the catalog this worker serves and is fresh"""
+        if not config.POSITION_SNAPSHOT_ENABLED:
+            return None
+        version = self.catalog_versions.get(source)
+        snapshot = snapshot_store.read(source) if version is not None else None
+        if snapshot is None or snapshot.catalog_version != version:
+            return None
+        # A snapshot older than two ticks means no worker is producing; propagate per request instead
+        if snapshot.age_seconds() >= 2 * max(config.UPDATE_INTERVAL, 1):
+            return None
+        return snapshot
+    
+    def snapshot_position(self, norad_id: int, timestamp: Optional[datetime] = None,
+                          source: str = 'active') -> Optional[OrbitPosition]:
+        """One satellite's position from the current shared snapshot, if it holds that satellite at ``timestamp``
+        
+        Without a timestamp any current snapshot will do, as for the bulk endpoints.
+        """
+        snapshot = self.current_snapshot(source)
+        if snapshot is None or (timestamp is not None and timestamp != snapshot.epoch):
+            return None
+        rows = snapshot.rows([norad_id])
+        if len(rows) == 0 or snapshot.arrays['error'][rows[0]] != 0:
+            return None
+        row = rows[0]
+        altitude_km = float(snapshot.arrays['altitude_km'][row])
+        return OrbitPosition(
+            timestamp=snapshot.epoch,
+            latitude=float(snapshot.arrays['latitude'][row]),
+            longitude=float(snapshot.arrays['longitude'][row]),
+            altitude_km=altitude_km,
+            velocity_kms=float(snapshot.arrays['velocity_kms'][row]),
+            visible=altitude_km > 200
+        )
+    
+    def request_refresh(self, source: str) -> None:
+        """Ask the refresher to look at a catalog now instead of on its next tick"""
+        self._refresh_sources.add(source)
+        self._refresh_wakeup.set()
+    
+    def refresh_running(self) -> bool:
+        return self._refresher is not None and self._refresher.is_alive()
+    
+    def start_background_refresh(self) -> bool:
+        """Start this process's catalog refresher, once"""
+        with self._refresher_lock:
+            if self.refresh_running():
+                return False
+            self._refresh_stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, name='catalog-refresh', daemon=True)
+            self._refresher.start()
+            logger.info("Background catalog refresh started")
+            return True
     
+    def stop_background_refresh(self) -> None:
+        """Stop the refresher after its current check"""
+        self._refresh_stop.set()
+        self._refresh_wakeup.set()
+        if self._refresher is not None:
+            self._refresher.join(timeout=config.TLE_REFRESH_LOCK_SECONDS)
+    
+    def _refresh_loop(self) -> None:
+        """Check every catalog each UPDATE_INTERVAL, refreshing ahead of CACHE_TTL expiry"""
+        while not self._refresh_stop.is_set():
+            for source in sorted((self._refresh_sources | set(self.tle_data)) & CATALOG_SOURCES.keys()):
+                self.refresh_catalog(source)
+            # Wake on tick boundaries so snapshots are published as soon as their tick starts
+            interval = max(config.UPDATE_INTERVAL, 1)
+            self._refresh_wakeup.wait(interval - time.time() % interval)
+            self._refresh_wakeup.clear()
+    
+    def get_satrec(self, satellite_data: SatelliteData) -> Satrec:
+        """Get the cached SGP4 record for this TLE, initializing it on first use"""
+        return propagator_cache.get(
+            satellite_data.norad_id,
+            satellite_data.name,
+            satellite_data.line1,
+            satellite_data.line2
+        )
+    
+    def get_propagator(self, satellite_data: SatelliteData) -> 'EarthSatellite':
+        """Skyfield satellite around the cached SGP4 record, for the Skyfield time and topos APIs"""
+        from skyfield.sgp4lib import EarthSatellite
+        satellite = EarthSatellite.from_satrec(self.get_satrec(satellite_data), get_timescale())
+        satellite.name = satellite_data.name
+        return satellite
+        
+    @COMPUTE_SECONDS.labels('calculate_position').time()
     def calculate_position(self, satellite_data: SatelliteData, 
                           timestamp: Optional[datetime] = None) -> OrbitPosition:
         """Calculate precise satellite position using Skyfield"""
@@ -207,16 +711,11 @@ class AutonomousSatelliteTracker:
             if timestamp is None:
                 timestamp = datetime.now(timezone.utc)
             
-            # Create Skyfield satellite object
-            satellite = EarthSatellite(
-                satellite_data.line1, 
-                satellite_data.line2, 
-                satellite_data.name, 
-                ts
-            )
+            # Get cached Skyfield satellite object
+            satellite = self.get_propagator(satellite_data)
             
             # Get position at specified time
-            t = ts.from_datetime(timestamp.replace(tzinfo=timezone.utc))
+            t = get_timescale().from_datetime(timestamp.replace(tzinfo=timezone.utc))
             geocentric = satellite.at(t)
             
             # Convert to lat/lon/alt
@@ -244,116 +743,449 @@ class AutonomousSatelliteTracker:
             logger.error(f"Failed to calculate position for {satellite_data.name}: {e}")
             raise
     
+    def _cached_satrecs(self, satellites: Sequence[Mapping[str, Any]]) -> Tuple[List[int], List[Satrec]]:
+        """SGP4 records for catalog entries from the propagator cache, skipping bad TLEs"""
+        norad_ids = []
+        satrecs = []
+        for satellite in satellites:
+            try:
+                model = propagator_cache.get(
+                    int(satellite['norad_id']), satellite['name'], satellite['line1'], satellite['line2']
+                )
+            except (KeyError, ValueError):
+                continue
+            if model.error == 0:
+                norad_ids.append(int(satellite['norad_id']))
+                satrecs.append(model)
+        return norad_ids, satrecs
+    
+    def ephemeris_covers(self, source: Optional[str], timestamps: List[datetime]) -> bool:
+        """Whether the source's ephemeris can answer for these times without running SGP4"""
+        ephemeris = self.ephemerides.get(source) if source else None
+        return ephemeris is not None and ephemeris.covers(timestamps)
+    
+    def _propagate(self, norad_ids: List[int], satrecs: List[Satrec], timestamps: List[datetime],
+                   source: Optional[str]) -> Dict[str, np.ndarray]:
+        """Read positions from the source's ephemeris where it covers the request, else run SGP4"""
+        ephemeris = self.ephemerides.get(source) if source else None
+        if not self.ephemeris_covers(source, timestamps):
+            PROPAGATED_STATES.labels('api', 'sgp4').inc(len(satrecs) * len(timestamps))
+            return propagate_catalog(satrecs, timestamps)
+        rows = ephemeris.lookup(norad_ids, satrecs)
+        tabulated = int(np.count_nonzero(rows >= 0))
+        PROPAGATED_STATES.labels('api', 'ephemeris').inc(tabulated * len(timestamps))
+        PROPAGATED_STATES.labels('api', 'sgp4').inc((len(rows) - tabulated) * len(timestamps))
+        return ephemeris.propagate(satrecs, rows, timestamps)
+    
+    @COMPUTE_SECONDS.labels('calculate_positions').time()
+    def calculate_positions(self, satellites: Sequence[Mapping[str, Any]],
+                            timestamps: List[datetime], source: Optional[str] = None) -> Dict[str, Any]:
+        """Calculate positions for many satellites and timestamps in one vectorized pass"""
+        norad_ids, satrecs = self._cached_satrecs(satellites)
+        result = self._propagate(norad_ids, satrecs, timestamps, source)
+        return self.positions_payload(norad_ids, timestamps, result)
+    
+    @staticmethod
+    def positions_payload(norad_ids: List[int], timestamps: List[datetime],
+                          result: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """JSON columns of propagated positions, one row per satellite and one column per timestamp"""
+        valid = result['error'] == 0
+        
+        def column(values: np.ndarray, decimals: int) -> List[List[Optional[float]]]:
+            # Failed propagations (decayed objects etc.) are reported as null
+            column_values = np.round(values, decimals).astype(object)
+            column_values[~valid] = None
+            return column_values.tolist()
+        
+        return {
+            'norad_ids': norad_ids,
+            'timestamps': [t.isoformat() for t in timestamps],
+            'latitude': column(result['latitude'], 6),
+            'longitude': column(result['longitude'], 6),
+            'altitude_km': column(result['altitude_km'], 3),
+            'velocity_kms': column(result['velocity_kms'], 5),
+            'visible': (valid & (result['altitude_km'] > 200)).tolist()
+        }
+    
+    def position_frame(self, satellites: Sequence[Mapping[str, Any]], timestamp: datetime,
+                       layout: str = 'geodetic', base_timestamp: Optional[datetime] = None,
+                       source: Optional[str] = None) -> bytearray:
+        """Encode positions at one timestamp as a binary frame, optionally as deltas from ``base_timestamp``"""
+        norad_ids, satrecs = self._cached_satrecs(satellites)
+        timestamps = [timestamp] if base_timestamp is None else [timestamp, base_timestamp]
+        result = self._propagate(norad_ids, satrecs, timestamps, source)
+        return self.encode_positions(norad_ids, result, layout, timestamp, base_timestamp)
+    
+    @staticmethod
+    def encode_positions(norad_ids: List[int], result: Dict[str, np.ndarray], layout: str,
+                         timestamp: datetime, base_timestamp: Optional[datetime] = None) -> bytearray:
+        """Binary frame of propagated positions at ``timestamp`` (and ``base_timestamp`` for deltas)"""
+        
+        if layout == 'ecef':
+            columns = np.moveaxis(result['position_ecef'], -1, 0)
+        else:
+            columns = np.stack((result['latitude'], result['longitude'], result['altitude_km']))
+        columns = np.where(result['error'] == 0, columns, np.nan)
+        
+        if base_timestamp is None:
+            return encode_frame(norad_ids, columns[:, :, 0], layout, timestamp)
+        return encode_frame(norad_ids, columns[:, :, 0], layout, timestamp,
+                            base_columns=columns[:, :, 1], base_epoch=base_timestamp)
+    
+    def ground_tracks(self, satellites: Sequence[Mapping[str, Any]], start: datetime,
+                      duration_seconds: float, step_seconds: float,
+                      tolerance_deg: Optional[float] = None, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Sub-satellite tracks of many satellites from one propagation over a shared time grid"""
+        offsets = np.arange(0.0, duration_seconds + step_seconds / 2.0, step_seconds)
+        offsets[-1] = min(offsets[-1], duration_seconds)
+        timestamps = [start + timedelta(seconds=float(offset)) for offset in offsets]
+        
+        norad_ids, satrecs = self._cached_satrecs(satellites)
+        result = self._propagate(norad_ids, satrecs, timestamps, source)
+        names = {int(satellite['norad_id']): satellite['name'] for satellite in satellites}
+        
+        # Failed propagations become NaN and break the track
+        valid = result['error'] == 0
+        latitude = np.where(valid, result['latitude'], np.nan)
+        longitude = np.where(valid, result['longitude'], np.nan)
+        
+        return [{
+            'norad_id': norad_id,
+            'name': names[norad_id],
+            'segments': compact_track(offsets, latitude[row], longitude[row], tolerance_deg)
+        } for row, norad_id in enumerate(norad_ids)]
+    
+    def _find_pass_events(self, satellite_data: SatelliteData, observer_lat: float,
+                          observer_lon: float, start: datetime, end: datetime) -> List[Tuple[str, datetime]]:
+        """Run Skyfield's event search for one satellite over one observer"""
+        from skyfield.api import Topos
+        observer = Topos(observer_lat, observer_lon)
+        satellite = self.get_propagator(satellite_data)
+        timescale = get_timescale()
+        
+        times, events = satellite.find_events(
+            observer, timescale.from_datetime(start), timescale.from_datetime(end),
+            altitude_degrees=PASS_MIN_ELEVATION_DEG
+        )
+        return [(PASS_EVENT_NAMES[event], t.utc_datetime()) for t, event in zip(times, events)]
+    
+    @COMPUTE_SECONDS.labels('predict_passes').time()
     def predict_passes(self, satellite_data: SatelliteData, 
                       observer_lat: float, observer_lon: float, 
-                      hours_ahead: int = 24) -> List[Dict]:
+                      hours_ahead: int = 24,
+                      start: Optional[datetime] = None) -> List[Dict]:
         """Predict satellite passes over observer location"""
         try:
-            # Create observer location
-            observer = Topos(observer_lat, observer_lon)
-            
-            # Create satellite
-            satellite = EarthSatellite(
-                satellite_data.line1, 
-                satellite_data.line2, 
-                satellite_data.name, 
-                ts
+            # Observers in the same grid cell share one cached prediction
+            lat_q, lon_q = pass_cache.quantize(observer_lat, observer_lon)
+            key = pass_cache.make_key(
+                satellite_data.norad_id, PropagatorCache.epoch_key(satellite_data.line1),
+                lat_q, lon_q, PASS_MIN_ELEVATION_DEG
             )
             
             # Calculate passes
-            t0 = ts.now()
-            t1 = ts.from_datetime(datetime.now(timezone.utc) + timedelta(hours=hours_ahead))
+            if start is None:
+                start = datetime.now(timezone.utc)
+            end = start + timedelta(hours=hours_ahead)
             
-            times, events = satellite.find_events(observer, t0, t1, altitude_degrees=10.0)
-            
-            passes = []
-            for time, event in zip(times, events):
-                if event == 0:  # Rise
-                    pass_info = {
-                        'rise_time': time.utc_datetime(),
-                        'event': 'rise'
-                    }
-                elif event == 1:  # Culmination
-                    pass_info = {
-                        'culmination_time': time.utc_datetime(),
-                        'event': 'culmination'
-                    }
-                elif event == 2:  # Set
-                    pass_info = {
-                        'set_time': time.utc_datetime(),
-                        'event': 'set'
-                    }
-                
-                passes.append(pass_info)
+            events = pass_cache.get_or_compute(
+                key, start, end,
+                lambda t0, t1: self._find_pass_events(satellite_data, lat_q, lon_q, t0, t1)
+            )
             
-            return passes
+            return [{f'{name}_time': when, 'event': name} for name, when in events]
             
         except Exception as e:
             logger.error(f"Failed to predict passes for {satellite_data.name}: {e}")
             return []
     
+    @COMPUTE_SECONDS.labels('predict_passes_batch').time()
+    def predict_passes_batch(self, satellites: SatelliteCatalog,
+                             observer_lat: float, observer_lon: float,
+                             hours_ahead: float = 24, min_elevation: float = 10.0,
+                             observer_alt_km: float = 0.0,
+                             start: Optional[datetime] = None) -> Dict[str, Any]:
+        """Predict passes of many satellites over one observer"""
+        if start is None:
+            start = datetime.now(timezone.utc)
+        
+        # Drop orbits that can never clear the elevation mask from this latitude
+        reachable = can_rise(
+            satellites.column('inclination'),
+            satellites.column('mean_motion'),
+            satellites.column('eccentricity'),
+            observer_lat, min_elevation
+        )
+        
+        norad_ids, satrecs = self._cached_satrecs(satellites.records(np.flatnonzero(reachable)))
+        candidates = [satellites[norad_id] for norad_id in norad_ids]
+        
+        results = find_passes(
+            satrecs, observer_lat, observer_lon, observer_alt_km, start, hours_ahead,
+            min_elevation, config.PASS_GRID_STEP_SECONDS
+        )
+        
+        passes = []
+        for satellite, satellite_passes in zip(candidates, results):
+            for pass_info in satellite_passes:
+                passes.append({
+                    'norad_id': satellite.norad_id,
+                    'name': satellite.name,
+                    **{
+                        key: value.isoformat() if isinstance(value, datetime) else value
+                        for key, value in pass_info.items()
+                    }
+                })
+        passes.sort(key=lambda pass_info: pass_info['culmination_time'])
+        
+        return {
+            'passes': passes,
+            'satellites_considered': len(satellites),
+            'satellites_propagated': len(satrecs)
+        }
+    
+    @COMPUTE_SECONDS.labels('assess_conjunction_threat').time()
     def assess_conjunction_threat(self, sat1_data: SatelliteData, 
                                  sat2_data: SatelliteData,
-                                 time_window_hours: int = 24) -> Optional[ThreatAssessment]:
+                                 time_window_hours: float = 24,
+                                 start: Optional[datetime] = None) -> Optional[ThreatAssessment]:
         """Assess conjunction threat between two satellites"""
+        encounters = self.conjunction_encounters(sat1_data, sat2_data, time_window_hours, start)
+        return encounters[0] if encounters else None
+    
+    def conjunction_encounters(self, sat1_data: SatelliteData, sat2_data: SatelliteData,
+                               time_window_hours: float = 24,
+                               start: Optional[datetime] = None) -> List[ThreatAssessment]:
+        """Every approach of two satellites within the threat threshold, closest first"""
         try:
-            # Create satellite objects
-            sat1 = EarthSatellite(sat1_data.line1, sat1_data.line2, sat1_data.name, ts)
-            sat2 = EarthSatellite(sat2_data.line1, sat2_data.line2, sat2_data.name, ts)
+            # Get cached SGP4 records
+            sat1 = self.get_satrec(sat1_data)
+            sat2 = self.get_satrec(sat2_data)
             
             # Time range for analysis
-            t0 = ts.now()
-            t1 = ts.from_datetime(datetime.now(timezone.utc) + timedelta(hours=time_window_hours))
-            
-            # Sample positions over time
-            times = ts.linspace(t0, t1, 1000)  # 1000 samples
-            
-            pos1 = sat1.at(times)
-            pos2 = sat2.at(times)
+            if start is None:
+                start = datetime.now(timezone.utc)
             
-            # Calculate distances
-            diff = pos1.position.km - pos2.position.km
-            distances = np.sqrt(np.sum(diff**2, axis=0))
-            
-            # Find minimum distance
-            min_distance_idx = np.argmin(distances)
-            min_distance = distances[min_distance_idx]
-            closest_approach_time = times[min_distance_idx].utc_datetime()
-            
-            # Assess risk level
-            if min_distance < 1.0:
-                risk_level = "CRITICAL"
-                probability = 0.9
-            elif min_distance < 5.0:
-                risk_level = "HIGH"
-                probability = 0.7
-            elif min_distance < config.THREAT_THRESHOLD_KM:
-                risk_level = "MEDIUM"
-                probability = 0.4
-            else:
-                risk_level = "LOW"
-                probability = 0.1
+            # Coarse scan, then root-find range rate inside each promising bracket
+            approaches = closest_approaches(
+                sat1, sat2, start, 0.0, time_window_hours * 3600.0,
+                config.CONJUNCTION_COARSE_STEP_SECONDS, config.THREAT_THRESHOLD_KM
+            )
             
-            # Only return if within threshold
-            if min_distance <= config.THREAT_THRESHOLD_KM:
-                return ThreatAssessment(
+            encounters = []
+            for approach in approaches:
+                # Only report approaches within threshold
+                if approach['distance_km'] > config.THREAT_THRESHOLD_KM:
+                    continue
+                risk_level, probability = classify_conjunction_risk(approach['distance_km'])
+                encounters.append(ThreatAssessment(
                     primary_object=sat1_data.norad_id,
                     secondary_object=sat2_data.norad_id,
-                    closest_approach_time=closest_approach_time,
-                    minimum_distance_km=min_distance,
+                    closest_approach_time=approach['time'],
+                    minimum_distance_km=approach['distance_km'],
                     risk_level=risk_level,
-                    probability=probability
-                )
-            
-            return None
+                    probability=probability,
+                    relative_velocity_kms=approach['relative_velocity_kms']
+                ))
+            return encounters
             
         except Exception as e:
             logger.error(f"Failed to assess conjunction threat: {e}")
-            return None
+            return []
+    
+    @COMPUTE_SECONDS.labels('visible_satellites').time()
+    def visible_satellites(self, satellites: SatelliteCatalog, observer_lat: float, observer_lon: float,
+                           observer_alt_km: float = 0.0, min_elevation: float = 0.0,
+                           timestamp: Optional[datetime] = None, source: Optional[str] = None) -> Dict[str, Any]:
+        """Look angles and sunlit/eclipse state of every catalog object above an observer at one time
+        
+        Without a timestamp the current shared snapshot is used when there is
+        one, so "what is overhead now" needs no propagation at all.
+        """
+        snapshot = self.current_snapshot(source) if timestamp is None and source else None
+        if snapshot is not None:
+            timestamp = snapshot.epoch
+            norad_ids = snapshot.arrays['norad_ids']
+            valid = snapshot.arrays['error'] == 0
+            r_ecef = snapshot.arrays['position_ecef']
+        else:
+            timestamp = timestamp or datetime.now(timezone.utc)
+            records = satellites.records(range(min(config.MAX_SATELLITES, len(satellites))))
+            ids, satrecs = self._cached_satrecs(records)
+            result = self._propagate(ids, satrecs, [timestamp], source)
+            norad_ids = np.asarray(ids, dtype=np.int64)
+            valid = result['error'][:, 0] == 0
+            r_ecef = result['position_ecef'][:, 0]
+        
+        view = observer_view(np.where(valid[:, None], r_ecef, np.nan), timestamp,
+                             observer_lat, observer_lon, observer_alt_km, min_elevation)
+        visible_ids = norad_ids[view['rows']].tolist()
+        names = [satellites.record(row).name for row in satellites.rows(visible_ids)]
+        
+        return {
+            'norad_ids': visible_ids,
+            'names': names,
+            'azimuth': np.round(view['azimuth'], 3).tolist(),
+            'elevation': np.round(view['elevation'], 3).tolist(),
+            'range_km': np.round(view['range_km'], 3).tolist(),
+            'illumination': [ILLUMINATION_STATES[state] for state in view['illumination']],
+            'observable': view['observable'].tolist(),
+            'sun': {
+                'azimuth': round(view['sun_azimuth'], 3),
+                'elevation': round(view['sun_elevation'], 3),
+                'dark_sky': view['dark_sky'],
+            },
+            'at': timestamp.isoformat(),
+            'satellites_checked': len(norad_ids),
+        }
+    
+    @COMPUTE_SECONDS.labels('screen_conjunctions').time()
+    def screen_conjunctions(self, satellites: Sequence[Mapping[str, Any]], time_window_hours: float,
+                            step_seconds: float, start: Optional[datetime] = None) -> List[ThreatAssessment]:
+        """Screen every catalog object against every other over the analysis window"""
+        norad_ids, satrecs = self._cached_satrecs(satellites)
+        
+        conjunctions = screen_catalog(
+            norad_ids, satrecs, time_window_hours, step_seconds, config.THREAT_THRESHOLD_KM, start
+        )
+        
+        assessments = []
+        for conjunction in conjunctions:
+            risk_level, probability = classify_conjunction_risk(conjunction['minimum_distance_km'])
+            assessments.append(ThreatAssessment(
+                risk_level=risk_level,
+                probability=probability,
+                **conjunction
+            ))
+        return assessments
+
+# Position snapshots shared by every worker on this host
+snapshot_store = PositionSnapshotStore(config.POSITION_SNAPSHOT_DIR)
 
 # Initialize tracker
 tracker = AutonomousSatelliteTracker()
 
+# Progress of this process's warm start, reported by /health; forked workers inherit the master's
+warm_start_state: Dict[str, Any] = {'status': 'pending'}
+
+def warm_start(sources: Optional[Sequence[str]] = None) -> Dict[str, float]:
+    """Do the first-request work up front: Skyfield, SciPy, Redis and the preloaded catalogs
+    
+    Starts no threads, so it can run in a gunicorn master before workers
+    are forked and share what it loads. Returns the seconds each step took.
+    """
+    warm_start_state.update(status='running', started_at=datetime.now(timezone.utc).isoformat())
+    try:
+        timings = _warm_start(sources)
+    except Exception as e:
+        logger.error(f"Warm start failed: {e}")
+        warm_start_state.update(status='failed', error=str(e))
+        raise
+    warm_start_state.update(status='ready', seconds={step: round(seconds, 3) for step, seconds in timings.items()})
+    return timings
+
+def _warm_start(sources: Optional[Sequence[str]]) -> Dict[str, float]:
+    timings = {}
+    started = time.perf_counter()
+    get_timescale()
+    timings['timescale'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    import scipy.optimize  # noqa: F401
+    import scipy.spatial  # noqa: F401
+    timings['modules'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    ensure_redis()
+    timings['redis'] = time.perf_counter() - started
+    
+    for source in config.PRELOAD_SOURCES if sources is None else sources:
+        started = time.perf_counter()
+        tracker.refresh_catalog(source)
+        timings[f'catalog:{source}'] = time.perf_counter() - started
+    logger.info(f"Warm start finished in {sum(timings.values()):.2f}s: "
+                + ", ".join(f"{step} {seconds:.2f}s" for step, seconds in timings.items()))
+    return timings
+
+def start_warm_start(sources: Optional[Sequence[str]] = None) -> threading.Thread:
+    """Warm this process in the background, so it serves and answers /health while its catalogs load
+    
+    The catalog refresher is started once the warm start is done rather than
+    by the first request, so the two never download and fit the same catalog
+    side by side.
+    """
+    warm_start_state.update(status='running')
+    
+    def run() -> None:
+        try:
+            warm_start(sources)
+        except Exception:
+            pass  # already logged and recorded in warm_start_state
+        finally:
+            if config.BACKGROUND_REFRESH:
+                tracker.start_background_refresh()
+    
+    thread = threading.Thread(target=run, name='warm-start', daemon=True)
+    thread.start()
+    return thread
+
+# Compute pool tasks. Pool processes import this module but keep their own
+# tracker and caches, so each task is handed the catalog rows it works on.
+
+def _propagate_task(satellites: SatelliteCatalog,
+                    timestamps: List[datetime]) -> Tuple[List[int], Dict[str, np.ndarray]]:
+    """SGP4 states of a sub-catalog, returned as arrays for the caller to encode"""
+    norad_ids, satrecs = tracker._cached_satrecs(satellites.records())
+    return norad_ids, tracker._propagate(norad_ids, satrecs, timestamps, None)
+
+def _ground_tracks_task(satellites: SatelliteCatalog, start: datetime, duration_seconds: float,
+                        step_seconds: float, tolerance_deg: Optional[float]) -> List[Dict[str, Any]]:
+    return tracker.ground_tracks(satellites.records(), start, duration_seconds, step_seconds, tolerance_deg)
+
+def _visible_task(satellites: SatelliteCatalog, lat: float, lon: float, alt_km: float,
+                  min_elevation: float, timestamp: Optional[datetime]) -> Dict[str, Any]:
+    return tracker.visible_satellites(satellites, lat, lon, alt_km, min_elevation, timestamp)
+
+def _satellite_passes_task(satellite_data: SatelliteData, lat: float, lon: float, hours: int) -> List[Dict]:
+    return tracker.predict_passes(satellite_data, lat, lon, hours)
+
+def _catalog_passes_task(satellites: SatelliteCatalog, lat: float, lon: float, hours: float,
+                         min_elevation: float, alt_km: float, start: datetime) -> Dict[str, Any]:
+    return tracker.predict_passes_batch(satellites, lat, lon, hours, min_elevation, alt_km, start=start)
+
+def _screening_task(satellites: SatelliteCatalog, time_window: float, step_seconds: float,
+                    start: Optional[datetime] = None) -> List[Dict]:
+    assessments = tracker.screen_conjunctions(satellites.records(), time_window, step_seconds, start)
+    return [assessment.model_dump(mode='json') for assessment in assessments]
+
+@app.before_request
+def ensure_background_refresh():
+    """Check Redis and start the catalog refresher in each serving process (after any fork)"""
+    ensure_redis()
+    if config.BACKGROUND_REFRESH and warm_start_state['status'] != 'running' and not tracker.refresh_running():
+        tracker.start_background_refresh()
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response: Response) -> Response:
+    """Observe request latency per route pattern (streamed bodies count until their first byte)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUEST_SECONDS.labels(endpoint, request.method, str(response.status_code)).observe(
+            time.perf_counter() - started
+        )
+    return response
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint, aggregated across workers in multi-process mode"""
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Comprehensive health check endpoint"""
@@ -363,19 +1195,39 @@ def health_check():
         
         # Check last data update
         data_freshness = "unknown"
+        catalog_age = None
         if tracker.last_update:
-            age = datetime.now(timezone.utc) - tracker.last_update
-            data_freshness = "fresh" if age.total_seconds() < 3600 else "stale"
+            catalog_age = (datetime.now(timezone.utc) - tracker.last_update).total_seconds()
+            data_freshness = "fresh" if catalog_age < config.CACHE_TTL else "stale"
+        
+        # Pass prediction runs in the compute pool, so its caches are counted there
+        worker_reports = compute_pool.worker_reports()
         
         status = {
-            "status": "healthy",
+            # A worker still warming serves requests, computing what it has not loaded yet itself
+            "status": "starting" if warm_start_state['status'] == 'running' else "healthy",
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "version": "1.0.0",
             "services": {
                 "redis": redis_status,
                 "data_freshness": data_freshness,
-                "satellites_loaded": len(tracker.tle_data),
-                "threats_active": len(tracker.threat_assessments)
+                "catalog_age_seconds": catalog_age,
+                "warm_start": dict(warm_start_state),
+                "catalog_refresh": "running" if tracker.refresh_running() else "stopped",
+                "satellites_loaded": sum(len(catalog) for catalog in tracker.tle_data.values()),
+                "threats_active": len(tracker.threat_assessments),
+                "propagator_cache": PropagatorCache.combine([propagator_cache.stats()] + [
+                    report['propagator_cache'] for report in worker_reports
+                ]),
+                "ephemeris": {source: table.stats() for source, table in tracker.ephemerides.items()},
+                "position_snapshots": snapshot_store.stats(),
+                "redis_commands": COMMAND_STATS.snapshot(),
+                "pass_cache": PassPredictionCache.combine([pass_cache.stats()] + [
+                    report['pass_cache'] for report in worker_reports
+                ]),
+                "response_cache": response_cache.stats(),
+                "representations": representations.stats(),
+                "compute_pool": compute_pool.stats()
             },
             "configuration": {
                 "autonomous_mode": config.AUTONOMOUS_MODE,
@@ -394,49 +1246,177 @@ def health_check():
             "timestamp": datetime.now(timezone.utc).isoformat()
         }), 503
 
+
+def _unknown_source(source: str) -> Tuple[Response, int]:
+    """400 for a ``source`` that is not one of the served catalogs"""
+    return jsonify({"error": f"Unknown source '{source}'; expected one of: {', '.join(CATALOG_SOURCES)}"}), 400
+
 @app.route('/satellites', methods=['GET'])
 def get_satellites():
     """Get all satellite data with optional filtering"""
     try:
         source = request.args.get('source', 'active')
+        if source not in CATALOG_SOURCES:
+            return _unknown_source(source)
         limit = min(int(request.args.get('limit', config.MAX_SATELLITES)), config.MAX_SATELLITES)
+        try:
+            query, fields = _listing_query(request.args)
+        except ValueError as e:
+            return jsonify({"error": f"Invalid request parameters: {e}"}), 400
+        filtered = bool(query) or fields is not None
         
         # Fetch data
         satellites = asyncio.run(tracker.fetch_tle_data(source))
+        if query:
+            rows = tracker.catalog_index(source, satellites).query(**query)
+        else:
+            rows = np.arange(len(satellites))
+        matched = len(rows)
+        rows = rows[:max(limit, 0)]
+        count = len(rows)
+        # A versioned catalog gives every listing a strong ETag for conditional requests
+        version = tracker.catalog_version(source, satellites)
+        # Filtered listings are tagged by their parameters; epoch-age bounds are fixed to the minute
+        tag = (limit, json.dumps(query, sort_keys=True, default=str), fields) if filtered else (count,)
         
-        # Apply limit
-        limited_satellites = dict(list(satellites.items())[:limit])
+        if _wants_ndjson():
+            if version is None:
+                return _stream_satellites(satellites, source, rows, fields)
+            etag = make_etag(source, version, *tag, 'ndjson')
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers=_validator_headers(etag))
+            response = _stream_satellites(satellites, source, rows, fields)
+            response.headers.update(_validator_headers(etag))
+            return response
         
-        return jsonify({
-            "satellites": limited_satellites,
-            "count": len(limited_satellites),
-            "source": source,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        })
+        def listing(timestamp: datetime) -> Dict[str, Any]:
+            norad_ids = satellites.elements['norad_id'][rows].tolist()
+            limited_satellites = dict(zip(norad_ids, project(satellites, rows, fields or SatelliteRecord.KEYS)))
+            body = {
+                "satellites": limited_satellites,
+                "count": len(limited_satellites),
+                "source": source,
+                "timestamp": timestamp.isoformat()
+            }
+            if filtered:
+                body["matched"] = matched
+            return body
+        
+        if version is None:
+            return jsonify(listing(datetime.now(timezone.utc)))
+        
+        updated_at = tracker.catalog_updated_at[source]
+        etag = make_etag(source, version, *tag, 'json')
+        if filtered:
+            # Indexed queries are cheap to answer, so only the full listing is kept precomputed
+            if request.if_none_match.contains_weak(etag):
+                return Response(status=304, headers=_validator_headers(etag))
+            return Response(app.json.dumps(listing(updated_at)), mimetype='application/json',
+                            headers=_validator_headers(etag))
+        
+        # The body only depends on the catalog, so it is serialized and compressed once per version
+        representation = representations.get(
+            source, version, etag, lambda: app.json.dumps(listing(updated_at)).encode()
+        )
+        return _send_representation(representation, 'application/json')
         
     except Exception as e:
         logger.error(f"Failed to get satellites: {e}")
         return jsonify({"error": str(e)}), 500
 
+def _listing_query(args: Mapping[str, str]) -> Tuple[Dict[str, Any], Optional[Tuple[str, ...]]]:
+    """Index query and field projection of a /satellites request
+    
+    Range filters are ``<field>_min``/``<field>_max`` for the fields in
+    LISTING_RANGE_FILTERS (perigee and apogee in km) plus ``epoch_age_min``/
+    ``epoch_age_max`` in days; ``category`` takes a comma separated list of
+    the category groups the sync job files objects under and ``name`` a
+    case-insensitive prefix. Raises ValueError for bad values.
+    """
+    query: Dict[str, Any] = {}
+    ranges: Dict[str, Tuple[Any, Any]] = {}
+    for param, field in LISTING_RANGE_FILTERS.items():
+        low, high = args.get(f'{param}_min'), args.get(f'{param}_max')
+        if low is not None or high is not None:
+            ranges[field] = (float(low) if low is not None else None, float(high) if high is not None else None)
+    min_age, max_age = args.get('epoch_age_min'), args.get('epoch_age_max')
+    if min_age is not None or max_age is not None:
+        now = datetime.fromtimestamp(time.time() // 60 * 60, timezone.utc)
+        ranges['epoch'] = (now - timedelta(days=float(max_age)) if max_age is not None else None,
+                           now - timedelta(days=float(min_age)) if min_age is not None else None)
+    if ranges:
+        query['ranges'] = ranges
+    if args.get('category'):
+        query['categories'] = sorted(args['category'].split(','))
+    if args.get('name'):
+        query['name_prefix'] = args['name']
+    
+    fields = None
+    if args.get('fields'):
+        fields = tuple(field.strip() for field in args['fields'].split(','))
+        unknown = set(fields) - set(PROJECTION_FIELDS)
+        if unknown:
+            raise ValueError(f"unknown fields {sorted(unknown)}; choose from {list(PROJECTION_FIELDS)}")
+    return query, fields
+
+def _validator_headers(etag: str) -> Dict[str, str]:
+    """Headers that let clients revalidate a listing with If-None-Match on every poll"""
+    return {'ETag': f'"{etag}"', 'Cache-Control': 'no-cache', 'Vary': 'Accept, Accept-Encoding'}
+
+def _send_representation(representation: Representation, mimetype: str) -> Response:
+    """Send the best content coding the client accepts, or 304 if it already holds the same body"""
+    coding, body = representation.select(request.accept_encodings.quality)
+    headers = _validator_headers(representation.etag_for(coding))
+    # Every coding carries the same entity, so a tag of any of them is a match
+    if any(request.if_none_match.contains_weak(etag) for etag in representation.etags()):
+        return Response(status=304, headers=headers)
+    if coding != 'identity':
+        headers['Content-Encoding'] = coding
+    return Response(body, mimetype=mimetype, headers=headers)
+
+def _wants_ndjson() -> bool:
+    """Whether the client opted into the streaming NDJSON format"""
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+def _stream_satellites(satellites: SatelliteCatalog, source: str, rows: np.ndarray,
+                       fields: Optional[Sequence[str]] = None) -> Response:
+    """Stream catalog records as newline-delimited JSON, one record per line
+    
+    Records are serialized straight from the catalog in batches, so memory use
+    does not grow with the catalog and clients can render the first objects
+    before the last ones are encoded.
+    """
+    def generate():
+        for start in range(0, len(rows), NDJSON_BATCH_RECORDS):
+            batch = project(satellites, rows[start:start + NDJSON_BATCH_RECORDS], fields or SatelliteRecord.KEYS)
+            yield ''.join(json.dumps(record) + '\n' for record in batch)
+    
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE, headers={
+        'X-Satellite-Count': str(len(rows)),
+        'X-Catalog-Source': source
+    })
+
 @app.route('/satellites/<int:norad_id>/position', methods=['GET'])
 def get_satellite_position(norad_id: int):
     """Get current position of a specific satellite"""
     try:
         # Get timestamp from query param
         timestamp_str = request.args.get('timestamp')
-        if timestamp_str:
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        else:
-            timestamp = datetime.now(timezone.utc)
+        timestamp = _parse_timestamp(timestamp_str) if timestamp_str else None
         
         # Find satellite in cache
-        satellites = asyncio.run(tracker.fetch_tle_data('active'))
+        asyncio.run(tracker.fetch_tle_data('active'))
+        satellite_data = tracker.get_satellite(norad_id)
         
-        if norad_id not in satellites:
+        if satellite_data is None:
             return jsonify({"error": "Satellite not found"}), 404
         
-        satellite_data = SatelliteData(**satellites[norad_id])
-        position = tracker.calculate_position(satellite_data, timestamp)
+        # Current positions come from this tick's shared snapshot when it holds the satellite
+        position = tracker.snapshot_position(norad_id, timestamp)
+        if position is None:
+            position = tracker.calculate_position(satellite_data, timestamp or datetime.now(timezone.utc))
         
         return jsonify(position.dict())
         
@@ -444,6 +1424,228 @@ def get_satellite_position(norad_id: int):
         logger.error(f"Failed to get satellite position: {e}")
         return jsonify({"error": str(e)}), 500
 
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an ISO-8601 query timestamp into an aware UTC datetime"""
+    timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if timestamp.tzinfo is None:
+        return timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc)
+
+@app.route('/satellites/positions', methods=['GET', 'POST'])
+def get_bulk_positions():
+    """Get positions of many satellites at one or more timestamps"""
+    try:
+        if request.method == 'POST':
+            payload = request.get_json(silent=True) or {}
+            source = str(payload.get('source', 'active'))
+            norad_ids = payload.get('norad_ids')
+            timestamp_strs = payload.get('timestamps', [])
+        else:
+            source = request.args.get('source', 'active')
+            ids_param = request.args.get('ids')
+            norad_ids = ids_param.split(',') if ids_param else None
+            timestamp_strs = request.args.getlist('timestamp')
+        if source not in CATALOG_SOURCES:
+            return _unknown_source(source)
+        
+        response_format = request.args.get('format', 'json')
+        layout = request.args.get('frame', 'geodetic')
+        delta_from = request.args.get('delta_from')
+        
+        try:
+            timestamps = [_parse_timestamp(value) for value in timestamp_strs]
+            wanted_ids = {int(norad_id) for norad_id in norad_ids} if norad_ids else None
+            base_timestamp = _parse_timestamp(delta_from) if delta_from else None
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"Invalid request parameters: {e}"}), 400
+        
+        if response_format == 'binary':
+            if layout not in FRAME_LAYOUTS:
+                return jsonify({"error": f"frame must be one of {sorted(FRAME_LAYOUTS)}"}), 400
+            if len(timestamps) > 1:
+                return jsonify({"error": "Binary frames hold a single timestamp"}), 400
+        
+        if len(timestamps) > config.MAX_POSITION_TIMESTAMPS:
+            return jsonify({
+                "error": f"At most {config.MAX_POSITION_TIMESTAMPS} timestamps per request"
+            }), 400
+        
+        satellites = asyncio.run(tracker.fetch_tle_data(source))
+        
+        # Current positions come from this tick's shared snapshot
+        snapshot = tracker.current_snapshot(source) if not timestamps and base_timestamp is None else None
+        snapshot_rows = snapshot.rows(wanted_ids) if snapshot is not None else None
+        if snapshot_rows is not None and wanted_ids is not None and \
+                len(snapshot_rows) < len(np.unique(satellites.rows(wanted_ids))):
+            # The snapshot holds the first MAX_SATELLITES rows; requests reaching past them are propagated
+            snapshot = None
+        if snapshot is not None and snapshot_rows is not None:
+            headers = {'X-Catalog-Source': source, 'X-Snapshot-Sequence': str(snapshot.sequence)}
+            if response_format == 'binary' and wanted_ids is None:
+                # The pre-encoded frame; WSGI servers need bytes, so this is the one copy
+                return Response(bytes(snapshot.frame(layout)), mimetype=FRAME_MIMETYPE, headers=headers)
+            snapshot_ids = snapshot.arrays['norad_ids'][snapshot_rows].tolist()
+            result = snapshot.result(snapshot_rows)
+            if response_format == 'binary':
+                frame = tracker.encode_positions(snapshot_ids, result, layout, snapshot.epoch)
+                return Response(bytes(frame), mimetype=FRAME_MIMETYPE, headers=headers)
+            positions = tracker.positions_payload(snapshot_ids, [snapshot.epoch], result)
+            return jsonify({
+                **positions,
+                "count": len(positions['norad_ids']),
+                "source": source,
+                "snapshot_sequence": snapshot.sequence,
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            })
+        
+        if not timestamps:
+            timestamps = [datetime.now(timezone.utc)]
+        
+        if wanted_ids is not None:
+            rows = np.sort(satellites.rows(wanted_ids))
+        else:
+            rows = np.arange(min(config.MAX_SATELLITES, len(satellites)))
+        
+        if response_format == 'binary':
+            needed = [timestamps[0]] if base_timestamp is None else [timestamps[0], base_timestamp]
+        else:
+            needed = timestamps
+        
+        if tracker.ephemeris_covers(source, needed):
+            if response_format == 'binary':
+                frame = tracker.position_frame(satellites.records(rows), timestamps[0], layout, base_timestamp, source)
+                return Response(bytes(frame), mimetype=FRAME_MIMETYPE, headers={'X-Catalog-Source': source})
+            positions = tracker.calculate_positions(satellites.records(rows), timestamps, source)
+        else:
+            # SGP4 over many objects and times runs in the compute pool
+            norad_ids, result = compute_pool.run('positions', _propagate_task, satellites.select(rows), needed)
+            if response_format == 'binary':
+                frame = tracker.encode_positions(norad_ids, result, layout, timestamps[0], base_timestamp)
+                return Response(bytes(frame), mimetype=FRAME_MIMETYPE, headers={'X-Catalog-Source': source})
+            positions = tracker.positions_payload(norad_ids, timestamps, result)
+        
+        return jsonify({
+            **positions,
+            "count": len(positions['norad_ids']),
+            "source": source,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+        
+    except ComputePoolBusy:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get bulk positions: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/satellites/groundtrack', methods=['GET'])
+def get_ground_tracks():
+    """Ground tracks of one or more satellites, split at the antimeridian"""
+    try:
+        try:
+            norad_ids = [int(norad_id) for norad_id in request.args['ids'].split(',')]
+            start_param = request.args.get('start')
+            start = _parse_timestamp(start_param) if start_param else datetime.now(timezone.utc)
+            duration_minutes = float(request.args.get('duration', 90))
+            step_seconds = float(request.args.get('step', 60))
+            tolerance_arg = request.args.get('tolerance_px')
+            tolerance_px: Optional[float] = float(tolerance_arg) if tolerance_arg is not None else None
+            map_width = int(request.args.get('map_width', 1024))
+        except (KeyError, ValueError) as e:
+            return jsonify({"error": f"Invalid request parameters: {e}"}), 400
+        
+        if not (duration_minutes > 0 and step_seconds >= 1.0 and map_width > 0
+                and (tolerance_px is None or tolerance_px >= 0)):
+            return jsonify({"error": "duration, step (>= 1 s), map_width and tolerance_px must be positive"}), 400
+        if duration_minutes * 60.0 / step_seconds + 1 > config.MAX_GROUNDTRACK_POINTS:
+            return jsonify({
+                "error": f"At most {config.MAX_GROUNDTRACK_POINTS} points per track; increase step"
+            }), 400
+        if len(norad_ids) > config.MAX_GROUNDTRACK_SATELLITES:
+            return jsonify({
+                "error": f"At most {config.MAX_GROUNDTRACK_SATELLITES} satellites per request"
+            }), 400
+        
+        source = request.args.get('source', 'active')
+        if source not in CATALOG_SOURCES:
+            return _unknown_source(source)
+        satellites = asyncio.run(tracker.fetch_tle_data(source))
+        rows = satellites.rows(norad_ids)
+        selected = satellites.records(rows)
+        if not selected:
+            return jsonify({"error": "Satellite not found"}), 404
+        
+        tolerance_deg = pixel_tolerance_deg(tolerance_px, map_width) if tolerance_px else None
+        if tracker.ephemeris_covers(source, [start, start + timedelta(minutes=duration_minutes)]):
+            tracks = tracker.ground_tracks(
+                selected, start, duration_minutes * 60.0, step_seconds, tolerance_deg, source
+            )
+        else:
+            tracks = compute_pool.run(
+                'groundtrack', _ground_tracks_task, satellites.select(rows), start,
+                duration_minutes * 60.0, step_seconds, tolerance_deg
+            )
+        
+        return jsonify({
+            "tracks": tracks,
+            "count": len(tracks),
+            "start": start.isoformat(),
+            "duration_minutes": duration_minutes,
+            "step_seconds": step_seconds,
+            "source": source,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+        
+    except ComputePoolBusy:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to compute ground tracks: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/satellites/visible', methods=['GET'])
+def get_visible_satellites():
+    """Every satellite above an observer's horizon at one time, with look angles and illumination"""
+    try:
+        try:
+            lat = float(request.args['lat'])
+            lon = float(request.args['lon'])
+            alt_km = float(request.args.get('alt', 0)) / 1000.0
+            min_elevation = float(request.args.get('min_elevation', 0.0))
+            timestamp_param = request.args.get('timestamp')
+            timestamp = _parse_timestamp(timestamp_param) if timestamp_param else None
+        except (KeyError, ValueError) as e:
+            return jsonify({"error": f"Invalid request parameters: {e}"}), 400
+        
+        if not (-90.0 <= lat <= 90.0 and -90.0 <= min_elevation <= 90.0):
+            return jsonify({"error": "lat and min_elevation must be within [-90, 90]"}), 400
+        
+        source = request.args.get('source', 'active')
+        if source not in CATALOG_SOURCES:
+            return _unknown_source(source)
+        satellites = asyncio.run(tracker.fetch_tle_data(source))
+        if timestamp is None and tracker.current_snapshot(source) is not None:
+            result = tracker.visible_satellites(satellites, lat, lon, alt_km, min_elevation, None, source)
+        elif tracker.ephemeris_covers(source, [timestamp or datetime.now(timezone.utc)]):
+            result = tracker.visible_satellites(satellites, lat, lon, alt_km, min_elevation, timestamp, source)
+        else:
+            result = compute_pool.run(
+                'visible', _visible_task, satellites, lat, lon, alt_km, min_elevation, timestamp
+            )
+        
+        return jsonify({
+            **result,
+            "count": len(result['norad_ids']),
+            "observer": {"latitude": lat, "longitude": lon, "altitude_km": alt_km},
+            "min_elevation_deg": min_elevation,
+            "source": source,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+        
+    except ComputePoolBusy:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to compute visible satellites: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/satellites/<int:norad_id>/passes', methods=['GET'])
 def predict_satellite_passes(norad_id: int):
     """Predict satellite passes over observer location"""
@@ -454,56 +1656,248 @@ def predict_satellite_passes(norad_id: int):
         hours = int(request.args.get('hours', 24))
         
         # Find satellite
-        satellites = asyncio.run(tracker.fetch_tle_data('active'))
+        asyncio.run(tracker.fetch_tle_data('active'))
+        satellite_data = tracker.get_satellite(norad_id)
         
-        if norad_id not in satellites:
+        if satellite_data is None:
             return jsonify({"error": "Satellite not found"}), 404
         
-        satellite_data = SatelliteData(**satellites[norad_id])
-        passes = tracker.predict_passes(satellite_data, lat, lon, hours)
+        passes = compute_pool.run('satellite_passes', _satellite_passes_task, satellite_data, lat, lon, hours)
         
         return jsonify({
             "passes": passes,
             "observer": {"latitude": lat, "longitude": lon},
+            "observer_grid_deg": config.PASS_CACHE_GRID_DEG,
             "prediction_window_hours": hours
         })
         
+    except ComputePoolBusy:
+        raise
     except Exception as e:
         logger.error(f"Failed to predict passes: {e}")
         return jsonify({"error": str(e)}), 500
 
+# Screening jobs live in Redis, so any worker can answer a poll for a job another worker started
+SCREENING_JOBS_UNAVAILABLE = "Full-catalog screening jobs need Redis to share job state between workers"
+
+def _save_screening_job(job_id: str, job: Dict[str, Any]) -> None:
+    """Persist screening job state where every worker can read it"""
+    if redis_client is None:
+        logger.error(f"Lost the result of screening job {job_id}: Redis is unavailable")
+        return
+    redis_client.setex(f"screening:job:{job_id}", config.SCREENING_JOB_TTL, json.dumps(job, default=str))
+
+def _load_screening_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Read screening job state"""
+    cached = redis_client.get(f"screening:job:{job_id}") if redis_client else None
+    return json.loads(cached) if cached else None
+
+def _finish_screening_job(job_id: str, job: Dict[str, Any], started: float, future: Future) -> None:
+    """Publish the result of a full-catalog screening once its pool task is done"""
+    try:
+        threats = future.result()
+        tracker.threat_assessments = [ThreatAssessment(**threat) for threat in threats]
+        job.update(
+            status="completed",
+            threats=threats,
+            completed_at=datetime.now(timezone.utc).isoformat(),
+            duration_seconds=round(time.monotonic() - started, 3)
+        )
+        logger.info(f"Screening job {job_id} found {len(threats)} conjunctions "
+                    f"among {job['satellites_screened']} objects in {job['duration_seconds']}s")
+    except Exception as e:
+        logger.error(f"Screening job {job_id} failed: {e}")
+        job.update(status="failed", error=str(e))
+    _save_screening_job(job_id, job)
+
+def _submit_screening_job(time_window: float, step_seconds: float) -> Tuple[Dict[str, Any], int]:
+    """Queue an all-vs-all screening of the active catalog"""
+    satellites = asyncio.run(tracker.fetch_tle_data('active'))
+    job_id = uuid.uuid4().hex
+    job = {
+        "job_id": job_id,
+        "status": "running",
+        "satellites_screened": len(satellites),
+        "analysis_window_hours": time_window,
+        "step_seconds": step_seconds,
+        "submitted_at": datetime.now(timezone.utc).isoformat()
+    }
+    started = time.monotonic()
+    # Raises ComputePoolBusy before any job is recorded when the pool is full
+    future = compute_pool.submit('screening', _screening_task, satellites, time_window, step_seconds)
+    _save_screening_job(job_id, job)
+    future.add_done_callback(lambda done: _finish_screening_job(job_id, dict(job), started, done))
+    return {**job, "status_url": f"/threats/conjunctions/jobs/{job_id}"}, 202
+
+def _cached_response(endpoint: str, source: str, catalog: SatelliteCatalog, params: Mapping[str, Any],
+                     compute: Callable[[datetime, float], Dict[str, Any]],
+                     trim: Callable[[Dict[str, Any], datetime], Dict[str, Any]]) -> Response:
+    """Serve a heavy endpoint from the response cache, computing its body from the start of the current time bucket
+    
+    ``compute(start, slack)`` must cover its window from ``start`` plus
+    ``slack`` seconds, so the body computed for the bucket's start still
+    covers the whole window of a request made at the end of the bucket.
+    Identical requests share that body until the bucket or the catalog
+    changes, and ``trim`` cuts it to the window of each request as sent.
+    """
+    interval = max(config.RESPONSE_CACHE_BUCKET_SECONDS, 1)
+    now = time.time()
+    bucket = int(now // interval)
+    start = datetime.fromtimestamp(bucket * interval, timezone.utc)
+    now_dt = datetime.fromtimestamp(now, timezone.utc)
+    version = tracker.catalog_version(source, catalog)
+    if version is None:
+        # Without a version the body could not be invalidated, so it is computed for this request only
+        body = app.json.dumps(trim(compute(now_dt, 0.0), now_dt))
+        return Response(body, mimetype='application/json', headers={'X-Cache': 'BYPASS'})
+    body, outcome = response_cache.get_or_compute(
+        endpoint, source, version, params, bucket, 2 * interval, lambda: app.json.dumps(compute(start, interval))
+    )
+    body = app.json.dumps(trim(json.loads(body), now_dt))
+    return Response(body, mimetype='application/json', headers={'X-Cache': outcome.upper()})
+
+def _passes_in_window(hours: float) -> Callable[[Dict[str, Any], datetime], Dict[str, Any]]:
+    """Trim a /passes body to the passes still up or rising in the ``hours`` after the time it is sent"""
+    def trim(result: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        end = now + timedelta(hours=hours)
+        return {**result, "timestamp": now.isoformat(), "passes": [
+            pass_info for pass_info in result["passes"]
+            if (pass_info.get("set_time") is None or datetime.fromisoformat(pass_info["set_time"]) >= now)
+            and (pass_info.get("rise_time") is None or datetime.fromisoformat(pass_info["rise_time"]) <= end)
+        ]}
+    return trim
+
+def _conjunctions_in_window(hours: float) -> Callable[[Dict[str, Any], datetime], Dict[str, Any]]:
+    """Trim a /threats/conjunctions body to the encounters in the ``hours`` after the time it is sent"""
+    def trim(result: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        end = now + timedelta(hours=hours)
+        return {**result, "timestamp": now.isoformat(), "threats": [
+            threat for threat in result["threats"]
+            if now <= datetime.fromisoformat(threat["closest_approach_time"]) <= end
+        ]}
+    return trim
+
+@app.route('/passes', methods=['GET'])
+def predict_catalog_passes():
+    """Predict passes of the whole catalog (or a list of satellites) over one observer"""
+    try:
+        try:
+            lat = float(request.args['lat'])
+            lon = float(request.args['lon'])
+            alt_km = float(request.args.get('alt', 0)) / 1000.0
+            hours = int(request.args.get('hours', 24))
+            min_elevation = float(request.args.get('min_elevation', 10.0))
+            ids_param = request.args.get('ids')
+            wanted_ids = {int(norad_id) for norad_id in ids_param.split(',')} if ids_param else None
+        except (KeyError, ValueError) as e:
+            return jsonify({"error": f"Invalid request parameters: {e}"}), 400
+        
+        if not (-90.0 <= lat <= 90.0 and 0 < hours <= config.MAX_PASS_WINDOW_HOURS):
+            return jsonify({
+                "error": f"lat must be within [-90, 90] and hours within (0, {config.MAX_PASS_WINDOW_HOURS}]"
+            }), 400
+        
+        source = request.args.get('source', 'active')
+        if source not in CATALOG_SOURCES:
+            return _unknown_source(source)
+        satellites = asyncio.run(tracker.fetch_tle_data(source))
+        
+        def compute(start: datetime, slack: float) -> Dict[str, Any]:
+            selected = satellites if wanted_ids is None else satellites.select(np.sort(satellites.rows(wanted_ids)))
+            result = compute_pool.run(
+                'passes', _catalog_passes_task, selected, lat, lon, hours + slack / 3600.0, min_elevation, alt_km,
+                start
+            )
+            return {
+                **result,
+                "observer": {"latitude": lat, "longitude": lon, "altitude_km": alt_km},
+                "min_elevation_deg": min_elevation,
+                "prediction_window_hours": hours,
+                "source": source,
+                "timestamp": start.isoformat()
+            }
+        
+        params = {"lat": lat, "lon": lon, "alt_km": alt_km, "hours": hours, "min_elevation": min_elevation,
+                  "ids": sorted(wanted_ids) if wanted_ids is not None else None}
+        return _cached_response('passes', source, satellites, params, compute, _passes_in_window(hours))
+        
+    except ComputePoolBusy:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to predict catalog passes: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route('/threats/conjunctions', methods=['GET'])
 def assess_conjunction_threats():
     """Assess conjunction threats between satellites"""
     try:
         time_window = int(request.args.get('hours', 24))
         
+        # Full-catalog screening runs asynchronously and returns a job handle
+        if request.args.get('mode') == 'full':
+            step_seconds = float(request.args.get('step', config.SCREENING_STEP_SECONDS))
+            if not 1.0 <= step_seconds <= 300.0:
+                return jsonify({"error": "step must be between 1 and 300 seconds"}), 400
+            if redis_client is None:
+                return jsonify({"error": SCREENING_JOBS_UNAVAILABLE}), 503
+            body, status_code = _submit_screening_job(time_window, step_seconds)
+            return jsonify(body), status_code
+        
         # Get active satellites
         satellites = asyncio.run(tracker.fetch_tle_data('active'))
         
-        threats = []
-        satellite_list = list(satellites.values())
-        
-        # Check pairs of satellites (limit for performance)
-        for i in range(min(100, len(satellite_list))):
-            for j in range(i + 1, min(100, len(satellite_list))):
-                sat1_data = SatelliteData(**satellite_list[i])
-                sat2_data = SatelliteData(**satellite_list[j])
-                
-                threat = tracker.assess_conjunction_threat(sat1_data, sat2_data, time_window)
-                if threat:
-                    threats.append(threat.dict())
+        def compute(start: datetime, slack: float) -> Dict[str, Any]:
+            # The same grid screening as mode=full, over the first objects only
+            limit = config.CONJUNCTION_SYNC_LIMIT
+            selected = satellites.select(np.arange(min(limit, len(satellites))))
+            threats = compute_pool.run(
+                'conjunctions', _screening_task, selected, time_window + slack / 3600.0,
+                config.SCREENING_STEP_SECONDS, start
+            )
+            
+            return {
+                "threats": threats,
+                "analysis_window_hours": time_window,
+                "satellites_screened": len(selected),
+                "truncated": len(satellites) > limit,
+                "timestamp": start.isoformat()
+            }
         
-        return jsonify({
-            "threats": threats,
-            "analysis_window_hours": time_window,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        })
+        return _cached_response('conjunctions', 'active', satellites, {"hours": time_window}, compute,
+                                _conjunctions_in_window(time_window))
         
+    except ComputePoolBusy:
+        raise
     except Exception as e:
         logger.error(f"Failed to assess threats: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/threats/conjunctions/jobs/<job_id>', methods=['GET'])
+def get_screening_job(job_id: str):
+    """Get status or result of a full-catalog screening job"""
+    try:
+        if redis_client is None:
+            return jsonify({"error": SCREENING_JOBS_UNAVAILABLE}), 503
+        job = _load_screening_job(job_id)
+        if job is None:
+            return jsonify({"error": "Screening job not found"}), 404
+        return jsonify(job)
+        
+    except Exception as e:
+        logger.error(f"Failed to load screening job: {e}")
+        return jsonify({"error": str(e)}), 500
+
+@app.errorhandler(ComputePoolBusy)
+def shed_load(error: ComputePoolBusy):
+    """Heavy requests beyond the compute pool's capacity fail fast instead of queueing"""
+    response = jsonify({
+        "error": str(error),
+        "retry_after_seconds": error.retry_after,
+        "timestamp": datetime.now(timezone.utc).isoformat()
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
 @app.errorhandler(Exception)
 def handle_error(error):
     """Global error handler"""
@@ -515,4 +1909,5 @@ def handle_error(error):
 
 if __name__ == '__main__':
     logger.info("Starting Orbit Microservice")
+    warm_start()
     app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
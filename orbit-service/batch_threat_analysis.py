@@ -9,12 +9,15 @@ import sys
 import json
 import logging
 import time
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Mapping, Optional
 from datetime import datetime, timezone, timedelta
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, as_completed, wait
 import numpy as np
-import redis
-from sgp4.api import Satrec, jday
+from sgp4.api import jday
+
+from catalog import OBJECT_TYPE_NAMES, SatelliteCatalog, SatelliteRecord
+from metrics import PAIR_ANALYSIS_SECONDS, PROPAGATED_STATES, push_worker_metrics, reset_multiprocess_dir
+from redis_store import BatchWriter, InstrumentedRedis, connect, load_json
 
 # Configure logging
 logging.basicConfig(
@@ -27,17 +30,36 @@ logger = logging.getLogger(__name__)
 REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
 THREAT_ANALYSIS_ENABLED = os.getenv('THREAT_ANALYSIS_ENABLED', 'true').lower() == 'true'
 BATCH_SIZE = int(os.getenv('BATCH_SIZE', '100'))
+PAIR_BLOCK_SIZE = int(os.getenv('PAIR_BLOCK_SIZE', '1000000'))  # candidate pairs screened per block
 MAX_WORKERS = int(os.getenv('MAX_WORKERS', '4'))
 ANALYSIS_WINDOW_DAYS = int(os.getenv('ANALYSIS_WINDOW_DAYS', '14'))
 HIGH_RISK_THRESHOLD_KM = float(os.getenv('HIGH_RISK_THRESHOLD_KM', '10.0'))
 CRITICAL_THRESHOLD_KM = float(os.getenv('CRITICAL_THRESHOLD_KM', '2.0'))
 
+
+def orbital_periods(catalog: SatelliteCatalog, records: Iterable[Mapping]) -> np.ndarray:
+    """Orbital period of each catalog row in minutes: the GP PERIOD field where
+    the record has one, otherwise derived from the mean motion"""
+    with np.errstate(divide='ignore'):
+        periods = 1440.0 / catalog.column('mean_motion')
+    for record in records:
+        try:
+            period = float(record.get('PERIOD') or 0)
+            norad_id = int(record['NORAD_CAT_ID'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if period > 0 and norad_id in catalog:
+            periods[catalog.row(norad_id)] = period
+    return periods
+
+
 class BatchThreatAnalyzer:
     """Batch processor for comprehensive threat analysis"""
     
     def __init__(self):
         self.redis_client = self._init_redis()
         self.analysis_start_time = datetime.now(timezone.utc)
+        self.periods: Optional[np.ndarray] = None
         self.stats = {
             'total_satellites': 0,
             'pairs_analyzed': 0,
@@ -47,10 +69,10 @@ class BatchThreatAnalyzer:
             'processing_time': 0
         }
         
-    def _init_redis(self) -> redis.Redis:
+    def _init_redis(self) -> InstrumentedRedis:
         """Initialize Redis connection"""
         try:
-            client = redis.from_url(REDIS_URL, decode_responses=True)
+            client = connect(REDIS_URL)
             client.ping()
             logger.info("Successfully connected to Redis")
             return client
@@ -69,41 +91,33 @@ class BatchThreatAnalyzer:
         
         try:
             # Load all satellites
-            satellites = self._load_all_satellites()
-            self.stats['total_satellites'] = len(satellites)
+            catalog = self._load_all_satellites()
+            self.stats['total_satellites'] = len(catalog)
             
-            if len(satellites) < 2:
+            if len(catalog) < 2:
                 logger.warning("Not enough satellites for analysis")
                 return self.stats
                 
-            # Generate satellite pairs for analysis
-            pairs = self._generate_satellite_pairs(satellites)
-            total_pairs = len(pairs)
-            logger.info(f"Analyzing {total_pairs} satellite pairs")
-            
-            # Process in batches with multiprocessing
+            # Generate satellite pairs block by block and process them in batches
+            logger.info(f"Analyzing pairs of {len(catalog)} satellites")
             all_threats = []
-            with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                # Submit batches for processing
-                futures = []
-                for i in range(0, total_pairs, BATCH_SIZE):
-                    batch = pairs[i:i + BATCH_SIZE]
-                    future = executor.submit(self._process_batch, batch, satellites)
-                    futures.append(future)
-                    
-                # Collect results
-                for future in as_completed(futures):
-                    try:
-                        batch_threats = future.result()
-                        all_threats.extend(batch_threats)
-                        self.stats['pairs_analyzed'] += BATCH_SIZE
-                        
-                        # Log progress
-                        progress = (self.stats['pairs_analyzed'] / total_pairs) * 100
-                        logger.info(f"Progress: {progress:.1f}% ({self.stats['pairs_analyzed']}/{total_pairs})")
+            # The catalog goes to each pool process once; batches carry only row pairs
+            with ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=_init_pair_worker,
+                                     initargs=(self.analysis_start_time, catalog)) as executor:
+                # Keep a bounded number of batches in flight so pairs are never all in memory
+                pending: Dict[Future, int] = {}
+                for pairs in self._generate_satellite_pairs(catalog, self.periods):
+                    for i in range(0, len(pairs), BATCH_SIZE):
+                        if len(pending) >= 2 * MAX_WORKERS:
+                            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                self._collect_batch(future, pending.pop(future), all_threats)
+                        batch = pairs[i:i + BATCH_SIZE]
+                        pending[executor.submit(_process_batch_task, batch)] = len(batch)
                         
-                    except Exception as e:
-                        logger.error(f"Batch processing failed: {e}")
+                # Collect results
+                for future in as_completed(pending):
+                    self._collect_batch(future, pending[future], all_threats)
                         
             # Process and store results
             self._process_analysis_results(all_threats)
@@ -121,118 +135,86 @@ class BatchThreatAnalyzer:
             logger.error(f"Batch analysis failed: {e}", exc_info=True)
             raise
             
-    def _load_all_satellites(self) -> Dict[str, Dict[str, Any]]:
+    def _load_all_satellites(self) -> SatelliteCatalog:
         """Load all satellite data from Redis"""
-        satellites = {}
+        records = []
         
         try:
-            # Get all satellite TLE keys
-            pattern = "satellite:tle:*"
-            keys = self.redis_client.keys(pattern)
-            
-            logger.info(f"Loading {len(keys)} satellites")
-            
-            for key in keys:
-                try:
-                    tle_json = self.redis_client.get(key)
-                    if tle_json:
-                        tle_data = json.loads(tle_json)
-                        sat_id = key.split(':')[-1]
-                        
-                        # Create SGP4 satellite object
-                        line1 = tle_data.get('TLE_LINE1', '')
-                        line2 = tle_data.get('TLE_LINE2', '')
-                        
-                        if line1 and line2:
-                            satellite = Satrec.twoline2rv(line1, line2)
-                            satellites[sat_id] = {
-                                'id': sat_id,
-                                'name': tle_data.get('OBJECT_NAME', 'Unknown'),
-                                'satellite': satellite,
-                                'tle_data': tle_data,
-                                'category': tle_data.get('CATEGORY', 'unknown')
-                            }
-                            
-                except Exception as e:
-                    logger.error(f"Failed to load satellite {key}: {e}")
-                    
+            # SCAN the keys and read them with a few MGETs instead of one GET each
+            records = load_json(self.redis_client, "satellite:tle:*")
+            logger.info(f"Loading {len(records)} satellites")
+            
         except Exception as e:
             logger.error(f"Failed to load satellites: {e}")
-            
-        return satellites
         
-    def _generate_satellite_pairs(self, satellites: Dict[str, Dict[str, Any]]) -> List[Tuple[str, str]]:
-        """Generate all unique satellite pairs for analysis"""
-        sat_ids = list(satellites.keys())
-        pairs = []
+        catalog = SatelliteCatalog.from_gp_records(records)
+        for rejected in catalog.rejected:
+            logger.error(f"Failed to load satellite {rejected['name']}: {rejected['reason']}")
+        self.periods = orbital_periods(catalog, records)
+        return catalog
         
+    def _generate_satellite_pairs(self, catalog: SatelliteCatalog,
+                                  periods: Optional[np.ndarray] = None) -> Iterator[np.ndarray]:
+        """Generate all unique satellite pairs for analysis as (k, 2) arrays of catalog rows
+        
+        Applies the same rules as before to a block of rows against all later
+        rows at a time: always analyze pairs with a priority category, skip
+        debris against debris, otherwise require orbital periods (minutes,
+        from the mean motion unless given) within 10%.
+        """
         # Prioritize certain satellite combinations
-        priority_categories = ['stations', 'active', 'communications']
+        priority = catalog.category_mask('stations', 'active', 'communications')
+        debris = catalog.column('object_type') == OBJECT_TYPE_NAMES.index('DEBRIS')
+        if periods is None:
+            with np.errstate(divide='ignore'):
+                periods = 1440.0 / catalog.column('mean_motion')
         
-        for i in range(len(sat_ids)):
-            for j in range(i + 1, len(sat_ids)):
-                sat1 = satellites[sat_ids[i]]
-                sat2 = satellites[sat_ids[j]]
-                
-                # Check if pair should be analyzed
-                if self._should_analyze_pair(sat1, sat2, priority_categories):
-                    pairs.append((sat_ids[i], sat_ids[j]))
-                    
-        return pairs
+        n = len(catalog)
+        block_rows = max(1, PAIR_BLOCK_SIZE // max(n, 1))
+        for start in range(0, n - 1, block_rows):
+            stop = min(start + block_rows, n - 1)
+            i, j = np.triu_indices(stop - start, k=1, m=n - start)
+            i += start
+            j += start
+            similar = np.abs(periods[i] - periods[j]) / np.maximum(periods[i], periods[j]) < 0.1
+            keep = priority[i] | priority[j] | (~(debris[i] & debris[j]) & similar)
+            yield np.column_stack((i[keep], j[keep]))
         
-    def _should_analyze_pair(self, sat1: Dict[str, Any], sat2: Dict[str, Any], 
-                           priority_categories: List[str]) -> bool:
-        """Determine if satellite pair should be analyzed"""
-        # Always analyze if either satellite is in priority category
-        if (sat1['category'] in priority_categories or 
-            sat2['category'] in priority_categories):
-            return True
-            
-        # Skip if both are debris
-        if (sat1['tle_data'].get('OBJECT_TYPE') == 'DEBRIS' and 
-            sat2['tle_data'].get('OBJECT_TYPE') == 'DEBRIS'):
-            return False
-            
-        # Analyze if orbits are similar (rough check)
+    def _collect_batch(self, future: Future, size: int, all_threats: List[Dict[str, Any]]) -> None:
+        """Add the threats of a finished batch and log progress"""
         try:
-            period1 = float(sat1['tle_data'].get('PERIOD', 0))
-            period2 = float(sat2['tle_data'].get('PERIOD', 0))
-            
-            # If periods are within 10%, orbits might intersect
-            if period1 > 0 and period2 > 0:
-                period_diff = abs(period1 - period2) / max(period1, period2)
-                return period_diff < 0.1
-                
-        except Exception:
-            pass
+            all_threats.extend(future.result())
+            self.stats['pairs_analyzed'] += size
+            logger.info(f"Progress: {self.stats['pairs_analyzed']} pairs analyzed")
             
-        return True
+        except Exception as e:
+            logger.error(f"Batch processing failed: {e}")
         
-    def _process_batch(self, pairs: List[Tuple[str, str]], 
-                      satellites: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _process_batch(self, pairs: np.ndarray, catalog: SatelliteCatalog) -> List[Dict[str, Any]]:
         """Process a batch of satellite pairs"""
         threats = []
         
-        for sat1_id, sat2_id in pairs:
+        for row1, row2 in pairs:
             try:
-                sat1 = satellites[sat1_id]
-                sat2 = satellites[sat2_id]
+                sat1 = catalog.record(row1)
+                sat2 = catalog.record(row2)
                 
                 threat = self._analyze_pair_collision_risk(sat1, sat2)
                 if threat:
                     threats.append(threat)
                     
             except Exception as e:
-                logger.error(f"Failed to analyze pair {sat1_id}-{sat2_id}: {e}")
+                logger.error(f"Failed to analyze pair at rows {row1}-{row2}: {e}")
                 
         return threats
         
-    def _analyze_pair_collision_risk(self, sat1: Dict[str, Any], 
-                                   sat2: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    @PAIR_ANALYSIS_SECONDS.labels('batch_threat_analysis').time()
+    def _analyze_pair_collision_risk(self, sat1: SatelliteRecord, 
+                                   sat2: SatelliteRecord) -> Optional[Dict[str, Any]]:
         """Analyze collision risk between two satellites"""
         try:
-            sat1_obj = sat1['satellite']
-            sat2_obj = sat2['satellite']
+            sat1_obj = sat1.satrec
+            sat2_obj = sat2.satrec
             
             # Time range for analysis
             start_time = self.analysis_start_time
@@ -256,6 +238,7 @@ class BatchThreatAnalyzer:
                 
                 e1, r1, v1 = sat1_obj.sgp4(jd, fr)
                 e2, r2, v2 = sat2_obj.sgp4(jd, fr)
+                PROPAGATED_STATES.labels('batch_threat_analysis', 'sgp4').inc(2)
                 
                 if e1 == 0 and e2 == 0:  # No propagation errors
                     # Calculate distance
@@ -286,14 +269,14 @@ class BatchThreatAnalyzer:
                 
                 return {
                     'satellite1': {
-                        'id': sat1['id'],
-                        'name': sat1['name'],
-                        'category': sat1['category']
+                        'id': str(sat1.norad_id),
+                        'name': sat1.name,
+                        'category': sat1.category
                     },
                     'satellite2': {
-                        'id': sat2['id'],
-                        'name': sat2['name'],
-                        'category': sat2['category']
+                        'id': str(sat2.norad_id),
+                        'name': sat2.name,
+                        'category': sat2.category
                     },
                     'min_distance_km': min_distance,
                     'closest_approach_time': closest_time.isoformat(),
@@ -366,16 +349,18 @@ class BatchThreatAnalyzer:
                 })
             )
             
-            # Create alerts for critical threats
-            for threat in threats:
-                if threat['threat_level'] in ['EMERGENCY', 'CRITICAL']:
-                    self._create_threat_alert(threat)
+            # Create alerts for critical threats, batched into pipelined round trips
+            with BatchWriter(self.redis_client) as writer:
+                for threat in threats:
+                    if threat['threat_level'] in ['EMERGENCY', 'CRITICAL']:
+                        self._create_threat_alert(threat, writer)
                     
         except Exception as e:
             logger.error(f"Failed to process analysis results: {e}")
             
-    def _create_threat_alert(self, threat: Dict[str, Any]) -> None:
-        """Create alert for critical threat"""
+    def _create_threat_alert(self, threat: Dict[str, Any], writer: Optional[BatchWriter] = None) -> None:
+        """Create alert for critical threat, queued on ``writer`` if given"""
+        redis_client = writer or self.redis_client
         try:
             alert = {
                 'type': 'batch_collision_threat',
@@ -386,11 +371,11 @@ class BatchThreatAnalyzer:
             }
             
             # Push to alert queue
-            self.redis_client.rpush('alerts:critical', json.dumps(alert))
+            redis_client.rpush('alerts:critical', json.dumps(alert))
             
             # Store individual alert
             alert_key = f"alert:batch:{threat['satellite1']['id']}:{threat['satellite2']['id']}"
-            self.redis_client.setex(alert_key, 86400 * 3, json.dumps(alert))  # 3 days
+            redis_client.setex(alert_key, 86400 * 3, json.dumps(alert))  # 3 days
             
             logger.warning(
                 f"{threat['threat_level']} threat: {threat['satellite1']['name']} - "
@@ -463,8 +448,30 @@ class BatchThreatAnalyzer:
             
         return recommendations
 
+
+# Set in each pool process by _init_pair_worker
+_worker_analyzer: Optional[BatchThreatAnalyzer] = None
+_worker_catalog: Optional[SatelliteCatalog] = None
+
+
+def _init_pair_worker(analysis_start_time: datetime, catalog: SatelliteCatalog) -> None:
+    """Keep the catalog and an analyzer without a Redis connection for the batches this process runs"""
+    global _worker_analyzer, _worker_catalog
+    _worker_analyzer = BatchThreatAnalyzer.__new__(BatchThreatAnalyzer)
+    _worker_analyzer.analysis_start_time = analysis_start_time
+    _worker_catalog = catalog
+
+
+def _process_batch_task(pairs: np.ndarray) -> List[Dict[str, Any]]:
+    """Analyze a batch of catalog row pairs against the catalog the pool process was started with"""
+    if _worker_analyzer is None or _worker_catalog is None:
+        raise RuntimeError("Pool process was started without _init_pair_worker")
+    return _worker_analyzer._process_batch(pairs, _worker_catalog)
+
+
 def main():
     """Main entry point"""
+    reset_multiprocess_dir()
     if not THREAT_ANALYSIS_ENABLED:
         logger.info("Threat analysis is disabled. Exiting.")
         return
@@ -473,6 +480,13 @@ def main():
         analyzer = BatchThreatAnalyzer()
         stats = analyzer.run_batch_analysis()
         
+        # Pairs are analyzed in subprocesses; their samples reach the push
+        # only when PROMETHEUS_MULTIPROC_DIR is set
+        try:
+            push_worker_metrics('batch_threat_analysis')
+        except Exception as e:
+            logger.warning(f"Failed to push metrics: {e}")
+        
         # Exit with appropriate code
         if stats['critical_threats'] > 0:
             logger.error(f"Critical threats detected: {stats['critical_threats']}")
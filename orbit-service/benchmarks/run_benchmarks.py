@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Orbit Service Benchmarks
+Times parsing, propagation, conjunction and pass prediction on synthetic catalogs, offline
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+sys.path.insert(0, os.path.join(SERVICE_DIR, 'tests'))
+
+# Keep the service offline before it is imported: an unreachable Redis (replaced
+# by the in-memory stand-in below), no refresher thread and no shared snapshots
+os.environ['REDIS_URL'] = 'redis://127.0.0.1:1'
+os.environ['CATALOG_BACKGROUND_REFRESH'] = 'false'
+os.environ['POSITION_SNAPSHOT_ENABLED'] = 'false'
+
+import numpy as np  # noqa: E402
+import sgp4  # noqa: E402
+
+import app as orbit_app  # noqa: E402
+import batch_threat_analysis  # noqa: E402
+import screening  # noqa: E402
+import threat_worker  # noqa: E402
+from batch_threat_analysis import BatchThreatAnalyzer  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import InMemoryRedis  # noqa: E402
+from pass_cache import PassPredictionCache  # noqa: E402
+from propagation import propagate_catalog  # noqa: E402
+from threat_worker import ThreatAnalyzer  # noqa: E402
+from tle_parser import parse_tle_text  # noqa: E402
+
+from benchmarks.synthetic_catalog import DEFAULT_EPOCH, MIXES, generate_catalog, to_tle_text  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+START = DEFAULT_EPOCH + timedelta(hours=1)
+OBSERVER = (40.7128, -74.0060)
+
+# Objects or pairs per repetition for the per-object benchmarks, so their
+# cost does not grow with the catalog
+SINGLE_SAMPLE = 100
+PAIR_SAMPLE = 20
+WORKER_PAIR_SAMPLE = 5
+PASS_SAMPLE = 20
+BULK_TIMESTAMPS = 10
+SCREENING_HOURS = 1.0
+
+# Whole-catalog benchmarks that take minutes per repetition on large catalogs
+HEAVY_BENCHMARKS = {'predict_passes_batch', 'screen_conjunctions'}
+
+
+def measure(name: str, size: int, run: Callable[[], Any], units: int, repeat: int,
+            setup: Optional[Callable[[], None]] = None, warmup: int = 1) -> Dict[str, Any]:
+    """Time ``run`` ``repeat`` times after ``warmup`` untimed runs; ``setup`` runs untimed before each"""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        run()
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - started)
+    median = statistics.median(times)
+    return {
+        'name': name,
+        'size': size,
+        'repeat': repeat,
+        'units': units,
+        'min_s': min(times),
+        'median_s': median,
+        'mean_s': statistics.fmean(times),
+        'stdev_s': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'units_per_second': units / median if median > 0 else None,
+    }
+
+
+def _sample_rows(count: int, sample: int) -> np.ndarray:
+    return np.linspace(0, count - 1, min(sample, count), dtype=np.int64)
+
+
+def _sample_pairs(count: int, sample: int) -> List[tuple]:
+    """Neighbouring rows spread over the catalog; neighbours share a shell and often a plane"""
+    return [(int(row), int(row) + 1) for row in _sample_rows(count - 1, sample)]
+
+
+def _fresh_pass_cache() -> None:
+    orbit_app.pass_cache = PassPredictionCache(
+        InMemoryRedis(), orbit_app.config.PASS_CACHE_SIZE, orbit_app.config.PASS_CACHE_GRID_DEG,
+        orbit_app.config.CACHE_TTL
+    )
+
+
+def benchmark_catalog(size: int, mix: str, seed: int, repeat: int,
+                      only: Optional[List[str]] = None, max_heavy_size: int = 10000) -> List[Dict[str, Any]]:
+    """Run every benchmark against one synthetic catalog"""
+    records = generate_catalog(size, mix, seed)
+    text = to_tle_text(records)
+    catalog = SatelliteCatalog.from_records(records)
+    satrecs = [catalog.satrec(row) for row in range(len(catalog))]
+    models = [orbit_app.SatelliteData(**catalog.record(row)) for row in range(len(catalog))]
+    tracker = orbit_app.tracker
+    timestamps = [START + timedelta(minutes=minute) for minute in range(BULK_TIMESTAMPS)]
+    single_rows = _sample_rows(size, SINGLE_SAMPLE)
+    pass_rows = _sample_rows(size, PASS_SAMPLE)
+    pairs = _sample_pairs(size, PAIR_SAMPLE)
+    worker_pairs = _sample_pairs(size, WORKER_PAIR_SAMPLE)
+
+    batch_analyzer = BatchThreatAnalyzer.__new__(BatchThreatAnalyzer)
+    batch_analyzer.redis_client = InMemoryRedis()
+    batch_analyzer.analysis_start_time = START
+    analyzer = ThreatAnalyzer.__new__(ThreatAnalyzer)
+    analyzer.redis_client = InMemoryRedis()
+    analyzer.catalog = catalog
+    all_records = catalog.records()
+
+    benchmarks = {
+        'parse_tle_text': (lambda: parse_tle_text(text), size, None),
+        'catalog_from_records': (lambda: SatelliteCatalog.from_records(records), size, None),
+        'propagate_single': (
+            lambda: [tracker.calculate_position(models[row], START) for row in single_rows],
+            len(single_rows), None
+        ),
+        'propagate_bulk': (lambda: propagate_catalog(satrecs, timestamps), size * len(timestamps), None),
+        'calculate_positions': (lambda: tracker.calculate_positions(all_records, [START]), size, None),
+        'assess_conjunction_threat': (
+            lambda: [tracker.assess_conjunction_threat(models[a], models[b], 24, START) for a, b in pairs],
+            len(pairs), None
+        ),
+        'batch_pair_collision_risk': (
+            lambda: [batch_analyzer._analyze_pair_collision_risk(catalog.record(a), catalog.record(b))
+                     for a, b in worker_pairs],
+            len(worker_pairs), None
+        ),
+        'threat_worker_check_collision': (
+            lambda: [analyzer._check_collision_threat(int(catalog.record(a).norad_id),
+                                                      int(catalog.record(b).norad_id)) for a, b in pairs],
+            len(pairs), None
+        ),
+        'predict_passes': (
+            lambda: [tracker.predict_passes(models[row], *OBSERVER, 24, START) for row in pass_rows],
+            len(pass_rows), _fresh_pass_cache
+        ),
+        'visible_satellites': (
+            lambda: tracker.visible_satellites(catalog, *OBSERVER, 0.0, 0.0, START), size, None
+        ),
+        'predict_passes_batch': (
+            lambda: tracker.predict_passes_batch(catalog, *OBSERVER, 24, start=START), size, None
+        ),
+        'screen_conjunctions': (
+            lambda: tracker.screen_conjunctions(all_records, SCREENING_HOURS,
+                                                orbit_app.config.SCREENING_STEP_SECONDS),
+            size, None
+        ),
+    }
+
+    results = []
+    # The threat worker and catalog screening start from "now"; pin both to the synthetic epoch
+    with mock.patch.object(threat_worker, 'datetime', wraps=datetime) as worker_clock, \
+            mock.patch.object(screening, 'datetime', wraps=datetime) as screening_clock:
+        worker_clock.now.return_value = START
+        screening_clock.now.return_value = START
+        for name, (run, units, setup) in benchmarks.items():
+            if only and name not in only:
+                continue
+            if name in HEAVY_BENCHMARKS and size > max_heavy_size:
+                continue
+            result = measure(name, size, run, units, repeat, setup)
+            print(f"{name:32s} {size:>7d} {result['median_s'] * 1000:10.2f} ms "
+                  f"{result['units_per_second'] or 0:14.0f} /s", file=sys.stderr)
+            results.append(result)
+    return results
+
+
+def _git_revision() -> Optional[Dict[str, Any]]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=SERVICE_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=SERVICE_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {'commit': commit, 'dirty': bool(dirty)}
+
+
+def run(sizes: List[int], mix: str = 'mixed', seed: int = 0, repeat: int = 5,
+        only: Optional[List[str]] = None, max_heavy_size: int = 10000) -> Dict[str, Any]:
+    """Benchmark every size and return the results document"""
+    orbit_app.redis_client = InMemoryRedis()
+    _fresh_pass_cache()
+    # Keep log output from the timed sections
+    batch_threat_analysis.logger.disabled = True
+    threat_worker.logger.disabled = True
+
+    results = []
+    for size in sizes:
+        results.extend(benchmark_catalog(size, mix, seed, repeat, only, max_heavy_size))
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git': _git_revision(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'sgp4': sgp4.__version__,
+        },
+        'parameters': {'sizes': sizes, 'mix': mix, 'seed': seed, 'repeat': repeat,
+                       'max_heavy_size': max_heavy_size, 'start': START.isoformat()},
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Median time ratios against a baseline document, flagging those slower than ``threshold``"""
+    before = {(result['name'], result['size']): result['median_s'] for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        reference = before.get((result['name'], result['size']))
+        if not reference:
+            continue
+        ratio = result['median_s'] / reference
+        rows.append({'name': result['name'], 'size': result['size'], 'ratio': ratio,
+                     'regressed': ratio > threshold})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[-1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--mix', choices=sorted(MIXES), default='mixed')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--only', nargs='+', help='run only these benchmarks')
+    parser.add_argument('--max-heavy-size', type=int, default=10000,
+                        help=f"largest catalog to run {', '.join(sorted(HEAVY_BENCHMARKS))} on")
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='results JSON of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='median time ratio above which a benchmark counts as regressed')
+    args = parser.parse_args(argv)
+
+    document = run(args.sizes, args.mix, args.seed, args.repeat, args.only, args.max_heavy_size)
+    with open(args.output, 'w') as handle:
+        json.dump(document, handle, indent=2)
+    print(f"Wrote {len(document['results'])} results to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            rows = compare(document, json.load(handle), args.threshold)
+        for row in rows:
+            flag = '  REGRESSED' if row['regressed'] else ''
+            print(f"{row['name']:32s} {row['size']:>7d} {row['ratio']:6.2f}x{flag}", file=sys.stderr)
+        return 1 if any(row['regressed'] for row in rows) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
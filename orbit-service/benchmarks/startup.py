@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Orbit Service Startup Benchmark
+Times a cold import of the service and how long a fresh server takes to answer /health
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from importlib.util import find_spec
+from typing import Any, Dict, List, Optional
+
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+IMPORT_SCRIPT = (
+    "import time; started = time.perf_counter(); import app; "
+    "print(time.perf_counter() - started)"
+)
+WERKZEUG_SCRIPT = (
+    "import sys, app; app.warm_start(); "
+    "app.app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)"
+)
+
+
+def offline_environment(sources: str = '') -> Dict[str, str]:
+    """Environment for a server with no reachable Redis, no refresher and only ``sources`` preloaded"""
+    env = dict(os.environ)
+    env.setdefault('REDIS_URL', 'redis://127.0.0.1:1')
+    env['CATALOG_BACKGROUND_REFRESH'] = 'false'
+    env['PRELOAD_SOURCES'] = sources
+    env['POSITION_SNAPSHOT_DIR'] = tempfile.mkdtemp(prefix='orbit-startup-')
+    return env
+
+
+def import_seconds(runs: int, env: Dict[str, str]) -> List[float]:
+    """Seconds to import the service in ``runs`` fresh interpreters"""
+    times = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', IMPORT_SCRIPT], cwd=SERVICE_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_command(server: str, port: int) -> List[str]:
+    """Command line starting one serving process of ``server`` on ``port``"""
+    if server == 'werkzeug':
+        return [sys.executable, '-c', WERKZEUG_SCRIPT, str(port)]
+    return [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+            '--workers', '1', 'app:app']
+
+
+def seconds_to_healthy(command: List[str], port: int, env: Dict[str, str], timeout: float = 60.0) -> float:
+    """Seconds from starting ``command`` until its /health answers 200"""
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with status {process.returncode}")
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError, OSError):
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"/health did not answer within {timeout:.0f}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _summary(times: List[float]) -> Dict[str, Any]:
+    return {'runs': len(times), 'min_s': min(times), 'median_s': statistics.median(times), 'max_s': max(times)}
+
+
+def run(runs: int = 5, servers: Optional[List[str]] = None, sources: str = '') -> Dict[str, Any]:
+    """Measure cold import and time-to-first-healthy and return the results document"""
+    if servers is None:
+        servers = ['werkzeug'] + (['gunicorn', 'gunicorn-preload'] if find_spec('gunicorn') else [])
+    env = offline_environment(sources)
+    document = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'parameters': {'runs': runs, 'preload_sources': sources},
+        'import': _summary(import_seconds(runs, env)),
+        'first_healthy': {},
+    }
+    for server in servers:
+        server_env = dict(env, GUNICORN_PRELOAD=str(server == 'gunicorn-preload').lower())
+        times = []
+        for _ in range(runs):
+            port = _free_port()
+            times.append(seconds_to_healthy(server_command(server.split('-')[0], port), port, server_env))
+        document['first_healthy'][server] = _summary(times)
+    return document
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[-1])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--servers', nargs='+', choices=['werkzeug', 'gunicorn', 'gunicorn-preload'],
+                        help='servers to start (default: werkzeug, plus gunicorn when installed)')
+    parser.add_argument('--preload-sources', default='',
+                        help='comma separated catalogs to warm before serving (needs Redis or CelesTrak)')
+    parser.add_argument('--output', default='startup-results.json')
+    args = parser.parse_args(argv)
+
+    document = run(args.runs, args.servers, args.preload_sources)
+    print(f"import {document['import']['median_s'] * 1000:8.1f} ms", file=sys.stderr)
+    for server, summary in document['first_healthy'].items():
+        print(f"{server} first healthy {summary['median_s'] * 1000:8.1f} ms", file=sys.stderr)
+    with open(args.output, 'w') as handle:
+        json.dump(document, handle, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
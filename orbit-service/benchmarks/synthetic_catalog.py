@@ -0,0 +1,136 @@
+"""
+Synthetic Catalogs
+Reproducible TLE catalogs mixing LEO, MEO and GEO populations and Starlink-like shells
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sgp4.api import Satrec, WGS72
+from sgp4.exporter import export_tle
+
+EARTH_RADIUS_KM = 6378.135
+MU_KM3_S2 = 398600.8
+SGP4_EPOCH_ORIGIN = datetime(1949, 12, 31, tzinfo=timezone.utc)
+DEFAULT_EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+FIRST_NORAD_ID = 10000
+
+# Orbital populations. Shells with ``planes`` place satellites in evenly spaced
+# planes phased along each plane, like a constellation; the rest get random
+# node and anomaly. Ranges are sampled uniformly; bstar gives LEO some drag.
+SHELLS: Dict[str, Dict[str, Any]] = {
+    'starlink-53': {'altitude_km': (550.0, 550.0), 'inclination_deg': (53.0, 53.0),
+                    'eccentricity': (0.0001, 0.0002), 'planes': 72, 'bstar': (1e-5, 1e-4)},
+    'starlink-70': {'altitude_km': (570.0, 570.0), 'inclination_deg': (70.0, 70.0),
+                    'eccentricity': (0.0001, 0.0002), 'planes': 36, 'bstar': (1e-5, 1e-4)},
+    'starlink-97': {'altitude_km': (560.0, 560.0), 'inclination_deg': (97.6, 97.6),
+                    'eccentricity': (0.0001, 0.0002), 'planes': 6, 'bstar': (1e-5, 1e-4)},
+    'leo-sso': {'altitude_km': (450.0, 900.0), 'inclination_deg': (96.5, 99.5),
+                'eccentricity': (0.0001, 0.005), 'planes': 0, 'bstar': (1e-5, 5e-4)},
+    'leo-other': {'altitude_km': (300.0, 1500.0), 'inclination_deg': (0.0, 110.0),
+                  'eccentricity': (0.0001, 0.02), 'planes': 0, 'bstar': (1e-5, 1e-3)},
+    'meo-gnss': {'altitude_km': (19100.0, 23222.0), 'inclination_deg': (54.0, 65.0),
+                 'eccentricity': (0.0001, 0.01), 'planes': 0, 'bstar': (0.0, 0.0)},
+    'heo-molniya': {'altitude_km': (20000.0, 20500.0), 'inclination_deg': (63.4, 63.4),
+                    'eccentricity': (0.6, 0.74), 'planes': 0, 'bstar': (0.0, 0.0)},
+    'geo': {'altitude_km': (35776.0, 35796.0), 'inclination_deg': (0.0, 5.0),
+            'eccentricity': (0.0001, 0.001), 'planes': 0, 'bstar': (0.0, 0.0)},
+}
+
+# Share of each shell in a catalog; 'mixed' roughly follows today's public catalog
+MIXES: Dict[str, Dict[str, float]] = {
+    'mixed': {'starlink-53': 0.35, 'starlink-70': 0.06, 'starlink-97': 0.04, 'leo-sso': 0.2,
+              'leo-other': 0.25, 'meo-gnss': 0.04, 'heo-molniya': 0.01, 'geo': 0.05},
+    'starlink': {'starlink-53': 0.75, 'starlink-70': 0.15, 'starlink-97': 0.1},
+    'leo': {'leo-sso': 0.4, 'leo-other': 0.6},
+    'meo': {'meo-gnss': 0.9, 'heo-molniya': 0.1},
+    'geo': {'geo': 1.0},
+}
+
+
+def _shell_counts(count: int, mix: Dict[str, float]) -> Dict[str, int]:
+    """Split ``count`` objects across shells by their shares, largest remainders first"""
+    total = sum(mix.values())
+    exact = {name: count * share / total for name, share in mix.items()}
+    counts = {name: int(value) for name, value in exact.items()}
+    by_remainder = sorted(exact, key=lambda name: exact[name] - counts[name], reverse=True)
+    for name in by_remainder[:count - sum(counts.values())]:
+        counts[name] += 1
+    return counts
+
+
+def _shell_satrecs(shell: Dict[str, Any], count: int, first_satnum: int,
+                   epoch: datetime, rng: np.random.Generator) -> List[Satrec]:
+    """SGP4 records of ``count`` objects drawn from one shell"""
+    altitude = rng.uniform(*shell['altitude_km'], count)
+    inclination = rng.uniform(*shell['inclination_deg'], count)
+    eccentricity = rng.uniform(*shell['eccentricity'], count)
+    bstar = rng.uniform(*shell['bstar'], count)
+    arg_perigee = rng.uniform(0.0, 360.0, count)
+    if shell['planes']:
+        planes = min(shell['planes'], count)
+        per_plane = -(-count // planes)
+        plane = np.arange(count) % planes
+        slot = np.arange(count) // planes
+        raan = plane * 360.0 / planes
+        # Walker-style phasing between neighbouring planes
+        mean_anomaly = (slot * 360.0 / per_plane + plane * 360.0 / count) % 360.0
+    else:
+        raan = rng.uniform(0.0, 360.0, count)
+        mean_anomaly = rng.uniform(0.0, 360.0, count)
+
+    # Mean altitude sets the semi-major axis; perigee must stay above the surface
+    semi_major_axis = EARTH_RADIUS_KM + altitude
+    eccentricity = np.minimum(eccentricity, 1.0 - (EARTH_RADIUS_KM + 150.0) / semi_major_axis)
+    mean_motion = np.sqrt(MU_KM3_S2 / semi_major_axis ** 3) * 60.0  # rad/min
+    epoch_days = (epoch - SGP4_EPOCH_ORIGIN).total_seconds() / 86400.0
+
+    satrecs = []
+    for i in range(count):
+        satrec = Satrec()
+        satrec.sgp4init(
+            WGS72, 'i', first_satnum + i, epoch_days,
+            float(bstar[i]), 0.0, 0.0, float(eccentricity[i]), math.radians(arg_perigee[i]),
+            math.radians(inclination[i]), math.radians(mean_anomaly[i]),
+            float(mean_motion[i]), math.radians(raan[i])
+        )
+        satrecs.append(satrec)
+    return satrecs
+
+
+def generate_catalog(count: int, mix: str = 'mixed', seed: int = 0,
+                     epoch: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Service records (``norad_id``, ``name``, ``line1``, ``line2``) of a synthetic catalog
+
+    The same arguments always give the same catalog. NORAD IDs are
+    consecutive from 10000 and grouped by shell.
+    """
+    if mix not in MIXES:
+        raise ValueError(f"Unknown mix {mix!r}; choose from {sorted(MIXES)}")
+    if FIRST_NORAD_ID + count > 100000:
+        raise ValueError("Synthetic catalogs are limited to five-digit NORAD IDs")
+    rng = np.random.default_rng(seed)
+    epoch = epoch or DEFAULT_EPOCH
+
+    records = []
+    satnum = FIRST_NORAD_ID
+    for shell_name, shell_count in _shell_counts(count, MIXES[mix]).items():
+        if not shell_count:
+            continue
+        for i, satrec in enumerate(_shell_satrecs(SHELLS[shell_name], shell_count, satnum, epoch, rng)):
+            line1, line2 = export_tle(satrec)
+            records.append({
+                'norad_id': satnum + i,
+                'name': f"SYNTH {shell_name.upper()} {i + 1}",
+                'line1': line1,
+                'line2': line2,
+            })
+        satnum += shell_count
+    return records
+
+
+def to_tle_text(records: List[Dict[str, Any]]) -> str:
+    """Three-line TLE listing of records, as CelesTrak serves it"""
+    return ''.join(f"{record['name']}\r\n{record['line1']}\r\n{record['line2']}\r\n" for record in records)
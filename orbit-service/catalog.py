@@ -0,0 +1,307 @@
+"""
+Satellite Catalog
+Array-backed in-memory catalog with a NORAD ID index and lightweight per-object views
+"""
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+from sgp4.api import Satrec
+
+from tle_parser import parse_tle_text
+
+ELEMENT_FIELDS = ('mean_motion', 'eccentricity', 'inclination', 'arg_perigee', 'raan', 'mean_anomaly')
+
+# Code 0 of each table is the fallback for values not listed
+CATEGORY_NAMES = (
+    'unknown', 'active', 'stations', 'weather', 'communications', 'navigation', 'science', 'starlink', 'gps'
+)
+OBJECT_TYPE_NAMES = ('UNKNOWN', 'PAYLOAD', 'ROCKET BODY', 'DEBRIS', 'TBA')
+
+CATALOG_DTYPE = np.dtype([
+    ('norad_id', '<i4'),
+    ('epoch', '<M8[us]'),
+    *((field, '<f8') for field in ELEMENT_FIELDS),
+    ('category', 'u1'),
+    ('object_type', 'u1'),
+    ('line1', 'S69'),
+    ('line2', 'S69'),
+])
+
+
+def _codes(values: Sequence[Optional[str]], table: Sequence[str]) -> np.ndarray:
+    lookup: Dict[Optional[str], int] = {name: code for code, name in enumerate(table)}
+    return np.fromiter((lookup.get(value, 0) for value in values), dtype=np.uint8, count=len(values))
+
+
+class SatelliteRecord(Mapping):
+    """Read-only view of one catalog row
+
+    Holds only the catalog and a row number. Attributes return native types;
+    item access returns the JSON-ready values of the record dicts the catalog
+    replaced, so ``SatelliteData(**record)`` and ``record['line1']`` keep working.
+    """
+
+    __slots__ = ('catalog', 'row')
+
+    # Same fields as ``SatelliteData``
+    KEYS = ('norad_id', 'name', 'line1', 'line2', 'epoch', *ELEMENT_FIELDS)
+
+    def __init__(self, catalog: 'SatelliteCatalog', row: int):
+        self.catalog = catalog
+        self.row = row
+
+    @property
+    def norad_id(self) -> int:
+        return int(self.catalog.elements['norad_id'][self.row])
+
+    @property
+    def name(self) -> str:
+        return str(self.catalog.names[self.row])
+
+    @property
+    def line1(self) -> str:
+        return self.catalog.elements['line1'][self.row].decode('ascii')
+
+    @property
+    def line2(self) -> str:
+        return self.catalog.elements['line2'][self.row].decode('ascii')
+
+    @property
+    def epoch(self) -> datetime:
+        return self.catalog.elements['epoch'][self.row].astype(datetime)
+
+    @property
+    def category(self) -> str:
+        return CATEGORY_NAMES[self.catalog.elements['category'][self.row]]
+
+    @property
+    def object_type(self) -> str:
+        return OBJECT_TYPE_NAMES[self.catalog.elements['object_type'][self.row]]
+
+    @property
+    def satrec(self) -> Satrec:
+        return self.catalog.satrec(self.row)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in ELEMENT_FIELDS:
+            return float(self.catalog.elements[key][self.row])
+        if key == 'epoch':
+            return str(np.datetime_as_string(self.catalog.elements['epoch'][self.row], unit='us'))
+        if key in self.KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: self[key] for key in self.KEYS}
+
+    def __repr__(self) -> str:
+        return f"SatelliteRecord(norad_id={self.norad_id}, name={self.name!r})"
+
+
+class SatelliteCatalog(Mapping):
+    """Orbital elements of a whole catalog in one NumPy structured array
+
+    One row per object holds the NORAD ID, epoch, mean elements, category and
+    object type codes and both TLE lines (about 230 bytes), with names in a
+    separate fixed-width column. The ID index is a sorted copy of the ID
+    column searched with ``searchsorted``, so there are no per-object Python
+    objects until a ``SatelliteRecord`` view is asked for. Element filters
+    are array operations on ``elements``.
+
+    Behaves as a read-only mapping of NORAD ID to record view in catalog order.
+    """
+
+    def __init__(self, elements: np.ndarray, names: np.ndarray,
+                 rejected: Optional[List[Dict[str, Any]]] = None):
+        self.elements = elements
+        self.names = names
+        self.rejected = rejected or []
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Derive the NORAD ID index and the empty SGP4 record cache from ``elements``"""
+        self._order = np.argsort(self.elements['norad_id'], kind='stable')
+        self._sorted_ids = self.elements['norad_id'][self._order]
+        self._satrecs: List[Optional[Satrec]] = [None] * len(self.elements)
+
+    @classmethod
+    def empty(cls) -> 'SatelliteCatalog':
+        return cls(np.zeros(0, dtype=CATALOG_DTYPE), np.zeros(0, dtype='U1'))
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Any], categories: Union[str, np.ndarray, None] = None,
+                     object_types: Optional[np.ndarray] = None,
+                     rejected: Optional[List[Dict[str, Any]]] = None) -> 'SatelliteCatalog':
+        """Build from ``parse_tle_text`` columns; a repeated NORAD ID keeps its last record
+
+        ``categories`` is one category name for every record or a code per parsed record.
+        """
+        ids = np.asarray(columns['norad_id'])
+        _, last_from_end = np.unique(ids[::-1], return_index=True)
+        keep = np.sort(len(ids) - 1 - last_from_end)
+
+        elements = np.zeros(len(keep), dtype=CATALOG_DTYPE)
+        elements['norad_id'] = ids[keep]
+        elements['epoch'] = np.asarray(columns['epoch'])[keep]
+        for field in ELEMENT_FIELDS:
+            elements[field] = np.asarray(columns[field])[keep]
+        if isinstance(categories, str):
+            elements['category'] = _codes([categories], CATEGORY_NAMES)[0]
+        elif categories is not None:
+            elements['category'] = categories[keep]
+        if object_types is not None:
+            elements['object_type'] = object_types[keep]
+        elements['line1'] = np.array(columns['line1'], dtype='S69')[keep] if len(keep) else []
+        elements['line2'] = np.array(columns['line2'], dtype='S69')[keep] if len(keep) else []
+        names = np.array([columns['name'][row] for row in keep], dtype=str) if len(keep) else np.zeros(0, dtype='U1')
+        return cls(elements, names, rejected)
+
+    @classmethod
+    def from_lines(cls, names: Sequence[str], line1: Sequence[str], line2: Sequence[str],
+                   categories: Optional[Sequence[Optional[str]]] = None,
+                   object_types: Optional[Sequence[Optional[str]]] = None) -> 'SatelliteCatalog':
+        """Parse element sets given as separate name and line lists; a missing category or type is code 0"""
+        text = '\n'.join(f"{name}\n{first}\n{second}" for name, first, second in zip(names, line1, line2))
+        columns, rejected = parse_tle_text(text)
+        rows = columns['index']
+        return cls.from_columns(
+            columns,
+            categories=_codes(categories, CATEGORY_NAMES)[rows] if categories is not None else None,
+            object_types=_codes(object_types, OBJECT_TYPE_NAMES)[rows] if object_types is not None else None,
+            rejected=rejected
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]], category: str = 'unknown') -> 'SatelliteCatalog':
+        """Build from service records (``name``, ``line1``, ``line2``; elements are re-derived from the lines)"""
+        records = list(records)
+        return cls.from_lines(
+            [record['name'] for record in records],
+            [record['line1'] for record in records],
+            [record['line2'] for record in records],
+            categories=[category] * len(records)
+        )
+
+    @classmethod
+    def from_gp_records(cls, records: Iterable[Mapping[str, Any]]) -> 'SatelliteCatalog':
+        """Build from CelesTrak GP JSON records as stored by the sync job"""
+        records = list(records)
+        return cls.from_lines(
+            [record.get('OBJECT_NAME', 'Unknown') for record in records],
+            [record.get('TLE_LINE1', '') for record in records],
+            [record.get('TLE_LINE2', '') for record in records],
+            categories=[record.get('CATEGORY') for record in records],
+            object_types=[record.get('OBJECT_TYPE') for record in records]
+        )
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.elements['norad_id'].tolist())
+
+    def __contains__(self, norad_id: object) -> bool:
+        if not isinstance(norad_id, (int, str, np.integer)):
+            return False
+        try:
+            self.row(norad_id)
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+    def __getitem__(self, norad_id: int) -> SatelliteRecord:
+        return SatelliteRecord(self, self.row(norad_id))
+
+    def row(self, norad_id: Union[int, str, np.integer]) -> int:
+        """Row of a NORAD ID, raising KeyError if it is not in the catalog"""
+        position = int(np.searchsorted(self._sorted_ids, int(norad_id)))
+        if position == len(self._sorted_ids) or self._sorted_ids[position] != int(norad_id):
+            raise KeyError(norad_id)
+        return int(self._order[position])
+
+    def rows(self, norad_ids: Iterable[int]) -> np.ndarray:
+        """Rows of the given NORAD IDs that are in the catalog, in the order given"""
+        wanted = np.fromiter((int(norad_id) for norad_id in norad_ids), dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self._sorted_ids, wanted), max(len(self._sorted_ids) - 1, 0))
+        if not len(self._sorted_ids):
+            return np.zeros(0, dtype=np.int64)
+        found = self._sorted_ids[positions] == wanted
+        return self._order[positions[found]]
+
+    def record(self, row: int) -> SatelliteRecord:
+        return SatelliteRecord(self, int(row))
+
+    def records(self, rows: Optional[Iterable[int]] = None) -> List[SatelliteRecord]:
+        """Views of the given rows, or of the whole catalog"""
+        if rows is None:
+            rows = range(len(self))
+        return [SatelliteRecord(self, int(row)) for row in rows]
+
+    def select(self, rows: np.ndarray) -> 'SatelliteCatalog':
+        """Sub-catalog of the given rows or boolean mask"""
+        return SatelliteCatalog(self.elements[rows], self.names[rows])
+
+    def column(self, field: str) -> np.ndarray:
+        return self.elements[field]
+
+    def category_mask(self, *categories: str) -> np.ndarray:
+        codes = [CATEGORY_NAMES.index(category) for category in categories if category in CATEGORY_NAMES]
+        return np.isin(self.elements['category'], codes)
+
+    def assign_categories(self, members: Mapping[str, Iterable[int]]) -> None:
+        """Set the category of every row whose NORAD ID is listed under a category
+
+        Only for a freshly built catalog that nobody reads yet; a row listed
+        under several categories takes the last one.
+        """
+        for category, norad_ids in members.items():
+            if category in CATEGORY_NAMES:
+                self.elements['category'][self.rows(norad_ids)] = CATEGORY_NAMES.index(category)
+
+    def category_members(self, exclude: Iterable[str] = ()) -> Dict[str, List[int]]:
+        """NORAD IDs per category, the inverse of ``assign_categories``"""
+        codes = self.elements['category']
+        return {
+            CATEGORY_NAMES[code]: self.elements['norad_id'][codes == code].tolist()
+            for code in np.unique(codes) if CATEGORY_NAMES[code] not in exclude
+        }
+
+    def satrec(self, row: int) -> Satrec:
+        """SGP4 record of a row, initialized on first use"""
+        satrec = self._satrecs[row]
+        if satrec is None:
+            satrec = self._satrecs[row] = Satrec.twoline2rv(
+                self.elements['line1'][row].decode('ascii'), self.elements['line2'][row].decode('ascii')
+            )
+        return satrec
+
+    def to_records(self) -> Dict[int, Dict[str, Any]]:
+        """JSON-ready records keyed by NORAD ID"""
+        return {record.norad_id: record.to_dict() for record in self.records()}
+
+    @property
+    def nbytes(self) -> int:
+        return self.elements.nbytes + self.names.nbytes
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Initialized SGP4 records stay behind; they are rebuilt on demand
+        return {'elements': self.elements, 'names': self.names, 'rejected': self.rejected}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Unpickling creates the instance with object.__new__; set what __init__ would
+        self.elements = state['elements']
+        self.names = state['names']
+        self.rejected = state['rejected']
+        self._build_index()
+
+    def __repr__(self) -> str:
+        return f"SatelliteCatalog({len(self)} objects, {self.nbytes} bytes)"
@@ -0,0 +1,170 @@
+"""
+Catalog Indexes
+Sorted per-field indexes over one catalog version for range, category and name-prefix queries
+"""
+
+import functools
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from catalog import CATEGORY_NAMES, ELEMENT_FIELDS, OBJECT_TYPE_NAMES, SatelliteCatalog, SatelliteRecord
+from passes import EARTH_MU_KM3_S2
+from propagation import SECONDS_PER_DAY, WGS84_A_KM
+
+# Fields with a sorted index; epoch bounds are datetimes, the rest numbers
+RANGE_FIELDS = ('inclination', 'mean_motion', 'eccentricity', 'perigee_km', 'apogee_km', 'epoch')
+# Fields a listing can be projected onto
+PROJECTION_FIELDS = (*SatelliteRecord.KEYS, 'category', 'object_type')
+
+# Sorts after every character a name can hold, closing a prefix range
+_PREFIX_END = '\U0010ffff'
+
+
+def orbit_altitudes(mean_motion_rev_day: np.ndarray, eccentricity: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Perigee and apogee altitudes (km above the equatorial radius) from mean motion and eccentricity"""
+    mean_motion = np.asarray(mean_motion_rev_day, dtype=np.float64) * 2.0 * np.pi / SECONDS_PER_DAY
+    with np.errstate(divide='ignore'):
+        semi_major_axis = np.cbrt(EARTH_MU_KM3_S2 / mean_motion ** 2)
+    return (semi_major_axis * (1.0 - eccentricity) - WGS84_A_KM,
+            semi_major_axis * (1.0 + eccentricity) - WGS84_A_KM)
+
+
+def _within(values: np.ndarray, low: Any, high: Any) -> np.ndarray:
+    keep = np.ones(len(values), dtype=bool)
+    if low is not None:
+        keep &= values >= low
+    if high is not None:
+        keep &= values <= high
+    return keep
+
+
+def _rows_within(values: np.ndarray, low: Any, high: Any, rows: np.ndarray) -> np.ndarray:
+    """Which of ``rows`` have ``values`` within [low, high]"""
+    return _within(values[rows], low, high)
+
+
+def project(catalog: SatelliteCatalog, rows: np.ndarray,
+            fields: Sequence[str] = SatelliteRecord.KEYS) -> List[Dict[str, Any]]:
+    """Records of ``rows`` with only ``fields``, built a column at a time
+
+    With the default fields each record equals ``SatelliteRecord.to_dict()``.
+    """
+    elements = catalog.elements[rows]
+
+    def element_column(field: str) -> Callable[[], List[Any]]:
+        return lambda: elements[field].tolist()
+
+    columns: Dict[str, Callable[[], List[Any]]] = {
+        'norad_id': lambda: elements['norad_id'].tolist(),
+        'name': lambda: catalog.names[rows].tolist(),
+        'line1': lambda: np.char.decode(elements['line1'], 'ascii').tolist(),
+        'line2': lambda: np.char.decode(elements['line2'], 'ascii').tolist(),
+        'epoch': lambda: np.datetime_as_string(elements['epoch'], unit='us').tolist(),
+        'category': lambda: np.asarray(CATEGORY_NAMES)[elements['category']].tolist(),
+        'object_type': lambda: np.asarray(OBJECT_TYPE_NAMES)[elements['object_type']].tolist(),
+        **{field: element_column(field) for field in ELEMENT_FIELDS},
+    }
+    values = [columns[field]() for field in fields]
+    return [dict(zip(fields, record)) for record in zip(*values)]
+
+
+class CatalogIndex:
+    """Sorted copies of the filterable columns of one catalog
+
+    Each range field keeps its values in ascending order with the row of
+    each, so a range is two binary searches and a slice; names (upper-cased)
+    and category codes are sorted the same way for prefix and category
+    lookups. A query walks only the rows of its most selective condition and
+    checks the others on those rows, so it costs O(log n + k) rather than a
+    scan of the catalog. Built once per catalog version and never modified.
+    """
+
+    def __init__(self, catalog: SatelliteCatalog):
+        self.catalog = catalog
+        elements = catalog.elements
+        perigee, apogee = orbit_altitudes(elements['mean_motion'], elements['eccentricity'])
+        self._values: Dict[str, np.ndarray] = {
+            'inclination': elements['inclination'],
+            'mean_motion': elements['mean_motion'],
+            'eccentricity': elements['eccentricity'],
+            'perigee_km': perigee,
+            'apogee_km': apogee,
+            'epoch': elements['epoch'].astype(np.int64),
+            'name': np.char.upper(catalog.names),
+            'category': elements['category'],
+        }
+        self._order: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        for field, values in self._values.items():
+            self._order[field] = np.argsort(values, kind='stable')
+            self._sorted[field] = values[self._order[field]]
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    def _span(self, field: str, low: Any, high: Any,
+              high_side: Literal['left', 'right'] = 'right') -> Tuple[int, int]:
+        ordered = self._sorted[field]
+        start = 0 if low is None else int(np.searchsorted(ordered, low, 'left'))
+        stop = len(ordered) if high is None else int(np.searchsorted(ordered, high, high_side))
+        return start, max(start, stop)
+
+    def _span_rows(self, field: str, start: int, stop: int) -> np.ndarray:
+        """Rows of the ``start:stop`` slice of a field's sort order"""
+        return self._order[field][start:stop]
+
+    @staticmethod
+    def _epoch_key(value: Optional[datetime]) -> Optional[int]:
+        if value is None:
+            return None
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return int(np.datetime64(value, 'us').astype(np.int64))
+
+    def query(self, ranges: Optional[Mapping[str, Tuple[Any, Any]]] = None,
+              categories: Optional[Sequence[str]] = None, name_prefix: Optional[str] = None) -> np.ndarray:
+        """Rows, in catalog order, within every (low, high) range (inclusive, None for open),
+        in any of ``categories`` and with a name starting with ``name_prefix`` (case-insensitive)"""
+        # Each condition as the rows it selects, lazily, and a check of those rows against it
+        conditions: List[Tuple[int, Callable[[], np.ndarray], Callable[[np.ndarray], np.ndarray]]] = []
+
+        for field, (low, high) in (ranges or {}).items():
+            if field not in RANGE_FIELDS:
+                raise ValueError(f"{field} is not indexed")
+            if field == 'epoch':
+                low, high = self._epoch_key(low), self._epoch_key(high)
+            start, stop = self._span(field, low, high)
+            conditions.append((
+                stop - start,
+                functools.partial(self._span_rows, field, start, stop),
+                functools.partial(_rows_within, self._values[field], low, high),
+            ))
+
+        if categories is not None:
+            codes = [CATEGORY_NAMES.index(category) for category in categories if category in CATEGORY_NAMES]
+            spans = [self._span('category', code, code) for code in codes]
+            conditions.append((
+                sum(stop - start for start, stop in spans),
+                lambda: np.concatenate([self._order['category'][start:stop] for start, stop in spans]
+                                       or [np.zeros(0, dtype=np.int64)]),
+                lambda rows: np.isin(self._values['category'][rows], codes),
+            ))
+
+        if name_prefix:
+            prefix = name_prefix.upper()
+            start, stop = self._span('name', prefix, prefix + _PREFIX_END, 'left')
+            conditions.append((
+                stop - start,
+                functools.partial(self._span_rows, 'name', start, stop),
+                lambda rows: np.char.startswith(self._values['name'][rows], prefix),
+            ))
+
+        if not conditions:
+            return np.arange(len(self.catalog))
+        conditions.sort(key=lambda condition: condition[0])
+        rows = np.asarray(conditions[0][1](), dtype=np.int64)
+        for _, _, check in conditions[1:]:
+            rows = rows[check(rows)]
+        return np.sort(rows)
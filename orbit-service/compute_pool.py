@@ -0,0 +1,243 @@
+"""
+Compute Pool
+Bounded process pool for CPU-bound request work, with per-endpoint concurrency limits and load shedding
+"""
+
+import functools
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class ComputePoolBusy(Exception):
+    """Raised instead of queueing when the pool or an endpoint's share of it is full"""
+
+    def __init__(self, endpoint: str, retry_after: int):
+        super().__init__(f"Compute pool is busy; {endpoint} requests are being shed")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+def parse_limits(text: str) -> Dict[str, int]:
+    """Per-endpoint limits from ``"passes=2,conjunctions=1"``"""
+    limits = {}
+    for item in text.split(','):
+        if '=' in item:
+            endpoint, limit = item.split('=', 1)
+            limits[endpoint.strip()] = int(limit)
+    return limits
+
+
+def _gevent_hub() -> Optional[Any]:
+    """This thread's gevent hub when gevent is loaded (as under the gevent worker), else None"""
+    gevent = sys.modules.get('gevent')
+    return gevent.get_hub() if gevent is not None else None
+
+
+def _run_and_report(reporter: Callable[[], Dict[str, Any]], fn: Callable[..., Any],
+                    *args: Any) -> Tuple[int, Any, Dict[str, Any]]:
+    """Runs in a pool process: the task's result with that process's pid and report"""
+    result = fn(*args)
+    return os.getpid(), result, reporter()
+
+
+class ComputePool:
+    """Run CPU-bound tasks in worker processes so they never block the serving event loop
+
+    At most ``workers`` tasks run at once and ``queue_size`` more may wait;
+    each endpoint may also hold no more than its limit of those slots. A
+    task that does not fit is rejected at once with ``ComputePoolBusy``
+    rather than queued, so cheap requests are never stuck behind heavy ones.
+    Tasks and their arguments must be picklable. With ``workers=0`` tasks
+    run in the calling thread under the same admission limits.
+
+    The executor is created on first use in each process, so a pool built
+    at import in a preloaded master is never shared with forked workers.
+
+    State the tasks change lives in the pool processes, out of sight of the
+    serving process. ``reporter``, if given, is called in a pool process
+    after each task it completes and the latest report of every live pool
+    process is kept for ``worker_reports()``.
+    """
+
+    def __init__(self, workers: int, queue_size: int, limits: Optional[Mapping[str, int]] = None,
+                 start_method: str = 'spawn', initializer: Optional[Callable[[], None]] = None,
+                 reporter: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.workers = max(workers, 0)
+        self.capacity = max(self.workers, 1) + max(queue_size, 0)
+        self.limits = dict(limits or {})
+        self.start_method = start_method
+        self.initializer = initializer
+        self.reporter = reporter
+        self._executor: Optional[Executor] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._active: Dict[str, int] = {}
+        # Smoothed task duration per endpoint, for Retry-After
+        self._durations: Dict[str, float] = {}
+        self.completed = 0
+        self.failed = 0
+        self.rejected: Dict[str, int] = {}
+        # Latest report per pool process pid
+        self._reports: Dict[int, Dict[str, Any]] = {}
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None or self._pid != os.getpid():
+            self._reports = {}
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=self.initializer,
+            )
+            self._pid = os.getpid()
+        return self._executor
+
+    def _retry_after(self, endpoint: str) -> int:
+        """Seconds until a slot is likely free: the queue ahead drained at the endpoint's task duration"""
+        duration = self._durations.get(endpoint, 1.0)
+        return max(1, math.ceil(duration * self._in_flight / max(self.workers, 1)))
+
+    def _admit(self, endpoint: str) -> None:
+        with self._lock:
+            limit = self.limits.get(endpoint, self.capacity)
+            if self._in_flight >= self.capacity or self._active.get(endpoint, 0) >= limit:
+                self.rejected[endpoint] = self.rejected.get(endpoint, 0) + 1
+                raise ComputePoolBusy(endpoint, self._retry_after(endpoint))
+            self._in_flight += 1
+            self._active[endpoint] = self._active.get(endpoint, 0) + 1
+
+    def _finish(self, endpoint: str, seconds: Optional[float], failed: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._active[endpoint] -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            if seconds is not None:
+                previous = self._durations.get(endpoint, seconds)
+                self._durations[endpoint] = 0.8 * previous + 0.2 * seconds
+
+    def _discard_broken(self, executor: Optional[Executor]) -> None:
+        """Drop an executor whose worker process died; the next task starts a fresh one"""
+        with self._lock:
+            if executor is not None and self._executor is executor:
+                logger.error("Compute pool worker died, restarting the pool")
+                self._executor = None
+                self._reports = {}
+
+    def _done(self, endpoint: str, started: float, executor: Optional[Executor], future: Future) -> None:
+        error = None if future.cancelled() else future.exception()
+        if isinstance(error, BrokenProcessPool):
+            self._discard_broken(executor)
+        self._finish(endpoint, time.monotonic() - started, future.cancelled() or error is not None)
+
+    def _unwrap(self, executor: Executor, reported: Future, future: Future) -> None:
+        """Complete ``future`` with the task's own result, keeping the report that came with it"""
+        if reported.cancelled():
+            future.cancel()
+            return
+        if not future.set_running_or_notify_cancel():
+            return
+        error = reported.exception()
+        if error is not None:
+            future.set_exception(error)
+            return
+        pid, result, report = reported.result()
+        with self._lock:
+            if self._executor is executor:
+                self._reports[pid] = report
+        future.set_result(result)
+
+    def submit(self, endpoint: str, fn: Callable[..., Any], *args: Any) -> Future:
+        """Start ``fn(*args)`` in the pool, or raise ``ComputePoolBusy`` if there is no room for it"""
+        self._admit(endpoint)
+        started = time.monotonic()
+        executor: Optional[Executor] = None
+        future: Future
+        try:
+            if self.workers:
+                with self._lock:
+                    executor = self._get_executor()
+                if self.reporter is None:
+                    future = executor.submit(fn, *args)
+                else:
+                    reported = executor.submit(_run_and_report, self.reporter, fn, *args)
+                    future = Future()
+                    reported.add_done_callback(functools.partial(self._unwrap, executor, future=future))
+            else:
+                future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._discard_broken(executor)
+            self._finish(endpoint, None, True)
+            raise
+        future.add_done_callback(functools.partial(self._done, endpoint, started, executor))
+        return future
+
+    def start(self) -> None:
+        """Start the worker processes now instead of on the first request"""
+        if not self.workers:
+            return
+        with self._lock:
+            executor = self._get_executor()
+        for future in [executor.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+
+    def run(self, endpoint: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """``fn(*args)`` computed in the pool; the caller waits for the result
+
+        Under gevent the blocking wait is handed to a native thread of the
+        hub's thread pool, so only the calling greenlet waits and the event
+        loop keeps serving, whether or not the standard library was
+        monkey-patched before this module was imported.
+        """
+        future = self.submit(endpoint, fn, *args)
+        hub = _gevent_hub()
+        if hub is None or future.done():
+            return future.result()
+        threadpool = hub.threadpool
+        if threadpool.maxsize < self.capacity:
+            threadpool.maxsize = self.capacity
+        return threadpool.spawn(future.result).get()
+
+    def worker_reports(self) -> List[Dict[str, Any]]:
+        """The latest report of each live pool process (none when tasks run inline)"""
+        with self._lock:
+            return list(self._reports.values())
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._reports = {}
+        if executor is not None and self._pid == os.getpid():
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'capacity': self.capacity,
+                'in_flight': self._in_flight,
+                'active': {endpoint: count for endpoint, count in self._active.items() if count},
+                'limits': dict(self.limits),
+                'completed': self.completed,
+                'failed': self.failed,
+                'rejected': dict(self.rejected),
+                'mean_task_seconds': {endpoint: round(seconds, 3) for endpoint, seconds in self._durations.items()},
+            }
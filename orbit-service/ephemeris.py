@@ -0,0 +1,270 @@
+"""
+Chebyshev Ephemeris Tables
+Piecewise Chebyshev fits of SGP4 positions over a rolling window, evaluated without propagating
+"""
+
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+
+from propagation import SECONDS_PER_DAY, UNIX_EPOCH_JD, julian_dates, propagate_catalog, state_fields
+
+# Satellites per SatrecArray call while fitting and per gather while evaluating,
+# bounding the temporary arrays to tens of MB for a full catalog
+FIT_BATCH_SIZE = 500
+EVALUATE_BATCH_SIZE = 2000
+
+
+def _unix_seconds(timestamps: Sequence[datetime]) -> np.ndarray:
+    return np.array([
+        (t if t.tzinfo else t.replace(tzinfo=timezone.utc)).timestamp() for t in timestamps
+    ], dtype=np.float64)
+
+
+def _satrec_epochs(satrecs: Sequence[Satrec]) -> np.ndarray:
+    """TLE epoch of every record as a Julian date, identifying the element set a fit belongs to"""
+    return np.array([satrec.jdsatepoch + satrec.jdsatepochF for satrec in satrecs], dtype=np.float64)
+
+
+def chebyshev_basis(x: np.ndarray, n_terms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """T_k(x) and dT_k/dx for k < n_terms, each of shape (len(x), n_terms)"""
+    x = np.asarray(x, dtype=np.float64)
+    values = np.empty((len(x), n_terms))
+    slopes = np.empty((len(x), n_terms))
+    values[:, 0] = 1.0
+    slopes[:, 0] = 0.0
+    if n_terms > 1:
+        values[:, 1] = x
+        slopes[:, 1] = 1.0
+    for k in range(2, n_terms):
+        values[:, k] = 2.0 * x * values[:, k - 1] - values[:, k - 2]
+        slopes[:, k] = 2.0 * values[:, k - 1] + 2.0 * x * slopes[:, k - 1] - slopes[:, k - 2]
+    return values, slopes
+
+
+def _fit_segments(satrecs: Sequence[Satrec], segments: np.ndarray, segment_seconds: float,
+                  n_terms: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Fit TEME positions of every record over the given segments
+
+    Each segment is interpolated at its ``n_terms`` Chebyshev nodes and then
+    checked against SGP4 at the extrema between them, where interpolation
+    error peaks. Returns float32 coefficients of shape
+    (n_satellites, n_segments, 3, n_terms), NaN for segments in which SGP4
+    failed, and the largest check error of every segment in km.
+    """
+    nodes = np.cos(np.pi * (np.arange(n_terms) + 0.5) / n_terms)
+    checks = np.cos(np.pi * np.arange(n_terms + 1) / n_terms)
+    samples = np.concatenate((nodes, checks))
+
+    # Discrete orthogonality of T_k over the nodes turns the fit into one matrix product
+    fit_matrix = (2.0 / n_terms) * chebyshev_basis(nodes, n_terms)[0].T
+    fit_matrix[0] *= 0.5
+    check_basis = chebyshev_basis(checks, n_terms)[0]
+
+    days = ((segments[:, None] + (samples + 1.0) / 2.0) * segment_seconds).ravel() / SECONDS_PER_DAY
+    jd = UNIX_EPOCH_JD + np.floor(days)
+    fr = days - np.floor(days)
+
+    coefficients = np.empty((len(satrecs), len(segments), 3, n_terms), dtype=np.float32)
+    segment_error = np.zeros((len(satrecs), len(segments)), dtype=np.float32)
+    for start in range(0, len(satrecs), FIT_BATCH_SIZE):
+        batch = list(satrecs[start:start + FIT_BATCH_SIZE])
+        error, r_teme, _ = SatrecArray(batch).sgp4(jd, fr)
+        r_teme = r_teme.reshape(len(batch), len(segments), len(samples), 3)
+        failed = (error.reshape(len(batch), len(segments), len(samples)) != 0).any(axis=2)
+
+        fitted = np.einsum('bsjc,kj->bsck', r_teme[:, :, :n_terms], fit_matrix).astype(np.float32)
+        fitted[failed] = np.nan
+        # Check the stored float32 coefficients, not the float64 fit
+        check = np.einsum('bsck,xk->bsxc', fitted.astype(np.float64), check_basis)
+        deviation = np.linalg.norm(check - r_teme[:, :, n_terms:], axis=-1).max(axis=2)
+
+        coefficients[start:start + len(batch)] = fitted
+        segment_error[start:start + len(batch)] = np.where(failed, 0.0, deviation)
+        # A full catalog takes seconds; yield between batches so gevent workers keep serving
+        time.sleep(0)
+    return coefficients, segment_error
+
+
+class ChebyshevEphemeris:
+    """Per-satellite Chebyshev tables of TEME position over a window of fixed segments
+
+    Segments are aligned to multiples of ``segment_seconds`` since the Unix
+    epoch, so a window that rolls forward keeps every segment it already
+    fitted and only fits the new tail. A satellite's fit is tied to its TLE
+    epoch: a new element set is refitted, an unchanged one is reused.
+    Satellites whose fit misses ``tolerance_km`` anywhere in the window are
+    left to SGP4.
+
+    A lookup is a segment index, the basis at one point and a dot product
+    per axis; velocity is the derivative of the same series.
+    """
+
+    def __init__(self, norad_ids: np.ndarray, epochs: np.ndarray, first_segment: int,
+                 segment_seconds: float, coefficients: np.ndarray, segment_error_km: np.ndarray,
+                 tolerance_km: float):
+        self.norad_ids = norad_ids
+        self.epochs = epochs
+        self.first_segment = first_segment
+        self.segment_seconds = segment_seconds
+        self.coefficients = coefficients
+        self.segment_error_km = segment_error_km
+        self.max_error_km = segment_error_km.max(axis=1, initial=0.0)
+        self.tolerance_km = tolerance_km
+        self._order = np.argsort(norad_ids, kind='stable')
+        self._sorted_ids = norad_ids[self._order]
+
+    @property
+    def n_segments(self) -> int:
+        return self.coefficients.shape[1]
+
+    @property
+    def n_terms(self) -> int:
+        return self.coefficients.shape[3]
+
+    @property
+    def start(self) -> datetime:
+        return datetime.fromtimestamp(self.first_segment * self.segment_seconds, timezone.utc)
+
+    @property
+    def end(self) -> datetime:
+        return datetime.fromtimestamp((self.first_segment + self.n_segments) * self.segment_seconds, timezone.utc)
+
+    @property
+    def nbytes(self) -> int:
+        return self.coefficients.nbytes + self.segment_error_km.nbytes
+
+    @classmethod
+    def build(cls, norad_ids: Sequence[int], satrecs: Sequence[Satrec], start: datetime,
+              window_hours: float, segment_minutes: float, degree: int, tolerance_km: float,
+              previous: Optional['ChebyshevEphemeris'] = None) -> 'ChebyshevEphemeris':
+        """Fit tables for a window starting at the segment containing ``start``
+
+        With ``previous`` (the table this one replaces) satellites whose TLE
+        epoch is unchanged keep the segments both windows share. If nothing
+        changed at all, ``previous`` itself is returned.
+        """
+        segment_seconds = segment_minutes * 60.0
+        first_segment = int(math.floor(_unix_seconds([start])[0] / segment_seconds))
+        n_segments = int(math.ceil(window_hours * 3600.0 / segment_seconds))
+        n_terms = degree + 1
+        ids = np.asarray(norad_ids, dtype=np.int64)
+        epochs = _satrec_epochs(satrecs)
+
+        reused = np.full(len(ids), -1)
+        shared = 0
+        if (previous is not None and previous.segment_seconds == segment_seconds
+                and previous.n_terms == n_terms and previous.tolerance_km == tolerance_km):
+            if (previous.first_segment == first_segment and previous.n_segments == n_segments
+                    and np.array_equal(previous.norad_ids, ids) and np.array_equal(previous.epochs, epochs)):
+                return previous
+            offset = first_segment - previous.first_segment
+            if 0 <= offset < previous.n_segments:
+                shared = min(previous.n_segments - offset, n_segments)
+                reused = previous._rows(ids, epochs)
+
+        coefficients = np.empty((len(ids), n_segments, 3, n_terms), dtype=np.float32)
+        segment_error = np.zeros((len(ids), n_segments), dtype=np.float32)
+        segments = np.arange(first_segment, first_segment + n_segments)
+
+        kept = np.flatnonzero(reused >= 0)
+        # Rows are only reused from a previous table
+        if previous is not None and len(kept):
+            offset = first_segment - previous.first_segment
+            coefficients[kept, :shared] = previous.coefficients[reused[kept], offset:offset + shared]
+            segment_error[kept, :shared] = previous.segment_error_km[reused[kept], offset:offset + shared]
+            if shared < n_segments:
+                coefficients[kept, shared:], segment_error[kept, shared:] = _fit_segments(
+                    [satrecs[row] for row in kept], segments[shared:], segment_seconds, n_terms
+                )
+
+        fresh = np.flatnonzero(reused < 0)
+        if len(fresh):
+            coefficients[fresh], segment_error[fresh] = _fit_segments(
+                [satrecs[row] for row in fresh], segments, segment_seconds, n_terms
+            )
+
+        return cls(ids, epochs, first_segment, segment_seconds, coefficients, segment_error, tolerance_km)
+
+    def _rows(self, norad_ids: np.ndarray, epochs: np.ndarray) -> np.ndarray:
+        """Table row of each (NORAD ID, TLE epoch), -1 where there is none"""
+        if not len(self._sorted_ids):
+            return np.full(len(norad_ids), -1)
+        positions = np.minimum(np.searchsorted(self._sorted_ids, norad_ids), len(self._sorted_ids) - 1)
+        rows = self._order[positions]
+        found = (self._sorted_ids[positions] == norad_ids) & (self.epochs[rows] == epochs)
+        return np.where(found, rows, -1)
+
+    def lookup(self, norad_ids: Sequence[int], satrecs: Sequence[Satrec]) -> np.ndarray:
+        """Rows to evaluate for these records, -1 for those that must go through SGP4"""
+        rows = self._rows(np.asarray(norad_ids, dtype=np.int64), _satrec_epochs(satrecs))
+        within = np.zeros(len(rows), dtype=bool)
+        within[rows >= 0] = self.max_error_km[rows[rows >= 0]] <= self.tolerance_km
+        return np.where(within, rows, -1)
+
+    def covers(self, timestamps: Sequence[datetime]) -> bool:
+        seconds = _unix_seconds(timestamps)
+        return bool(len(seconds)) and bool(np.all(
+            (seconds >= self.first_segment * self.segment_seconds)
+            & (seconds < (self.first_segment + self.n_segments) * self.segment_seconds)
+        ))
+
+    def evaluate(self, rows: np.ndarray, timestamps: Sequence[datetime]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """TEME position and velocity of table rows at timestamps inside the window
+
+        Returns ``(error, r, v)`` shaped like ``SatrecArray.sgp4`` output, with
+        error 1 where SGP4 failed while the segment was fitted.
+        """
+        position = _unix_seconds(timestamps) / self.segment_seconds
+        segment = np.floor(position)
+        index = segment.astype(np.int64) - self.first_segment
+        values, slopes = chebyshev_basis(2.0 * (position - segment) - 1.0, self.n_terms)
+        # d/dt = d/dtau * 2 / segment length
+        slopes *= 2.0 / self.segment_seconds
+
+        r = np.empty((len(rows), len(index), 3))
+        v = np.empty((len(rows), len(index), 3))
+        for start in range(0, len(rows), EVALUATE_BATCH_SIZE):
+            chunk = slice(start, start + EVALUATE_BATCH_SIZE)
+            coefficients = self.coefficients[rows[chunk, None], index[None, :]]
+            r[chunk] = np.einsum('btck,tk->btc', coefficients, values)
+            v[chunk] = np.einsum('btck,tk->btc', coefficients, slopes)
+        error = np.isnan(r[..., 0]).astype(np.uint8)
+        return error, r, v
+
+    def propagate(self, satrecs: Sequence[Satrec], rows: np.ndarray,
+                  timestamps: Sequence[datetime]) -> Dict[str, np.ndarray]:
+        """``propagate_catalog`` equivalent that reads table rows and runs SGP4 only where ``rows`` is -1"""
+        if not len(satrecs):
+            return propagate_catalog(satrecs, timestamps)
+        jd, fr = julian_dates(timestamps)
+        error = np.zeros((len(satrecs), len(jd)), dtype=np.uint8)
+        r_teme = np.empty((len(satrecs), len(jd), 3))
+        v_teme = np.empty((len(satrecs), len(jd), 3))
+
+        tabulated = np.flatnonzero(rows >= 0)
+        if len(tabulated):
+            error[tabulated], r_teme[tabulated], v_teme[tabulated] = self.evaluate(rows[tabulated], timestamps)
+        others = np.flatnonzero(rows < 0)
+        if len(others):
+            error[others], r_teme[others], v_teme[others] = SatrecArray(
+                [satrecs[i] for i in others]
+            ).sgp4(jd, fr)
+        return state_fields(error, r_teme, v_teme, jd, fr)
+
+    def stats(self) -> Dict[str, Any]:
+        """Coverage and size figures for health reporting"""
+        return {
+            'satellites': len(self.norad_ids),
+            'sgp4_fallbacks': int(np.sum(self.max_error_km > self.tolerance_km)),
+            'window_start': self.start.isoformat(),
+            'window_end': self.end.isoformat(),
+            'segments': self.n_segments,
+            'degree': self.n_terms - 1,
+            'max_error_km': float(self.max_error_km.max(initial=0.0)),
+            'nbytes': self.nbytes,
+        }
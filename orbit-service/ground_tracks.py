@@ -0,0 +1,110 @@
+"""
+Ground Tracks
+Antimeridian splitting and pixel-tolerance simplification of sub-satellite tracks
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Equirectangular maps span 360 degrees of longitude across their width
+MAP_SPAN_DEG = 360.0
+
+
+def pixel_tolerance_deg(tolerance_px: float, map_width_px: int) -> float:
+    """Convert a tolerance in screen pixels to degrees on an equirectangular map"""
+    return tolerance_px * MAP_SPAN_DEG / map_width_px
+
+
+def _antimeridian_crossing(offsets: np.ndarray, latitude: np.ndarray, longitude: np.ndarray,
+                           i: int) -> Tuple[float, float, float]:
+    """Time, latitude and edge longitude where the track leaves the map between samples i and i + 1"""
+    edge = 180.0 if longitude[i] > 0 else -180.0
+    unwrapped = longitude[i + 1] + 2.0 * edge
+    fraction = (edge - longitude[i]) / (unwrapped - longitude[i])
+    return (
+        offsets[i] + fraction * (offsets[i + 1] - offsets[i]),
+        latitude[i] + fraction * (latitude[i + 1] - latitude[i]),
+        edge,
+    )
+
+
+def split_track(offsets: np.ndarray, latitude: np.ndarray,
+                longitude: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Break a track into pieces that neither cross the antimeridian nor span a failed sample
+
+    A piece that ends at a crossing gets an interpolated point on the map
+    edge, and the next piece starts from the same point on the opposite
+    edge, so both polylines reach the border.
+    """
+    valid = np.isfinite(latitude) & np.isfinite(longitude)
+    both_valid = valid[:-1] & valid[1:]
+    with np.errstate(invalid='ignore'):
+        crossing = both_valid & (np.abs(np.diff(longitude)) > 180.0)
+    cuts = np.flatnonzero(crossing | ~both_valid) + 1
+
+    pieces = []
+    for indices in np.split(np.arange(len(offsets)), cuts):
+        indices = indices[valid[indices]]
+        if not len(indices):
+            continue
+        piece = [offsets[indices], latitude[indices], longitude[indices]]
+        first, last = indices[0], indices[-1]
+        if first > 0 and crossing[first - 1]:
+            when, lat, edge = _antimeridian_crossing(offsets, latitude, longitude, first - 1)
+            piece = [np.insert(values, 0, value) for values, value in zip(piece, (when, lat, -edge))]
+        if last < len(offsets) - 1 and crossing[last]:
+            when, lat, edge = _antimeridian_crossing(offsets, latitude, longitude, last)
+            piece = [np.append(values, value) for values, value in zip(piece, (when, lat, edge))]
+        pieces.append(tuple(piece))
+    return pieces
+
+
+def simplify(longitude: np.ndarray, latitude: np.ndarray, tolerance_deg: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker mask of the points to keep for a polyline in map degrees"""
+    keep = np.zeros(len(longitude), dtype=bool)
+    if not len(longitude):
+        return keep
+    keep[[0, -1]] = True
+
+    spans = [(0, len(longitude) - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        inner = np.arange(first + 1, last)
+        dx = longitude[last] - longitude[first]
+        dy = latitude[last] - latitude[first]
+        length = np.hypot(dx, dy)
+        if length == 0.0:
+            distance = np.hypot(longitude[inner] - longitude[first], latitude[inner] - latitude[first])
+        else:
+            distance = np.abs(dx * (latitude[first] - latitude[inner])
+                              - dy * (longitude[first] - longitude[inner])) / length
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance_deg:
+            split = int(inner[farthest])
+            keep[split] = True
+            spans.extend(((first, split), (split, last)))
+    return keep
+
+
+def compact_track(offsets: np.ndarray, latitude: np.ndarray, longitude: np.ndarray,
+                  tolerance_deg: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Split (and optionally simplify) a track into JSON-ready segments
+
+    Each segment holds ``[longitude, latitude]`` pairs in GeoJSON order and
+    the seconds from the track start of every kept point.
+    """
+    segments = []
+    for piece_offsets, piece_latitude, piece_longitude in split_track(offsets, latitude, longitude):
+        if tolerance_deg is not None:
+            keep = simplify(piece_longitude, piece_latitude, tolerance_deg)
+            piece_offsets, piece_latitude, piece_longitude = (
+                piece_offsets[keep], piece_latitude[keep], piece_longitude[keep]
+            )
+        segments.append({
+            'offsets': np.round(piece_offsets, 3).tolist(),
+            'coordinates': np.round(np.column_stack((piece_longitude, piece_latitude)), 4).tolist(),
+        })
+    return segments
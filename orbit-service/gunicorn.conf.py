@@ -0,0 +1,71 @@
+"""
+Gunicorn Configuration
+Worker settings, optional preloading and Prometheus multi-process bookkeeping for the orbit-service workers
+"""
+
+import gc
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+
+# Import and warm the app once in the master so every worker forks with the
+# timescale, propagators and catalogs already loaded
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
+# Aggregate the workers' metrics in the API's own directory under METRICS_ROOT;
+# set here, before the app (and prometheus_client) is imported
+if os.environ.get('METRICS_ROOT') and not os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = os.path.join(os.environ['METRICS_ROOT'], 'api')
+
+# Empty the directory when the master reads this file, which is before a
+# preloaded app writes its files there. A reload (SIGHUP) re-reads the file
+# in the same master while workers still write, so only the first read clears.
+_metrics_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if _metrics_dir and os.environ.get('ORBIT_METRICS_DIR_OWNER') != str(os.getpid()):
+    shutil.rmtree(_metrics_dir, ignore_errors=True)
+    os.makedirs(_metrics_dir, exist_ok=True)
+    os.environ['ORBIT_METRICS_DIR_OWNER'] = str(os.getpid())
+
+if preload_app and worker_class == 'gevent':
+    # Locks and events the app creates at import must be gevent-aware before workers fork
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def when_ready(server):
+    """Warm the preloaded app before the first worker is forked"""
+    if preload_app:
+        from app import warm_start
+        warm_start()
+        # Keep what the master loaded out of collections so workers do not copy its pages
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    """Start the worker's compute pool before it accepts requests; without preloading it also warms itself
+
+    The warm start (catalog download, ephemeris fit, first snapshot) can take
+    longer than ``timeout``, so it runs in the background once the worker is
+    serving and /health reports its progress.
+    """
+    from app import compute_pool, start_warm_start
+    compute_pool.start()
+    if not preload_app:
+        start_warm_start()
+
+
+def worker_exit(server, worker):
+    """Stop the worker's compute pool processes with it"""
+    from app import compute_pool
+    compute_pool.shutdown()
+
+
+def child_exit(server, worker):
+    """Drop the live-gauge files of a worker that has exited"""
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,124 @@
+"""
+Prometheus Metrics
+Histograms and counters shared by the API and the analysis workers, with multi-process export
+"""
+
+import os
+import socket
+import sys
+from typing import Optional, Tuple
+
+
+def _worker_multiprocess_dir() -> Tuple[Optional[str], bool]:
+    """The multi-process directory, and whether this process picked it itself
+
+    gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR for the API before the app
+    is imported. A worker script started on its own (``python threat_worker.py``)
+    gets ``$METRICS_ROOT/<script name>-<host>-<pid>`` instead, so it never
+    shares files with the API or with a replica on the same volume; its
+    subprocesses inherit the variable and keep the directory. Nothing is
+    deleted here: the script's ``main()`` calls ``reset_multiprocess_dir()``.
+    """
+    directory = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    root = os.getenv('METRICS_ROOT')
+    if directory or not root:
+        return directory, False
+    name = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv and sys.argv[0] else 'python'))[0]
+    directory = os.path.join(root, f"{name or 'python'}-{socket.gethostname()}-{os.getpid()}")
+    os.makedirs(directory, exist_ok=True)
+    os.environ['PROMETHEUS_MULTIPROC_DIR'] = directory
+    return directory, True
+
+
+# Must be settled before prometheus_client is imported: samples of every
+# gunicorn worker or analysis subprocess are then aggregated through it
+MULTIPROCESS_DIR, _OWNS_MULTIPROCESS_DIR = _worker_multiprocess_dir()
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram,
+    generate_latest, multiprocess, push_to_gateway, start_http_server
+)
+
+# From sub-millisecond cache hits up to minute-long downloads and batch jobs
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+TLE_FETCHES = Counter(
+    'orbit_tle_fetch_total', 'TLE catalog lookups by where they were answered from', ['source', 'result']
+)
+TLE_FETCH_SECONDS = Histogram(
+    'orbit_tle_fetch_seconds', 'fetch_tle_data latency', ['source'], buckets=LATENCY_BUCKETS
+)
+TLE_DOWNLOAD_SECONDS = Histogram(
+    'orbit_tle_download_seconds', 'CelesTrak download latency', ['source'], buckets=LATENCY_BUCKETS
+)
+TLE_PARSE_SECONDS = Histogram(
+    'orbit_tle_parse_seconds', 'TLE listing parse time', ['source'], buckets=LATENCY_BUCKETS
+)
+PASS_CACHE_LOOKUPS = Counter(
+    'orbit_pass_cache_lookups_total', 'Pass prediction cache lookups by outcome (memory or redis hit, tail, miss)',
+    ['result']
+)
+COMPUTE_SECONDS = Histogram(
+    'orbit_compute_seconds', 'Latency of orbit computations', ['operation'], buckets=LATENCY_BUCKETS
+)
+PROPAGATED_STATES = Counter(
+    'orbit_propagated_states_total', 'Satellite states computed, one per satellite and timestamp',
+    ['component', 'method']
+)
+REDIS_COMMAND_SECONDS = Histogram(
+    'orbit_redis_command_seconds', 'Redis round-trip latency by command', ['command'], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'orbit_http_request_seconds', 'Request latency by endpoint', ['endpoint', 'method', 'status'],
+    buckets=LATENCY_BUCKETS
+)
+PAIR_ANALYSIS_SECONDS = Histogram(
+    'orbit_pair_analysis_seconds', 'Cost of one pairwise collision check', ['worker'], buckets=LATENCY_BUCKETS
+)
+
+
+def collector_registry() -> CollectorRegistry:
+    """Registry to export: every process's samples in multi-process mode, otherwise this process's"""
+    if not MULTIPROCESS_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Body and content type of a scrape"""
+    return generate_latest(collector_registry()), CONTENT_TYPE_LATEST
+
+
+def reset_multiprocess_dir() -> None:
+    """Drop samples an earlier run with the same host and pid left in this worker's directory
+
+    Called first thing in a worker script's ``main()``. Files of this process
+    (metrics used at import) are kept, and a directory this process did not
+    pick, such as the API's, is never touched.
+    """
+    if not _OWNS_MULTIPROCESS_DIR:
+        return
+    own = f"_{os.getpid()}.db"
+    for name in os.listdir(MULTIPROCESS_DIR):
+        if name.endswith('.db') and not name.endswith(own):
+            os.remove(os.path.join(MULTIPROCESS_DIR, name))
+
+
+def serve_worker_metrics() -> bool:
+    """Expose a long-running worker's metrics on METRICS_PORT, if set"""
+    port = os.getenv('METRICS_PORT')
+    if not port:
+        return False
+    start_http_server(int(port), registry=collector_registry())
+    return True
+
+
+def push_worker_metrics(job: str) -> bool:
+    """Push a finished batch job's metrics to PROMETHEUS_PUSHGATEWAY, if set"""
+    gateway = os.getenv('PROMETHEUS_PUSHGATEWAY')
+    if not gateway:
+        return False
+    push_to_gateway(gateway, job=job, registry=collector_registry())
+    return True
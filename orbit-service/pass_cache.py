@@ -0,0 +1,155 @@
+"""
+Pass Prediction Cache
+Two-level (in-process LRU, then Redis) cache of pass events per satellite, TLE epoch and observer cell
+"""
+
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+
+from metrics import PASS_CACHE_LOOKUPS
+
+logger = structlog.get_logger()
+
+# (event name, time) pairs as produced by the pass search
+PassEvents = List[Tuple[str, datetime]]
+
+
+class PassPredictionCache:
+    """Cache of pass events that extends cached windows instead of recomputing them
+
+    Entries are keyed by NORAD ID, TLE epoch, observer position rounded to
+    ``grid_deg`` and elevation mask, and remember the time span they cover.
+    A request inside that span is a hit and is served by trimming; a request
+    that starts inside it but ends later only computes the missing tail. A
+    new TLE epoch produces a new key, so stale predictions are never served.
+    """
+
+    def __init__(self, redis_client, maxsize: int, grid_deg: float, ttl_seconds: int):
+        self.redis_client = redis_client
+        self.maxsize = maxsize
+        self.grid_deg = grid_deg
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    def quantize(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """Snap an observer to the centre of its grid cell"""
+        def snap(value: float) -> float:
+            return round(round(value / self.grid_deg) * self.grid_deg, 6)
+        return snap(latitude), snap(longitude)
+
+    @staticmethod
+    def make_key(norad_id: int, epoch: str, latitude: float, longitude: float,
+                 min_elevation: float) -> str:
+        return f"passes:{norad_id}:{epoch.strip()}:{latitude}:{longitude}:{min_elevation}"
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if self.redis_client:
+            try:
+                cached = self.redis_client.get(key)
+            except Exception as e:
+                logger.warning(f"Pass cache read failed: {e}")
+                cached = None
+            if cached:
+                data = json.loads(cached)
+                entry = {
+                    'start': datetime.fromisoformat(data['start']),
+                    'end': datetime.fromisoformat(data['end']),
+                    'events': [(name, datetime.fromisoformat(when)) for name, when in data['events']],
+                    'from_redis': True
+                }
+                self._remember(key, entry)
+                return entry
+        return None
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        self._remember(key, entry)
+        if self.redis_client:
+            try:
+                self.redis_client.setex(key, self.ttl_seconds, json.dumps({
+                    'start': entry['start'].isoformat(),
+                    'end': entry['end'].isoformat(),
+                    'events': [(name, when.isoformat()) for name, when in entry['events']]
+                }))
+            except Exception as e:
+                logger.warning(f"Pass cache write failed: {e}")
+
+    def get_or_compute(self, key: str, start: datetime, end: datetime,
+                       compute: Callable[[datetime, datetime], PassEvents]) -> PassEvents:
+        """Return events in [start, end], computing only what the cache does not cover"""
+        entry = self._load(key)
+
+        if entry is not None and entry['start'] <= start and entry['end'] >= end:
+            with self._lock:
+                self.hits += 1
+                from_redis = entry.pop('from_redis', False)
+                if from_redis:
+                    self.redis_hits += 1
+            PASS_CACHE_LOOKUPS.labels('redis' if from_redis else 'memory').inc()
+        elif entry is not None and entry['start'] <= start <= entry['end']:
+            # Drop what has already passed and extend the tail
+            tail = [event for event in compute(entry['end'], end) if event[1] > entry['end']]
+            entry = {
+                'start': start,
+                'end': end,
+                'events': [event for event in entry['events'] if event[1] >= start] + tail
+            }
+            self._store(key, entry)
+            with self._lock:
+                self.partial_hits += 1
+            PASS_CACHE_LOOKUPS.labels('tail').inc()
+        else:
+            entry = {'start': start, 'end': end, 'events': compute(start, end)}
+            self._store(key, entry)
+            with self._lock:
+                self.misses += 1
+            PASS_CACHE_LOOKUPS.labels('miss').inc()
+
+        return [event for event in entry['events'] if start <= event[1] <= end]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for health and metrics reporting"""
+        with self._lock:
+            lookups = self.hits + self.partial_hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'redis_hits': self.redis_hits,
+                'partial_hits': self.partial_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'reuse_rate': (self.hits + self.partial_hits) / lookups if lookups else 0.0,
+            }
+
+    @staticmethod
+    def combine(stats: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+        """``stats()`` of several processes' caches summed into one"""
+        total = {key: sum(entry[key] for entry in stats)
+                 for key in ('size', 'maxsize', 'hits', 'redis_hits', 'partial_hits', 'misses')}
+        lookups = total['hits'] + total['partial_hits'] + total['misses']
+        total['hit_rate'] = total['hits'] / lookups if lookups else 0.0
+        total['reuse_rate'] = (total['hits'] + total['partial_hits']) / lookups if lookups else 0.0
+        return total
@@ -0,0 +1,227 @@
+"""
+Catalog Pass Prediction
+Rise/culmination/set search for many satellites over one observer on a shared time grid
+"""
+
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+
+from propagation import (
+    SECONDS_PER_DAY, geodetic_to_ecef, julian_dates, look_angles, teme_to_ecef
+)
+
+EARTH_MU_KM3_S2 = 398600.4418
+# Polar radius keeps the footprint estimate conservative
+EARTH_POLAR_RADIUS_KM = 6356.752
+# Geodetic vs geocentric latitude and observer height slack
+LATITUDE_MARGIN_DEG = 0.5
+# SGP4's deep-space threshold; these objects move slowly across the sky
+DEEP_SPACE_PERIOD_MIN = 225.0
+
+
+def can_rise(inclination_deg: np.ndarray, mean_motion_rev_day: np.ndarray,
+             eccentricity: np.ndarray, observer_lat_deg: float,
+             min_elevation_deg: float) -> np.ndarray:
+    """Mask of orbits that can ever climb above ``min_elevation_deg`` for this observer
+
+    The sub-satellite point never leaves the band |lat| <= inclination
+    (180 - inclination for retrograde orbits), and from apogee altitude the
+    satellite is above the mask within a ground-range angle of
+    arccos(Re cos(el) / r) - el. Observers outside that band plus footprint
+    can never see the object.
+    """
+    inclination = np.asarray(inclination_deg, dtype=np.float64)
+    mean_motion = np.asarray(mean_motion_rev_day, dtype=np.float64) * 2.0 * np.pi / SECONDS_PER_DAY
+    eccentricity = np.asarray(eccentricity, dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        semi_major_axis = np.cbrt(EARTH_MU_KM3_S2 / mean_motion ** 2)
+    apogee = semi_major_axis * (1.0 + eccentricity)
+    perigee = semi_major_axis * (1.0 - eccentricity)
+
+    elevation = np.radians(min_elevation_deg)
+    with np.errstate(invalid='ignore'):
+        footprint = np.degrees(
+            np.arccos(np.clip(EARTH_POLAR_RADIUS_KM * np.cos(elevation) / apogee, -1.0, 1.0)) - elevation
+        )
+    max_latitude = np.where(inclination <= 90.0, inclination, 180.0 - inclination)
+
+    return (
+        np.isfinite(semi_major_axis)
+        & (perigee > EARTH_POLAR_RADIUS_KM)
+        & (abs(observer_lat_deg) <= max_latitude + footprint + LATITUDE_MARGIN_DEG)
+    )
+
+
+class _ElevationFunction:
+    """Scalar look angles of one satellite, used for root refinement
+
+    Plain ``math`` on Python floats: refinement calls this tens of times per
+    pass, where NumPy's per-call overhead would dominate.
+    """
+
+    def __init__(self, satrec: Satrec, jd0: float, fr0: float, observer: Tuple[float, float, float]):
+        self.satrec = satrec
+        self.jd0 = jd0
+        self.fr0 = fr0
+        lat = math.radians(observer[0])
+        lon = math.radians(observer[1])
+        self.site = tuple(float(c) for c in geodetic_to_ecef(*observer))
+        self.sin_lat, self.cos_lat = math.sin(lat), math.cos(lat)
+        self.sin_lon, self.cos_lon = math.sin(lon), math.cos(lon)
+
+    def look(self, offset: float) -> Tuple[float, float]:
+        fraction = self.fr0 + offset / SECONDS_PER_DAY
+        error, r, _ = self.satrec.sgp4(self.jd0, fraction)
+        if error:
+            return 0.0, -90.0
+
+        # TEME -> Earth-fixed (same GMST model as gmst_radians)
+        tut1 = ((self.jd0 - 2451545.0) + fraction) / 36525.0
+        theta = math.radians((-6.2e-6 * tut1 ** 3 + 0.093104 * tut1 ** 2
+                              + (876600.0 * 3600.0 + 8640184.812866) * tut1 + 67310.54841) / 240.0)
+        cos_t, sin_t = math.cos(theta), math.sin(theta)
+        dx = cos_t * r[0] + sin_t * r[1] - self.site[0]
+        dy = -sin_t * r[0] + cos_t * r[1] - self.site[1]
+        dz = r[2] - self.site[2]
+
+        east = -self.sin_lon * dx + self.cos_lon * dy
+        north = -self.sin_lat * self.cos_lon * dx - self.sin_lat * self.sin_lon * dy + self.cos_lat * dz
+        up = self.cos_lat * self.cos_lon * dx + self.cos_lat * self.sin_lon * dy + self.sin_lat * dz
+        distance = math.sqrt(east * east + north * north + up * up)
+        azimuth = math.degrees(math.atan2(east, north)) % 360.0
+        return azimuth, math.degrees(math.asin(max(-1.0, min(1.0, up / distance))))
+
+    def elevation(self, offset: float) -> float:
+        return self.look(offset)[1]
+
+
+def _crossing(func: _ElevationFunction, lo: float, hi: float, min_elevation: float) -> float:
+    """Time at which elevation crosses the mask between two grid samples"""
+    from scipy.optimize import brentq  # SciPy is imported on first use to keep service startup fast
+    try:
+        return brentq(lambda t: func.elevation(t) - min_elevation, lo, hi, xtol=0.5)
+    except ValueError:
+        return (lo + hi) / 2.0
+
+
+def _parabola_vertex(t0: float, t1: float, t2: float, y0: float, y1: float, y2: float) -> float:
+    """Abscissa of the vertex of the parabola through three points, clamped to [t0, t2]"""
+    denom = (t0 - t1) * (t0 - t2) * (t1 - t2)
+    a = (t2 * (y1 - y0) + t1 * (y0 - y2) + t0 * (y2 - y1)) / denom
+    b = (t2 * t2 * (y0 - y1) + t1 * t1 * (y2 - y0) + t0 * t0 * (y1 - y2)) / denom
+    if a >= 0:
+        return t1
+    return min(max(-b / (2.0 * a), t0), t2)
+
+
+def _culmination(func: _ElevationFunction, offsets: np.ndarray, elevation: np.ndarray, peak: int) -> float:
+    """Refine the highest grid sample with two rounds of parabolic interpolation"""
+    if peak == 0 or peak == len(offsets) - 1:
+        return float(offsets[peak])
+    t = _parabola_vertex(offsets[peak - 1], offsets[peak], offsets[peak + 1],
+                         elevation[peak - 1], elevation[peak], elevation[peak + 1])
+    h = (offsets[peak + 1] - offsets[peak - 1]) / 16.0
+    return _parabola_vertex(t - h, t, t + h, func.elevation(t - h), func.elevation(t), func.elevation(t + h))
+
+
+def _passes_for_row(func: _ElevationFunction, offsets: np.ndarray, elevation: np.ndarray,
+                    min_elevation: float) -> List[Dict[str, Any]]:
+    """Assemble refined passes from one satellite's sampled elevation"""
+    above = elevation >= min_elevation
+    edges = np.diff(above.astype(np.int8))
+    starts = list(np.flatnonzero(edges == 1) + 1)
+    ends = list(np.flatnonzero(edges == -1))
+    if above[0]:
+        starts.insert(0, 0)
+    if above[-1]:
+        ends.append(len(above) - 1)
+
+    last = len(offsets) - 1
+    results = []
+    for first, final in zip(starts, ends):
+        rise = None if first == 0 else _crossing(func, offsets[first - 1], offsets[first], min_elevation)
+        set_ = None if final == last else _crossing(func, offsets[final], offsets[final + 1], min_elevation)
+
+        peak = first + int(np.argmax(elevation[first:final + 1]))
+        culmination = _culmination(func, offsets, elevation, peak)
+
+        culmination_azimuth, max_elevation = func.look(culmination)
+        results.append({
+            'rise_time': rise,
+            'rise_azimuth_deg': func.look(rise)[0] if rise is not None else None,
+            'culmination_time': float(culmination),
+            'culmination_azimuth_deg': culmination_azimuth,
+            'max_elevation_deg': max_elevation,
+            'set_time': set_,
+            'set_azimuth_deg': func.look(set_)[0] if set_ is not None else None,
+        })
+    return results
+
+
+def _find_passes_on_grid(satrecs: Sequence[Satrec], observer: Tuple[float, float, float],
+                         start: datetime, hours: float, min_elevation_deg: float,
+                         step_seconds: float, batch_size: int) -> List[List[Dict[str, Any]]]:
+    """Sample one group of satellites on a shared grid and refine its crossings"""
+    offsets = np.arange(0.0, hours * 3600.0 + step_seconds, step_seconds)
+    offsets[-1] = min(offsets[-1], hours * 3600.0)
+    jd0, fr0 = julian_dates([start])
+    jd = np.full(len(offsets), jd0[0])
+    fr = fr0[0] + offsets / SECONDS_PER_DAY
+
+    def as_time(offset: Optional[float]) -> Optional[datetime]:
+        return None if offset is None else start + timedelta(seconds=float(offset))
+
+    results: List[List[Dict[str, Any]]] = []
+    for batch_start in range(0, len(satrecs), batch_size):
+        batch = list(satrecs[batch_start:batch_start + batch_size])
+        error, r_teme, _ = SatrecArray(batch).sgp4(jd, fr)
+        _, elevation, _ = look_angles(teme_to_ecef(r_teme, jd, fr), *observer)
+        elevation[error != 0] = -90.0
+
+        for row, satrec in enumerate(batch):
+            if not np.any(elevation[row] >= min_elevation_deg):
+                results.append([])
+                continue
+            func = _ElevationFunction(satrec, float(jd0[0]), float(fr0[0]), observer)
+            passes = _passes_for_row(func, offsets, elevation[row], min_elevation_deg)
+            for item in passes:
+                for key in ('rise_time', 'culmination_time', 'set_time'):
+                    item[key] = as_time(item[key])
+            results.append(passes)
+
+    return results
+
+
+def find_passes(satrecs: Sequence[Satrec], observer_lat: float, observer_lon: float,
+                observer_alt_km: float, start: datetime, hours: float,
+                min_elevation_deg: float = 10.0, step_seconds: float = 60.0,
+                batch_size: int = 1000) -> List[List[Dict[str, Any]]]:
+    """Predict passes for every record over one observer
+
+    Elevation is evaluated for a batch of satellites on a shared grid with
+    one SatrecArray call; only the grid intervals where a satellite crosses
+    the mask, and the sample nearest each peak, are refined individually.
+    Deep-space objects (period of 225 minutes or more) pass slowly and are
+    sampled ten times more coarsely. Passes shorter than the grid step can
+    fall between samples. Returns one list of passes per input record, with
+    times as datetimes (``None`` for a rise or set outside the window).
+    """
+    observer = (observer_lat, observer_lon, observer_alt_km)
+    deep_space = [2.0 * np.pi / satrec.no_kozai >= DEEP_SPACE_PERIOD_MIN for satrec in satrecs]
+
+    results: List[List[Dict[str, Any]]] = [[] for _ in satrecs]
+    for is_deep, step in ((False, step_seconds), (True, step_seconds * 10.0)):
+        rows = [i for i, deep in enumerate(deep_space) if deep == is_deep]
+        if not rows:
+            continue
+        group = _find_passes_on_grid(
+            [satrecs[i] for i in rows], observer, start, hours, min_elevation_deg, step, batch_size
+        )
+        for i, passes in zip(rows, group):
+            results[i] = passes
+    return results
@@ -0,0 +1,96 @@
+"""
+Binary Position Frames
+Compact little-endian encoding of bulk satellite positions for the globe renderer
+"""
+
+import struct
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+FRAME_MIMETYPE = 'application/octet-stream'
+FRAME_MAGIC = b'OPF1'
+FRAME_VERSION = 1
+FLAG_DELTA = 0x01
+
+# magic, version, layout code, flags, field count, epoch, base epoch (unix seconds), count.
+# 28 bytes keeps every array that follows 4-byte aligned for typed-array views.
+FRAME_HEADER = struct.Struct('<4sBBBBddI')
+
+# Layout name -> (code, fields after the NORAD ID column)
+FRAME_LAYOUTS = {
+    'geodetic': (0, ('latitude', 'longitude', 'altitude_km')),
+    'ecef': (1, ('x_km', 'y_km', 'z_km')),
+}
+# Fields whose deltas are wrapped into [-180, 180)
+WRAPPED_FIELDS = {'longitude'}
+
+
+def _unix_seconds(timestamp: datetime) -> float:
+    return (timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)).timestamp()
+
+
+def encode_frame(norad_ids: Sequence[int], columns: Union[np.ndarray, Sequence[np.ndarray]], layout: str,
+                 epoch: datetime, base_columns: Union[np.ndarray, Sequence[np.ndarray], None] = None,
+                 base_epoch: Optional[datetime] = None) -> bytearray:
+    """Pack one frame: header, uint32 NORAD IDs, then one float32 array per field
+
+    ``columns`` holds one array per field of the layout, as a sequence or as
+    the rows of a 2-D array. Columns are cast straight into views over the
+    output buffer, so the only copy is the float64 -> float32 conversion.
+    With ``base_columns`` the frame carries ``columns - base_columns``
+    instead (longitude wrapped), which the client adds to the frame it
+    already holds for ``base_epoch``. Failed propagations are encoded as NaN.
+    """
+    code, fields = FRAME_LAYOUTS[layout]
+    if len(columns) != len(fields):
+        raise ValueError(f"Layout '{layout}' expects {len(fields)} columns")
+    delta = base_columns is not None
+    if delta and base_epoch is None:
+        raise ValueError("Delta frames need the base epoch")
+
+    count = len(norad_ids)
+    buffer = bytearray(FRAME_HEADER.size + 4 * count * (len(fields) + 1))
+    FRAME_HEADER.pack_into(
+        buffer, 0, FRAME_MAGIC, FRAME_VERSION, code, FLAG_DELTA if delta else 0, len(fields),
+        _unix_seconds(epoch), _unix_seconds(base_epoch) if base_epoch is not None and delta else 0.0, count
+    )
+
+    offset = FRAME_HEADER.size
+    np.frombuffer(buffer, dtype='<u4', count=count, offset=offset)[:] = norad_ids
+    for index, field in enumerate(fields):
+        offset += 4 * count
+        values = np.asarray(columns[index], dtype=np.float64)
+        if base_columns is not None:
+            values = values - np.asarray(base_columns[index], dtype=np.float64)
+            if field in WRAPPED_FIELDS:
+                values = np.mod(values + 180.0, 360.0) - 180.0
+        np.frombuffer(buffer, dtype='<f4', count=count, offset=offset)[:] = values
+    return buffer
+
+
+def decode_frame(data: bytes) -> Dict[str, Any]:
+    """Unpack a frame into NumPy views (the reference for client decoders)"""
+    magic, version, code, flags, n_fields, epoch, base_epoch, count = FRAME_HEADER.unpack_from(data, 0)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError("Not a position frame")
+    layout = next(name for name, (layout_code, _) in FRAME_LAYOUTS.items() if layout_code == code)
+    fields = FRAME_LAYOUTS[layout][1]
+
+    offset = FRAME_HEADER.size
+    norad_ids = np.frombuffer(data, dtype='<u4', count=count, offset=offset)
+    columns = {}
+    for field in fields[:n_fields]:
+        offset += 4 * count
+        columns[field] = np.frombuffer(data, dtype='<f4', count=count, offset=offset)
+
+    delta = bool(flags & FLAG_DELTA)
+    return {
+        'layout': layout,
+        'delta': delta,
+        'epoch': datetime.fromtimestamp(epoch, timezone.utc),
+        'base_epoch': datetime.fromtimestamp(base_epoch, timezone.utc) if delta else None,
+        'norad_ids': norad_ids,
+        'columns': columns,
+    }
@@ -0,0 +1,219 @@
+"""
+Position Snapshots
+Whole-catalog positions published once per tick into a memory-mapped file shared by every worker
+"""
+
+import fcntl
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from position_frames import FRAME_LAYOUTS, encode_frame
+
+SNAPSHOT_MAGIC = b'OPS1'
+SNAPSHOT_VERSION = 1
+
+# magic, format version, sequence, epoch (unix seconds), count, catalog version,
+# then (offset, length) of the geodetic and ECEF frames; padded to 8-byte alignment
+SNAPSHOT_HEADER = struct.Struct('<4sIQdI40sIIII4x')
+
+# Per-satellite arrays after the header, in file order
+_FLOAT_FIELDS = ('latitude', 'longitude', 'altitude_km', 'velocity_kms')
+
+
+def _align(offset: int, size: int = 8) -> int:
+    return -(-offset // size) * size
+
+
+def _array_offsets(count: int) -> Tuple[Dict[str, Tuple[int, str, Tuple[int, ...]]], int]:
+    """Offset, dtype and shape of every array in a snapshot of ``count`` satellites, and where they end"""
+    layout: Dict[str, Tuple[int, str, Tuple[int, ...]]] = {}
+    offset = SNAPSHOT_HEADER.size
+    layout['norad_ids'] = (offset, '<u4', (count,))
+    offset = _align(offset + 4 * count)
+    for field in _FLOAT_FIELDS:
+        layout[field] = (offset, '<f8', (count,))
+        offset += 8 * count
+    layout['position_ecef'] = (offset, '<f8', (count, 3))
+    offset += 24 * count
+    layout['error'] = (offset, 'u1', (count,))
+    return layout, _align(offset + count)
+
+
+class PositionSnapshot:
+    """Read-only view of one published snapshot
+
+    Arrays are NumPy views straight over the mapping, and ``frame()``
+    returns the pre-encoded binary frame of a layout as a memoryview, so
+    reading a snapshot copies nothing.
+    """
+
+    def __init__(self, buffer: mmap.mmap, identity: Tuple[int, int]):
+        (magic, version, self.sequence, epoch, self.count, catalog_version,
+         geodetic_offset, geodetic_length, ecef_offset, ecef_length) = SNAPSHOT_HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Not a position snapshot")
+        self.identity = identity
+        self.epoch = datetime.fromtimestamp(epoch, timezone.utc)
+        self.catalog_version = catalog_version.rstrip(b'\0').decode('ascii') or None
+        self._buffer = buffer
+        self._frames = {
+            'geodetic': (geodetic_offset, geodetic_length),
+            'ecef': (ecef_offset, ecef_length),
+        }
+        layout, _ = _array_offsets(self.count)
+        self.arrays = {
+            name: np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+            for name, (offset, dtype, shape) in layout.items()
+        }
+
+    def frame(self, layout: str) -> memoryview:
+        offset, length = self._frames[layout]
+        return memoryview(self._buffer)[offset:offset + length]
+
+    def rows(self, norad_ids: Optional[Iterable[int]] = None) -> np.ndarray:
+        """Snapshot rows of the given satellites in snapshot order, or all rows"""
+        if norad_ids is None:
+            return np.arange(self.count)
+        return np.flatnonzero(np.isin(self.arrays['norad_ids'], np.fromiter(norad_ids, dtype=np.int64)))
+
+    def result(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Single-timestamp ``propagate_catalog``-shaped arrays of the given rows"""
+        return {name: values[rows][:, None] for name, values in self.arrays.items() if name != 'norad_ids'}
+
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        return ((now or datetime.now(timezone.utc)) - self.epoch).total_seconds()
+
+
+class PositionSnapshotStore:
+    """Publishes and maps per-source snapshot files in a directory shared by the workers
+
+    Each tick one process wins a non-blocking ``flock`` and writes the new
+    snapshot to a temporary file that it renames over the old one, so
+    readers always map a complete snapshot. Readers re-map only when the
+    file's inode changes; one ``stat`` per lookup is the whole cost of
+    noticing a new tick. Mappings of replaced snapshots stay valid for
+    requests still using them and are released with their last view.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._mapped: Dict[str, PositionSnapshot] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def _path(self, source: str) -> str:
+        return os.path.join(self.directory, f"positions-{source}.bin")
+
+    def read(self, source: str) -> Optional[PositionSnapshot]:
+        """The latest snapshot of a source, or None if none has been published"""
+        path = self._path(source)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns)
+
+        with self._lock:
+            snapshot = self._mapped.get(source)
+            if snapshot is not None and snapshot.identity == identity:
+                return snapshot
+        try:
+            with open(path, 'rb') as handle:
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        snapshot = PositionSnapshot(buffer, identity)
+        with self._lock:
+            self._mapped[source] = snapshot
+        return snapshot
+
+    def publish(self, source: str, epoch: datetime, catalog_version: Optional[str],
+                produce: Callable[[], Tuple[List[int], Dict[str, np.ndarray]]]) -> Optional[PositionSnapshot]:
+        """Write the snapshot for ``epoch`` unless another worker has it or is writing it
+
+        ``produce()`` is called only by the winning process and returns
+        ``(norad_ids, result)`` with ``result`` shaped like a single-timestamp
+        ``propagate_catalog`` output.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(source) + '.lock', 'w') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return None
+            try:
+                current = self.read(source)
+                if current is not None and current.epoch >= epoch and current.catalog_version == catalog_version:
+                    return current
+                norad_ids, result = produce()
+                sequence = current.sequence + 1 if current is not None else 1
+                self._write(source, sequence, epoch, catalog_version, norad_ids, result)
+                self.published += 1
+                return self.read(source)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write(self, source: str, sequence: int, epoch: datetime, catalog_version: Optional[str],
+               norad_ids: Sequence[int], result: Dict[str, np.ndarray]) -> None:
+        count = len(norad_ids)
+        layout, end = _array_offsets(count)
+        valid = result['error'][:, 0] == 0
+
+        frames = {}
+        for name in FRAME_LAYOUTS:
+            if name == 'ecef':
+                columns = np.moveaxis(result['position_ecef'][:, 0], -1, 0)
+            else:
+                columns = np.stack([result[field][:, 0] for field in FRAME_LAYOUTS[name][1]])
+            frames[name] = encode_frame(norad_ids, np.where(valid, columns, np.nan), name, epoch)
+        geodetic_offset = end
+        ecef_offset = _align(geodetic_offset + len(frames['geodetic']))
+        size = ecef_offset + len(frames['ecef'])
+
+        buffer = bytearray(size)
+        SNAPSHOT_HEADER.pack_into(
+            buffer, 0, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, sequence, epoch.timestamp(), count,
+            (catalog_version or '').encode('ascii')[:40],
+            geodetic_offset, len(frames['geodetic']), ecef_offset, len(frames['ecef'])
+        )
+        values = {
+            'norad_ids': np.asarray(norad_ids),
+            'position_ecef': result['position_ecef'][:, 0],
+            'error': result['error'][:, 0],
+            **{field: result[field][:, 0] for field in _FLOAT_FIELDS},
+        }
+        for name, (offset, dtype, shape) in layout.items():
+            view = np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=offset)
+            view.reshape(shape)[:] = values[name]
+        buffer[geodetic_offset:geodetic_offset + len(frames['geodetic'])] = frames['geodetic']
+        buffer[ecef_offset:ecef_offset + len(frames['ecef'])] = frames['ecef']
+
+        path = self._path(source)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as handle:
+            handle.write(buffer)
+        os.replace(temporary, path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Published snapshots per source for health reporting"""
+        with self._lock:
+            sources = dict(self._mapped)
+        return {
+            'directory': self.directory,
+            'published_here': self.published,
+            'sources': {
+                source: {
+                    'sequence': snapshot.sequence,
+                    'epoch': snapshot.epoch.isoformat(),
+                    'satellites': snapshot.count,
+                    'catalog_version': snapshot.catalog_version,
+                }
+                for source, snapshot in sources.items()
+            },
+        }
@@ -0,0 +1,198 @@
+"""
+Redis Access
+Pooled, instrumented Redis clients with batched writes and bulk reads, shared by the API and the workers
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import redis
+
+from metrics import REDIS_COMMAND_SECONDS
+
+logger = logging.getLogger(__name__)
+
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379')
+# Connections per process; callers wait up to REDIS_POOL_TIMEOUT for a free one instead of opening more
+REDIS_MAX_CONNECTIONS = int(os.getenv('REDIS_MAX_CONNECTIONS', '16'))
+REDIS_POOL_TIMEOUT = float(os.getenv('REDIS_POOL_TIMEOUT', '5'))
+REDIS_SOCKET_TIMEOUT = float(os.getenv('REDIS_SOCKET_TIMEOUT', '5'))
+# Commands per pipeline round trip and keys per MGET or SCAN call
+REDIS_BATCH_SIZE = int(os.getenv('REDIS_BATCH_SIZE', '1000'))
+
+
+class CommandStats:
+    """Per-command call counts and latencies of this process, for logs and /health"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._commands: Dict[str, List[float]] = {}
+
+    def record(self, command: str, seconds: float, commands: int = 1) -> None:
+        with self._lock:
+            entry = self._commands.setdefault(command, [0, 0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += commands
+            entry[2] += seconds
+            entry[3] = max(entry[3], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Round trips, commands sent, and mean and max latency in milliseconds per command"""
+        with self._lock:
+            return {
+                command: {
+                    'round_trips': calls,
+                    'commands': commands,
+                    'mean_ms': round(total / calls * 1000, 3),
+                    'max_ms': round(longest * 1000, 3),
+                }
+                for command, (calls, commands, total, longest) in sorted(self._commands.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._commands.clear()
+
+
+COMMAND_STATS = CommandStats()
+
+
+class InstrumentedPipeline(redis.client.Pipeline):
+    """Pipeline timing each round trip as one ``pipeline`` command"""
+
+    def execute(self, raise_on_error: bool = True):
+        queued = len(self.command_stack)
+        started = time.perf_counter()
+        try:
+            with REDIS_COMMAND_SECONDS.labels('pipeline').time():
+                return super().execute(raise_on_error)
+        finally:
+            COMMAND_STATS.record('pipeline', time.perf_counter() - started, queued)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client recording the latency of every command it sends"""
+
+    def execute_command(self, *args, **options):
+        command = str(args[0]).lower()
+        started = time.perf_counter()
+        try:
+            with REDIS_COMMAND_SECONDS.labels(command).time():
+                return super().execute_command(*args, **options)
+        finally:
+            COMMAND_STATS.record(command, time.perf_counter() - started)
+
+    def pipeline(self, transaction: bool = True, shard_hint: Optional[str] = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+def connect(url: Optional[str] = None, max_connections: Optional[int] = None) -> InstrumentedRedis:
+    """Client over a blocking pool of at most ``max_connections`` connections; connects on first command"""
+    pool = redis.BlockingConnectionPool.from_url(
+        url or REDIS_URL,
+        max_connections=max_connections or REDIS_MAX_CONNECTIONS,
+        timeout=REDIS_POOL_TIMEOUT,
+        socket_timeout=REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=REDIS_SOCKET_TIMEOUT,
+        health_check_interval=30,
+        decode_responses=True,
+    )
+    return InstrumentedRedis(connection_pool=pool)
+
+
+class BatchWriter:
+    """Queue write commands and send them ``batch_size`` at a time on a non-transactional pipeline
+
+    Any client command can be queued by calling it on the writer, e.g.
+    ``writer.setex(key, ttl, value)``. Leaving a ``with`` block sends what
+    is left; an exception inside the block discards the unsent commands.
+    """
+
+    def __init__(self, client, batch_size: int = REDIS_BATCH_SIZE):
+        self.client = client
+        self.batch_size = max(batch_size, 1)
+        self.pending = 0
+        self.sent = 0
+        self.round_trips = 0
+        self._pipe = client.pipeline(transaction=False)
+
+    def __getattr__(self, name: str):
+        command = getattr(self._pipe, name)
+
+        def queue(*args, **kwargs) -> None:
+            command(*args, **kwargs)
+            self.pending += 1
+            if self.pending >= self.batch_size:
+                self.flush()
+        return queue
+
+    def flush(self) -> int:
+        """Send the queued commands in one round trip, returning how many there were"""
+        if not self.pending:
+            return 0
+        sent, self.pending = self.pending, 0
+        self._pipe.execute()
+        self.sent += sent
+        self.round_trips += 1
+        return sent
+
+    def __enter__(self) -> 'BatchWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is None:
+            self.flush()
+        elif hasattr(self._pipe, 'reset'):
+            self._pipe.reset()
+
+
+def add_to_sets(writer: BatchWriter, members: Dict[str, Iterable[Any]], ttl: Optional[int] = None) -> None:
+    """SADD many members per set in chunks, then set each set's expiry once"""
+    for key, values in members.items():
+        values = list(values)
+        for start in range(0, len(values), writer.batch_size):
+            writer.sadd(key, *values[start:start + writer.batch_size])
+        if ttl is not None and values:
+            writer.expire(key, ttl)
+
+
+def scan_keys(client, pattern: str, count: int = REDIS_BATCH_SIZE) -> List[str]:
+    """Keys matching ``pattern``, walked with SCAN so Redis is never blocked the way KEYS blocks it"""
+    return list(client.scan_iter(match=pattern, count=count))
+
+
+def get_many(client, keys: Sequence[str], batch_size: int = REDIS_BATCH_SIZE) -> List[Optional[str]]:
+    """Values of ``keys`` in order, None where missing, with one MGET per ``batch_size`` keys"""
+    values: List[Optional[str]] = []
+    for start in range(0, len(keys), batch_size):
+        values.extend(client.mget(keys[start:start + batch_size]))
+    return values
+
+
+def get_ttls(client, keys: Sequence[str], batch_size: int = REDIS_BATCH_SIZE) -> List[int]:
+    """TTL of each key in order, pipelined ``batch_size`` keys per round trip"""
+    ttls: List[int] = []
+    for start in range(0, len(keys), batch_size):
+        pipe = client.pipeline(transaction=False)
+        for key in keys[start:start + batch_size]:
+            pipe.ttl(key)
+        ttls.extend(pipe.execute())
+    return ttls
+
+
+def load_json(client, pattern: str, batch_size: int = REDIS_BATCH_SIZE) -> List[Any]:
+    """Decoded JSON values of every key matching ``pattern``, skipping missing and undecodable ones"""
+    keys = scan_keys(client, pattern, batch_size)
+    records = []
+    for key, value in zip(keys, get_many(client, keys, batch_size)):
+        if not value:
+            continue
+        try:
+            records.append(json.loads(value))
+        except ValueError as e:
+            logger.error(f"Failed to decode {key}: {e}")
+    return records
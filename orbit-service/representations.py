@@ -0,0 +1,114 @@
+"""
+Precomputed Representations
+Serialized and compressed response bodies with strong ETags, built once per catalog version
+"""
+
+import gzip
+import hashlib
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Content codings offered to clients, preferred first when they accept several equally
+ENCODINGS = ('gzip', 'deflate')
+
+
+def make_etag(*parts: object) -> str:
+    """Strong entity tag (without quotes) for a body determined entirely by ``parts``"""
+    return hashlib.sha1('\x1f'.join(map(str, parts)).encode()).hexdigest()[:32]
+
+
+class Representation:
+    """One response body in every content coding, each with its own strong ETag"""
+
+    def __init__(self, etag: str, body: bytes, compress_level: int, min_bytes: int):
+        self.etag = etag
+        self.bodies: Dict[str, bytes] = {'identity': body}
+        # Tiny bodies are not worth a compressed variant
+        if len(body) >= min_bytes:
+            self.bodies['gzip'] = gzip.compress(body, compresslevel=compress_level, mtime=0)
+            self.bodies['deflate'] = zlib.compress(body, compress_level)
+
+    def etag_for(self, coding: str) -> str:
+        return self.etag if coding == 'identity' else f"{self.etag}-{coding}"
+
+    def etags(self) -> Iterable[str]:
+        return [self.etag_for(coding) for coding in self.bodies]
+
+    def select(self, quality: Callable[[str], float]) -> Tuple[str, bytes]:
+        """The coding to send given the client's quality for each, and its body"""
+        offered = [coding for coding in ENCODINGS if coding in self.bodies and quality(coding) > 0]
+        if offered:
+            coding = max(offered, key=quality)
+            return coding, self.bodies[coding]
+        return 'identity', self.bodies['identity']
+
+    def size(self) -> int:
+        return sum(len(body) for body in self.bodies.values())
+
+
+class RepresentationCache:
+    """LRU of representations keyed by source, catalog version and request parameters
+
+    Each representation is rendered and compressed by the first request
+    that needs it; concurrent requests for the same key wait for that one.
+    """
+
+    def __init__(self, maxsize: int, compress_level: int = 6, min_bytes: int = 1024):
+        self.maxsize = maxsize
+        self.compress_level = compress_level
+        self.min_bytes = min_bytes
+        self._entries: "OrderedDict[str, Tuple[str, str, Representation]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.builds = 0
+
+    def _cached(self, key: str) -> Optional[Representation]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def get(self, source: str, version: str, etag: str, render: Callable[[], bytes]) -> Representation:
+        """The representation tagged ``etag``, rendering and compressing it on first use"""
+        representation = self._cached(etag)
+        if representation is not None:
+            return representation
+        with self._lock:
+            build_lock = self._build_locks.setdefault(etag, threading.Lock())
+        with build_lock:
+            representation = self._cached(etag)
+            if representation is not None:
+                return representation
+            representation = Representation(etag, render(), self.compress_level, self.min_bytes)
+            with self._lock:
+                self._entries[etag] = (source, version, representation)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                self._build_locks.pop(etag, None)
+                self.builds += 1
+        return representation
+
+    def invalidate(self, source: str, keep_version: Optional[str]) -> int:
+        """Drop representations of ``source`` built from any other catalog version"""
+        with self._lock:
+            stale = [key for key, (entry_source, version, _) in self._entries.items()
+                     if entry_source == source and version != keep_version]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'bytes': sum(representation.size() for _, _, representation in self._entries.values()),
+                'hits': self.hits,
+                'builds': self.builds,
+            }
@@ -0,0 +1,204 @@
+"""
+Response Cache
+Expensive response bodies cached per catalog version, parameters and time bucket, with request coalescing
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class ResponseCache:
+    """Two-level (in-process LRU, then Redis) cache of rendered response bodies
+
+    Keys combine the endpoint, the catalog version the body was computed
+    from, the request parameters and a time bucket. Identical requests that
+    arrive while a body is being computed wait for it instead of computing
+    it again: within a process on an event, across processes on a Redis
+    lease. Entries of a superseded catalog version are dropped when the new
+    version is installed, so a new catalog is never answered from old data.
+    """
+
+    def __init__(self, redis_client, maxsize: int, lock_seconds: float, poll_seconds: float):
+        self.redis_client = redis_client
+        self.maxsize = maxsize
+        self.lock_seconds = lock_seconds
+        self.poll_seconds = poll_seconds
+        self._entries: "OrderedDict[str, Tuple[str, str, str]]" = OrderedDict()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.redis_hits = 0
+        self.coalesced = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(endpoint: str, source: str, version: str, params: Mapping[str, Any], bucket: int) -> str:
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+        return f"response:{endpoint}:{source}:{version}:{bucket}:{digest}"
+
+    @staticmethod
+    def _version_set(source: str, version: str) -> str:
+        return f"response:keys:{source}:{version}"
+
+    def _local(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def _remember(self, key: str, source: str, version: str, body: str) -> None:
+        with self._lock:
+            self._entries[key] = (source, version, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _shared(self, key: str) -> Optional[str]:
+        if not self.redis_client:
+            return None
+        try:
+            return self.redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    def _share(self, key: str, source: str, version: str, body: str, ttl_seconds: int) -> None:
+        if not self.redis_client:
+            return
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(key, ttl_seconds, body)
+            # Track the keys of each version so a new catalog can delete them
+            pipe.sadd(self._version_set(source, version), key)
+            pipe.expire(self._version_set(source, version), ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    def _lease_or_wait(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Take the cross-process lease on ``key``, returning its token, or wait for the holder's body"""
+        if not self.redis_client:
+            return None, None
+        lock_key = f"{key}:lock"
+        token = uuid.uuid4().hex
+        try:
+            if self.redis_client.set(lock_key, token, nx=True, ex=max(int(self.lock_seconds), 1)):
+                return None, token
+            deadline = time.monotonic() + self.lock_seconds
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_seconds)
+                body = self.redis_client.get(key)
+                if body is not None:
+                    return body, None
+                # The holder failed or gave up; compute here without a lease
+                if self.redis_client.get(lock_key) is None:
+                    break
+        except Exception as e:
+            logger.warning(f"Response cache lease failed: {e}")
+        return None, None
+
+    def _release(self, key: str, token: Optional[str]) -> None:
+        """Release our own lease; an expired one may already belong to another process"""
+        if token is None or not self.redis_client:
+            return
+        try:
+            if self.redis_client.get(f"{key}:lock") == token:
+                self.redis_client.delete(f"{key}:lock")
+        except Exception as e:
+            logger.warning(f"Response cache lease release failed: {e}")
+
+    def get_or_compute(self, endpoint: str, source: str, version: str, params: Mapping[str, Any], bucket: int,
+                       ttl_seconds: int, compute: Callable[[], str]) -> Tuple[str, str]:
+        """Return the rendered body for a request and how it was served: hit, coalesced or miss"""
+        key = self.make_key(endpoint, source, version, params, bucket)
+        while True:
+            body = self._local(key)
+            if body is not None:
+                with self._lock:
+                    self.hits += 1
+                return body, 'hit'
+            with self._lock:
+                waiting = self._inflight.get(key)
+                if waiting is None:
+                    done = self._inflight[key] = threading.Event()
+                    break
+            # Another request in this process is computing the same body
+            waiting.wait()
+            body = self._local(key)
+            if body is not None:
+                with self._lock:
+                    self.coalesced += 1
+                return body, 'coalesced'
+
+        try:
+            body = self._shared(key)
+            if body is not None:
+                self._remember(key, source, version, body)
+                with self._lock:
+                    self.redis_hits += 1
+                return body, 'hit'
+            body, token = self._lease_or_wait(key)
+            if body is not None:
+                self._remember(key, source, version, body)
+                with self._lock:
+                    self.coalesced += 1
+                return body, 'coalesced'
+            try:
+                body = compute()
+                self._remember(key, source, version, body)
+                self._share(key, source, version, body, ttl_seconds)
+            finally:
+                self._release(key, token)
+            with self._lock:
+                self.misses += 1
+            return body, 'miss'
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            done.set()
+
+    def invalidate(self, source: str, keep_version: Optional[str]) -> int:
+        """Drop this process's entries of ``source`` computed from any other catalog version"""
+        with self._lock:
+            stale = [key for key, (entry_source, version, _) in self._entries.items()
+                     if entry_source == source and version != keep_version]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self.invalidations += 1
+        return len(stale)
+
+    def purge_shared(self, source: str, version: str) -> None:
+        """Delete the shared entries of a superseded catalog version"""
+        if not self.redis_client:
+            return
+        try:
+            version_set = self._version_set(source, version)
+            keys = list(self.redis_client.smembers(version_set))
+            self.redis_client.delete(version_set, *keys)
+        except Exception as e:
+            logger.warning(f"Response cache purge failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'redis_hits': self.redis_hits,
+                'coalesced': self.coalesced,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+            }
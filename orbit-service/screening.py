@@ -0,0 +1,219 @@
+"""
+Catalog Conjunction Screening
+All-vs-all close approach search on a shared time grid using a KD-tree per timestep
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sgp4.api import Satrec, SatrecArray
+
+from propagation import julian_dates, SECONDS_PER_DAY
+
+# Upper bound on the relative speed of two Earth orbiters (head-on LEO)
+MAX_RELATIVE_SPEED_KMS = 16.0
+# Upper bound on the relative gravitational acceleration of two LEO objects
+MAX_RELATIVE_ACCEL_KMS2 = 0.02
+
+
+def _grid_margin_km(step_seconds: float) -> float:
+    """Deviation of the true relative path from a straight line over half a step"""
+    half = step_seconds / 2.0
+    return 0.5 * MAX_RELATIVE_ACCEL_KMS2 * half ** 2
+
+
+def find_candidates(satrecs: Sequence[Satrec], start: datetime, duration_hours: float,
+                    step_seconds: float, threshold_km: float,
+                    chunk_steps: int = 30) -> List[Dict[str, Any]]:
+    """Propagate every object once onto a shared grid and collect close pairs
+
+    At each timestep the KD-tree returns every pair closer than the distance
+    either object can cover in half a step. Those pairs are then checked with
+    a straight-line closest approach inside the step, so nothing closer than
+    ``threshold_km`` can fall between samples. A pair close at consecutive
+    steps keeps each sample that is a local minimum of its miss distance, so
+    every encounter (and every minimum of a long one) is refined separately
+    with ``closest_approaches``.
+    """
+    from scipy.spatial import cKDTree  # SciPy is imported on first use to keep service startup fast
+    n_steps = int(duration_hours * 3600 // step_seconds) + 1
+    offsets = np.arange(n_steps) * step_seconds
+    jd0, fr0 = julian_dates([start])
+    search_radius = threshold_km + MAX_RELATIVE_SPEED_KMS * step_seconds / 2.0
+    keep_radius = threshold_km + _grid_margin_km(step_seconds)
+    half_step = step_seconds / 2.0
+
+    satrec_array = SatrecArray(list(satrecs))
+    n_objects = len(satrecs)
+    found_keys = []
+    found_step = []
+    found_miss = []
+    found_time = []
+
+    for chunk_start in range(0, n_steps, chunk_steps):
+        chunk = offsets[chunk_start:chunk_start + chunk_steps]
+        fr = fr0[0] + chunk / SECONDS_PER_DAY
+        jd = np.full(len(chunk), jd0[0])
+        error, r, v = satrec_array.sgp4(jd, fr)
+
+        for k, offset in enumerate(chunk):
+            rows = np.flatnonzero(error[:, k] == 0)
+            if len(rows) < 2:
+                continue
+            positions = r[rows, k]
+            pairs = cKDTree(positions).query_pairs(search_radius, output_type='ndarray')
+            if len(pairs) == 0:
+                continue
+
+            i = rows[pairs[:, 0]]
+            j = rows[pairs[:, 1]]
+            dr = r[j, k] - r[i, k]
+            dv = v[j, k] - v[i, k]
+            speed_sq = np.einsum('ij,ij->i', dv, dv)
+            tau = np.where(speed_sq > 0, -np.einsum('ij,ij->i', dr, dv) / np.maximum(speed_sq, 1e-12), 0.0)
+            tau = np.clip(tau, -half_step, half_step)
+            miss = np.linalg.norm(dr + dv * tau[:, None], axis=1)
+
+            close = miss < keep_radius
+            if np.any(close):
+                found_keys.append(i[close].astype(np.int64) * n_objects + j[close])
+                found_step.append(np.full(np.count_nonzero(close), chunk_start + k))
+                found_miss.append(miss[close])
+                found_time.append(offset + tau[close])
+
+    if not found_keys:
+        return []
+
+    keys = np.concatenate(found_keys)
+    steps = np.concatenate(found_step)
+    miss = np.concatenate(found_miss)
+    times = np.concatenate(found_time)
+
+    # Keep the grid hits of each pair that are closer than the hits at the
+    # steps either side (of equal neighbours, the later one)
+    order = np.lexsort((steps, keys))
+    keys, steps, miss, times = keys[order], steps[order], miss[order], times[order]
+    follows = (keys[1:] == keys[:-1]) & (steps[1:] == steps[:-1] + 1)
+    no_closer_before = np.concatenate(([True], ~follows | (miss[1:] <= miss[:-1])))
+    no_closer_after = np.concatenate((~follows | (miss[:-1] < miss[1:]), [True]))
+    minima = no_closer_before & no_closer_after
+
+    return [
+        {
+            'index1': int(key // n_objects),
+            'index2': int(key % n_objects),
+            'offset_seconds': float(offset),
+            'grid_distance_km': float(distance)
+        }
+        for key, offset, distance in zip(keys[minima], times[minima], miss[minima])
+    ]
+
+
+def closest_approaches(sat1: Satrec, sat2: Satrec, start: datetime, window_start_s: float,
+                       window_end_s: float, step_seconds: float,
+                       threshold_km: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Find every local closest approach of two objects inside a window
+
+    Samples the pair on a coarse grid, brackets each local minimum by a
+    negative-to-positive sign change of the range rate (dr . dv), and solves
+    for the root with Brent's method. Brackets that cannot get closer than
+    ``threshold_km`` even on a straight-line path are skipped.
+    Returns refined approaches sorted by miss distance.
+    """
+    from scipy.optimize import brentq
+    jd0, fr0 = julian_dates([start])
+    jd0, fr0 = float(jd0[0]), float(fr0[0])
+    offsets = np.arange(window_start_s, window_end_s + step_seconds, step_seconds)
+    offsets[-1] = min(offsets[-1], window_end_s)
+    jd = np.full(len(offsets), jd0)
+    fr = fr0 + offsets / SECONDS_PER_DAY
+
+    e1, r1, v1 = sat1.sgp4_array(jd, fr)
+    e2, r2, v2 = sat2.sgp4_array(jd, fr)
+    dr = r2 - r1
+    dv = v2 - v1
+    distance = np.linalg.norm(dr, axis=1)
+    range_rate = np.einsum('ij,ij->i', dr, dv)
+    valid = (e1 == 0) & (e2 == 0)
+
+    def state(offset: float) -> Tuple[float, float, float]:
+        fraction = fr0 + offset / SECONDS_PER_DAY
+        err1, p1, w1 = sat1.sgp4(jd0, fraction)
+        err2, p2, w2 = sat2.sgp4(jd0, fraction)
+        if err1 or err2:
+            raise ValueError("propagation error during TCA refinement")
+        rel_r = np.subtract(p2, p1)
+        rel_v = np.subtract(w2, w1)
+        return float(np.dot(rel_r, rel_v)), float(np.linalg.norm(rel_r)), float(np.linalg.norm(rel_v))
+
+    approaches = []
+
+    # Interior minima: range rate goes from closing to opening between samples
+    brackets = np.flatnonzero(valid[:-1] & valid[1:] & (range_rate[:-1] < 0) & (range_rate[1:] >= 0))
+    for k in brackets:
+        if threshold_km is not None:
+            speed = max(np.linalg.norm(dv[k]), np.linalg.norm(dv[k + 1]))
+            reach = speed * (offsets[k + 1] - offsets[k]) / 2.0 + _grid_margin_km(offsets[k + 1] - offsets[k])
+            if min(distance[k], distance[k + 1]) - reach > threshold_km:
+                continue
+        try:
+            tca = brentq(lambda t: state(t)[0], offsets[k], offsets[k + 1], xtol=1e-4)
+            _, miss, rel_speed = state(tca)
+        except ValueError:
+            # Fall back to the better bracketing sample
+            best = k if distance[k] <= distance[k + 1] else k + 1
+            tca, miss, rel_speed = offsets[best], distance[best], np.linalg.norm(dv[best])
+        approaches.append((tca, miss, rel_speed))
+
+    # Minima pinned to the window edges
+    if valid[0] and range_rate[0] > 0:
+        approaches.append((offsets[0], distance[0], np.linalg.norm(dv[0])))
+    if valid[-1] and range_rate[-1] < 0:
+        approaches.append((offsets[-1], distance[-1], np.linalg.norm(dv[-1])))
+
+    approaches.sort(key=lambda approach: approach[1])
+    return [
+        {
+            'time': start + timedelta(seconds=float(tca)),
+            'offset_seconds': float(tca),
+            'distance_km': float(miss),
+            'relative_velocity_kms': float(rel_speed)
+        }
+        for tca, miss, rel_speed in approaches
+        if threshold_km is None or miss <= threshold_km
+    ]
+
+
+def screen_catalog(norad_ids: Sequence[int], satrecs: Sequence[Satrec], duration_hours: float,
+                   step_seconds: float, threshold_km: float,
+                   start: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Screen a whole catalog for conjunctions closer than ``threshold_km``"""
+    if start is None:
+        start = datetime.now(timezone.utc)
+    if len(satrecs) < 2:
+        return []
+
+    candidates = find_candidates(satrecs, start, duration_hours, step_seconds, threshold_km)
+
+    window_end = duration_hours * 3600.0
+    conjunctions = []
+    for candidate in candidates:
+        sat1 = satrecs[candidate['index1']]
+        sat2 = satrecs[candidate['index2']]
+        offset = candidate['offset_seconds']
+        approaches = closest_approaches(sat1, sat2, start, max(offset - step_seconds, 0.0),
+                                        min(offset + step_seconds, window_end), step_seconds / 4.0,
+                                        threshold_km)
+        if approaches:
+            refined = approaches[0]
+            conjunctions.append({
+                'primary_object': int(norad_ids[candidate['index1']]),
+                'secondary_object': int(norad_ids[candidate['index2']]),
+                'closest_approach_time': refined['time'],
+                'minimum_distance_km': refined['distance_km'],
+                'relative_velocity_kms': refined['relative_velocity_kms']
+            })
+
+    conjunctions.sort(key=lambda c: c['minimum_distance_km'])
+    return conjunctions
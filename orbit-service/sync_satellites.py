@@ -11,11 +11,15 @@ import logging
 import time
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timezone
-import redis
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from metrics import reset_multiprocess_dir
+from redis_store import (
+    COMMAND_STATS, BatchWriter, InstrumentedRedis, add_to_sets, connect, get_ttls, scan_keys
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -79,10 +83,10 @@ class SatelliteDataSync:
             'categories_synced': []
         }
         
-    def _init_redis(self) -> redis.Redis:
+    def _init_redis(self) -> InstrumentedRedis:
         """Initialize Redis connection"""
         try:
-            client = redis.from_url(REDIS_URL, decode_responses=True)
+            client = connect(REDIS_URL)
             client.ping()
             logger.info("Successfully connected to Redis")
             return client
@@ -123,6 +127,7 @@ class SatelliteDataSync:
         elapsed_time = time.time() - start_time
         logger.info(f"Sync completed in {elapsed_time:.2f} seconds")
         logger.info(f"Stats: {self.stats}")
+        logger.info(f"Redis commands: {COMMAND_STATS.snapshot()}")
         
         return self.stats
         
@@ -138,9 +143,14 @@ class SatelliteDataSync:
             satellites = response.json()
             logger.info(f"Retrieved {len(satellites)} satellites in category {category['name']}")
             
-            # Process each satellite
-            for sat_data in satellites:
-                self._process_satellite(sat_data, category['name'])
+            # Queue every write and send them in pipelined batches; set members
+            # are gathered and added with one SADD per batch at the end
+            set_members: Dict[str, List[str]] = {}
+            with BatchWriter(self.redis_client) as writer:
+                for sat_data in satellites:
+                    self._process_satellite(sat_data, category['name'], writer, set_members)
+                add_to_sets(writer, set_members, 86400 * 7)
+            logger.info(f"Wrote {category['name']} in {writer.round_trips} round trips")
                 
             self.stats['categories_synced'].append(category['name'])
             
@@ -151,8 +161,9 @@ class SatelliteDataSync:
             logger.error(f"JSON decode error for {category['name']}: {e}")
             raise
             
-    def _process_satellite(self, sat_data: Dict[str, Any], category: str) -> None:
-        """Process and store individual satellite data"""
+    def _process_satellite(self, sat_data: Dict[str, Any], category: str, writer: BatchWriter,
+                           set_members: Dict[str, List[str]]) -> None:
+        """Process and queue the writes of individual satellite data"""
         try:
             sat_id = sat_data.get('NORAD_CAT_ID', '')
             if not sat_id:
@@ -171,14 +182,14 @@ class SatelliteDataSync:
                 
             # Store in Redis with TTL
             key = f"satellite:tle:{sat_id}"
-            self.redis_client.setex(
+            writer.setex(
                 key,
                 86400 * 2,  # 48 hour TTL
                 json.dumps(sat_data)
             )
             
             # Update satellite index
-            self._update_satellite_index(sat_id, sat_data)
+            self._update_satellite_index(sat_id, sat_data, writer, set_members)
             
             self.stats['updated'] += 1
             self.stats['total_satellites'] += 1
@@ -192,8 +203,9 @@ class SatelliteDataSync:
         required_fields = ['TLE_LINE1', 'TLE_LINE2', 'OBJECT_NAME', 'NORAD_CAT_ID']
         return all(field in sat_data and sat_data[field] for field in required_fields)
         
-    def _update_satellite_index(self, sat_id: str, sat_data: Dict[str, Any]) -> None:
-        """Update satellite search index"""
+    def _update_satellite_index(self, sat_id: str, sat_data: Dict[str, Any], writer: BatchWriter,
+                                set_members: Dict[str, List[str]]) -> None:
+        """Update satellite search index; set memberships are collected in ``set_members``"""
         try:
             # Create search index entry
             index_data = {
@@ -212,7 +224,7 @@ class SatelliteDataSync:
             
             # Store in satellite index
             index_key = f"satellite:index:{sat_id}"
-            self.redis_client.setex(
+            writer.setex(
                 index_key,
                 86400 * 7,  # 7 day TTL
                 json.dumps(index_data)
@@ -220,13 +232,11 @@ class SatelliteDataSync:
             
             # Add to category set
             category_set_key = f"satellites:category:{sat_data.get('CATEGORY', 'unknown')}"
-            self.redis_client.sadd(category_set_key, sat_id)
-            self.redis_client.expire(category_set_key, 86400 * 7)
+            set_members.setdefault(category_set_key, []).append(sat_id)
             
             # Add to active satellites set
             if sat_data.get('OBJECT_TYPE') != 'DEBRIS':
-                self.redis_client.sadd('satellites:active', sat_id)
-                self.redis_client.expire('satellites:active', 86400 * 7)
+                set_members.setdefault('satellites:active', []).append(sat_id)
                 
         except Exception as e:
             logger.error(f"Failed to update satellite index for {sat_id}: {e}")
@@ -240,19 +250,20 @@ class SatelliteDataSync:
                 'categories': SATELLITE_CATEGORIES
             }
             
-            self.redis_client.setex(
-                'sync:metadata',
-                86400,  # 24 hour TTL
-                json.dumps(metadata)
-            )
-            
-            # Store sync history
-            history_key = f"sync:history:{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
-            self.redis_client.setex(
-                history_key,
-                86400 * 30,  # 30 day TTL
-                json.dumps(metadata)
-            )
+            with BatchWriter(self.redis_client) as writer:
+                writer.setex(
+                    'sync:metadata',
+                    86400,  # 24 hour TTL
+                    json.dumps(metadata)
+                )
+                
+                # Store sync history
+                history_key = f"sync:history:{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
+                writer.setex(
+                    history_key,
+                    86400 * 30,  # 30 day TTL
+                    json.dumps(metadata)
+                )
             
         except Exception as e:
             logger.error(f"Failed to store sync metadata: {e}")
@@ -264,14 +275,14 @@ class SatelliteDataSync:
             
             # Get all satellite keys
             pattern = "satellite:tle:*"
-            keys = self.redis_client.keys(pattern)
+            keys = scan_keys(self.redis_client, pattern)
             
             cleaned = 0
-            for key in keys:
-                ttl = self.redis_client.ttl(key)
-                if ttl == -1:  # No TTL set
-                    self.redis_client.expire(key, 86400 * 2)  # Set 48 hour TTL
-                    cleaned += 1
+            with BatchWriter(self.redis_client) as writer:
+                for key, ttl in zip(keys, get_ttls(self.redis_client, keys)):
+                    if ttl == -1:  # No TTL set
+                        writer.expire(key, 86400 * 2)  # Set 48 hour TTL
+                        cleaned += 1
                     
             logger.info(f"Cleaned up {cleaned} satellite records")
             
@@ -280,6 +291,7 @@ class SatelliteDataSync:
 
 def main():
     """Main entry point"""
+    reset_multiprocess_dir()
     try:
         syncer = SatelliteDataSync()
         
@@ -0,0 +1,15 @@
+"""
+Shared pytest configuration
+"""
+
+import os
+import tempfile
+
+# Keep the catalog refresher thread (and its CelesTrak downloads) out of unit tests
+os.environ.setdefault('CATALOG_BACKGROUND_REFRESH', 'false')
+
+# Position snapshots go to a private directory instead of the host-wide one
+os.environ.setdefault('POSITION_SNAPSHOT_DIR', tempfile.mkdtemp(prefix='orbit-snapshots-'))
+
+# Heavy handlers run in the request thread so tests can patch what they call
+os.environ.setdefault('COMPUTE_POOL_WORKERS', '0')
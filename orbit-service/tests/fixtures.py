@@ -0,0 +1,136 @@
+"""
+Sample TLE records and an in-memory Redis stand-in shared by the orbit service tests
+"""
+
+import fnmatch
+import math
+from datetime import datetime, timezone
+
+from sgp4.api import Satrec, WGS72
+
+SGP4_EPOCH_ORIGIN = datetime(1949, 12, 31, tzinfo=timezone.utc)
+
+ISS_TLE = {
+    'norad_id': 25544,
+    'name': 'ISS (ZARYA)',
+    'line1': '1 25544U 98067A   14020.93268519  .00009878  00000-0  18200-3 0  5082',
+    'line2': '2 25544  51.6498 109.4756 0003572  55.9686 274.8005 15.49815350868473',
+}
+
+GPS_TLE = {
+    'norad_id': 24876,
+    'name': 'GPS BIIR-2  (PRN 13)',
+    'line1': '1 24876U 97035A   14020.52318098  .00000053  00000-0  00000+0 0  1230',
+    'line2': '2 24876  55.7064 301.5098 0036862 112.6637 247.7709  2.00564026121413',
+}
+
+
+def circular_satrec(satnum, altitude_km, inclination_deg, raan_deg, mean_anomaly_deg, epoch):
+    """Build a drag-free circular-orbit Satrec directly from elements"""
+    semi_major_axis = 6378.135 + altitude_km
+    mean_motion = math.sqrt(398600.8 / semi_major_axis ** 3) * 60.0  # rad/min
+    satrec = Satrec()
+    satrec.sgp4init(
+        WGS72, 'i', satnum,
+        (epoch - SGP4_EPOCH_ORIGIN).total_seconds() / 86400.0,
+        0.0, 0.0, 0.0, 1e-7, 0.0,
+        math.radians(inclination_deg), math.radians(mean_anomaly_deg),
+        mean_motion, math.radians(raan_deg)
+    )
+    return satrec
+
+
+class InMemoryRedis:
+    """Minimal stand-in for the subset of the redis-py client used by the service"""
+
+    def __init__(self):
+        self.store = {}
+        self.expiry = {}
+        self.commands = []
+
+    def _record(self, name):
+        self.commands.append(name)
+
+    def ping(self):
+        return True
+
+    def get(self, key):
+        self._record('get')
+        return self.store.get(key)
+
+    def mget(self, keys):
+        self._record('mget')
+        return [self.store.get(key) for key in keys]
+
+    def scan_iter(self, match='*', count=None):
+        self._record('scan')
+        return [key for key in list(self.store) if fnmatch.fnmatchcase(key, match)]
+
+    def set(self, key, value, ex=None, nx=False):
+        self._record('set')
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        if ex is not None:
+            self.expiry[key] = ex
+        return True
+
+    def setex(self, key, ttl, value):
+        self._record('setex')
+        self.store[key] = value
+        self.expiry[key] = ttl
+        return True
+
+    def ttl(self, key):
+        self._record('ttl')
+        if key not in self.store:
+            return -2
+        return self.expiry.get(key, -1)
+
+    def delete(self, *keys):
+        self._record('delete')
+        return sum(self.store.pop(key, None) is not None for key in keys)
+
+    def expire(self, key, ttl):
+        self._record('expire')
+        if key not in self.store:
+            return False
+        self.expiry[key] = ttl
+        return True
+
+    def sadd(self, key, *members):
+        self._record('sadd')
+        members = set(map(str, members)) - self.store.setdefault(key, set())
+        self.store[key] |= members
+        return len(members)
+
+    def smembers(self, key):
+        self._record('smembers')
+        return set(self.store.get(key, set()))
+
+    def rpush(self, key, *values):
+        self._record('rpush')
+        self.store.setdefault(key, []).extend(values)
+        return len(self.store[key])
+
+    def pipeline(self, transaction=True):
+        return _InMemoryPipeline(self)
+
+
+class _InMemoryPipeline:
+    """Buffers commands and applies them on execute()"""
+
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.queued]
+        self.queued = []
+        return results
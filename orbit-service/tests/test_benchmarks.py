@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test suite for the synthetic catalog generator and the benchmark runner
+"""
+
+import unittest
+import json
+import subprocess
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+# Add parent directory to path
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+
+from benchmarks.synthetic_catalog import MIXES, generate_catalog, to_tle_text  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from tle_parser import parse_tle_text  # noqa: E402
+
+
+class TestSyntheticCatalog(unittest.TestCase):
+    """Test cases for synthetic catalog generation"""
+
+    def test_reproducible(self):
+        """Test the same seed gives the same catalog and another seed a different one"""
+        self.assertEqual(generate_catalog(50, seed=3), generate_catalog(50, seed=3))
+        self.assertNotEqual(generate_catalog(50, seed=3), generate_catalog(50, seed=4))
+
+    def test_listing_parses_cleanly(self):
+        """Test every generated element set passes the service parser with valid checksums"""
+        records = generate_catalog(500)
+        columns, errors = parse_tle_text(to_tle_text(records))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(columns['norad_id'].tolist(), [record['norad_id'] for record in records])
+
+    def test_regimes(self):
+        """Test each mix lands in its orbital regime"""
+        periods = {}
+        for mix in MIXES:
+            catalog = SatelliteCatalog.from_records(generate_catalog(200, mix))
+            self.assertEqual(len(catalog), 200)
+            periods[mix] = 1440.0 / catalog.column('mean_motion')
+
+        self.assertTrue(np.all(periods['starlink'] < 100))
+        self.assertTrue(np.all(periods['leo'] < 130))
+        self.assertTrue(np.all((periods['meo'] > 600) & (periods['meo'] < 900)))
+        self.assertTrue(np.all(np.abs(periods['geo'] - 1436) < 2))
+        self.assertTrue(np.any(periods['mixed'] < 100) and np.any(periods['mixed'] > 1400))
+
+    def test_rejects_unknown_mix(self):
+        """Test an unknown mix name is reported"""
+        with self.assertRaises(ValueError):
+            generate_catalog(10, 'lunar')
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    """Test cases for the benchmark command line"""
+
+    def test_writes_results_and_compares(self):
+        """Test a tiny offline run writes JSON results and compares against itself"""
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'results.json')
+            command = [sys.executable, os.path.join(SERVICE_DIR, 'benchmarks', 'run_benchmarks.py'),
+                       '--sizes', '20', '--repeat', '1', '--only', 'parse_tle_text', 'propagate_bulk',
+                       '--output', output]
+            subprocess.run(command, check=True, capture_output=True, cwd=directory)
+            with open(output) as handle:
+                document = json.load(handle)
+            compared = subprocess.run(command + ['--baseline', output, '--threshold', '1000'],
+                                      capture_output=True, cwd=directory)
+
+        self.assertEqual([result['name'] for result in document['results']], ['parse_tle_text', 'propagate_bulk'])
+        self.assertEqual(document['results'][1]['units'], 200)
+        self.assertGreater(document['results'][0]['units_per_second'], 0)
+        self.assertEqual(document['parameters']['sizes'], [20])
+        self.assertEqual(compared.returncode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
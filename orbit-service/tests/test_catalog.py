@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test suite for the array-backed satellite catalog
+"""
+
+import unittest
+import json
+import pickle
+import sys
+import os
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sgp4.exporter import export_tle  # noqa: E402
+
+import batch_threat_analysis  # noqa: E402
+from batch_threat_analysis import BatchThreatAnalyzer, orbital_periods  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis, circular_satrec  # noqa: E402
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _gp_record(satnum, altitude_km, category, object_type):
+    line1, line2 = export_tle(circular_satrec(satnum, altitude_km, 53.0, 0.0, 0.0, EPOCH))
+    return {
+        'NORAD_CAT_ID': satnum,
+        'OBJECT_NAME': f'OBJECT {satnum}',
+        'TLE_LINE1': line1,
+        'TLE_LINE2': line2,
+        'CATEGORY': category,
+        'OBJECT_TYPE': object_type,
+    }
+
+
+class TestSatelliteCatalog(unittest.TestCase):
+    """Test cases for catalog construction and lookup"""
+
+    def setUp(self):
+        """Build a two-object catalog from service records"""
+        self.catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE], category='active')
+
+    def test_mapping_by_norad_id(self):
+        """Test the catalog behaves as a mapping of NORAD ID to record in catalog order"""
+        self.assertEqual(list(self.catalog), [25544, 24876])
+        self.assertIn(24876, self.catalog)
+        self.assertNotIn(1, self.catalog)
+        self.assertIn('24876', self.catalog)
+        self.assertNotIn(None, self.catalog)
+        self.assertIsNone(self.catalog.get(1))
+        self.assertEqual(self.catalog[24876].name, GPS_TLE['name'])
+
+    def test_record_matches_service_shape(self):
+        """Test record views expose the JSON fields of SatelliteData"""
+        record = self.catalog[25544].to_dict()
+
+        self.assertEqual(record['line1'], ISS_TLE['line1'])
+        self.assertEqual(record['epoch'], '2014-01-20T22:23:04.000416')
+        self.assertAlmostEqual(record['inclination'], 51.6498)
+        self.assertEqual(self.catalog[25544].category, 'active')
+
+    def test_rows_skip_unknown_ids(self):
+        """Test bulk lookup returns rows of known IDs in the order asked"""
+        rows = self.catalog.rows([24876, 99999, 25544])
+        self.assertEqual(rows.tolist(), [1, 0])
+
+    def test_duplicate_ids_keep_last_record(self):
+        """Test a repeated NORAD ID keeps the later element set"""
+        newer = dict(ISS_TLE, name='ISS (NEWER)')
+        catalog = SatelliteCatalog.from_records([ISS_TLE, newer])
+        self.assertEqual(len(catalog), 1)
+        self.assertEqual(catalog[25544].name, 'ISS (NEWER)')
+
+    def test_satrec_initialized_once(self):
+        """Test SGP4 records are built lazily and reused"""
+        first = self.catalog[25544].satrec
+        self.assertIs(first, self.catalog[25544].satrec)
+        self.assertEqual(first.satnum, 25544)
+
+    def test_pickle_drops_satrecs(self):
+        """Test pickled catalogs carry the arrays but not the SGP4 records"""
+        self.catalog[25544].satrec
+        restored = pickle.loads(pickle.dumps(self.catalog))
+
+        self.assertEqual(list(restored), list(self.catalog))
+        self.assertEqual(restored._satrecs, [None, None])
+
+    def test_gp_records_report_bad_tles(self):
+        """Test GP records are coded by category and type, with bad TLEs rejected"""
+        records = [_gp_record(90001, 550.0, 'stations', 'PAYLOAD'),
+                   _gp_record(90002, 560.0, 'no-such-group', 'DEBRIS'),
+                   {'OBJECT_NAME': 'BROKEN', 'TLE_LINE1': '1 0', 'TLE_LINE2': '2 0'}]
+        catalog = SatelliteCatalog.from_gp_records(records)
+
+        self.assertEqual(list(catalog), [90001, 90002])
+        self.assertEqual(catalog[90002].category, 'unknown')
+        self.assertEqual(catalog[90002].object_type, 'DEBRIS')
+        self.assertEqual([error['name'] for error in catalog.rejected], ['BROKEN'])
+
+
+class TestBatchPairSelection(unittest.TestCase):
+    """Test cases for vectorized pair selection in the batch analyzer"""
+
+    def test_pairs_follow_analysis_rules(self):
+        """Test priority, debris and period rules select the expected pairs"""
+        catalog = SatelliteCatalog.from_gp_records([
+            _gp_record(90001, 550.0, 'stations', 'PAYLOAD'),
+            _gp_record(90002, 20000.0, 'weather', 'DEBRIS'),
+            _gp_record(90003, 20100.0, 'weather', 'DEBRIS'),
+            _gp_record(90004, 20200.0, 'science', 'PAYLOAD'),
+            _gp_record(90005, 35786.0, 'science', 'PAYLOAD'),
+        ])
+        analyzer = BatchThreatAnalyzer.__new__(BatchThreatAnalyzer)
+
+        pairs = np.concatenate(list(analyzer._generate_satellite_pairs(catalog)))
+        norad_ids = catalog.column('norad_id')
+        selected = {tuple(norad_ids[pair].tolist()) for pair in pairs}
+
+        # The station pairs with everything; debris-debris is skipped; MEO and GEO periods differ
+        self.assertEqual(selected, {
+            (90001, 90002), (90001, 90003), (90001, 90004), (90001, 90005),
+            (90002, 90004), (90003, 90004),
+        })
+        self.assertEqual(pairs.dtype.kind, 'i')
+        self.assertTrue(np.all(pairs[:, 0] < pairs[:, 1]))
+
+    def test_pairs_are_generated_in_blocks(self):
+        """Test small blocks yield the same pairs as one block covering the catalog"""
+        catalog = SatelliteCatalog.from_gp_records([
+            _gp_record(90001 + i, 500.0 + 50.0 * i, 'science', 'DEBRIS' if i % 3 else 'PAYLOAD') for i in range(12)
+        ])
+        analyzer = BatchThreatAnalyzer.__new__(BatchThreatAnalyzer)
+
+        whole = np.concatenate(list(analyzer._generate_satellite_pairs(catalog)))
+        with mock.patch.object(batch_threat_analysis, 'PAIR_BLOCK_SIZE', 30):
+            blocks = list(analyzer._generate_satellite_pairs(catalog))
+
+        self.assertEqual(len(blocks), 6)
+        self.assertTrue(all(len(block) <= 30 for block in blocks))
+        np.testing.assert_array_equal(np.concatenate(blocks), whole)
+
+    def test_gp_period_is_preferred(self):
+        """Test the GP PERIOD field decides the period rule where a record has one"""
+        records = [_gp_record(90001, 20000.0, 'science', 'PAYLOAD'), _gp_record(90002, 35786.0, 'science', 'PAYLOAD')]
+        catalog = SatelliteCatalog.from_gp_records(records)
+        analyzer = BatchThreatAnalyzer.__new__(BatchThreatAnalyzer)
+        derived = orbital_periods(catalog, records)
+
+        records[1]['PERIOD'] = derived[0] * 1.05
+        periods = orbital_periods(catalog, records)
+
+        self.assertEqual(len(np.concatenate(list(analyzer._generate_satellite_pairs(catalog, derived)))), 0)
+        self.assertEqual(periods[1], records[1]['PERIOD'])
+        self.assertEqual(np.concatenate(list(analyzer._generate_satellite_pairs(catalog, periods))).tolist(),
+                         [[0, 1]])
+
+    def test_pool_gets_catalog_once(self):
+        """Test pool processes are started with the catalog and each batch sends only row pairs"""
+        client = InMemoryRedis()
+        for satnum in (90001, 90002, 90003):
+            client.setex(f'satellite:tle:{satnum}', 60, json.dumps(_gp_record(satnum, 550.0, 'stations', 'PAYLOAD')))
+        with mock.patch.object(batch_threat_analysis, 'connect', return_value=client):
+            analyzer = BatchThreatAnalyzer()
+        analyzer.analysis_start_time = EPOCH
+        submit = batch_threat_analysis.ProcessPoolExecutor.submit
+
+        with mock.patch.object(batch_threat_analysis, 'MAX_WORKERS', 1), \
+                mock.patch.object(batch_threat_analysis, 'BATCH_SIZE', 2), \
+                mock.patch.object(batch_threat_analysis.ProcessPoolExecutor, 'submit', autospec=True,
+                                  side_effect=submit) as submitted:
+            stats = analyzer.run_batch_analysis()
+
+        self.assertEqual(len(submitted.call_args_list), 2)
+        for call in submitted.call_args_list:
+            _, task, batch = call.args
+            self.assertIs(task, batch_threat_analysis._process_batch_task)
+            self.assertIsInstance(batch, np.ndarray)
+        # Identical orbits: every pair is at zero distance
+        self.assertEqual((stats['pairs_analyzed'], stats['threats_found']), (3, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Test suite for the in-process catalog cache
+"""
+
+import unittest
+import asyncio
+import json
+import sys
+import os
+import threading
+import time
+from unittest import mock
+
+from prometheus_client import REGISTRY
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as orbit_app  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis  # noqa: E402
+
+
+def _record(tle):
+    record = dict(tle)
+    record.update(epoch='2014-01-20T22:23:04', mean_motion=15.498, eccentricity=0.0003572,
+                  inclination=51.6498, arg_perigee=55.9686, raan=109.4756, mean_anomaly=274.8005)
+    return record
+
+
+class TestCatalogCache(unittest.TestCase):
+    """Test cases for version-keyed catalog reuse"""
+
+    def setUp(self):
+        """Install an in-memory Redis holding a published catalog"""
+        self.redis = InMemoryRedis()
+        self.redis.setex('tle_data:active', 3600, json.dumps({'25544': _record(ISS_TLE)}))
+        self.redis.setex('tle_data:active:version', 3600, 'v1')
+        patcher = mock.patch.object(orbit_app, 'redis_client', self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracker = orbit_app.AutonomousSatelliteTracker()
+
+    def test_catalog_decoded_once_per_version(self):
+        """Test repeated fetches only check the version key"""
+        first = asyncio.run(self.tracker.fetch_tle_data('active'))
+        self.redis.commands.clear()
+        second = asyncio.run(self.tracker.fetch_tle_data('active'))
+
+        self.assertIs(first, second)
+        self.assertEqual(self.redis.commands, ['get'])
+        self.assertIn(25544, second)
+
+    def test_new_version_replaces_catalog(self):
+        """Test publishing a new version triggers one reload"""
+        asyncio.run(self.tracker.fetch_tle_data('active'))
+        self.redis.setex('tle_data:active', 3600, json.dumps({'24876': _record(GPS_TLE)}))
+        self.redis.setex('tle_data:active:version', 3600, 'v2')
+
+        catalog = asyncio.run(self.tracker.fetch_tle_data('active'))
+        self.assertEqual(list(catalog), [24876])
+        self.assertIsNone(self.tracker.get_satellite(25544))
+
+    def test_get_satellite_memoizes_model(self):
+        """Test validated models are built once per catalog version"""
+        asyncio.run(self.tracker.fetch_tle_data('active'))
+        satellite = self.tracker.get_satellite(25544)
+        self.assertEqual(satellite.name, 'ISS (ZARYA)')
+        self.assertIs(satellite, self.tracker.get_satellite(25544))
+
+    def test_missing_version_key_is_backfilled(self):
+        """Test blobs written without a version key are only decoded once"""
+        self.redis.delete('tle_data:active:version')
+        asyncio.run(self.tracker.fetch_tle_data('active'))
+        self.assertIsNotNone(self.redis.get('tle_data:active:version'))
+
+        self.redis.commands.clear()
+        asyncio.run(self.tracker.fetch_tle_data('active'))
+        self.assertEqual(self.redis.commands, ['get'])
+
+    def test_backfilled_version_outlives_unexpiring_blob(self):
+        """Test a version key backfilled for a blob without a TTL is kept for CACHE_TTL, not one second"""
+        self.redis.delete('tle_data:active:version')
+        self.redis.expiry.pop('tle_data:active', None)
+        asyncio.run(self.tracker.fetch_tle_data('active'))
+        self.assertEqual(self.redis.expiry['tle_data:active:version'], orbit_app.config.CACHE_TTL)
+
+
+def _celestrak_response(*tles, delay=0.0):
+    """Build a fake requests.get that serves the given TLEs after ``delay`` seconds"""
+    text = '\n'.join(f"{tle['name']}\n{tle['line1']}\n{tle['line2']}" for tle in tles)
+
+    def fake_get(url, timeout=None):
+        time.sleep(delay)
+        return mock.Mock(text=text, raise_for_status=mock.Mock())
+    return mock.Mock(side_effect=fake_get)
+
+
+class TestCatalogSingleFlight(unittest.TestCase):
+    """Test cases for coalescing catalog downloads across threads and workers"""
+
+    def setUp(self):
+        """Install an empty in-memory Redis and a fresh tracker"""
+        self.redis = InMemoryRedis()
+        patcher = mock.patch.object(orbit_app, 'redis_client', self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracker = orbit_app.AutonomousSatelliteTracker()
+
+    def test_miss_downloads_and_releases_lease(self):
+        """Test the lease holder publishes the catalog and frees the lock"""
+        fake_get = _celestrak_response(ISS_TLE)
+        with mock.patch.object(orbit_app.requests, 'get', fake_get):
+            catalog = asyncio.run(self.tracker.fetch_tle_data('active'))
+
+        self.assertEqual(list(catalog), [25544])
+        self.assertIsNotNone(self.redis.get('tle_data:active'))
+        self.assertIsNone(self.redis.get('tle_data:active:lock'))
+
+    def test_concurrent_misses_download_once(self):
+        """Test threads racing on the same miss share one download"""
+        fake_get = _celestrak_response(ISS_TLE, delay=0.2)
+        results = []
+
+        def fetch():
+            results.append(asyncio.run(self.tracker.fetch_tle_data('active')))
+
+        with mock.patch.object(orbit_app.requests, 'get', fake_get):
+            threads = [threading.Thread(target=fetch) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(fake_get.call_count, 1)
+        self.assertTrue(all(list(result) == [25544] for result in results))
+
+    def test_other_worker_holding_lease_serves_stale_copy(self):
+        """Test a worker with a previous catalog keeps serving it while another refreshes"""
+        self.tracker._install_catalog('active', {'25544': _record(ISS_TLE)}, 'v1')
+        self.redis.set('tle_data:active:lock', 'other-worker', ex=45)
+        fake_get = _celestrak_response(GPS_TLE)
+
+        with mock.patch.object(orbit_app.requests, 'get', fake_get):
+            catalog = asyncio.run(self.tracker.fetch_tle_data('active'))
+
+        self.assertEqual(list(catalog), [25544])
+        fake_get.assert_not_called()
+
+    def test_other_worker_holding_lease_is_awaited(self):
+        """Test a cold worker waits for the lease holder's result instead of downloading"""
+        self.redis.set('tle_data:active:lock', 'other-worker', ex=45)
+        fake_get = _celestrak_response(GPS_TLE)
+
+        async def publish_while_waiting(delay):
+            self.redis.setex('tle_data:active', 3600, json.dumps({'25544': _record(ISS_TLE)}))
+            self.redis.setex('tle_data:active:version', 3600, 'v1')
+
+        with mock.patch.object(orbit_app.requests, 'get', fake_get), \
+                mock.patch.object(orbit_app.asyncio, 'sleep', side_effect=publish_while_waiting):
+            catalog = asyncio.run(self.tracker.fetch_tle_data('active'))
+
+        self.assertEqual(list(catalog), [25544])
+        self.assertEqual(self.tracker.catalog_versions['active'], 'v1')
+        fake_get.assert_not_called()
+
+    def test_abandoned_lease_is_taken_over(self):
+        """Test a waiter downloads itself once the holder's lease disappears"""
+        self.redis.set('tle_data:active:lock', 'other-worker', ex=45)
+        fake_get = _celestrak_response(GPS_TLE)
+
+        async def expire_lease(delay):
+            self.redis.delete('tle_data:active:lock')
+
+        with mock.patch.object(orbit_app.requests, 'get', fake_get), \
+                mock.patch.object(orbit_app.asyncio, 'sleep', side_effect=expire_lease):
+            catalog = asyncio.run(self.tracker.fetch_tle_data('active'))
+
+        self.assertEqual(list(catalog), [24876])
+        fake_get.assert_called_once()
+
+
+class TestBackgroundRefresh(unittest.TestCase):
+    """Test cases for stale-while-revalidate catalog refresh"""
+
+    def setUp(self):
+        """Install an in-memory Redis and a tracker holding an old catalog"""
+        self.redis = InMemoryRedis()
+        patcher = mock.patch.object(orbit_app, 'redis_client', self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tracker = orbit_app.AutonomousSatelliteTracker()
+        self.tracker._install_catalog('active', {'25544': _record(ISS_TLE)}, 'v1')
+
+    def test_expired_catalog_is_served_stale_while_refreshing(self):
+        """Test requests never download when the refresher is running"""
+        fake_get = _celestrak_response(GPS_TLE)
+        with mock.patch.object(self.tracker, 'refresh_running', return_value=True), \
+                mock.patch.object(orbit_app.requests, 'get', fake_get):
+            catalog = asyncio.run(self.tracker.fetch_tle_data('active'))
+
+        self.assertEqual(list(catalog), [25544])
+        fake_get.assert_not_called()
+        self.assertTrue(self.tracker._refresh_wakeup.is_set())
+
+    def test_refresh_ahead_of_expiry(self):
+        """Test a catalog inside the refresh margin is downloaded and swapped in"""
+        self.redis.setex('tle_data:active', 60, json.dumps({'25544': _record(ISS_TLE)}))
+        self.redis.setex('tle_data:active:version', 60, 'v1')
+        fake_get = _celestrak_response(GPS_TLE)
+
+        with mock.patch.object(orbit_app.requests, 'get', fake_get):
+            self.tracker.refresh_catalog('active')
+
+        self.assertEqual(list(self.tracker.tle_data['active']), [24876])
+        self.assertEqual(self.redis.expiry['tle_data:active'], orbit_app.config.CACHE_TTL)
+        self.assertIsNotNone(self.redis.get('tle_data:active:updated'))
+
+    def test_fresh_catalog_from_other_worker_is_loaded(self):
+        """Test the refresher installs a newer published version without downloading"""
+        self.redis.setex('tle_data:active', 3600, json.dumps({'24876': _record(GPS_TLE)}))
+        self.redis.setex('tle_data:active:version', 3600, 'v2')
+        self.redis.setex('tle_data:active:updated', 3600, '2024-05-01T12:00:00+00:00')
+        fake_get = _celestrak_response(GPS_TLE)
+
+        with mock.patch.object(orbit_app.requests, 'get', fake_get):
+            self.tracker.refresh_catalog('active')
+
+        fake_get.assert_not_called()
+        self.assertEqual(self.tracker.catalog_versions['active'], 'v2')
+        self.assertEqual(self.tracker.last_update.isoformat(), '2024-05-01T12:00:00+00:00')
+
+    def test_refresher_starts_once(self):
+        """Test the refresher thread is started once and checks the default catalog"""
+        refreshed = threading.Event()
+        with mock.patch.object(self.tracker, 'refresh_catalog', side_effect=lambda source: refreshed.set()):
+            self.assertTrue(self.tracker.start_background_refresh())
+            self.assertFalse(self.tracker.start_background_refresh())
+            self.assertTrue(refreshed.wait(1))
+            self.assertTrue(self.tracker.refresh_running())
+            self.tracker.stop_background_refresh()
+        self.assertFalse(self.tracker.refresh_running())
+
+    def test_refresher_skips_unknown_sources(self):
+        """Test only served catalog names are refreshed, whatever else was installed or requested"""
+        self.tracker._install_catalog('bogus', {'25544': _record(ISS_TLE)}, 'v1')
+        self.tracker.request_refresh('bogus')
+        refreshed = []
+        checked = threading.Event()
+
+        def refresh(source):
+            refreshed.append(source)
+            checked.set()
+
+        with mock.patch.object(self.tracker, 'refresh_catalog', side_effect=refresh):
+            self.tracker.start_background_refresh()
+            self.assertTrue(checked.wait(1))
+            self.tracker.stop_background_refresh()
+        self.assertEqual(set(refreshed), {'active'})
+
+    def test_unknown_source_is_rejected(self):
+        """Test requests naming an unknown catalog get 400 and leave no catalog or metric behind"""
+        client = orbit_app.app.test_client()
+        with mock.patch.object(orbit_app, 'tracker', self.tracker):
+            listing = client.get('/satellites?source=no-such-group')
+            positions = client.post('/satellites/positions', json={'source': 'no-such-group'})
+
+        self.assertEqual((listing.status_code, positions.status_code), (400, 400))
+        self.assertNotIn('no-such-group', self.tracker.tle_data)
+        with self.assertRaises(ValueError):
+            asyncio.run(self.tracker.fetch_tle_data('no-such-group'))
+        self.assertIsNone(REGISTRY.get_sample_value('orbit_tle_fetch_seconds_count', {'source': 'no-such-group'}))
+
+    def test_health_reports_catalog_age(self):
+        """Test /health reports freshness from the last upstream download"""
+        with mock.patch.object(orbit_app, 'tracker', self.tracker):
+            data = orbit_app.app.test_client().get('/health').get_json()
+
+        self.assertEqual(data['services']['data_freshness'], 'fresh')
+        self.assertLess(data['services']['catalog_age_seconds'], 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test suite for the sorted catalog indexes and field projection
+"""
+
+import unittest
+import sys
+import os
+from datetime import timedelta, timezone
+
+import numpy as np
+
+# Add parent directory to path
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+
+from benchmarks.synthetic_catalog import generate_catalog  # noqa: E402
+from catalog import CATEGORY_NAMES, SatelliteCatalog  # noqa: E402
+from catalog_index import CatalogIndex, orbit_altitudes, project  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+
+
+class TestCatalogIndex(unittest.TestCase):
+    """Test cases for index queries against a brute-force scan"""
+
+    @classmethod
+    def setUpClass(cls):
+        records = generate_catalog(2000, seed=7)
+        names = [record['name'] for record in records]
+        categories = [CATEGORY_NAMES[1 + i % 4] for i in range(len(records))]
+        cls.catalog = SatelliteCatalog.from_lines(
+            names, [record['line1'] for record in records], [record['line2'] for record in records],
+            categories=categories
+        )
+        cls.index = CatalogIndex(cls.catalog)
+        cls.perigee, cls.apogee = orbit_altitudes(
+            cls.catalog.column('mean_motion'), cls.catalog.column('eccentricity')
+        )
+
+    def test_range_matches_scan(self):
+        """Test inclusive and open-ended ranges select exactly the rows a scan selects"""
+        inclination = self.catalog.column('inclination')
+        low, high = np.percentile(inclination, [20, 60])
+
+        rows = self.index.query({'inclination': (low, high)})
+        expected = np.flatnonzero((inclination >= low) & (inclination <= high))
+        np.testing.assert_array_equal(rows, expected)
+        np.testing.assert_array_equal(self.index.query({'perigee_km': (None, 1000.0)}),
+                                      np.flatnonzero(self.perigee <= 1000.0))
+
+    def test_combined_conditions(self):
+        """Test ranges, categories and a name prefix are intersected and returned in catalog order"""
+        rows = self.index.query({'apogee_km': (500.0, None), 'eccentricity': (None, 0.01)},
+                                categories=['stations', 'gps'], name_prefix='synth')
+
+        names = np.char.upper(self.catalog.names)
+        expected = np.flatnonzero(
+            (self.apogee >= 500.0) & (self.catalog.column('eccentricity') <= 0.01)
+            & self.catalog.category_mask('stations', 'gps') & np.char.startswith(names, 'SYNTH')
+        )
+        np.testing.assert_array_equal(rows, expected)
+        self.assertTrue(len(rows))
+
+    def test_epoch_and_empty_results(self):
+        """Test epoch bounds take datetimes and unmatched conditions give no rows"""
+        epoch = self.catalog.record(0).epoch
+        self.assertEqual(len(self.index.query({'epoch': (epoch - timedelta(days=1), None)})), len(self.catalog))
+        self.assertEqual(len(self.index.query({'epoch': (epoch + timedelta(days=1), None)})), 0)
+        # Aware bounds are compared in UTC, whatever their zone
+        east = timezone(timedelta(hours=5, minutes=30))
+        np.testing.assert_array_equal(
+            self.index.query({'epoch': (None, epoch.replace(tzinfo=timezone.utc).astimezone(east))}),
+            self.index.query({'epoch': (None, epoch)})
+        )
+        self.assertEqual(len(self.index.query(name_prefix='NO SUCH')), 0)
+        self.assertEqual(len(self.index.query(categories=['gps', 'no-such-category'])), 0)
+        with self.assertRaises(ValueError):
+            self.index.query({'raan': (0.0, 1.0)})
+
+    def test_projection(self):
+        """Test the default projection equals the record dicts and fields can be narrowed"""
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE], category='stations')
+        rows = np.arange(len(catalog))
+
+        self.assertEqual(project(catalog, rows), [record.to_dict() for record in catalog.values()])
+        self.assertEqual(project(catalog, rows[1:], ('norad_id', 'category')),
+                         [{'norad_id': GPS_TLE['norad_id'], 'category': 'stations'}])
+
+    def test_altitudes(self):
+        """Test the ISS sits around 420 km"""
+        catalog = SatelliteCatalog.from_records([ISS_TLE])
+        perigee, apogee = orbit_altitudes(catalog.column('mean_motion'), catalog.column('eccentricity'))
+        self.assertTrue(400.0 < perigee[0] <= apogee[0] < 440.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test suite for the bounded compute pool and load shedding
+"""
+
+import unittest
+import math
+import sys
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from compute_pool import ComputePool, ComputePoolBusy, parse_limits  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis  # noqa: E402
+
+
+def _wait_idle(pool, seconds=10):
+    deadline = time.monotonic() + seconds
+    while pool.stats()['in_flight'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestComputePool(unittest.TestCase):
+    """Test cases for admission control and the worker processes"""
+
+    def setUp(self):
+        self.pool = ComputePool(1, 1, {'slow': 1})
+        self.addCleanup(self.pool.shutdown)
+
+    def test_tasks_run_in_another_process(self):
+        """Test tasks are computed in a pool process and their results returned"""
+        self.pool.start()
+        self.assertEqual(self.pool.run('math', math.factorial, 10), 3628800)
+        self.assertNotEqual(self.pool.run('math', os.getpid), os.getpid())
+
+    def test_full_pool_sheds_load(self):
+        """Test requests beyond an endpoint's limit or the queue are rejected at once"""
+        running = self.pool.submit('slow', time.sleep, 0.5)
+        with self.assertRaises(ComputePoolBusy) as busy:
+            self.pool.submit('slow', time.sleep, 0.5)
+        self.assertEqual(busy.exception.endpoint, 'slow')
+        queued = self.pool.submit('other', time.sleep, 0.1)
+
+        started = time.monotonic()
+        with self.assertRaises(ComputePoolBusy) as busy:
+            self.pool.submit('other', time.sleep, 0.1)
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertGreaterEqual(busy.exception.retry_after, 1)
+
+        running.result()
+        queued.result()
+        _wait_idle(self.pool)
+        stats = self.pool.stats()
+        self.assertEqual(stats['rejected'], {'slow': 1, 'other': 1})
+        self.assertEqual((stats['in_flight'], stats['completed']), (0, 2))
+
+    def test_dead_worker_is_replaced(self):
+        """Test a task that kills its process fails alone and the next task gets a new pool"""
+        with self.assertRaises(BrokenProcessPool):
+            self.pool.run('crash', os._exit, 1)
+        _wait_idle(self.pool)
+        self.assertEqual(self.pool.run('math', math.factorial, 5), 120)
+        self.assertEqual(self.pool.stats()['failed'], 1)
+
+    def test_gevent_wait_runs_on_hub_threadpool(self):
+        """Test under gevent the wait for a result is handed to the hub's native thread pool"""
+        hub = mock.Mock()
+        hub.threadpool.maxsize = 1
+        hub.threadpool.spawn.side_effect = lambda wait: mock.Mock(get=wait)
+        gevent = mock.Mock(get_hub=mock.Mock(return_value=hub))
+
+        with mock.patch.dict(sys.modules, {'gevent': gevent}):
+            self.assertEqual(self.pool.run('math', math.factorial, 6), 720)
+
+        hub.threadpool.spawn.assert_called_once()
+        self.assertEqual(hub.threadpool.maxsize, self.pool.capacity)
+
+    def test_parse_limits(self):
+        """Test per-endpoint limits are read from a comma separated list"""
+        self.assertEqual(parse_limits('passes=2, conjunctions=1,,bad'), {'passes': 2, 'conjunctions': 1})
+
+
+class TestLoadShedding(unittest.TestCase):
+    """Test cases for heavy endpoints under a saturated pool"""
+
+    def setUp(self):
+        """Set up test client with a stubbed catalog and an exhausted pool"""
+        orbit_app.app.config['TESTING'] = True
+        self.client = orbit_app.app.test_client()
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        for patcher in (
+            mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog)),
+            mock.patch.object(orbit_app, 'redis_client', None),
+            mock.patch.object(orbit_app, 'compute_pool', ComputePool(0, 0, {'passes': 0, 'screening': 0})),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_heavy_request_gets_429(self):
+        """Test a shed request is answered 429 with Retry-After while health checks still pass"""
+        response = self.client.get('/passes?lat=40.7&lon=-74.0&hours=6')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        self.assertEqual(response.get_json()['retry_after_seconds'], 1)
+        health = self.client.get('/health').get_json()
+        self.assertEqual(health['services']['compute_pool']['rejected'], {'passes': 1})
+
+    def test_shed_screening_records_no_job(self):
+        """Test a screening job the pool cannot take is rejected without leaving a job behind"""
+        with mock.patch.object(orbit_app, 'redis_client', InMemoryRedis()), \
+                mock.patch.object(orbit_app, '_save_screening_job') as save:
+            response = self.client.get('/threats/conjunctions?mode=full&hours=1')
+
+        self.assertEqual(response.status_code, 429)
+        save.assert_not_called()
+
+    def test_light_endpoints_bypass_pool(self):
+        """Test lookups that need no computation are served while the pool is full"""
+        response = self.client.get('/satellites?source=active')
+        self.assertEqual(response.status_code, 200)
+
+
+class TestPooledEndpoints(unittest.TestCase):
+    """Test cases for endpoints served through real pool processes"""
+
+    def setUp(self):
+        """Set up test client with a stubbed catalog and a one-process pool"""
+        self.client = orbit_app.app.test_client()
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        self.pool = ComputePool(1, 1, start_method='spawn', initializer=orbit_app._init_compute_worker,
+                                reporter=orbit_app._report_compute_worker)
+        self.addCleanup(self.pool.shutdown)
+        for patcher in (
+            mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog)),
+            mock.patch.dict(orbit_app.tracker.tle_data, {'active': catalog}),
+            mock.patch.dict(orbit_app.tracker.satellites_cache, {'active': {}}),
+            mock.patch.object(orbit_app, 'compute_pool', self.pool),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_visible_matches_inline(self):
+        """Test a body computed in a pool process equals the one computed inline"""
+        url = '/satellites/visible?lat=0&lon=0&min_elevation=-90&timestamp=2014-01-21T12:00:00Z'
+        pooled = self.client.get(url).get_json()
+        with mock.patch.object(orbit_app, 'compute_pool', ComputePool(0, 0)):
+            inline = self.client.get(url).get_json()
+
+        self.assertEqual(self.pool.stats()['completed'], 1)
+        self.assertEqual(pooled['count'], 2)
+        for body in (pooled, inline):
+            body.pop('timestamp')
+        self.assertEqual(pooled, inline)
+
+    def test_cheap_route_answers_while_pool_busy(self):
+        """Test health checks and listings are served while a heavy request waits on the pool"""
+        self.pool.start()
+        heavy = threading.Thread(target=self.pool.run, args=('slow', time.sleep, 1.0))
+        heavy.start()
+        self.addCleanup(heavy.join)
+        while not self.pool.stats()['in_flight']:
+            time.sleep(0.01)
+
+        started = time.monotonic()
+        health = self.client.get('/health')
+        listing = self.client.get('/satellites?limit=1')
+
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual((health.status_code, listing.status_code), (200, 200))
+        self.assertTrue(heavy.is_alive())
+
+    def test_health_counts_pool_caches(self):
+        """Test /health includes the caches of the pool processes that predicted passes"""
+        local = orbit_app.pass_cache.stats()
+        for _ in range(2):
+            response = self.client.get(f"/satellites/{ISS_TLE['norad_id']}/passes?lat=40.7&lon=-74.0&hours=6")
+            self.assertEqual(response.status_code, 200)
+
+        health = self.client.get('/health').get_json()['services']
+        self.assertEqual(len(self.pool.worker_reports()), 1)
+        self.assertEqual(health['pass_cache']['misses'] - local['misses'], 1)
+        self.assertEqual(health['pass_cache']['hits'] + health['pass_cache']['partial_hits']
+                         - local['hits'] - local['partial_hits'], 1)
+        self.assertGreater(health['propagator_cache']['misses'], orbit_app.propagator_cache.stats()['misses'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test suite for the Chebyshev ephemeris tables
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sgp4.api import Satrec  # noqa: E402
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from ephemeris import ChebyshevEphemeris, chebyshev_basis  # noqa: E402
+from propagation import propagate_catalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+
+START = datetime(2014, 1, 21, 0, 0, tzinfo=timezone.utc)
+NORAD_IDS = [25544, 24876]
+
+
+def _satrecs():
+    return [Satrec.twoline2rv(tle['line1'], tle['line2']) for tle in (ISS_TLE, GPS_TLE)]
+
+
+def _build(satrecs, start=START, previous=None, tolerance_km=0.1):
+    return ChebyshevEphemeris.build(NORAD_IDS, satrecs, start, 2, 10, 7, tolerance_km, previous)
+
+
+class TestChebyshevEphemeris(unittest.TestCase):
+    """Test cases for fitting and evaluating ephemeris tables"""
+
+    def setUp(self):
+        """Fit a two-hour table for the ISS and a GPS satellite"""
+        self.satrecs = _satrecs()
+        self.ephemeris = _build(self.satrecs)
+
+    def test_basis_derivative(self):
+        """Test the basis slopes match finite differences of the values"""
+        x = np.linspace(-0.9, 0.9, 7)
+        values, slopes = chebyshev_basis(x, 8)
+        ahead, _ = chebyshev_basis(x + 1e-6, 8)
+        behind, _ = chebyshev_basis(x - 1e-6, 8)
+        np.testing.assert_allclose(slopes, (ahead - behind) / 2e-6, atol=1e-5)
+
+    def test_matches_sgp4_inside_window(self):
+        """Test table positions and velocities agree with SGP4 between fit nodes"""
+        timestamps = [START + timedelta(minutes=minutes) for minutes in (0.5, 17.3, 64.9, 119.0)]
+        rows = self.ephemeris.lookup(NORAD_IDS, self.satrecs)
+        table = self.ephemeris.propagate(self.satrecs, rows, timestamps)
+        exact = propagate_catalog(self.satrecs, timestamps)
+
+        self.assertEqual(rows.tolist(), [0, 1])
+        self.assertLess(np.abs(table['position_teme'] - exact['position_teme']).max(), 0.01)
+        self.assertLess(np.abs(table['velocity_teme'] - exact['velocity_teme']).max(), 1e-4)
+        np.testing.assert_allclose(table['latitude'], exact['latitude'], atol=1e-4)
+
+    def test_window_coverage(self):
+        """Test only timestamps inside the fitted segments are covered"""
+        self.assertTrue(self.ephemeris.covers([START, START + timedelta(minutes=119)]))
+        self.assertFalse(self.ephemeris.covers([START + timedelta(hours=2)]))
+        self.assertFalse(self.ephemeris.covers([START - timedelta(seconds=1)]))
+
+    def test_unchanged_inputs_return_same_table(self):
+        """Test a rebuild in the same segment with the same TLEs is a no-op"""
+        again = _build(self.satrecs, START + timedelta(minutes=5), previous=self.ephemeris)
+        self.assertIs(again, self.ephemeris)
+
+    def test_rolling_window_reuses_segments(self):
+        """Test rolling forward keeps the shared segments and fits only the tail"""
+        rolled = _build(self.satrecs, START + timedelta(minutes=10), previous=self.ephemeris)
+
+        self.assertEqual(rolled.first_segment, self.ephemeris.first_segment + 1)
+        np.testing.assert_array_equal(rolled.coefficients[:, :-1], self.ephemeris.coefficients[:, 1:])
+        self.assertTrue(rolled.covers([START + timedelta(minutes=125)]))
+
+    def test_new_tle_epoch_is_refitted(self):
+        """Test a changed element set misses the old table and is refitted on rebuild"""
+        line1 = ISS_TLE['line1'][:18] + '14021.93268519' + ISS_TLE['line1'][32:]
+        checksum = sum(int(c) if c.isdigit() else c == '-' for c in line1[:68]) % 10
+        updated = [Satrec.twoline2rv(line1[:68] + str(checksum), ISS_TLE['line2']), self.satrecs[1]]
+
+        self.assertEqual(self.ephemeris.lookup(NORAD_IDS, updated).tolist(), [-1, 1])
+        rebuilt = _build(updated, previous=self.ephemeris)
+        self.assertEqual(rebuilt.lookup(NORAD_IDS, updated).tolist(), [0, 1])
+        self.assertFalse(np.array_equal(rebuilt.coefficients[0], self.ephemeris.coefficients[0]))
+        np.testing.assert_array_equal(rebuilt.coefficients[1], self.ephemeris.coefficients[1])
+
+    def test_fits_outside_tolerance_fall_back_to_sgp4(self):
+        """Test satellites whose fit misses the error bound are propagated exactly"""
+        strict = _build(self.satrecs, tolerance_km=1e-9)
+        rows = strict.lookup(NORAD_IDS, self.satrecs)
+        timestamps = [START + timedelta(minutes=30)]
+
+        self.assertEqual(rows.tolist(), [-1, -1])
+        self.assertEqual(strict.stats()['sgp4_fallbacks'], 2)
+        np.testing.assert_array_equal(strict.propagate(self.satrecs, rows, timestamps)['position_teme'],
+                                      propagate_catalog(self.satrecs, timestamps)['position_teme'])
+
+
+class TestEphemerisService(unittest.TestCase):
+    """Test cases for serving positions from the tracker's ephemeris"""
+
+    def setUp(self):
+        """Install a catalog without touching Redis"""
+        self.tracker = orbit_app.AutonomousSatelliteTracker()
+        self.tracker._install_catalog('active', SatelliteCatalog.from_records([ISS_TLE, GPS_TLE]), 'v1')
+        patcher = mock.patch.object(orbit_app, 'datetime', wraps=datetime)
+        self.clock = patcher.start()
+        self.clock.now.return_value = START + timedelta(minutes=10)
+        self.addCleanup(patcher.stop)
+
+    def test_positions_read_from_table(self):
+        """Test positions inside the window come from the table and match SGP4"""
+        ephemeris = self.tracker.update_ephemeris('active')
+        records = self.tracker.tle_data['active'].records()
+        timestamps = [START + timedelta(minutes=42)]
+
+        with mock.patch.object(ephemeris, 'propagate', wraps=ephemeris.propagate) as table:
+            positions = self.tracker.calculate_positions(records, timestamps, 'active')
+        exact = self.tracker.calculate_positions(records, timestamps)
+
+        table.assert_called_once()
+        np.testing.assert_allclose(positions['latitude'], exact['latitude'], atol=1e-4)
+        self.assertEqual(self.tracker.update_ephemeris('active'), ephemeris)
+
+    def test_outside_window_uses_sgp4(self):
+        """Test timestamps past the window are propagated directly"""
+        ephemeris = self.tracker.update_ephemeris('active')
+        records = self.tracker.tle_data['active'].records()
+
+        with mock.patch.object(ephemeris, 'propagate') as table:
+            self.tracker.calculate_positions(records, [START + timedelta(days=2)], 'active')
+        table.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test suite for ground-track splitting, simplification and the endpoint
+"""
+
+import unittest
+import sys
+import os
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from ground_tracks import compact_track, pixel_tolerance_deg, simplify, split_track  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+
+
+class TestTrackGeometry(unittest.TestCase):
+    """Test cases for antimeridian splitting and simplification"""
+
+    def test_split_at_antimeridian(self):
+        """Test a crossing closes one piece on the edge and opens the next on the opposite edge"""
+        offsets = np.array([0.0, 60.0, 120.0, 180.0])
+        latitude = np.array([0.0, 10.0, 20.0, 30.0])
+        longitude = np.array([170.0, 178.0, -178.0, -170.0])
+
+        pieces = split_track(offsets, latitude, longitude)
+
+        self.assertEqual(len(pieces), 2)
+        first_offsets, first_latitude, first_longitude = pieces[0]
+        second_offsets, second_latitude, second_longitude = pieces[1]
+        self.assertEqual(first_longitude.tolist(), [170.0, 178.0, 180.0])
+        self.assertEqual(second_longitude.tolist(), [-180.0, -178.0, -170.0])
+        self.assertAlmostEqual(first_offsets[-1], 90.0)
+        self.assertAlmostEqual(first_latitude[-1], second_latitude[0])
+        self.assertAlmostEqual(second_offsets[0], 90.0)
+
+    def test_failed_samples_break_track(self):
+        """Test NaN samples are dropped and split the track"""
+        offsets = np.arange(5.0)
+        latitude = np.array([0.0, 1.0, np.nan, 3.0, 4.0])
+        longitude = np.array([0.0, 1.0, np.nan, 3.0, 4.0])
+
+        pieces = split_track(offsets, latitude, longitude)
+
+        self.assertEqual([piece[0].tolist() for piece in pieces], [[0.0, 1.0], [3.0, 4.0]])
+
+    def test_simplify_drops_collinear_points(self):
+        """Test points within tolerance of a straight line are removed"""
+        longitude = np.linspace(0.0, 10.0, 11)
+        latitude = longitude * 0.5
+        latitude[5] += 0.01
+
+        self.assertEqual(simplify(longitude, latitude, 0.1).sum(), 2)
+        self.assertTrue(simplify(longitude, latitude, 0.001)[5])
+
+    def test_pixel_tolerance(self):
+        """Test pixel tolerances scale with the map width"""
+        self.assertAlmostEqual(pixel_tolerance_deg(1.0, 360), 1.0)
+        self.assertAlmostEqual(pixel_tolerance_deg(2.0, 1440), 0.5)
+
+    def test_compact_track_is_json_ready(self):
+        """Test segments hold [lon, lat] pairs and offsets as plain lists"""
+        segments = compact_track(np.array([0.0, 60.0]), np.array([1.0, 2.0]), np.array([3.0, 4.0]))
+        self.assertEqual(segments, [{'offsets': [0.0, 60.0], 'coordinates': [[3.0, 1.0], [4.0, 2.0]]}])
+
+
+class TestGroundTrackEndpoint(unittest.TestCase):
+    """Test cases for /satellites/groundtrack"""
+
+    def setUp(self):
+        """Set up test client with a stubbed catalog"""
+        self.client = orbit_app.app.test_client()
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        patcher = mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_track_matches_positions(self):
+        """Test an orbit-long track agrees with the bulk positions and wraps at the edge"""
+        start = '2014-01-21T12:00:00Z'
+        response = self.client.get(f'/satellites/groundtrack?ids=25544&start={start}&duration=100&step=60')
+        self.assertEqual(response.status_code, 200)
+        track = response.get_json()['tracks'][0]
+
+        self.assertEqual(track['norad_id'], 25544)
+        self.assertGreaterEqual(len(track['segments']), 2)
+        self.assertEqual(abs(track['segments'][0]['coordinates'][-1][0]), 180.0)
+        for segment in track['segments']:
+            self.assertLess(np.abs(np.diff(np.array(segment['coordinates'])[:, 0])).max(), 180.0)
+
+        position = self.client.get(f'/satellites/positions?ids=25544&timestamp={start}').get_json()
+        self.assertEqual(track['segments'][0]['offsets'][0], 0.0)
+        self.assertAlmostEqual(track['segments'][0]['coordinates'][0][1], position['latitude'][0][0], places=3)
+
+    def test_simplified_track_is_shorter(self):
+        """Test a pixel tolerance removes redundant points"""
+        query = '/satellites/groundtrack?ids=25544,24876&start=2014-01-21T12:00:00Z&duration=720&step=30'
+        full = self.client.get(query).get_json()
+        simplified = self.client.get(query + '&tolerance_px=1&map_width=1024').get_json()
+
+        def points(data):
+            return sum(len(segment['offsets']) for track in data['tracks'] for segment in track['segments'])
+
+        self.assertEqual(simplified['count'], 2)
+        self.assertLess(points(simplified), points(full) / 2)
+
+    def test_rejects_unknown_and_oversized_requests(self):
+        """Test unknown satellites and too many points are reported"""
+        self.assertEqual(self.client.get('/satellites/groundtrack?ids=1').status_code, 404)
+        self.assertEqual(self.client.get('/satellites/groundtrack?ids=25544&duration=6000&step=1').status_code, 400)
+        self.assertEqual(self.client.get('/satellites/groundtrack').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test suite for Prometheus instrumentation
+"""
+
+import unittest
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import os
+import tempfile
+from unittest import mock
+
+import redis
+from prometheus_client import REGISTRY
+
+# Add parent directory to path
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+
+import app as orbit_app  # noqa: E402
+from batch_threat_analysis import BatchThreatAnalyzer  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from pass_cache import PassPredictionCache  # noqa: E402
+from redis_store import InstrumentedRedis  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis  # noqa: E402
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestServiceMetrics(unittest.TestCase):
+    """Test cases for API instrumentation"""
+
+    def setUp(self):
+        """Set up test client"""
+        self.client = orbit_app.app.test_client()
+
+    def test_scrape_lists_request_latency(self):
+        """Test /metrics exposes per-endpoint latency in the text format"""
+        self.client.get('/health')
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        self.assertIn(b'orbit_http_request_seconds_bucket{endpoint="/health"', response.data)
+
+    def test_fetch_counts_where_catalog_came_from(self):
+        """Test Redis and in-process catalog hits are counted separately"""
+        store = InMemoryRedis()
+        store.setex('tle_data:metrics', 3600, json.dumps(SatelliteCatalog.from_records([ISS_TLE]).to_records()))
+        store.setex('tle_data:metrics:version', 3600, 'v1')
+        tracker = orbit_app.AutonomousSatelliteTracker()
+        before = {result: _sample('orbit_tle_fetch_total', source='metrics', result=result)
+                  for result in ('redis', 'memory')}
+
+        with mock.patch.object(orbit_app, 'redis_client', store), \
+                mock.patch.dict(orbit_app.CATALOG_SOURCES, {'metrics': 'metrics'}):
+            asyncio.run(tracker.fetch_tle_data('metrics'))
+            asyncio.run(tracker.fetch_tle_data('metrics'))
+
+        self.assertEqual(_sample('orbit_tle_fetch_total', source='metrics', result='redis') - before['redis'], 1)
+        self.assertEqual(_sample('orbit_tle_fetch_total', source='metrics', result='memory') - before['memory'], 1)
+
+    def test_bulk_positions_count_propagated_states(self):
+        """Test propagation throughput counts one state per satellite and timestamp"""
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        before = _sample('orbit_propagated_states_total', component='api', method='sgp4')
+        timings = _sample('orbit_compute_seconds_count', operation='calculate_positions')
+
+        orbit_app.tracker.calculate_positions(catalog.records(), [orbit_app.datetime(2014, 1, 21)] * 3)
+
+        self.assertEqual(_sample('orbit_propagated_states_total', component='api', method='sgp4') - before, 6)
+        self.assertEqual(_sample('orbit_compute_seconds_count', operation='calculate_positions') - timings, 1)
+
+    def test_pass_cache_counts_lookups(self):
+        """Test pass cache hits, tail extensions and misses are counted by outcome"""
+        start = orbit_app.datetime(2014, 1, 21)
+        cache = PassPredictionCache(None, 100, 0.1, 3600)
+        results = ('memory', 'redis', 'tail', 'miss')
+        before = {result: _sample('orbit_pass_cache_lookups_total', result=result) for result in results}
+
+        cache.get_or_compute('passes:metrics', start, start + orbit_app.timedelta(hours=24), lambda t0, t1: [])
+        cache.get_or_compute('passes:metrics', start, start + orbit_app.timedelta(hours=12), lambda t0, t1: [])
+        cache.get_or_compute('passes:metrics', start, start + orbit_app.timedelta(hours=30), lambda t0, t1: [])
+
+        counted = {result: _sample('orbit_pass_cache_lookups_total', result=result) - before[result]
+                   for result in results}
+        self.assertEqual(counted, {'memory': 1, 'redis': 0, 'tail': 1, 'miss': 1})
+
+
+class TestRedisMetrics(unittest.TestCase):
+    """Test cases for Redis round-trip timing"""
+
+    def test_commands_and_pipelines_are_timed(self):
+        """Test single commands are timed by name and a pipeline as one round trip"""
+        client = InstrumentedRedis()
+        before = {command: _sample('orbit_redis_command_seconds_count', command=command)
+                  for command in ('get', 'pipeline')}
+
+        with mock.patch.object(redis.Redis, 'execute_command', return_value=None), \
+                mock.patch.object(redis.client.Pipeline, 'execute', return_value=[]):
+            client.get('key')
+            pipe = client.pipeline()
+            pipe.setex('key', 1, 'value')
+            pipe.execute()
+
+        self.assertEqual(_sample('orbit_redis_command_seconds_count', command='get') - before['get'], 1)
+        self.assertEqual(_sample('orbit_redis_command_seconds_count', command='pipeline') - before['pipeline'], 1)
+
+
+class TestWorkerMetrics(unittest.TestCase):
+    """Test cases for analysis worker instrumentation"""
+
+    def test_pair_cost_and_throughput(self):
+        """Test each pair check is timed and its propagations counted"""
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        analyzer = BatchThreatAnalyzer.__new__(BatchThreatAnalyzer)
+        analyzer.analysis_start_time = orbit_app.datetime(2014, 1, 21, tzinfo=orbit_app.timezone.utc)
+        pairs = _sample('orbit_pair_analysis_seconds_count', worker='batch_threat_analysis')
+        states = _sample('orbit_propagated_states_total', component='batch_threat_analysis', method='sgp4')
+
+        with mock.patch('batch_threat_analysis.ANALYSIS_WINDOW_DAYS', 1):
+            analyzer._analyze_pair_collision_risk(catalog.record(0), catalog.record(1))
+
+        self.assertEqual(_sample('orbit_pair_analysis_seconds_count', worker='batch_threat_analysis') - pairs, 1)
+        self.assertEqual(
+            _sample('orbit_propagated_states_total', component='batch_threat_analysis', method='sgp4') - states,
+            2 * 288
+        )
+
+
+class TestMultiprocessDirectory(unittest.TestCase):
+    """Test cases for where multi-process samples are written"""
+
+    def test_standalone_worker_gets_own_directory(self):
+        """Test a worker script gets a directory per host and pid, emptied only by its main()"""
+        with tempfile.TemporaryDirectory() as root:
+            replica = os.path.join(root, f'job-{socket.gethostname()}-1', 'histogram_1.db')
+            os.makedirs(os.path.dirname(replica))
+            open(replica, 'w').close()
+            script = os.path.join(root, 'job.py')
+            with open(script, 'w') as f:
+                f.write(
+                    "import os, metrics, threat_worker\n"
+                    "directory = os.environ['PROMETHEUS_MULTIPROC_DIR']\n"
+                    "open(os.path.join(directory, 'counter_1.db'), 'w').close()\n"
+                    "print(directory, os.getpid(), ','.join(sorted(os.listdir(directory))))\n"
+                    "metrics.reset_multiprocess_dir()\n"
+                    "print(','.join(sorted(os.listdir(directory))))\n"
+                )
+            env = dict(os.environ, METRICS_ROOT=root, PYTHONPATH=SERVICE_DIR, REDIS_URL='redis://127.0.0.1:1')
+            env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+            result = subprocess.run([sys.executable, script], env=env, capture_output=True, text=True)
+
+            self.assertEqual(result.returncode, 0, result.stderr)
+            imported, reset = result.stdout.strip().splitlines()
+            directory, pid, files = imported.split()
+            own = f'histogram_{pid}.db'
+            self.assertEqual(directory, os.path.join(root, f'job-{socket.gethostname()}-{pid}'))
+            # Importing deletes nothing; the reset drops only other processes' files
+            self.assertEqual(files.split(','), ['counter_1.db', own])
+            self.assertEqual(reset, own)
+            self.assertTrue(os.path.exists(replica))
+
+
+if __name__ == '__main__':
+    unittest.main()
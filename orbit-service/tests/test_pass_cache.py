@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test suite for the pass prediction cache
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as orbit_app  # noqa: E402
+from pass_cache import PassPredictionCache  # noqa: E402
+from fixtures import ISS_TLE, InMemoryRedis  # noqa: E402
+
+START = datetime(2014, 1, 21, 0, 0, tzinfo=timezone.utc)
+
+
+class TestPassPredictionCache(unittest.TestCase):
+    """Test cases for window trimming, tail refresh and invalidation"""
+
+    def setUp(self):
+        """Create a cache whose compute function records every call"""
+        self.redis = InMemoryRedis()
+        self.cache = PassPredictionCache(self.redis, 100, 0.1, 3600)
+        self.calls = []
+
+    def compute(self, t0, t1):
+        self.calls.append((t0, t1))
+        # One synthetic event every 90 minutes
+        events = []
+        when = START
+        while when <= t1:
+            if when >= t0:
+                events.append(('rise', when))
+            when += timedelta(minutes=90)
+        return events
+
+    def test_quantize_to_grid(self):
+        """Test nearby observers snap to the same cell"""
+        self.assertEqual(self.cache.quantize(40.712, -74.006), self.cache.quantize(40.68, -73.97))
+
+    def test_contained_window_is_a_hit(self):
+        """Test a narrower later window is served by trimming"""
+        key = self.cache.make_key(25544, '14020.93268519', 40.7, -74.0, 10.0)
+        self.cache.get_or_compute(key, START, START + timedelta(hours=24), self.compute)
+        events = self.cache.get_or_compute(key, START + timedelta(hours=1), START + timedelta(hours=6),
+                                           self.compute)
+        self.assertEqual(len(self.calls), 1)
+        self.assertTrue(all(START + timedelta(hours=1) <= when for _, when in events))
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_later_window_only_computes_tail(self):
+        """Test a sliding window recomputes only the uncovered tail"""
+        key = self.cache.make_key(25544, '14020.93268519', 40.7, -74.0, 10.0)
+        self.cache.get_or_compute(key, START, START + timedelta(hours=24), self.compute)
+        events = self.cache.get_or_compute(key, START + timedelta(hours=3), START + timedelta(hours=27),
+                                           self.compute)
+        self.assertEqual(self.calls[-1], (START + timedelta(hours=24), START + timedelta(hours=27)))
+        self.assertEqual(events, self.compute(START + timedelta(hours=3), START + timedelta(hours=27)))
+        self.assertEqual(self.cache.stats()['partial_hits'], 1)
+
+    def test_new_epoch_misses(self):
+        """Test a refreshed TLE is never served old predictions"""
+        old = self.cache.make_key(25544, '14020.93268519', 40.7, -74.0, 10.0)
+        new = self.cache.make_key(25544, '14021.50000000', 40.7, -74.0, 10.0)
+        self.cache.get_or_compute(old, START, START + timedelta(hours=24), self.compute)
+        self.cache.get_or_compute(new, START, START + timedelta(hours=24), self.compute)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_redis_shares_entries_across_workers(self):
+        """Test a second process-local cache is filled from Redis"""
+        key = self.cache.make_key(25544, '14020.93268519', 40.7, -74.0, 10.0)
+        self.cache.get_or_compute(key, START, START + timedelta(hours=24), self.compute)
+        other = PassPredictionCache(self.redis, 100, 0.1, 3600)
+        events = other.get_or_compute(key, START, START + timedelta(hours=12), self.compute)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(len(events), 9)
+        self.assertEqual(other.stats()['redis_hits'], 1)
+
+
+class TestTrackerPassCache(unittest.TestCase):
+    """Test cases for predict_passes reuse"""
+
+    def test_nearby_observers_share_prediction(self):
+        """Test the Skyfield search runs once for observers in one cell"""
+        satellite = orbit_app.SatelliteData(
+            epoch=START, mean_motion=15.5, eccentricity=0.0, inclination=51.6,
+            arg_perigee=0.0, raan=0.0, mean_anomaly=0.0, **ISS_TLE
+        )
+        cache = PassPredictionCache(None, 100, 0.1, 3600)
+        with mock.patch.object(orbit_app, 'pass_cache', cache):
+            first = orbit_app.tracker.predict_passes(satellite, 40.712, -74.006, 24, start=START)
+            second = orbit_app.tracker.predict_passes(satellite, 40.70, -74.01, 12, start=START)
+        self.assertTrue(first)
+        self.assertEqual(cache.stats()['misses'], 1)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(second, [p for p in first if p['event'] and
+                                  list(p.values())[0] <= START + timedelta(hours=12)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test suite for catalog pass prediction
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from skyfield.api import Topos  # noqa: E402
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from passes import can_rise  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+
+START = datetime(2014, 1, 21, 0, 0, tzinfo=timezone.utc)
+
+
+def _catalog_record(tle, inclination, mean_motion, eccentricity):
+    record = dict(tle)
+    record.update(epoch='2014-01-20T00:00:00', mean_motion=mean_motion, eccentricity=eccentricity,
+                  inclination=inclination, arg_perigee=0.0, raan=0.0, mean_anomaly=0.0)
+    return record
+
+
+ISS_RECORD = _catalog_record(ISS_TLE, 51.6498, 15.49815350, 0.0003572)
+GPS_RECORD = _catalog_record(GPS_TLE, 55.7064, 2.00564026, 0.0036862)
+
+
+class TestPassPrefilter(unittest.TestCase):
+    """Test cases for the analytic visibility pre-filter"""
+
+    def test_high_latitude_observer_never_sees_iss(self):
+        """Test a LEO orbit is dropped for observers beyond its footprint band"""
+        mask = can_rise([51.6498, 55.7064], [15.498, 2.0056], [0.0003, 0.0037], 85.0, 10.0)
+        self.assertEqual(mask.tolist(), [False, True])
+
+    def test_mid_latitude_observer_keeps_both(self):
+        """Test reachable orbits are kept"""
+        mask = can_rise([51.6498, 55.7064], [15.498, 2.0056], [0.0003, 0.0037], 40.0, 10.0)
+        self.assertEqual(mask.tolist(), [True, True])
+
+
+class TestBatchPasses(unittest.TestCase):
+    """Test cases for shared-grid pass prediction"""
+
+    def test_matches_skyfield_find_events(self):
+        """Test rise/culmination/set agree with Skyfield's per-satellite search"""
+        lat, lon = 40.0, -75.0
+        result = orbit_app.tracker.predict_passes_batch(
+            SatelliteCatalog.from_records([ISS_RECORD]), lat, lon, 24, 10.0, start=START
+        )
+
+        satellite = orbit_app.tracker.get_propagator(orbit_app.SatelliteData(**ISS_RECORD))
+        t0 = orbit_app.get_timescale().from_datetime(START)
+        t1 = orbit_app.get_timescale().from_datetime(START + timedelta(hours=24))
+        times, events = satellite.find_events(Topos(lat, lon), t0, t1, altitude_degrees=10.0)
+        expected = [(time.utc_datetime(), event) for time, event in zip(times, events)]
+
+        rises = [t for t, event in expected if event == 0]
+        culminations = [t for t, event in expected if event == 1]
+        sets = [t for t, event in expected if event == 2]
+        self.assertEqual(len(result['passes']), len(rises))
+        for pass_info, rise, culmination, set_ in zip(result['passes'], rises, culminations, sets):
+            self.assertLess(abs((datetime.fromisoformat(pass_info['rise_time']) - rise).total_seconds()), 5.0)
+            self.assertLess(abs((datetime.fromisoformat(pass_info['set_time']) - set_).total_seconds()), 5.0)
+            self.assertLess(abs((datetime.fromisoformat(pass_info['culmination_time'])
+                                 - culmination).total_seconds()), 5.0)
+            self.assertGreaterEqual(pass_info['max_elevation_deg'], 10.0)
+
+    def test_unbuildable_propagator_is_skipped(self):
+        """Test a satellite whose propagator cannot be built is left out instead of failing the batch"""
+        catalog = SatelliteCatalog.from_records([ISS_RECORD, GPS_RECORD])
+        real_get = orbit_app.propagator_cache.get
+
+        def get(norad_id, name, line1, line2):
+            if norad_id == GPS_RECORD['norad_id']:
+                raise ValueError("checksum mismatch")
+            return real_get(norad_id, name, line1, line2)
+
+        with mock.patch.object(orbit_app.propagator_cache, 'get', side_effect=get):
+            result = orbit_app.tracker.predict_passes_batch(catalog, 40.0, -75.0, 24, 10.0, start=START)
+
+        self.assertEqual(result['satellites_propagated'], 1)
+        self.assertEqual({pass_info['norad_id'] for pass_info in result['passes']}, {ISS_RECORD['norad_id']})
+
+    def test_endpoint_filters_and_sorts(self):
+        """Test the endpoint reports filtered counts and passes in time order"""
+        app = orbit_app.app
+        app.config['TESTING'] = True
+        catalog = SatelliteCatalog.from_records([ISS_RECORD, GPS_RECORD])
+        with mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog)):
+            response = app.test_client().get('/passes?lat=85&lon=0&hours=12')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['satellites_considered'], 2)
+        self.assertEqual(data['satellites_propagated'], 1)
+        times = [p['culmination_time'] for p in data['passes']]
+        self.assertEqual(times, sorted(times))
+
+    def test_endpoint_requires_observer(self):
+        """Test missing coordinates are rejected"""
+        response = orbit_app.app.test_client().get('/passes?lat=10')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test suite for binary position frames
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, tracker  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+from position_frames import FRAME_HEADER, decode_frame, encode_frame  # noqa: E402
+
+EPOCH = datetime(2014, 1, 21, 12, 0, tzinfo=timezone.utc)
+
+
+class TestFrameEncoding(unittest.TestCase):
+    """Test cases for the frame layout"""
+
+    def test_round_trip(self):
+        """Test header and columns survive encoding as float32"""
+        columns = [np.array([51.5, -12.25]), np.array([-0.1, 179.9]), np.array([420.0, 20200.0])]
+        frame = encode_frame([25544, 24876], columns, 'geodetic', EPOCH)
+
+        self.assertEqual(len(frame), FRAME_HEADER.size + 4 * 2 * 4)
+        decoded = decode_frame(bytes(frame))
+        self.assertEqual(decoded['layout'], 'geodetic')
+        self.assertFalse(decoded['delta'])
+        self.assertEqual(decoded['epoch'], EPOCH)
+        self.assertEqual(decoded['norad_ids'].tolist(), [25544, 24876])
+        np.testing.assert_allclose(decoded['columns']['altitude_km'], columns[2], rtol=1e-7)
+
+    def test_arrays_are_aligned(self):
+        """Test every array starts on a 4-byte boundary for typed-array views"""
+        self.assertEqual(FRAME_HEADER.size % 4, 0)
+
+    def test_delta_wraps_longitude(self):
+        """Test deltas across the antimeridian stay small"""
+        base = [np.array([10.0]), np.array([179.5]), np.array([400.0])]
+        current = [np.array([10.5]), np.array([-179.5]), np.array([401.0])]
+        frame = encode_frame([1], current, 'geodetic', EPOCH, base_columns=base,
+                             base_epoch=EPOCH - timedelta(seconds=30))
+
+        decoded = decode_frame(bytes(frame))
+        self.assertTrue(decoded['delta'])
+        self.assertEqual(decoded['base_epoch'], EPOCH - timedelta(seconds=30))
+        self.assertAlmostEqual(float(decoded['columns']['longitude'][0]), 1.0, places=5)
+        self.assertAlmostEqual(float(decoded['columns']['latitude'][0]), 0.5, places=5)
+
+    def test_wrong_column_count(self):
+        """Test layouts reject a mismatched number of columns"""
+        with self.assertRaises(ValueError):
+            encode_frame([1], [np.zeros(1)], 'ecef', EPOCH)
+
+
+class TestBinaryPositionEndpoint(unittest.TestCase):
+    """Test cases for format=binary on the bulk positions endpoint"""
+
+    def setUp(self):
+        """Set up test client with a stubbed catalog"""
+        self.client = app.test_client()
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        patcher = mock.patch.object(tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_binary_frame_matches_json(self):
+        """Test the binary frame carries the same positions as the JSON response"""
+        query = '/satellites/positions?timestamp=2014-01-21T12:00:00Z'
+        data = self.client.get(query).get_json()
+        response = self.client.get(query + '&format=binary')
+
+        self.assertEqual(response.mimetype, 'application/octet-stream')
+        frame = decode_frame(response.data)
+        self.assertEqual(frame['norad_ids'].tolist(), data['norad_ids'])
+        np.testing.assert_allclose(frame['columns']['latitude'], [row[0] for row in data['latitude']], atol=1e-4)
+
+    def test_ecef_delta_frame(self):
+        """Test a delta frame added to the base frame reproduces the current frame"""
+        base = decode_frame(self.client.get(
+            '/satellites/positions?format=binary&frame=ecef&timestamp=2014-01-21T12:00:00Z').data)
+        current = decode_frame(self.client.get(
+            '/satellites/positions?format=binary&frame=ecef&timestamp=2014-01-21T12:00:30Z').data)
+        delta = decode_frame(self.client.get(
+            '/satellites/positions?format=binary&frame=ecef&timestamp=2014-01-21T12:00:30Z'
+            '&delta_from=2014-01-21T12:00:00Z').data)
+
+        self.assertTrue(delta['delta'])
+        for field in ('x_km', 'y_km', 'z_km'):
+            np.testing.assert_allclose(base['columns'][field] + delta['columns'][field],
+                                       current['columns'][field], atol=1e-2)
+
+    def test_binary_rejects_several_timestamps(self):
+        """Test a frame holds exactly one epoch"""
+        response = self.client.get('/satellites/positions?format=binary'
+                                   '&timestamp=2014-01-21T12:00:00Z&timestamp=2014-01-21T12:01:00Z')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_layout(self):
+        """Test unknown frame layouts are rejected"""
+        response = self.client.get('/satellites/positions?format=binary&frame=polar')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
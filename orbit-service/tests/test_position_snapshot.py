@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test suite for shared position snapshots
+"""
+
+import fcntl
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sgp4.api import Satrec  # noqa: E402
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+from position_frames import decode_frame  # noqa: E402
+from position_snapshot import PositionSnapshotStore  # noqa: E402
+from propagation import propagate_catalog  # noqa: E402
+
+EPOCH = datetime(2014, 1, 21, 12, 0, tzinfo=timezone.utc)
+NORAD_IDS = [25544, 24876]
+
+
+def _produce(calls=None, epoch=EPOCH):
+    def produce():
+        if calls is not None:
+            calls.append(epoch)
+        satrecs = [Satrec.twoline2rv(tle['line1'], tle['line2']) for tle in (ISS_TLE, GPS_TLE)]
+        return NORAD_IDS, propagate_catalog(satrecs, [epoch])
+    return produce
+
+
+class TestPositionSnapshotStore(unittest.TestCase):
+    """Test cases for publishing and mapping snapshots"""
+
+    def setUp(self):
+        """Use a private snapshot directory"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store = PositionSnapshotStore(directory.name)
+
+    def test_round_trip(self):
+        """Test a published snapshot maps back with its header, arrays and frames"""
+        self.store.publish('active', EPOCH, 'v1', _produce())
+        snapshot = PositionSnapshotStore(self.store.directory).read('active')
+        exact = _produce()()[1]
+
+        self.assertEqual(snapshot.epoch, EPOCH)
+        self.assertEqual(snapshot.catalog_version, 'v1')
+        self.assertEqual(snapshot.sequence, 1)
+        self.assertEqual(snapshot.arrays['norad_ids'].tolist(), NORAD_IDS)
+        np.testing.assert_array_equal(snapshot.arrays['latitude'], exact['latitude'][:, 0])
+        np.testing.assert_array_equal(snapshot.arrays['position_ecef'], exact['position_ecef'][:, 0])
+
+        frame = decode_frame(bytes(snapshot.frame('ecef')))
+        self.assertEqual(frame['epoch'], EPOCH)
+        np.testing.assert_allclose(frame['columns']['x_km'], exact['position_ecef'][:, 0, 0], rtol=1e-6)
+
+    def test_arrays_are_views(self):
+        """Test arrays read from the mapping without copying"""
+        self.store.publish('active', EPOCH, 'v1', _produce())
+        snapshot = self.store.read('active')
+
+        for values in snapshot.arrays.values():
+            self.assertFalse(values.flags.owndata)
+            self.assertFalse(values.flags.writeable)
+        self.assertIs(self.store.read('active'), snapshot)
+
+    def test_one_publish_per_tick(self):
+        """Test a second publish of the same tick and catalog reuses the snapshot"""
+        calls = []
+        first = self.store.publish('active', EPOCH, 'v1', _produce(calls))
+        again = self.store.publish('active', EPOCH, 'v1', _produce(calls))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(again.sequence, first.sequence)
+
+    def test_new_tick_and_catalog_republish(self):
+        """Test later ticks and changed catalogs replace the snapshot and are re-mapped"""
+        first = self.store.publish('active', EPOCH, 'v1', _produce())
+        later = EPOCH + timedelta(seconds=30)
+        second = self.store.publish('active', later, 'v1', _produce(epoch=later))
+        third = self.store.publish('active', later, 'v2', _produce(epoch=later))
+
+        self.assertEqual([first.sequence, second.sequence, third.sequence], [1, 2, 3])
+        self.assertEqual(self.store.read('active').catalog_version, 'v2')
+        self.assertEqual(first.epoch, EPOCH)
+
+    def test_busy_producer_skips(self):
+        """Test a worker that loses the producer lock neither waits nor propagates"""
+        os.makedirs(self.store.directory, exist_ok=True)
+        calls = []
+        with open(self.store._path('active') + '.lock', 'w') as held:
+            fcntl.flock(held, fcntl.LOCK_EX)
+            # flock locks belong to the open file, so a second open contends like another process
+            self.assertIsNone(self.store.publish('active', EPOCH, 'v1', _produce(calls)))
+        self.assertEqual(calls, [])
+
+    def test_missing_snapshot(self):
+        """Test reading before anything is published"""
+        self.assertIsNone(self.store.read('active'))
+
+
+class TestSnapshotEndpoint(unittest.TestCase):
+    """Test cases for serving current positions from the snapshot"""
+
+    def setUp(self):
+        """Install a versioned catalog and publish its snapshot"""
+        self.client = orbit_app.app.test_client()
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        orbit_app.tracker._install_catalog('snaptest', catalog, 'v1')
+        for patcher in (
+            mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog)),
+            mock.patch.dict(orbit_app.CATALOG_SOURCES, {'snaptest': 'snaptest'}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.snapshot = orbit_app.tracker.publish_snapshot('snaptest')
+        self.records = catalog.records()
+
+    def test_json_matches_propagation(self):
+        """Test snapshot positions equal per-request propagation at the snapshot epoch"""
+        with mock.patch.object(orbit_app.tracker, '_propagate', wraps=orbit_app.tracker._propagate) as propagate:
+            data = self.client.get('/satellites/positions?source=snaptest').get_json()
+        expected = orbit_app.tracker.calculate_positions(self.records, [self.snapshot.epoch])
+
+        propagate.assert_not_called()
+        self.assertEqual(data['snapshot_sequence'], self.snapshot.sequence)
+        for key in ('norad_ids', 'timestamps', 'latitude', 'longitude', 'altitude_km', 'visible'):
+            self.assertEqual(data[key], expected[key])
+
+    def test_binary_frame_and_subset(self):
+        """Test the stored frame is served whole and subsets are encoded from the arrays"""
+        response = self.client.get('/satellites/positions?source=snaptest&format=binary&frame=ecef')
+        self.assertEqual(response.data, bytes(self.snapshot.frame('ecef')))
+        self.assertEqual(response.headers['X-Snapshot-Sequence'], str(self.snapshot.sequence))
+
+        subset = decode_frame(self.client.get('/satellites/positions?source=snaptest&format=binary&ids=24876').data)
+        self.assertEqual(subset['norad_ids'].tolist(), [24876])
+        self.assertEqual(subset['epoch'], self.snapshot.epoch)
+
+    def test_ids_beyond_snapshot_are_propagated(self):
+        """Test a request for satellites past the snapshot's MAX_SATELLITES rows returns all of them"""
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        orbit_app.tracker._install_catalog('snaptest-partial', catalog, 'v1')
+        self.addCleanup(orbit_app.tracker.tle_data.pop, 'snaptest-partial', None)
+        with mock.patch.object(orbit_app.config, 'MAX_SATELLITES', 1), \
+                mock.patch.dict(orbit_app.CATALOG_SOURCES, {'snaptest-partial': 'snaptest-partial'}), \
+                mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog)):
+            self.assertEqual(orbit_app.tracker.publish_snapshot('snaptest-partial').count, 1)
+            both = self.client.get('/satellites/positions?source=snaptest-partial&ids=24876,25544').get_json()
+            held = self.client.get(f"/satellites/positions?source=snaptest-partial&ids={ISS_TLE['norad_id']}")
+
+        self.assertEqual(sorted(both['norad_ids']), [24876, 25544])
+        self.assertNotIn('snapshot_sequence', both)
+        self.assertIn('snapshot_sequence', held.get_json())
+
+    def test_single_position_from_snapshot(self):
+        """Test a current single-satellite position is read from the snapshot without propagating"""
+        orbit_app.tracker._install_catalog('active', SatelliteCatalog.from_records([ISS_TLE, GPS_TLE]), 'v1')
+        self.addCleanup(orbit_app.tracker.tle_data.pop, 'active', None)
+        snapshot = orbit_app.tracker.publish_snapshot('active')
+
+        with mock.patch.object(orbit_app.tracker, 'calculate_position',
+                               wraps=orbit_app.tracker.calculate_position) as calculate:
+            current = self.client.get('/satellites/24876/position').get_json()
+            at_epoch = self.client.get('/satellites/24876/position',
+                                       query_string={'timestamp': snapshot.epoch.isoformat()})
+            calculate.assert_not_called()
+            later = self.client.get('/satellites/24876/position?timestamp=2014-01-21T12:00:00Z')
+            calculate.assert_called_once()
+
+        expected = orbit_app.tracker.calculate_position(orbit_app.tracker.get_satellite(24876), snapshot.epoch)
+        self.assertEqual(current, at_epoch.get_json())
+        self.assertAlmostEqual(current['latitude'], expected.latitude, places=3)
+        self.assertAlmostEqual(current['longitude'], expected.longitude, places=3)
+        self.assertEqual(later.status_code, 200)
+
+    def test_explicit_timestamps_propagate(self):
+        """Test requested timestamps and stale catalogs bypass the snapshot"""
+        data = self.client.get('/satellites/positions?source=snaptest&timestamp=2014-01-21T12:00:00Z').get_json()
+        self.assertNotIn('snapshot_sequence', data)
+
+        orbit_app.tracker.catalog_versions['snaptest'] = 'v2'
+        self.assertIsNone(orbit_app.tracker.current_snapshot('snaptest'))
+
+
+if __name__ == '__main__':
+    unittest.main()
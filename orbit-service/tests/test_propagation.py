@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test suite for vectorized propagation
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app import app, tracker, SatelliteData  # noqa: E402
+from propagation import PropagatorCache, propagate_catalog, ecef_to_geodetic  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+
+EPOCH = datetime(2014, 1, 21, 12, 0, tzinfo=timezone.utc)
+
+
+def _catalog_entry(tle):
+    entry = dict(tle)
+    entry.update(epoch=EPOCH, mean_motion=15.5, eccentricity=0.0, inclination=51.6,
+                 arg_perigee=0.0, raan=0.0, mean_anomaly=0.0)
+    return entry
+
+
+class TestPropagation(unittest.TestCase):
+    """Test cases for SatrecArray propagation and frame conversion"""
+
+    def test_geodetic_conversion_on_equator_and_pole(self):
+        """Test WGS84 conversion at reference points"""
+        lat, lon, alt = ecef_to_geodetic(np.array([[6378.137 + 400.0, 0.0, 0.0],
+                                                   [0.0, 0.0, 6356.752314 + 400.0]]))
+        np.testing.assert_allclose(lat, [0.0, 90.0], atol=1e-9)
+        self.assertAlmostEqual(lon[0], 0.0)
+        np.testing.assert_allclose(alt, [400.0, 400.0], atol=1e-5)
+
+    def test_matches_skyfield_single_position(self):
+        """Test bulk propagation agrees with the per-satellite Skyfield path"""
+        timestamps = [EPOCH, EPOCH + timedelta(minutes=47)]
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        satrecs = [catalog.satrec(row) for row in range(len(catalog))]
+        result = propagate_catalog(satrecs, timestamps)
+
+        for row, tle in enumerate([ISS_TLE, GPS_TLE]):
+            for col, timestamp in enumerate(timestamps):
+                expected = tracker.calculate_position(SatelliteData(**_catalog_entry(tle)), timestamp)
+                self.assertAlmostEqual(result['latitude'][row, col], expected.latitude, delta=0.01)
+                self.assertAlmostEqual(result['longitude'][row, col], expected.longitude, delta=0.01)
+                self.assertAlmostEqual(result['altitude_km'][row, col], expected.altitude_km, delta=1.0)
+                self.assertAlmostEqual(result['velocity_kms'][row, col], expected.velocity_kms, delta=0.01)
+
+
+class TestPropagatorCache(unittest.TestCase):
+    """Test cases for the propagator LRU"""
+
+    def setUp(self):
+        """Create a small cache with a counting factory"""
+        self.built = []
+        self.cache = PropagatorCache(2, lambda name, line1, line2: self.built.append(name) or name)
+
+    def test_hit_after_first_build(self):
+        """Test a second lookup of the same epoch reuses the propagator"""
+        self.cache.get(25544, 'ISS', ISS_TLE['line1'], ISS_TLE['line2'])
+        self.cache.get(25544, 'ISS', ISS_TLE['line1'], ISS_TLE['line2'])
+        self.assertEqual(self.built, ['ISS'])
+        self.assertEqual(self.cache.stats()['hits'], 1)
+        self.assertEqual(self.cache.stats()['misses'], 1)
+
+    def test_new_epoch_invalidates_entry(self):
+        """Test a refreshed TLE rebuilds the propagator in place"""
+        self.cache.get(25544, 'old', ISS_TLE['line1'], ISS_TLE['line2'])
+        newer = ISS_TLE['line1'].replace('14020.93268519', '14021.50000000')
+        self.assertEqual(self.cache.get(25544, 'new', newer, ISS_TLE['line2']), 'new')
+        stats = self.cache.stats()
+        self.assertEqual(stats['invalidations'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache stays within its bound"""
+        self.cache.get(1, 'a', ISS_TLE['line1'], ISS_TLE['line2'])
+        self.cache.get(2, 'b', ISS_TLE['line1'], ISS_TLE['line2'])
+        self.cache.get(1, 'a', ISS_TLE['line1'], ISS_TLE['line2'])
+        self.cache.get(3, 'c', ISS_TLE['line1'], ISS_TLE['line2'])
+        self.cache.get(1, 'a', ISS_TLE['line1'], ISS_TLE['line2'])
+        self.assertEqual(self.built, ['a', 'b', 'c'])
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+
+    def test_tracker_methods_share_propagators(self):
+        """Test single and bulk paths reuse the same initialized SGP4 record"""
+        satellite = SatelliteData(**_catalog_entry(ISS_TLE))
+        first = tracker.get_satrec(satellite)
+        tracker.calculate_positions([ISS_TLE], [EPOCH])
+        self.assertIs(tracker.get_satrec(satellite), first)
+        self.assertIs(tracker.get_propagator(satellite).model, first)
+
+
+class TestBulkPositionEndpoint(unittest.TestCase):
+    """Test cases for the bulk positions endpoint"""
+
+    def setUp(self):
+        """Set up test client with a stubbed catalog"""
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        patcher = mock.patch.object(tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_all_satellites_many_timestamps(self):
+        """Test the whole catalog is propagated for each requested timestamp"""
+        response = self.client.get('/satellites/positions?timestamp=2014-01-21T12:00:00Z'
+                                   '&timestamp=2014-01-21T12:10:00Z')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(len(data['latitude']), 2)
+        self.assertEqual(len(data['latitude'][0]), 2)
+
+    def test_selected_ids_via_post(self):
+        """Test NORAD ID selection through a JSON body"""
+        response = self.client.post('/satellites/positions', json={
+            'norad_ids': [25544],
+            'timestamps': ['2014-01-21T12:00:00Z']
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['norad_ids'], [25544])
+
+    def test_invalid_timestamp(self):
+        """Test malformed timestamps are rejected"""
+        response = self.client.get('/satellites/positions?timestamp=yesterday')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
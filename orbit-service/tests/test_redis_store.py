@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test suite for the shared Redis access layer
+"""
+
+import unittest
+import json
+import sys
+import os
+from unittest import mock
+
+import redis
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sync_satellites  # noqa: E402
+from batch_threat_analysis import BatchThreatAnalyzer  # noqa: E402
+from threat_worker import ThreatAnalyzer  # noqa: E402
+from redis_store import COMMAND_STATS, BatchWriter, InstrumentedRedis, connect, get_many, load_json  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis  # noqa: E402
+
+
+def _gp_record(record):
+    return {'OBJECT_NAME': record['name'], 'NORAD_CAT_ID': record['norad_id'],
+            'TLE_LINE1': record['line1'], 'TLE_LINE2': record['line2']}
+
+
+class TestBatching(unittest.TestCase):
+    """Test cases for batched writes and bulk reads"""
+
+    def test_writes_are_sent_in_batches(self):
+        """Test queued commands go out batch_size at a time and the rest on leaving the block"""
+        client = InMemoryRedis()
+        with BatchWriter(client, batch_size=3) as writer:
+            for i in range(7):
+                writer.setex(f'key:{i}', 60, str(i))
+            self.assertEqual(writer.round_trips, 2)
+            self.assertEqual(writer.pending, 1)
+
+        self.assertEqual(writer.round_trips, 3)
+        self.assertEqual(writer.sent, 7)
+        self.assertEqual(client.store['key:6'], '6')
+
+    def test_error_discards_unsent_writes(self):
+        """Test an exception inside the block does not send the pending batch"""
+        client = InMemoryRedis()
+        with self.assertRaises(RuntimeError):
+            with BatchWriter(client, batch_size=10) as writer:
+                writer.setex('key', 60, 'value')
+                raise RuntimeError('boom')
+        self.assertNotIn('key', client.store)
+
+    def test_bulk_reads_use_mget(self):
+        """Test values are read in order with one MGET per batch, skipping bad JSON"""
+        client = InMemoryRedis()
+        for i in range(5):
+            client.setex(f'satellite:tle:{i}', 60, json.dumps({'id': i}))
+        client.setex('satellite:tle:bad', 60, '{not json')
+        client.setex('other:1', 60, json.dumps({'id': 'other'}))
+
+        self.assertEqual(get_many(client, ['satellite:tle:1', 'missing'], batch_size=1), [json.dumps({'id': 1}), None])
+        client.commands.clear()
+        records = load_json(client, 'satellite:tle:*', batch_size=2)
+
+        self.assertEqual(sorted(record['id'] for record in records), [0, 1, 2, 3, 4])
+        self.assertEqual(client.commands, ['scan', 'mget', 'mget', 'mget'])
+
+    def test_worker_loads_catalog_with_bulk_reads(self):
+        """Test the batch analyzer reads the whole catalog without a GET per satellite"""
+        client = InMemoryRedis()
+        for record in (ISS_TLE, GPS_TLE):
+            client.setex(f"satellite:tle:{record['norad_id']}", 60, json.dumps(_gp_record(record)))
+        analyzer = BatchThreatAnalyzer.__new__(BatchThreatAnalyzer)
+        analyzer.redis_client = client
+
+        catalog = analyzer._load_all_satellites()
+
+        self.assertEqual(sorted(catalog), [24876, 25544])
+        self.assertNotIn('get', client.commands)
+
+    def test_bad_threat_does_not_drop_other_alerts(self):
+        """Test a threat that cannot be turned into an alert is skipped while the rest go out in one batch"""
+        client = InMemoryRedis()
+        analyzer = ThreatAnalyzer.__new__(ThreatAnalyzer)
+        analyzer.redis_client = client
+        good = {'threat_level': 'CRITICAL', 'satellite1': {'name': 'ISS'}, 'satellite2': {'name': 'GPS'}}
+        bad = {'threat_level': 'HIGH', 'satellite1': {'name': 'ISS'}}
+
+        analyzer._process_critical_threats([bad, good])
+
+        self.assertEqual([json.loads(alert)['details'] for alert in client.store['alerts:queue']], [good])
+        self.assertEqual(client.commands, ['rpush', 'setex'])
+
+
+class TestSatelliteSync(unittest.TestCase):
+    """Test cases for pipelined catalog sync"""
+
+    def test_sync_writes_sets_once(self):
+        """Test each index set is written with one SADD and one EXPIRE whatever the catalog size"""
+        satellites = [dict(_gp_record(ISS_TLE), NORAD_CAT_ID=40000 + i, OBJECT_TYPE='PAYLOAD') for i in range(50)]
+        satellites[0]['OBJECT_TYPE'] = 'DEBRIS'
+        syncer = sync_satellites.SatelliteDataSync.__new__(sync_satellites.SatelliteDataSync)
+        syncer.redis_client = InMemoryRedis()
+        syncer.session = mock.Mock()
+        syncer.session.get.return_value.json.return_value = satellites
+        syncer.stats = {'total_satellites': 0, 'updated': 0, 'failed': 0, 'categories_synced': []}
+
+        syncer._sync_category(sync_satellites.SATELLITE_CATEGORIES[1])
+
+        store = syncer.redis_client.store
+        self.assertEqual(syncer.stats['updated'], 50)
+        self.assertEqual(len(store['satellites:category:stations']), 50)
+        self.assertEqual(len(store['satellites:active']), 49)
+        self.assertIn('satellite:index:40049', store)
+        self.assertEqual(syncer.redis_client.commands.count('sadd'), 2)
+        self.assertEqual(syncer.redis_client.commands.count('expire'), 2)
+
+
+class TestClient(unittest.TestCase):
+    """Test cases for the pooled, instrumented client"""
+
+    def test_pool_is_bounded(self):
+        """Test clients share an explicitly sized blocking pool and open no connection up front"""
+        client = connect('redis://127.0.0.1:1/0', max_connections=3)
+
+        self.assertIsInstance(client, InstrumentedRedis)
+        self.assertIsInstance(client.connection_pool, redis.BlockingConnectionPool)
+        self.assertEqual(client.connection_pool.max_connections, 3)
+
+    def test_command_stats(self):
+        """Test commands and pipeline round trips are counted per command"""
+        client = InstrumentedRedis()
+        before = COMMAND_STATS.snapshot()
+
+        with mock.patch.object(redis.Redis, 'execute_command', return_value=None), \
+                mock.patch.object(redis.client.Pipeline, 'execute', return_value=[]):
+            client.mget(['a', 'b'])
+            pipe = client.pipeline(transaction=False)
+            pipe.setex('a', 1, 'x')
+            pipe.setex('b', 1, 'y')
+            pipe.execute()
+
+        after = COMMAND_STATS.snapshot()
+        self.assertEqual(after['mget']['round_trips'] - before.get('mget', {}).get('round_trips', 0), 1)
+        self.assertEqual(after['pipeline']['commands'] - before.get('pipeline', {}).get('commands', 0), 2)
+        self.assertGreaterEqual(after['mget']['max_ms'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
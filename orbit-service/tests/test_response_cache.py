@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test suite for the catalog-versioned response cache
+"""
+
+import unittest
+import json
+import sys
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from response_cache import ResponseCache  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis  # noqa: E402
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test cases for ResponseCache"""
+
+    def setUp(self):
+        """Set up a cache shared through an in-memory Redis"""
+        self.redis = InMemoryRedis()
+        self.cache = ResponseCache(self.redis, 10, lock_seconds=2.0, poll_seconds=0.01)
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return json.dumps({'call': self.calls})
+
+    def test_miss_then_hit(self):
+        """Test a body is computed once per version, parameters and bucket"""
+        first = self.cache.get_or_compute('test', 'active', 'v1', {'hours': 24}, 7, 60, self.compute)
+        second = self.cache.get_or_compute('test', 'active', 'v1', {'hours': 24}, 7, 60, self.compute)
+        other = self.cache.get_or_compute('test', 'active', 'v1', {'hours': 12}, 7, 60, self.compute)
+        later = self.cache.get_or_compute('test', 'active', 'v1', {'hours': 24}, 8, 60, self.compute)
+
+        self.assertEqual(first, (json.dumps({'call': 1}), 'miss'))
+        self.assertEqual(second, (json.dumps({'call': 1}), 'hit'))
+        self.assertEqual(other[1], 'miss')
+        self.assertEqual(later[1], 'miss')
+        self.assertEqual(self.calls, 3)
+
+    def test_shared_between_processes(self):
+        """Test another worker's cache answers from Redis without computing"""
+        self.cache.get_or_compute('test', 'active', 'v1', {}, 1, 60, self.compute)
+        other_worker = ResponseCache(self.redis, 10, lock_seconds=2.0, poll_seconds=0.01)
+
+        body, outcome = other_worker.get_or_compute('test', 'active', 'v1', {}, 1, 60, self.compute)
+        self.assertEqual(outcome, 'hit')
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(other_worker.stats()['redis_hits'], 1)
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Test identical concurrent requests wait for one computation"""
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            return self.compute()
+
+        outcomes = []
+        threads = [threading.Thread(target=lambda: outcomes.append(
+            self.cache.get_or_compute('test', 'active', 'v1', {}, 1, 60, slow)[1])) for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(sorted(outcomes), ['coalesced'] * 4 + ['miss'])
+
+    def test_waits_for_another_process_lease(self):
+        """Test a request waits for the body another process is computing under its lease"""
+        key = ResponseCache.make_key('test', 'active', 'v1', {}, 1)
+        self.redis.set(f"{key}:lock", 'other-worker', nx=True, ex=60)
+        threading.Timer(0.05, lambda: self.redis.setex(key, 60, json.dumps({'call': 'other'}))).start()
+
+        body, outcome = self.cache.get_or_compute('test', 'active', 'v1', {}, 1, 60, self.compute)
+        self.assertEqual((json.loads(body), outcome), ({'call': 'other'}, 'coalesced'))
+        self.assertEqual(self.calls, 0)
+
+    def test_new_version_invalidates(self):
+        """Test entries of a superseded catalog are dropped locally and in Redis"""
+        self.cache.get_or_compute('test', 'active', 'v1', {}, 1, 60, self.compute)
+        self.cache.get_or_compute('test', 'starlink', 'v1', {}, 1, 60, self.compute)
+
+        self.assertEqual(self.cache.invalidate('active', 'v2'), 1)
+        self.cache.purge_shared('active', 'v1')
+
+        self.assertEqual(self.cache.stats()['entries'], 1)
+        self.assertFalse([key for key in self.redis.store if key.startswith('response:test:active')])
+        self.assertEqual(self.cache.get_or_compute('test', 'active', 'v1', {}, 1, 60, self.compute)[1], 'miss')
+
+
+class TestCachedEndpoints(unittest.TestCase):
+    """Test cases for heavy endpoints served through the cache"""
+
+    def setUp(self):
+        """Set up test client with a private cache and a versioned catalog"""
+        self.client = orbit_app.app.test_client()
+        self.catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        orbit_app.tracker._install_catalog('active', self.catalog, 'conjunctions-v1')
+        for patcher in (
+            mock.patch.object(orbit_app, 'response_cache', ResponseCache(None, 10, 1.0, 0.01)),
+            mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(side_effect=self.current)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(orbit_app.tracker.tle_data.pop, 'active', None)
+
+    def current(self, source='active'):
+        return orbit_app.tracker.tle_data[source]
+
+    def test_conjunctions_computed_once_per_catalog(self):
+        """Test repeat requests are served from the cache until a new catalog is installed"""
+        with mock.patch.object(orbit_app.tracker, 'screen_conjunctions', return_value=[]) as assess:
+            first = self.client.get('/threats/conjunctions?hours=6')
+            second = self.client.get('/threats/conjunctions?hours=6')
+            self.assertEqual(assess.call_count, 1)
+
+            orbit_app.tracker._install_catalog('active', SatelliteCatalog.from_records([ISS_TLE, GPS_TLE]),
+                                               'conjunctions-v2')
+            third = self.client.get('/threats/conjunctions?hours=6')
+
+        self.assertEqual([first.headers['X-Cache'], second.headers['X-Cache'], third.headers['X-Cache']],
+                         ['MISS', 'HIT', 'MISS'])
+        self.assertEqual(first.get_json()['threats'], second.get_json()['threats'])
+        self.assertEqual(first.get_json()['analysis_window_hours'], 6)
+        self.assertEqual((first.get_json()['satellites_screened'], first.get_json()['truncated']), (2, False))
+        self.assertEqual(assess.call_count, 2)
+
+    def test_cached_passes_cover_the_request_window(self):
+        """Test a pass body computed at the bucket start covers the bucket too and is trimmed to the request"""
+        now = datetime.now(timezone.utc)
+        windows = []
+
+        def passes(satellites, lat, lon, hours, min_elevation, alt_km, start):
+            windows.append(hours)
+            return {'passes': [{'norad_id': 25544, 'rise_time': rise, 'set_time': set_time} for rise, set_time in (
+                ((now - timedelta(minutes=5)).isoformat(), (now - timedelta(minutes=1)).isoformat()),
+                ((now + timedelta(minutes=50)).isoformat(), (now + timedelta(hours=1)).isoformat()),
+                ((now + timedelta(hours=5, minutes=59)).isoformat(), None),
+                ((now + timedelta(hours=6, minutes=1)).isoformat(), None),
+            )], 'satellites_considered': 2, 'satellites_propagated': 2}
+
+        with mock.patch.object(orbit_app.tracker, 'predict_passes_batch', side_effect=passes):
+            first = self.client.get('/passes?lat=40&lon=-74&hours=6')
+            second = self.client.get('/passes?lat=40&lon=-74&hours=6')
+
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(windows, [6 + orbit_app.config.RESPONSE_CACHE_BUCKET_SECONDS / 3600.0])
+        for response in (first, second):
+            self.assertEqual([item['set_time'] for item in response.get_json()['passes']],
+                             [(now + timedelta(hours=1)).isoformat(), None])
+
+    def test_cached_conjunctions_cover_the_request_window(self):
+        """Test cached encounters are kept only inside the window that starts at the request"""
+        now = datetime.now(timezone.utc)
+        windows = []
+
+        def screen(satellites, hours, step_seconds, start):
+            windows.append(hours)
+            return [orbit_app.ThreatAssessment(
+                primary_object=25544, secondary_object=28474, closest_approach_time=when,
+                minimum_distance_km=2.0, risk_level='HIGH', probability=0.7
+            ) for when in (now - timedelta(minutes=1), now + timedelta(hours=2), now + timedelta(hours=6, minutes=1))]
+
+        with mock.patch.object(orbit_app.tracker, 'screen_conjunctions', side_effect=screen):
+            response = self.client.get('/threats/conjunctions?hours=6')
+
+        self.assertEqual(windows, [6 + orbit_app.config.RESPONSE_CACHE_BUCKET_SECONDS / 3600.0])
+        threats = response.get_json()['threats']
+        self.assertEqual([datetime.fromisoformat(threat['closest_approach_time']) for threat in threats],
+                         [now + timedelta(hours=2)])
+
+    def test_unversioned_catalog_bypasses(self):
+        """Test a catalog without a version is computed per request"""
+        orbit_app.tracker._install_catalog('active', self.catalog, None)
+        response = self.client.get('/passes?lat=85&lon=0&hours=12')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Cache'], 'BYPASS')
+        self.assertEqual(response.get_json()['satellites_considered'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
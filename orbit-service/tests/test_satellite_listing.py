@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Test suite for the /satellites catalog listing
+"""
+
+import unittest
+import gzip
+import json
+import zlib
+import sys
+import os
+from datetime import datetime, timezone
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np  # noqa: E402
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis  # noqa: E402
+
+
+class TestSatelliteStreaming(unittest.TestCase):
+    """Test cases for the NDJSON streaming format"""
+
+    def setUp(self):
+        """Serve a small catalog without touching Redis or CelesTrak"""
+        self.catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        self.fetch = mock.AsyncMock(return_value=self.catalog)
+        patcher = mock.patch.object(orbit_app.tracker, 'fetch_tle_data', self.fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = orbit_app.app.test_client()
+
+    def test_ndjson_yields_one_record_per_line(self):
+        """Test format=ndjson streams every record as its own JSON line"""
+        response = self.client.get('/satellites?format=ndjson')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertTrue(response.is_streamed)
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [record.to_dict() for record in self.catalog.values()])
+        self.assertEqual(response.headers['X-Satellite-Count'], '2')
+
+    def test_accept_header_selects_ndjson(self):
+        """Test clients can opt in through the Accept header"""
+        response = self.client.get('/satellites?limit=1', headers={'Accept': 'application/x-ndjson'})
+
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['norad_id'], ISS_TLE['norad_id'])
+
+    def test_ndjson_batches_large_catalogs(self):
+        """Test records are flushed in bounded chunks"""
+        elements = np.repeat(self.catalog.elements[:1], 1000)
+        elements['norad_id'] = np.arange(1000)
+        self.fetch.return_value = SatelliteCatalog(elements, np.repeat(self.catalog.names[:1], 1000))
+
+        response = self.client.get('/satellites?format=ndjson')
+        chunks = list(response.response)
+
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(sum(chunk.count(b'\n') for chunk in chunks), 1000)
+
+    def test_default_format_is_json(self):
+        """Test the JSON envelope is unchanged without opting in"""
+        response = self.client.get('/satellites?limit=1')
+
+        data = json.loads(response.data)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(list(data['satellites']), [str(ISS_TLE['norad_id'])])
+
+
+class TestConditionalListing(unittest.TestCase):
+    """Test cases for ETags, 304 responses and precomputed encodings"""
+
+    def setUp(self):
+        """Serve a versioned catalog large enough to be compressed"""
+        base = SatelliteCatalog.from_records([ISS_TLE])
+        elements = np.repeat(base.elements, 50)
+        elements['norad_id'] = np.arange(50)
+        self.catalog = SatelliteCatalog(elements, np.repeat(base.names, 50))
+        orbit_app.tracker._install_catalog('etag-test', self.catalog, 'etag-v1')
+        self.addCleanup(orbit_app.tracker.tle_data.pop, 'etag-test', None)
+        for patcher in (
+            mock.patch.object(orbit_app.tracker, 'fetch_tle_data',
+                              mock.AsyncMock(side_effect=lambda source: orbit_app.tracker.tle_data[source])),
+            mock.patch.dict(orbit_app.CATALOG_SOURCES, {'etag-test': 'etag-test'}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = orbit_app.app.test_client()
+
+    def test_revalidation_returns_304(self):
+        """Test a repeat poll with the ETag gets 304 and no body until the catalog changes"""
+        first = self.client.get('/satellites?source=etag-test')
+        etag = first.headers['ETag']
+        repeat = self.client.get('/satellites?source=etag-test', headers={'If-None-Match': etag})
+        other_limit = self.client.get('/satellites?source=etag-test&limit=5', headers={'If-None-Match': etag})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.get_json()['count'], 50)
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat.data, b'')
+        self.assertEqual(repeat.headers['ETag'], etag)
+        self.assertEqual(other_limit.status_code, 200)
+
+        orbit_app.tracker._install_catalog('etag-test', self.catalog, 'etag-v2')
+        changed = self.client.get('/satellites?source=etag-test', headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers['ETag'], etag)
+
+    def test_encodings_are_precomputed(self):
+        """Test gzip and deflate bodies match the identity body and are built once per version"""
+        builds = orbit_app.representations.stats()['builds']
+        plain = self.client.get('/satellites?source=etag-test')
+        gzipped = self.client.get('/satellites?source=etag-test', headers={'Accept-Encoding': 'gzip, deflate'})
+        deflated = self.client.get('/satellites?source=etag-test', headers={'Accept-Encoding': 'deflate'})
+
+        self.assertEqual(gzipped.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(gzipped.data), plain.data)
+        self.assertEqual(deflated.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(zlib.decompress(deflated.data), plain.data)
+        self.assertLess(len(gzipped.data), len(plain.data))
+        self.assertNotEqual(gzipped.headers['ETag'], plain.headers['ETag'])
+        self.assertEqual(orbit_app.representations.stats()['builds'] - builds, 1)
+
+        revalidated = self.client.get('/satellites?source=etag-test', headers={
+            'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']
+        })
+        self.assertEqual(revalidated.status_code, 304)
+
+    def test_ndjson_revalidation(self):
+        """Test the streaming format has its own ETag and honours If-None-Match"""
+        first = self.client.get('/satellites?source=etag-test&format=ndjson')
+        repeat = self.client.get('/satellites?source=etag-test&format=ndjson',
+                                 headers={'If-None-Match': first.headers['ETag']})
+        json_listing = self.client.get('/satellites?source=etag-test')
+
+        self.assertEqual(len(first.get_data(as_text=True).splitlines()), 50)
+        self.assertEqual(repeat.status_code, 304)
+        self.assertNotEqual(first.headers['ETag'], json_listing.headers['ETag'])
+
+
+class TestFilteredListing(unittest.TestCase):
+    """Test cases for indexed filters and field projection"""
+
+    def setUp(self):
+        """Serve a versioned two-object catalog"""
+        self.catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE], category='stations')
+        orbit_app.tracker._install_catalog('filter-test', self.catalog, 'filter-v1')
+        self.addCleanup(orbit_app.tracker.tle_data.pop, 'filter-test', None)
+        for patcher in (
+            mock.patch.object(orbit_app.tracker, 'fetch_tle_data',
+                              mock.AsyncMock(side_effect=lambda source: orbit_app.tracker.tle_data[source])),
+            mock.patch.dict(orbit_app.CATALOG_SOURCES, {'filter-test': 'filter-test',
+                                                        'filter-test-active': 'filter-test-active'}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = orbit_app.app.test_client()
+
+    def test_range_and_name_filters(self):
+        """Test range, category and name-prefix filters select matching objects"""
+        leo = self.client.get('/satellites?source=filter-test&apogee_max=2000').get_json()
+        inclined = self.client.get('/satellites?source=filter-test&inclination_min=52&category=stations').get_json()
+        named = self.client.get('/satellites?source=filter-test&name=iss').get_json()
+
+        self.assertEqual(list(leo['satellites']), [str(ISS_TLE['norad_id'])])
+        self.assertEqual(leo['matched'], 1)
+        self.assertEqual(list(inclined['satellites']), [str(GPS_TLE['norad_id'])])
+        self.assertEqual(list(named['satellites']), [str(ISS_TLE['norad_id'])])
+
+    def test_category_filter_on_mixed_catalog(self):
+        """Test rows of the active catalog carry the sync job's category groups and filter on them"""
+        redis = InMemoryRedis()
+        redis.sadd('satellites:category:stations', str(ISS_TLE['norad_id']))
+        redis.sadd('satellites:category:navigation', str(GPS_TLE['norad_id']))
+        records = {str(record['norad_id']): record for record in (ISS_TLE, GPS_TLE)}
+        with mock.patch.object(orbit_app, 'redis_client', redis):
+            orbit_app.tracker._install_catalog('filter-test-active', records, 'active-v1')
+        self.addCleanup(orbit_app.tracker.tle_data.pop, 'filter-test-active', None)
+
+        stations = self.client.get('/satellites?source=filter-test-active&category=stations').get_json()
+        both = self.client.get('/satellites?source=filter-test-active&category=navigation,stations&fields=category')
+
+        self.assertEqual(list(stations['satellites']), [str(ISS_TLE['norad_id'])])
+        self.assertEqual(both.get_json()['satellites'], {str(ISS_TLE['norad_id']): {'category': 'stations'},
+                                                         str(GPS_TLE['norad_id']): {'category': 'navigation'}})
+
+    def test_categories_read_once_per_version(self):
+        """Test the groups read for a downloaded catalog are published with it and reused by other workers"""
+        redis = InMemoryRedis()
+        redis.sadd('satellites:category:stations', str(ISS_TLE['norad_id']))
+        downloaded = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE], category='active')
+        with mock.patch.object(orbit_app, 'redis_client', redis):
+            orbit_app.tracker._categorize('active', downloaded)
+            version = orbit_app.tracker._publish_catalog('active', downloaded, datetime.now(timezone.utc))
+            redis.commands.clear()
+
+            records = json.loads(redis.get('tle_data:active'))
+            installed = orbit_app.tracker._categorize(
+                'active', SatelliteCatalog.from_records(records.values(), category='active'), version
+            )
+            stale = orbit_app.tracker._categorize(
+                'active', SatelliteCatalog.from_records(records.values(), category='active'), 'other-version'
+            )
+
+        self.assertEqual(redis.commands.count('smembers'), len(orbit_app.CATEGORY_NAMES) - 2)
+        for catalog in (installed, stale):
+            self.assertEqual([catalog[norad_id].category for norad_id in (ISS_TLE['norad_id'], GPS_TLE['norad_id'])],
+                             ['stations', 'active'])
+
+    def test_index_built_once_per_version(self):
+        """Test filtered queries reuse one index until the catalog changes"""
+        self.client.get('/satellites?source=filter-test&name=GPS')
+        index = orbit_app.tracker.catalog_indexes['filter-test']
+        self.client.get('/satellites?source=filter-test&eccentricity_max=0.1')
+        self.assertIs(orbit_app.tracker.catalog_indexes['filter-test'], index)
+
+        orbit_app.tracker._install_catalog('filter-test', self.catalog.select(np.arange(1)), 'filter-v2')
+        self.assertNotIn('filter-test', orbit_app.tracker.catalog_indexes)
+
+    def test_epoch_age(self):
+        """Test epoch-age bounds are measured back from now in days"""
+        fresh = self.client.get('/satellites?source=filter-test&epoch_age_max=30').get_json()
+        stale = self.client.get('/satellites?source=filter-test&epoch_age_min=30').get_json()
+
+        self.assertEqual(fresh['count'], 0)
+        self.assertEqual(stale['count'], 2)
+
+    def test_field_projection(self):
+        """Test fields= trims every record, in both formats"""
+        listing = self.client.get('/satellites?source=filter-test&fields=name,category&limit=1').get_json()
+        streamed = self.client.get('/satellites?source=filter-test&fields=norad_id&format=ndjson')
+
+        self.assertEqual(listing['satellites'], {str(ISS_TLE['norad_id']): {'name': ISS_TLE['name'],
+                                                                            'category': 'stations'}})
+        self.assertEqual((listing['count'], listing['matched']), (1, 2))
+        self.assertEqual([json.loads(line) for line in streamed.get_data(as_text=True).splitlines()],
+                         [{'norad_id': ISS_TLE['norad_id']}, {'norad_id': GPS_TLE['norad_id']}])
+
+    def test_filtered_revalidation(self):
+        """Test filtered listings carry their own ETag and answer 304 to it"""
+        first = self.client.get('/satellites?source=filter-test&name=ISS')
+        repeat = self.client.get('/satellites?source=filter-test&name=ISS',
+                                 headers={'If-None-Match': first.headers['ETag']})
+        other = self.client.get('/satellites?source=filter-test&name=GPS',
+                                headers={'If-None-Match': first.headers['ETag']})
+
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(other.status_code, 200)
+
+    def test_invalid_parameters(self):
+        """Test unknown fields and non-numeric bounds are rejected"""
+        self.assertEqual(self.client.get('/satellites?source=filter-test&fields=mass').status_code, 400)
+        self.assertEqual(self.client.get('/satellites?source=filter-test&perigee_min=low').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
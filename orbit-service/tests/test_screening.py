@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test suite for full-catalog conjunction screening
+"""
+
+import unittest
+import sys
+import os
+import time
+from datetime import datetime, timezone, timedelta
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import app as orbit_app  # noqa: E402
+from sgp4.exporter import export_tle  # noqa: E402
+
+from screening import closest_approaches, find_candidates, screen_catalog  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, InMemoryRedis, circular_satrec  # noqa: E402
+
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _dense_minimum(sat1, sat2, center, half_window_s=60.0, resolution_s=0.01):
+    """Brute-force reference closest approach around ``center``"""
+    offsets = np.arange(-half_window_s, half_window_s, resolution_s)
+    jd = np.full(len(offsets), sat1.jdsatepoch)
+    fr = sat1.jdsatepochF + ((center - EPOCH).total_seconds() + offsets) / 86400.0
+    _, r1, _ = sat1.sgp4_array(jd, fr)
+    _, r2, _ = sat2.sgp4_array(jd, fr)
+    distances = np.linalg.norm(r1 - r2, axis=1)
+    best = int(np.argmin(distances))
+    return distances[best], center + timedelta(seconds=float(offsets[best]))
+
+
+class TestScreening(unittest.TestCase):
+    """Test cases for the KD-tree screening pipeline"""
+
+    def setUp(self):
+        """Two LEO objects crossing at the ascending node at epoch, plus a GEO bystander"""
+        self.satrecs = [
+            circular_satrec(1, 550.0, 53.0, 40.0, 0.0, EPOCH),
+            circular_satrec(2, 550.0, 70.0, 40.0, 0.0, EPOCH),
+            circular_satrec(3, 35786.0, 0.1, 0.0, 0.0, EPOCH),
+        ]
+        self.start = EPOCH - timedelta(minutes=10)
+
+    def test_crossing_pair_is_found_between_samples(self):
+        """Test a crossing that falls between grid points is still caught"""
+        candidates = find_candidates(self.satrecs, self.start + timedelta(seconds=7), 0.5, 30.0, 10.0)
+        pairs = {(c['index1'], c['index2']) for c in candidates}
+        self.assertEqual(pairs, {(0, 1)})
+
+    def test_repeat_encounters_are_kept(self):
+        """Test a pair meeting at both nodes every half orbit is refined once per encounter"""
+        satrecs = [circular_satrec(1, 550.0, 53.0, 40.0, 0.0, EPOCH),
+                   circular_satrec(2, 550.0, 127.0, 40.0, 0.0, EPOCH)]
+        candidates = find_candidates(satrecs, self.start, 2.0, 30.0, 10.0)
+        conjunctions = screen_catalog([1, 2], satrecs, 2.0, 30.0, 10.0, start=self.start)
+
+        offsets = sorted(c['offset_seconds'] for c in candidates)
+        self.assertEqual(len(offsets), 3)
+        # Half an orbit apart, about 48 minutes at 550 km
+        np.testing.assert_allclose(np.diff(offsets), 2870.0, atol=30.0)
+        self.assertEqual(len(conjunctions), 3)
+        self.assertTrue(all(c['minimum_distance_km'] < 0.01 for c in conjunctions))
+
+    def test_refined_closest_approach(self):
+        """Test refinement recovers the node crossing time and miss distance"""
+        conjunctions = screen_catalog([1, 2, 3], self.satrecs, 0.5, 30.0, 10.0, start=self.start)
+        self.assertEqual(len(conjunctions), 1)
+        conjunction = conjunctions[0]
+        self.assertEqual((conjunction['primary_object'], conjunction['secondary_object']), (1, 2))
+        expected_distance, expected_time = _dense_minimum(self.satrecs[0], self.satrecs[1], EPOCH)
+        self.assertAlmostEqual(conjunction['minimum_distance_km'], expected_distance, delta=0.05)
+        self.assertLess(abs((conjunction['closest_approach_time'] - expected_time).total_seconds()), 1.0)
+        self.assertGreater(conjunction['relative_velocity_kms'], 1.0)
+
+    def test_no_conjunctions_for_distant_objects(self):
+        """Test well separated objects produce no candidates"""
+        self.assertEqual(screen_catalog([1, 3], [self.satrecs[0], self.satrecs[2]], 0.5, 30.0, 10.0,
+                                        start=self.start), [])
+
+
+class TestClosestApproachRefinement(unittest.TestCase):
+    """Test cases for range-rate root refinement of TCA"""
+
+    def setUp(self):
+        """Two LEO objects crossing near the ascending node at epoch"""
+        self.sat1 = circular_satrec(1, 550.0, 53.0, 40.0, 0.0, EPOCH)
+        self.sat2 = circular_satrec(2, 550.0, 70.0, 40.0, 0.0, EPOCH)
+        self.start = EPOCH - timedelta(minutes=10)
+
+    def test_meter_level_accuracy_from_coarse_grid(self):
+        """Test a 2 minute grid refines to the dense-sampled minimum"""
+        approaches = closest_approaches(self.sat1, self.sat2, self.start, 0.0, 3600.0, 120.0)
+        expected_distance, expected_time = _dense_minimum(self.sat1, self.sat2, EPOCH)
+        self.assertAlmostEqual(approaches[0]['distance_km'], expected_distance, delta=1e-3)
+        self.assertLess(abs((approaches[0]['time'] - expected_time).total_seconds()), 0.02)
+
+    def test_threshold_skips_distant_brackets(self):
+        """Test only approaches within the threshold are returned"""
+        approaches = closest_approaches(self.sat1, self.sat2, self.start, 0.0, 3600.0, 120.0, 10.0)
+        self.assertTrue(approaches)
+        self.assertTrue(all(approach['distance_km'] <= 10.0 for approach in approaches))
+
+    def test_assess_conjunction_threat_uses_refined_tca(self):
+        """Test the tracker reports the refined miss distance and relative velocity"""
+        records = []
+        for satnum, satrec in ((1, self.sat1), (2, self.sat2)):
+            line1, line2 = export_tle(satrec)
+            records.append(orbit_app.SatelliteData(
+                norad_id=satnum, name=f'SAT-{satnum}', line1=line1, line2=line2, epoch=EPOCH,
+                mean_motion=15.05, eccentricity=0.0, inclination=0.0, arg_perigee=0.0, raan=0.0,
+                mean_anomaly=0.0
+            ))
+        threat = orbit_app.tracker.assess_conjunction_threat(records[0], records[1], 1, start=self.start)
+        expected_distance, _ = _dense_minimum(self.sat1, self.sat2, EPOCH)
+        self.assertAlmostEqual(threat.minimum_distance_km, expected_distance, delta=0.01)
+        self.assertEqual(threat.risk_level, 'HIGH')
+        self.assertGreater(threat.relative_velocity_kms, 1.0)
+
+    def test_screening_skips_malformed_tle(self):
+        """Test incomplete catalog entries are skipped instead of failing the screening"""
+        satellites = [ISS_TLE, {'norad_id': 1, 'name': 'NO LINE 2', 'line1': ISS_TLE['line1']},
+                      dict(GPS_TLE, norad_id='n/a'), GPS_TLE]
+        with mock.patch.object(orbit_app, 'screen_catalog', return_value=[]) as screen:
+            self.assertEqual(orbit_app.tracker.screen_conjunctions(satellites, 1.0, 60.0), [])
+        self.assertEqual(screen.call_args.args[0], [ISS_TLE['norad_id'], GPS_TLE['norad_id']])
+
+
+class TestScreeningJobs(unittest.TestCase):
+    """Test cases for the asynchronous screening endpoint"""
+
+    def setUp(self):
+        """Set up test client with a stubbed catalog and an in-memory Redis"""
+        orbit_app.app.config['TESTING'] = True
+        self.client = orbit_app.app.test_client()
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        for patcher in (
+            mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=catalog)),
+            mock.patch.object(orbit_app, 'redis_client', InMemoryRedis()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_full_mode_returns_job_handle(self):
+        """Test full screening is queued and its result becomes readable"""
+        response = self.client.get('/threats/conjunctions?mode=full&hours=1&step=60')
+        self.assertEqual(response.status_code, 202)
+        status_url = response.get_json()['status_url']
+
+        deadline = time.monotonic() + 30
+        job = self.client.get(status_url).get_json()
+        while job['status'] == 'running' and time.monotonic() < deadline:
+            time.sleep(0.05)
+            job = self.client.get(status_url).get_json()
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['satellites_screened'], 2)
+        self.assertEqual(job['threats'], [])
+
+    def test_full_mode_needs_redis(self):
+        """Test job state is never kept per worker: without Redis full screening is unavailable"""
+        with mock.patch.object(orbit_app, 'redis_client', None):
+            submitted = self.client.get('/threats/conjunctions?mode=full&hours=1&step=60')
+            polled = self.client.get('/threats/conjunctions/jobs/any-job')
+        self.assertEqual((submitted.status_code, polled.status_code), (503, 503))
+
+    def test_default_mode_screens_and_reports_truncation(self):
+        """Test the default mode grid-screens the first objects and says when that was part of the catalog"""
+        with mock.patch.object(orbit_app.config, 'CONJUNCTION_SYNC_LIMIT', 1), \
+                mock.patch.object(orbit_app.tracker, 'screen_conjunctions', return_value=[]) as screen:
+            data = self.client.get('/threats/conjunctions?hours=1').get_json()
+        self.assertEqual((data['satellites_screened'], data['truncated']), (1, True))
+        self.assertEqual([record['norad_id'] for record in screen.call_args.args[0]], [ISS_TLE['norad_id']])
+
+    def test_unknown_job(self):
+        """Test missing job handles return 404"""
+        response = self.client.get('/threats/conjunctions/jobs/does-not-exist')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
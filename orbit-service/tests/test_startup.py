@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test suite for lazy, network-free startup and warm start
+"""
+
+import unittest
+import runpy
+import subprocess
+import sys
+import os
+import tempfile
+import threading
+from unittest import mock
+
+# Add parent directory to path
+SERVICE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, SERVICE_DIR)
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+
+IMPORT_CHECK = """
+import socket, sys
+
+def refuse(*args, **kwargs):
+    raise AssertionError('network access at import')
+
+socket.socket.connect = refuse
+socket.create_connection = refuse
+import app
+print(' '.join(sorted(name for name in ('scipy', 'skyfield') if name in sys.modules)))
+"""
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for import-time behaviour and warm start"""
+
+    def test_import_is_network_free_and_lazy(self):
+        """Test importing the service opens no connection and defers SciPy and Skyfield"""
+        env = dict(os.environ, REDIS_URL='redis://127.0.0.1:1', CATALOG_BACKGROUND_REFRESH='false')
+        result = subprocess.run([sys.executable, '-c', IMPORT_CHECK], cwd=SERVICE_DIR, env=env,
+                                capture_output=True, text=True)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
+    def test_timescale_is_shared(self):
+        """Test the timescale is built once from bundled data"""
+        timescale = orbit_app.get_timescale()
+        self.assertIs(orbit_app.get_timescale(), timescale)
+        self.assertIsNotNone(timescale.utc(2024, 1, 1).tt)
+
+    def test_unreachable_redis_is_dropped(self):
+        """Test a failed first ping leaves the process running without Redis"""
+        client = mock.Mock()
+        client.ping.side_effect = ConnectionError('refused')
+        with mock.patch.object(orbit_app, 'redis_client', client), \
+                mock.patch.object(orbit_app, '_configured_redis', client), \
+                mock.patch.object(orbit_app, '_redis_available', None), \
+                mock.patch.object(orbit_app.pass_cache, 'redis_client', client):
+            self.assertIsNone(orbit_app.ensure_redis())
+            self.assertIsNone(orbit_app.redis_client)
+            self.assertIsNone(orbit_app.pass_cache.redis_client)
+            self.assertIsNone(orbit_app.ensure_redis())
+        client.ping.assert_called_once()
+
+    def test_warm_start_loads_catalogs(self):
+        """Test warm start loads each preload source and reports step timings"""
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+
+        def install(source):
+            orbit_app.tracker._install_catalog(source, catalog, 'warm-v1')
+
+        with mock.patch.object(orbit_app.tracker, 'refresh_catalog', side_effect=install) as refresh:
+            timings = orbit_app.warm_start(['warm-test'])
+
+        refresh.assert_called_once_with('warm-test')
+        self.assertIs(orbit_app.tracker.tle_data['warm-test'], catalog)
+        self.assertEqual(set(timings), {'timescale', 'modules', 'redis', 'catalog:warm-test'})
+        self.assertIn('scipy.spatial', sys.modules)
+        self.assertFalse(orbit_app.tracker.refresh_running())
+
+    def test_background_warm_start_reports_readiness(self):
+        """Test a background warm start serves /health while it runs and starts the refresher when done"""
+        release = threading.Event()
+
+        def install(source):
+            release.wait(5)
+
+        with mock.patch.object(orbit_app.tracker, 'refresh_catalog', side_effect=install), \
+                mock.patch.object(orbit_app.tracker, 'start_background_refresh') as start_refresh, \
+                mock.patch.object(orbit_app.config, 'BACKGROUND_REFRESH', True), \
+                mock.patch.dict(orbit_app.warm_start_state, clear=True):
+            thread = orbit_app.start_warm_start(['warm-test'])
+            response = orbit_app.app.test_client().get('/health')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['status'], 'starting')
+            self.assertEqual(response.get_json()['services']['warm_start']['status'], 'running')
+            start_refresh.assert_not_called()
+
+            release.set()
+            thread.join(5)
+            self.assertEqual(orbit_app.warm_start_state['status'], 'ready')
+            self.assertIn('catalog:warm-test', orbit_app.warm_start_state['seconds'])
+            start_refresh.assert_called_once_with()
+
+    def test_gunicorn_config_clears_metrics_once(self):
+        """Test reading the gunicorn config empties the metrics directory, but a reload in the same master does not"""
+        with tempfile.TemporaryDirectory() as root:
+            stale = os.path.join(root, 'api', 'histogram_1.db')
+            os.makedirs(os.path.dirname(stale))
+            open(stale, 'w').close()
+            environ = {'METRICS_ROOT': root, 'GUNICORN_PRELOAD': 'false'}
+            with mock.patch.dict(os.environ, environ):
+                os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+                os.environ.pop('ORBIT_METRICS_DIR_OWNER', None)
+                runpy.run_path(os.path.join(SERVICE_DIR, 'gunicorn.conf.py'))
+                self.assertEqual(os.environ['PROMETHEUS_MULTIPROC_DIR'], os.path.join(root, 'api'))
+                self.assertFalse(os.path.exists(stale))
+
+                open(stale, 'w').close()
+                runpy.run_path(os.path.join(SERVICE_DIR, 'gunicorn.conf.py'))
+                self.assertTrue(os.path.exists(stale))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test suite for the columnar TLE parser
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from sgp4.exporter import export_tle
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tle_parser import parse_tle_text  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from fixtures import ISS_TLE, GPS_TLE, circular_satrec  # noqa: E402
+
+
+def _listing(*tles):
+    return '\n'.join(f"{tle['name']}\n{tle['line1']}\n{tle['line2']}" for tle in tles)
+
+
+def _with_checksum(line):
+    """Recompute the checksum digit of an edited element line"""
+    total = sum(int(c) if c.isdigit() else c == '-' for c in line[:68])
+    return line[:68] + str(total % 10)
+
+
+class TestTLEParser(unittest.TestCase):
+    """Test cases for vectorized TLE decoding"""
+
+    def test_decodes_elements_and_epoch(self):
+        """Test fields match a scalar parse of the same columns"""
+        columns, errors = parse_tle_text(_listing(ISS_TLE, GPS_TLE))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(columns['norad_id'].tolist(), [25544, 24876])
+        self.assertEqual(columns['name'], ['ISS (ZARYA)', 'GPS BIIR-2  (PRN 13)'])
+        self.assertEqual(columns['inclination'][0], float(ISS_TLE['line2'][8:16]))
+        self.assertEqual(columns['eccentricity'][1], float('0.' + GPS_TLE['line2'][26:33]))
+        self.assertEqual(columns['mean_motion'][0], float(ISS_TLE['line2'][52:63]))
+        expected = datetime(2014, 1, 1) + timedelta(days=20.93268519 - 1)
+        self.assertEqual(columns['epoch'][0].astype(datetime), expected)
+
+    def test_bad_records_reported_in_bulk(self):
+        """Test each malformed record is reported once with the first failed check"""
+        bad_checksum = dict(ISS_TLE, name='BAD CHECKSUM', line1=ISS_TLE['line1'][:68] + '0')
+        short_line = dict(ISS_TLE, name='SHORT', line2=ISS_TLE['line2'][:60])
+        mismatched = dict(ISS_TLE, name='MISMATCH', line2=_with_checksum('2 25545' + ISS_TLE['line2'][7:]))
+        bad_field = dict(ISS_TLE, name='BAD FIELD',
+                         line2=_with_checksum(ISS_TLE['line2'][:8] + ' 51x6498' + ISS_TLE['line2'][16:]))
+
+        columns, errors = parse_tle_text(_listing(bad_checksum, GPS_TLE, short_line, mismatched, bad_field))
+
+        self.assertEqual(columns['norad_id'].tolist(), [24876])
+        self.assertEqual(
+            [(error['index'], error['name'], error['reason']) for error in errors],
+            [(2, 'SHORT', 'line length'), (0, 'BAD CHECKSUM', 'checksum'),
+             (3, 'MISMATCH', 'catalog number'), (4, 'BAD FIELD', 'field format')]
+        )
+
+    def test_crlf_and_padding(self):
+        """Test CRLF line endings and stray whitespace around lines are tolerated"""
+        text = f"{ISS_TLE['name']}  \r\n {ISS_TLE['line1']} \r\n{ISS_TLE['line2']}\r\n"
+        columns, errors = parse_tle_text(text)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(columns['line1'], [ISS_TLE['line1']])
+        self.assertEqual(columns['name'], ['ISS (ZARYA)'])
+
+    def test_alpha5_catalog_numbers(self):
+        """Test Alpha-5 catalog numbers above 99999 decode"""
+        line1 = _with_checksum(ISS_TLE['line1'][:2] + 'A0001' + ISS_TLE['line1'][7:])
+        line2 = _with_checksum(ISS_TLE['line2'][:2] + 'A0001' + ISS_TLE['line2'][7:])
+        columns, errors = parse_tle_text(_listing(dict(ISS_TLE, line1=line1, line2=line2)))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(columns['norad_id'].tolist(), [100001])
+
+    def test_empty_listing(self):
+        """Test an empty download yields no records and no errors"""
+        columns, errors = parse_tle_text('')
+        self.assertEqual(len(columns['norad_id']), 0)
+        self.assertEqual(errors, [])
+
+    def test_records_match_scalar_parse(self):
+        """Test a synthetic catalog decodes exactly like per-record float parsing"""
+        epoch = datetime(2024, 3, 1, 12, tzinfo=timezone.utc)
+        rng = np.random.default_rng(7)
+        tles = []
+        for i in range(200):
+            satrec = circular_satrec(40000 + i, rng.uniform(300, 36000), rng.uniform(0, 120),
+                                     rng.uniform(0, 360), rng.uniform(0, 360),
+                                     epoch + timedelta(minutes=float(rng.uniform(0, 5000))))
+            line1, line2 = export_tle(satrec)
+            tles.append({'name': f'SAT {i}', 'line1': line1, 'line2': line2})
+
+        columns, errors = parse_tle_text(_listing(*tles))
+        records = SatelliteCatalog.from_columns(columns).to_records()
+
+        self.assertEqual(errors, [])
+        for tle in tles:
+            record = records[int(tle['line1'][2:7])]
+            self.assertEqual(record['raan'], float(tle['line2'][17:25]))
+            self.assertEqual(record['arg_perigee'], float(tle['line2'][34:42]))
+            self.assertEqual(record['mean_anomaly'], float(tle['line2'][43:51]))
+            day = float(tle['line1'][20:32])
+            expected = datetime(2000 + int(tle['line1'][18:20]), 1, 1) + timedelta(days=day - 1)
+            self.assertEqual(datetime.fromisoformat(record['epoch']), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test suite for observer visibility and illumination
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime, timezone
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from skyfield.api import EarthSatellite, load, wgs84  # noqa: E402
+
+import app as orbit_app  # noqa: E402
+from catalog import SatelliteCatalog  # noqa: E402
+from propagation import geodetic_to_ecef, julian_dates  # noqa: E402
+from visibility import (  # noqa: E402
+    ASTRONOMICAL_UNIT_KM, ILLUMINATION_STATES, illumination, observer_view, sun_position_teme
+)
+from fixtures import ISS_TLE, GPS_TLE  # noqa: E402
+
+EPOCH = datetime(2014, 1, 21, 12, 0, tzinfo=timezone.utc)
+
+
+class TestSunAndShadow(unittest.TestCase):
+    """Test cases for the solar ephemeris and the shadow model"""
+
+    def test_sun_at_equinox_and_solstice(self):
+        """Test the sun crosses the equator at the March equinox and peaks at the June solstice"""
+        jd, fr = julian_dates([datetime(2024, 3, 20, 3, 6, tzinfo=timezone.utc),
+                               datetime(2024, 6, 20, 20, 51, tzinfo=timezone.utc)])
+        sun = sun_position_teme(jd, fr)
+        declination = np.degrees(np.arcsin(sun[:, 2] / np.linalg.norm(sun, axis=1)))
+
+        self.assertAlmostEqual(declination[0], 0.0, places=1)
+        self.assertAlmostEqual(declination[1], 23.44, places=1)
+        self.assertGreater(sun[0, 0], 0.99 * ASTRONOMICAL_UNIT_KM)
+
+    def test_conical_shadow(self):
+        """Test sunward, anti-sun and grazing positions"""
+        sun = np.array([ASTRONOMICAL_UNIT_KM, 0.0, 0.0])
+        positions = np.array([
+            [7000.0, 0.0, 0.0],
+            [-7000.0, 0.0, 0.0],
+            [-7000.0, 6378.137, 0.0],
+            [0.0, 7000.0, 0.0],
+        ])
+        states = [ILLUMINATION_STATES[state] for state in illumination(positions, sun)]
+        self.assertEqual(states, ['sunlit', 'umbra', 'penumbra', 'sunlit'])
+
+
+class TestObserverView(unittest.TestCase):
+    """Test cases for whole-catalog look angles"""
+
+    def test_selects_and_orders_above_mask(self):
+        """Test only positions above the mask are returned, highest first, skipping failures"""
+        positions = np.array([
+            geodetic_to_ecef(10.0, 20.0, 500.0),
+            geodetic_to_ecef(-10.0, -160.0, 500.0),
+            [np.nan, np.nan, np.nan],
+            geodetic_to_ecef(12.0, 20.0, 500.0),
+        ])
+        view = observer_view(positions, EPOCH, 10.0, 20.0, 0.0, 10.0)
+
+        self.assertEqual(view['rows'].tolist(), [0, 3])
+        self.assertAlmostEqual(view['elevation'][0], 90.0, places=3)
+        self.assertAlmostEqual(view['range_km'][0], 500.0, places=3)
+        self.assertEqual(len(view['illumination']), 2)
+
+    def test_matches_skyfield(self):
+        """Test ISS look angles agree with Skyfield's topocentric solution"""
+        timescale = load.timescale()
+        satellite = EarthSatellite(ISS_TLE['line1'], ISS_TLE['line2'], ISS_TLE['name'], timescale)
+        t = timescale.from_datetime(EPOCH)
+        subpoint = wgs84.subpoint_of(satellite.at(t))
+        lat, lon = subpoint.latitude.degrees + 5.0, subpoint.longitude.degrees - 3.0
+        elevation, azimuth, distance = (satellite - wgs84.latlon(lat, lon)).at(t).altaz()
+
+        catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        result = orbit_app.tracker.visible_satellites(catalog, lat, lon, 0.0, 0.0, EPOCH)
+
+        self.assertIn(25544, result['norad_ids'])
+        row = result['norad_ids'].index(25544)
+        self.assertEqual(result['names'][row], ISS_TLE['name'])
+        self.assertAlmostEqual(result['elevation'][row], elevation.degrees, delta=0.05)
+        self.assertAlmostEqual(result['azimuth'][row], azimuth.degrees, delta=0.05)
+        self.assertAlmostEqual(result['range_km'][row], distance.km, delta=1.0)
+        self.assertEqual(result['at'], EPOCH.isoformat())
+
+
+class TestVisibleEndpoint(unittest.TestCase):
+    """Test cases for /satellites/visible"""
+
+    def setUp(self):
+        """Set up test client with a stubbed catalog"""
+        self.client = orbit_app.app.test_client()
+        self.catalog = SatelliteCatalog.from_records([ISS_TLE, GPS_TLE])
+        patcher = mock.patch.object(orbit_app.tracker, 'fetch_tle_data', mock.AsyncMock(return_value=self.catalog))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_columns_and_sun(self):
+        """Test the response lists look angles per satellite and the sun state"""
+        response = self.client.get('/satellites/visible?lat=0&lon=0&min_elevation=-90'
+                                   '&timestamp=2014-01-21T12:00:00Z')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(sorted(data['norad_ids']), [24876, 25544])
+        self.assertEqual(data['elevation'], sorted(data['elevation'], reverse=True))
+        self.assertTrue(set(data['illumination']) <= set(ILLUMINATION_STATES))
+        # Local noon on the equator in January
+        self.assertGreater(data['sun']['elevation'], 60.0)
+        self.assertFalse(data['sun']['dark_sky'])
+        self.assertEqual(data['observable'], [False, False])
+
+    def test_current_positions_use_snapshot(self):
+        """Test a request without a timestamp reads the shared snapshot"""
+        orbit_app.tracker._install_catalog('visible-test', self.catalog, 'v1')
+        snapshot = orbit_app.tracker.publish_snapshot('visible-test')
+
+        with mock.patch.object(orbit_app.tracker, '_propagate') as propagate, \
+                mock.patch.dict(orbit_app.CATALOG_SOURCES, {'visible-test': 'visible-test'}):
+            data = self.client.get('/satellites/visible?lat=0&lon=0&min_elevation=-90&source=visible-test').get_json()
+
+        propagate.assert_not_called()
+        self.assertEqual(data['at'], snapshot.epoch.isoformat())
+
+    def test_rejects_bad_observer(self):
+        """Test missing or out-of-range coordinates are reported"""
+        self.assertEqual(self.client.get('/satellites/visible?lon=0').status_code, 400)
+        self.assertEqual(self.client.get('/satellites/visible?lat=91&lon=0').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
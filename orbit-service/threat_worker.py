@@ -12,10 +12,13 @@ import logging
 import numpy as np
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime, timezone, timedelta
-import redis
-from sgp4.api import Satrec, jday
+from sgp4.api import jday
 from sgp4.conveniences import sat_epoch_datetime
 
+from catalog import SatelliteCatalog
+from metrics import PAIR_ANALYSIS_SECONDS, PROPAGATED_STATES, reset_multiprocess_dir, serve_worker_metrics
+from redis_store import BatchWriter, InstrumentedRedis, connect, load_json
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -40,12 +43,12 @@ class ThreatAnalyzer:
     def __init__(self):
         self.redis_client = self._init_redis()
         self.running = True
-        self.satellites_cache = {}
+        self.catalog = SatelliteCatalog.empty()
         
-    def _init_redis(self) -> redis.Redis:
+    def _init_redis(self) -> InstrumentedRedis:
         """Initialize Redis connection"""
         try:
-            client = redis.from_url(REDIS_URL, decode_responses=True)
+            client = connect(REDIS_URL)
             client.ping()
             logger.info("Successfully connected to Redis")
             return client
@@ -84,51 +87,22 @@ class ThreatAnalyzer:
     def _update_satellite_cache(self) -> None:
         """Update local cache of satellite TLE data"""
         try:
-            # Get all satellite TLE keys
-            pattern = "satellite:tle:*"
-            keys = self.redis_client.keys(pattern)
-            
-            logger.info(f"Loading {len(keys)} satellites for analysis")
+            # SCAN the keys and read them with a few MGETs instead of one GET each
+            records = load_json(self.redis_client, "satellite:tle:*")
+            logger.info(f"Loading {len(records)} satellites for analysis")
             
-            for key in keys:
-                try:
-                    tle_json = self.redis_client.get(key)
-                    if tle_json:
-                        tle_data = json.loads(tle_json)
-                        sat_id = key.split(':')[-1]
-                        
-                        # Parse TLE and create SGP4 satellite object
-                        satellite = self._create_satellite_from_tle(tle_data)
-                        if satellite:
-                            self.satellites_cache[sat_id] = {
-                                'satellite': satellite,
-                                'tle_data': tle_data,
-                                'name': tle_data.get('OBJECT_NAME', 'Unknown')
-                            }
-                except Exception as e:
-                    logger.error(f"Failed to load satellite {key}: {e}")
+            # Parse every TLE at once; SGP4 records are initialized when first propagated
+            self.catalog = SatelliteCatalog.from_gp_records(records)
+            for rejected in self.catalog.rejected:
+                logger.error(f"Failed to create satellite {rejected['name']} from TLE: {rejected['reason']}")
                     
         except Exception as e:
             logger.error(f"Failed to update satellite cache: {e}")
-            
-    def _create_satellite_from_tle(self, tle_data: Dict[str, Any]) -> Optional[Satrec]:
-        """Create SGP4 satellite object from TLE data"""
-        try:
-            # Extract TLE lines
-            line1 = tle_data.get('TLE_LINE1', '')
-            line2 = tle_data.get('TLE_LINE2', '')
-            
-            if line1 and line2:
-                satellite = Satrec.twoline2rv(line1, line2)
-                return satellite
-        except Exception as e:
-            logger.error(f"Failed to create satellite from TLE: {e}")
-        return None
         
     def _analyze_collision_threats(self) -> List[Dict[str, Any]]:
         """Analyze potential collision threats between satellites"""
         threats = []
-        sat_ids = list(self.satellites_cache.keys())
+        sat_ids = list(self.catalog)
         
         logger.info(f"Analyzing collision threats for {len(sat_ids)} satellites")
         
@@ -145,14 +119,15 @@ class ThreatAnalyzer:
         logger.info(f"Found {len(threats)} potential collision threats")
         return threats
         
-    def _check_collision_threat(self, sat1_id: str, sat2_id: str) -> Optional[Dict[str, Any]]:
+    @PAIR_ANALYSIS_SECONDS.labels('threat_worker').time()
+    def _check_collision_threat(self, sat1_id: int, sat2_id: int) -> Optional[Dict[str, Any]]:
         """Check collision threat between two satellites"""
         try:
-            sat1_data = self.satellites_cache[sat1_id]
-            sat2_data = self.satellites_cache[sat2_id]
+            sat1_data = self.catalog[sat1_id]
+            sat2_data = self.catalog[sat2_id]
             
-            sat1 = sat1_data['satellite']
-            sat2 = sat2_data['satellite']
+            sat1 = sat1_data.satrec
+            sat2 = sat2_data.satrec
             
             # Calculate positions over prediction period
             start_time = datetime.now(timezone.utc)
@@ -177,6 +152,7 @@ class ThreatAnalyzer:
                 # Get positions
                 e1, r1, v1 = sat1.sgp4(jd, fr)
                 e2, r2, v2 = sat2.sgp4(jd, fr)
+                PROPAGATED_STATES.labels('threat_worker', 'sgp4').inc(2)
                 
                 if e1 == 0 and e2 == 0:  # No errors
                     # Calculate distance
@@ -194,12 +170,12 @@ class ThreatAnalyzer:
                 
                 return {
                     'satellite1': {
-                        'id': sat1_id,
-                        'name': sat1_data['name']
+                        'id': str(sat1_id),
+                        'name': sat1_data.name
                     },
                     'satellite2': {
-                        'id': sat2_id,
-                        'name': sat2_data['name']
+                        'id': str(sat2_id),
+                        'name': sat2_data.name
                     },
                     'min_distance_km': min_distance,
                     'closest_approach_time': closest_time.isoformat(),
@@ -234,14 +210,15 @@ class ThreatAnalyzer:
                 json.dumps({
                     'threats': threats,
                     'analysis_time': datetime.now(timezone.utc).isoformat(),
-                    'total_satellites': len(self.satellites_cache)
+                    'total_satellites': len(self.catalog)
                 })
             )
             
-            # Store individual threat records
-            for threat in threats:
-                threat_key = f"threat:{threat['satellite1']['id']}:{threat['satellite2']['id']}"
-                self.redis_client.setex(threat_key, 86400, json.dumps(threat))
+            # Store individual threat records, batched into pipelined round trips
+            with BatchWriter(self.redis_client) as writer:
+                for threat in threats:
+                    threat_key = f"threat:{threat['satellite1']['id']}:{threat['satellite2']['id']}"
+                    writer.setex(threat_key, 86400, json.dumps(threat))
                 
             logger.info(f"Stored {len(threats)} threat records")
             
@@ -252,29 +229,34 @@ class ThreatAnalyzer:
         """Process critical threats requiring immediate attention"""
         critical_threats = [t for t in threats if t['threat_level'] in ['CRITICAL', 'HIGH']]
         
-        for threat in critical_threats:
-            try:
-                # Create alert
-                alert = {
-                    'type': 'collision_threat',
-                    'severity': threat['threat_level'],
-                    'satellites': [threat['satellite1'], threat['satellite2']],
-                    'details': threat,
-                    'created_at': datetime.now(timezone.utc).isoformat()
-                }
-                
-                # Push to alert queue
-                self.redis_client.rpush('alerts:queue', json.dumps(alert))
-                
-                # Store in alerts history
-                alert_key = f"alert:{datetime.now(timezone.utc).timestamp()}"
-                self.redis_client.setex(alert_key, 604800, json.dumps(alert))  # 7 days
-                
-                logger.warning(f"Created {threat['threat_level']} alert for potential collision: "
-                             f"{threat['satellite1']['name']} - {threat['satellite2']['name']}")
+        try:
+            with BatchWriter(self.redis_client) as writer:
+                for threat in critical_threats:
+                    try:
+                        # Create alert
+                        alert = {
+                            'type': 'collision_threat',
+                            'severity': threat['threat_level'],
+                            'satellites': [threat['satellite1'], threat['satellite2']],
+                            'details': threat,
+                            'created_at': datetime.now(timezone.utc).isoformat()
+                        }
+                        
+                        # Push to alert queue
+                        writer.rpush('alerts:queue', json.dumps(alert))
+                        
+                        # Store in alerts history
+                        alert_key = f"alert:{datetime.now(timezone.utc).timestamp()}"
+                        writer.setex(alert_key, 604800, json.dumps(alert))  # 7 days
+                        
+                        logger.warning(f"Created {threat['threat_level']} alert for potential collision: "
+                                     f"{threat['satellite1']['name']} - {threat['satellite2']['name']}")
+                                 
+                    except Exception as e:
+                        logger.error(f"Failed to process critical threat: {e}")
                              
-            except Exception as e:
-                logger.error(f"Failed to process critical threat: {e}")
+        except Exception as e:
+            logger.error(f"Failed to write critical threat alerts: {e}")
                 
     def health_check(self) -> Dict[str, Any]:
         """Perform health check"""
@@ -284,7 +266,7 @@ class ThreatAnalyzer:
                 'status': 'healthy',
                 'worker_type': 'threat_analyzer',
                 'threat_analysis_enabled': THREAT_ANALYSIS_ENABLED,
-                'satellites_tracked': len(self.satellites_cache),
+                'satellites_tracked': len(self.catalog),
                 'timestamp': datetime.now(timezone.utc).isoformat()
             }
         except Exception as e:
@@ -304,6 +286,7 @@ class ThreatAnalyzer:
 
 def main():
     """Main entry point"""
+    reset_multiprocess_dir()
     if not THREAT_ANALYSIS_ENABLED:
         logger.info("Threat analysis is disabled. Exiting.")
         return
@@ -311,6 +294,9 @@ def main():
     try:
         analyzer = ThreatAnalyzer()
         
+        if serve_worker_metrics():
+            logger.info(f"Serving metrics on port {os.getenv('METRICS_PORT')}")
+        
         # Register shutdown handlers
         import signal
         signal.signal(signal.SIGTERM, lambda sig, frame: analyzer.shutdown())
@@ -0,0 +1,194 @@
+"""
+Columnar TLE Parser
+Vectorized decoding of whole three-line element sets into NumPy columns
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+TLE_LINE_LENGTH = 69
+
+_ZERO = ord('0')
+_SPACE = ord(' ')
+_POINT = ord('.')
+_MINUS = ord('-')
+_NEWLINE = ord('\n')
+_CR = ord('\r')
+
+# (first column, end column, decimal point column) with end for integers and None for an implied leading "0."
+_LINE1_FIELDS = {
+    'catalog_number': (3, 7, 7),
+    'epoch_year': (18, 20, 20),
+    'epoch_day': (20, 32, 23),
+}
+_LINE2_FIELDS = {
+    'catalog_number': (3, 7, 7),
+    'inclination': (8, 16, 11),
+    'raan': (17, 25, 20),
+    'eccentricity': (26, 33, None),
+    'arg_perigee': (34, 42, 37),
+    'mean_anomaly': (43, 51, 46),
+    'mean_motion': (52, 63, 54),
+}
+
+# Alpha-5 catalog numbers replace the leading digit with a letter (I and O are skipped)
+_ALPHA5_VALUES = np.zeros(256, dtype=np.int64)
+for _value, _letter in enumerate('ABCDEFGHJKLMNPQRSTUVWXYZ', start=10):
+    _ALPHA5_VALUES[ord(_letter)] = _value
+
+
+def _split_lines(text: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Byte buffer of the listing with the start and end offset of every line"""
+    buffer = np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+    newlines = np.flatnonzero(buffer == _NEWLINE)
+    starts = np.concatenate(([0], newlines + 1))
+    ends = np.concatenate((newlines, [len(buffer)]))
+    # CRLF line endings
+    if len(buffer):
+        ends -= (ends > starts) & (buffer[np.maximum(ends - 1, 0)] == _CR)
+    return buffer, starts, ends
+
+
+def _line_matrix(buffer: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Gather element lines into an (n, 69) uint8 matrix, returning it with each line's length"""
+    lengths = ends - starts
+    index = np.minimum(starts[:, None] + np.arange(TLE_LINE_LENGTH), max(len(buffer) - 1, 0))
+    chars = buffer[index] if len(buffer) else np.zeros((len(starts), TLE_LINE_LENGTH), dtype=np.uint8)
+
+    # Stray surrounding whitespace is rare, so those rows are repaired one by one
+    for row in np.flatnonzero(lengths != TLE_LINE_LENGTH):
+        line = buffer[starts[row]:ends[row]].tobytes().strip()
+        lengths[row] = len(line)
+        if len(line) == TLE_LINE_LENGTH:
+            chars[row] = np.frombuffer(line, dtype=np.uint8)
+    return chars, lengths
+
+
+class _LineColumns:
+    """Character classes and digit values of a line matrix, computed once for every field"""
+
+    def __init__(self, chars: np.ndarray):
+        self.chars = chars
+        self.is_digit = (chars >= _ZERO) & (chars <= _ZERO + 9)
+        self.digits = np.where(self.is_digit, chars - _ZERO, 0).astype(np.float64)
+
+    def checksum_valid(self) -> np.ndarray:
+        """Modulo-10 checksum of columns 1-68 (digits count their value, minus signs count 1)"""
+        body = slice(0, TLE_LINE_LENGTH - 1)
+        total = self.digits[:, body].sum(axis=1) + (self.chars[:, body] == _MINUS).sum(axis=1)
+        return (total.astype(np.int64) % 10) == self.digits[:, -1]
+
+    def fixed_point(self, spans: Dict[str, Tuple[int, int, Optional[int]]]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Decode fixed-width unsigned decimal fields of every row, each with a validity mask
+
+        Every field is a weighted sum of its digit columns, so all fields come
+        out of one matrix product; character checks are counted the same way.
+        """
+        n_fields = len(spans)
+        weights = np.zeros((TLE_LINE_LENGTH, n_fields))
+        members = np.zeros((TLE_LINE_LENGTH, n_fields), dtype=np.float32)
+        scales = np.empty(n_fields)
+        points = []
+        for k, (start, end, point) in enumerate(spans.values()):
+            columns = np.arange(start, end)
+            if point is None:
+                point = start - 1
+            points.append(point)
+            # Integer mantissa over an exact power of ten keeps the result correctly rounded
+            fraction_digits = int((columns > point).sum())
+            powers = np.where(columns < point, point - columns - 1, point - columns) + fraction_digits
+            digit_columns = columns != point
+            weights[columns[digit_columns], k] = 10.0 ** powers[digit_columns]
+            members[columns[digit_columns], k] = 1.0
+            scales[k] = 10.0 ** fraction_digits
+
+        values = (self.digits @ weights) / scales
+        invalid_chars = (~(self.is_digit | (self.chars == _SPACE))).astype(np.float32) @ members
+        digit_count = self.is_digit.astype(np.float32) @ members
+
+        decoded = {}
+        for k, (field, point) in enumerate(zip(spans, points)):
+            valid = (invalid_chars[:, k] == 0) & (digit_count[:, k] > 0)
+            start, end, _ = spans[field]
+            if start <= point < end:
+                valid &= self.chars[:, point] == _POINT
+            decoded[field] = (values[:, k], valid)
+        return decoded
+
+    def catalog_numbers(self, fields: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Combine column 3 with the decoded last four digits, accepting Alpha-5 leading letters"""
+        tail, tail_valid = fields.pop('catalog_number')
+        lead = self.chars[:, 2]
+        lead_value = np.full(len(lead), -1, dtype=np.int64)
+        lead_value[self.is_digit[:, 2]] = lead[self.is_digit[:, 2]] - _ZERO
+        lead_value[lead == _SPACE] = 0
+        letters = _ALPHA5_VALUES[lead]
+        lead_value[letters > 0] = letters[letters > 0]
+        return lead_value * 10000 + tail.astype(np.int64), tail_valid & (lead_value >= 0)
+
+
+def _decode_lines(chars: np.ndarray) -> List[str]:
+    return [line.decode('ascii', 'replace') for line in chars.view(f'S{TLE_LINE_LENGTH}').ravel().tolist()]
+
+
+def parse_tle_text(text: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Parse a three-line element listing into columns, reporting bad records in bulk
+
+    Returns ``(columns, errors)``. ``columns`` holds one array (or list for
+    strings) per field for the records that passed every check: line numbers,
+    line length, checksums, matching catalog numbers and field formats;
+    ``index`` gives each one's position in the listing.
+    ``errors`` lists the rejected records with the first failed check.
+    """
+    text = text.strip()
+    buffer, starts, ends = _split_lines(text)
+    n_records = len(starts) // 3 if text else 0
+    name_rows = np.arange(n_records) * 3
+    names = [name.strip() for name in text.split('\n')[0:3 * n_records:3]]
+
+    chars1, length1 = _line_matrix(buffer, starts[name_rows + 1], ends[name_rows + 1])
+    chars2, length2 = _line_matrix(buffer, starts[name_rows + 2], ends[name_rows + 2])
+    line1 = _LineColumns(chars1)
+    line2 = _LineColumns(chars2)
+
+    fields1 = line1.fixed_point(_LINE1_FIELDS)
+    fields2 = line2.fixed_point(_LINE2_FIELDS)
+    norad1, norad1_valid = line1.catalog_numbers(fields1)
+    norad2, norad2_valid = line2.catalog_numbers(fields2)
+    fields = {**fields1, **fields2}
+
+    # Checks in reporting order; a record is reported under the first one it fails
+    checks = [
+        ('line length', (length1 == TLE_LINE_LENGTH) & (length2 == TLE_LINE_LENGTH)),
+        ('line number', (chars1[:, 0] == ord('1')) & (chars2[:, 0] == ord('2'))),
+        ('checksum', line1.checksum_valid() & line2.checksum_valid()),
+        ('catalog number', norad1_valid & norad2_valid & (norad1 == norad2)),
+        ('field format', np.logical_and.reduce([valid for _, valid in fields.values()])),
+    ]
+
+    ok = np.ones(n_records, dtype=bool)
+    errors = []
+    for reason, passed in checks:
+        for index in np.flatnonzero(ok & ~passed):
+            errors.append({'index': int(index), 'name': names[index], 'reason': reason})
+        ok &= passed
+
+    rows = np.flatnonzero(ok)
+    year = fields['epoch_year'][0][rows].astype(np.int64)
+    year = np.where(year < 57, 2000 + year, 1900 + year)
+    day_us = np.round((fields['epoch_day'][0][rows] - 1.0) * 86400e6).astype(np.int64)
+    epoch = (year - 1970).astype('datetime64[Y]').astype('datetime64[us]') + day_us.astype('timedelta64[us]')
+
+    columns = {
+        'index': rows,
+        'norad_id': norad1[rows],
+        'name': [names[index] for index in rows],
+        'line1': _decode_lines(chars1[rows]),
+        'line2': _decode_lines(chars2[rows]),
+        'epoch': epoch,
+    }
+    for field in ('mean_motion', 'eccentricity', 'inclination', 'arg_perigee', 'raan', 'mean_anomaly'):
+        columns[field] = fields[field][0][rows]
+    return columns, errors
+
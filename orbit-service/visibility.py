@@ -0,0 +1,95 @@
+"""
+Observer Visibility
+Look angles and sunlit/eclipse state of a whole catalog from one observer, with one sun position per time
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+
+import numpy as np
+
+from propagation import WGS84_A_KM, julian_dates, look_angles, teme_to_ecef
+
+ASTRONOMICAL_UNIT_KM = 149597870.7
+SUN_RADIUS_KM = 696000.0
+
+ILLUMINATION_STATES = ('sunlit', 'penumbra', 'umbra')
+
+# Sun below this elevation leaves the sky dark enough to see sunlit satellites (civil twilight)
+DARK_SKY_SUN_ELEVATION_DEG = -6.0
+
+
+def sun_position_teme(jd: np.ndarray, fr: np.ndarray) -> np.ndarray:
+    """Geocentric sun position in km of shape (n_times, 3)
+
+    Low-precision solar ephemeris of the Astronomical Almanac (about 0.01
+    degrees over 1950-2050) in mean-of-date equatorial coordinates, which
+    differ from TEME by far less than shadow or look-angle precision needs.
+    """
+    t = ((np.asarray(jd) - 2451545.0) + np.asarray(fr)) / 36525.0
+    mean_longitude = np.radians(280.460 + 36000.771 * t)
+    mean_anomaly = np.radians(357.5291092 + 35999.05034 * t)
+    ecliptic_longitude = (mean_longitude + np.radians(1.914666471) * np.sin(mean_anomaly)
+                          + np.radians(0.019994643) * np.sin(2.0 * mean_anomaly))
+    distance = ASTRONOMICAL_UNIT_KM * (1.000140612 - 0.016708617 * np.cos(mean_anomaly)
+                                       - 0.000139589 * np.cos(2.0 * mean_anomaly))
+    obliquity = np.radians(23.439291 - 0.0130042 * t)
+    return distance[..., None] * np.stack((
+        np.cos(ecliptic_longitude),
+        np.cos(obliquity) * np.sin(ecliptic_longitude),
+        np.sin(obliquity) * np.sin(ecliptic_longitude),
+    ), axis=-1)
+
+
+def illumination(r: np.ndarray, sun: np.ndarray) -> np.ndarray:
+    """Index into ILLUMINATION_STATES of positions (..., 3) given the sun position in the same frame
+
+    Conical shadow: compares the apparent radii of the Earth and the sun
+    seen from each satellite with the angle between their centres.
+    """
+    to_sun = sun - r
+    sun_distance = np.linalg.norm(to_sun, axis=-1)
+    earth_distance = np.linalg.norm(r, axis=-1)
+    sun_radius = np.arcsin(np.minimum(SUN_RADIUS_KM / sun_distance, 1.0))
+    earth_radius = np.arcsin(np.minimum(WGS84_A_KM / earth_distance, 1.0))
+    separation = np.arccos(np.clip(
+        np.sum(-r * to_sun, axis=-1) / (earth_distance * sun_distance), -1.0, 1.0
+    ))
+
+    state = np.full(separation.shape, ILLUMINATION_STATES.index('penumbra'), dtype=np.uint8)
+    state[separation >= earth_radius + sun_radius] = ILLUMINATION_STATES.index('sunlit')
+    state[separation <= earth_radius - sun_radius] = ILLUMINATION_STATES.index('umbra')
+    return state
+
+
+def observer_view(r_ecef: np.ndarray, timestamp: datetime, latitude_deg: float, longitude_deg: float,
+                  altitude_km: float = 0.0, min_elevation_deg: float = 0.0) -> Dict[str, Any]:
+    """Satellites above an observer's elevation mask at one time, highest first
+
+    ``r_ecef`` holds one Earth-fixed position per satellite, shape (n, 3),
+    NaN where propagation failed. Returns the selected ``rows`` with their
+    look angles and illumination, the sun's look angles, and whether the
+    sky is dark enough for sunlit satellites to be seen.
+    """
+    jd, fr = julian_dates([timestamp])
+    sun_ecef = teme_to_ecef(sun_position_teme(jd, fr), jd, fr)[0]
+    sun_azimuth, sun_elevation, _ = look_angles(sun_ecef, latitude_deg, longitude_deg, altitude_km)
+
+    azimuth, elevation, distance = look_angles(r_ecef, latitude_deg, longitude_deg, altitude_km)
+    with np.errstate(invalid='ignore'):
+        above = np.flatnonzero(elevation >= min_elevation_deg)
+    rows = above[np.argsort(-elevation[above], kind='stable')]
+    state = illumination(r_ecef[rows], sun_ecef)
+    dark_sky = bool(sun_elevation < DARK_SKY_SUN_ELEVATION_DEG)
+
+    return {
+        'rows': rows,
+        'azimuth': azimuth[rows],
+        'elevation': elevation[rows],
+        'range_km': distance[rows],
+        'illumination': state,
+        'observable': (state == ILLUMINATION_STATES.index('sunlit')) & dark_sky,
+        'sun_azimuth': float(sun_azimuth),
+        'sun_elevation': float(sun_elevation),
+        'dark_sky': dark_sky,
+    }
@@ -11,12 +11,14 @@ import json
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
-import redis
 import requests
 from flask import Flask
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from metrics import reset_multiprocess_dir
+from redis_store import InstrumentedRedis, connect
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -42,10 +44,10 @@ class SatelliteDataProcessor:
         self.session = self._create_session()
         self.running = True
         
-    def _init_redis(self) -> redis.Redis:
+    def _init_redis(self) -> InstrumentedRedis:
         """Initialize Redis connection with retry logic"""
         try:
-            client = redis.from_url(REDIS_URL, decode_responses=True)
+            client = connect(REDIS_URL)
             client.ping()
             logger.info("Successfully connected to Redis")
             return client
@@ -198,6 +200,7 @@ class SatelliteDataProcessor:
 
 def main():
     """Main entry point"""
+    reset_multiprocess_dir()
     logger.info(f"Starting {WORKER_TYPE} worker...")
     
     try: